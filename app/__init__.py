@@ -10,8 +10,8 @@ from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from flask_socketio import SocketIO
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import text
-from .models import db, InputTemplate, OutputTemplate, FileType
+from sqlalchemy import literal_column, text
+from .models import db, InputTemplate, OutputTemplate, FileType, event_feed_rank
 
 logger = logging.getLogger(__name__)
 
@@ -145,6 +145,21 @@ def create_app(config_name=None):
             'environment': config_name
         })
 
+    @app.route('/api/health/media-pool')
+    def media_pool_health():
+        from app.utils.media_pool import media_pool
+        return jsonify(media_pool.stats())
+
+    @app.route('/api/health/upload-pipeline')
+    def upload_pipeline_health():
+        from app.file_upload import assembly
+        return jsonify(assembly.stats())
+
+    @app.route('/api/health/read-url-cache')
+    def read_url_cache_health():
+        from modules.object_storage import read_url_cache_stats
+        return jsonify(read_url_cache_stats())
+
     # Error Handlers
     @app.errorhandler(404)
     def not_found(error):
@@ -165,6 +180,19 @@ def create_app(config_name=None):
                 logger.info("Populating initial data...")
                 populate_initial_data()
                 logger.info("Initial data populated successfully.")
+                from app.events.grid import enabled as grid_enabled, ensure_version_row, open_event_grid
+                if grid_enabled():
+                    ensure_version_row()
+                    db.session.commit()
+                    open_event_grid.sync()
+                from app.events.snapshot_writer import enabled as snapshots_async, snapshot_writer
+                if snapshots_async():
+                    snapshot_writer.start(app)
+                from app.events.campaigns import refresh_campaign_index
+                refresh_campaign_index()
+                from app.file_upload.analysis_queue import AnalysisWorkerPool, in_process
+                if in_process():
+                    AnalysisWorkerPool(app).start()
             except SQLAlchemyError as e:
                 logger.error("Database error during initialization: %s", e)
                 db.session.rollback()
@@ -263,12 +291,24 @@ def ensure_schema_compatibility():
             # so the fake-independence detector can query it; backfilled NULL for
             # legacy rows (recompute_event treats NULL media as its own origin).
             'media_sha256': 'VARCHAR(64)',
+            # Stored text MinHash for near-duplicate detection; legacy rows stay
+            # NULL (hashed on the fly) until scripts/backfill_text_signatures.py.
+            'text_minhash': 'BYTEA' if dialect == 'postgresql' else 'BLOB',
         }
         # Events table: independent_source_count is derived by recompute_event
         # (ADR-0020 Phase 1). Backfill 0 for legacy rows; _derive_status falls
         # back to corroboration_count until each event is next recomputed.
         required_event_columns = {
             'independent_source_count': 'INTEGER DEFAULT 0 NOT NULL',
+            # Public-visibility rollup, also maintained by recompute_event.
+            'verified_member_count': 'INTEGER DEFAULT 0 NOT NULL',
+            'supporting_count': 'INTEGER DEFAULT 0 NOT NULL',
+            'has_public_member': ('BOOLEAN DEFAULT FALSE NOT NULL' if dialect == 'postgresql'
+                                  else 'BOOLEAN DEFAULT 0 NOT NULL'),
+            # Open-event grid sync stamp (app/events/grid.py).
+            'grid_version': 'INTEGER DEFAULT 0 NOT NULL',
+            # Incremental-recompute state; NULL until the Event's next full recompute.
+            'recompute_state': 'TEXT',
         }
         # Stage B: extend User into the identity + reputation table. `role`
         # replaces the legacy is_moderator boolean (migrated below).
@@ -303,22 +343,80 @@ def ensure_schema_compatibility():
                 altered = True
                 logger.info("Added missing column events.%s", col_name)
 
+        # ix_events_feed indexed the raw status column, which the feed's
+        # status-rank ORDER BY cannot use; ix_events_feed_rank replaces it.
+        db.session.execute(text("DROP INDEX IF EXISTS ix_events_feed"))
+        _feed_rank_sql = str(
+            event_feed_rank(literal_column('status'), literal_column('status_override'))
+            .compile(dialect=db.engine.dialect)
+        )
+
+        # Composite indexes backing the SQL-paged read feeds. db.create_all()
+        # only builds indexes for tables it creates, so legacy tables get them
+        # here; IF NOT EXISTS is accepted by both PostgreSQL and SQLite.
+        # Mirrors the dialect split on the model's __table_args__.
+        required_indexes = {
+            'ix_file_uploads_feed': (
+                'file_uploads (verification_status, upload_date DESC NULLS LAST, id DESC)'
+                if dialect == 'postgresql' else
+                'file_uploads (verification_status, upload_date, id)'
+            ),
+            # The feed's status-rank expression (models.event_feed_rank), so
+            # the index matches the ORDER BY and keyset predicate exactly.
+            'ix_events_feed_rank': (
+                f"events (has_public_member, {_feed_rank_sql}, updated_at DESC NULLS LAST, id DESC)"
+                if dialect == 'postgresql' else
+                f"events (has_public_member, {_feed_rank_sql}, updated_at DESC, id DESC)"
+            ),
+            'ix_events_has_public_member': 'events (has_public_member)',
+            # Clustering's bounding-box prefilter.
+            'ix_events_geo': 'events (lat, lon)',
+            'ix_events_grid_version': 'events (grid_version)',
+            # Backs the per-reporter track-record refresh (ADR-0024).
+            'ix_file_uploads_user_id': 'file_uploads (user_id)',
+        }
+        for idx_name, idx_cols in required_indexes.items():
+            db.session.execute(text(f"CREATE INDEX IF NOT EXISTS {idx_name} ON {idx_cols}"))
+            altered = True
+
         # The first time independent_source_count is added (ADR-0020 Phase 1),
         # backfill it by recomputing every event. Without this, existing rows
         # keep the ALTER's DEFAULT 0 — which under-reports corroboration in the
         # reader UI and would drop a stored-CORROBORATED event to DEVELOPING on
-        # its next recompute. (`event_cols` is the pre-ALTER snapshot, so this
-        # runs only on the migrating startup.)
-        if 'independent_source_count' not in event_cols:
+        # its next recompute. The visibility rollup needs the same backfill, or
+        # every legacy Event would vanish from the reader feed. (`event_cols`
+        # is the pre-ALTER snapshot, so this runs only on the migrating startup.)
+        if ('independent_source_count' not in event_cols
+                or 'has_public_member' not in event_cols):
             try:
                 from app.events.service import recompute_event
                 from app.models import Event
                 for _ev in Event.query.all():
                     recompute_event(_ev)
                 altered = True
-                logger.info("Backfilled events.independent_source_count via recompute")
+                logger.info("Backfilled events derived counts via recompute")
             except Exception as _bf:
-                logger.warning("independent_source_count backfill skipped: %s", _bf)
+                logger.warning("events derived-count backfill skipped: %s", _bf)
+
+        # Reader chips read the stored track record (ADR-0024), which nothing
+        # wrote before then. A reporter with VERIFIED reports but a zero count is
+        # that never-populated state: reconcile every user once from current rows.
+        try:
+            from app.models import User, FileUpload
+            from app.story.track_record import rebuild_track_records
+            unpopulated = db.session.query(User.userid).filter(
+                User.reports_count == 0,
+                db.session.query(FileUpload.id).filter(
+                    FileUpload.user_id == User.userid,
+                    FileUpload.verification_status == 'VERIFIED',
+                ).exists(),
+            ).first()
+            if unpopulated is not None:
+                drift = rebuild_track_records()
+                altered = True
+                logger.info("Backfilled users track record (%d rows)", len(drift))
+        except Exception as _tr:
+            logger.warning("track-record backfill skipped: %s", _tr)
 
         # Migrate legacy is_moderator → role, only on the run that first adds
         # `role` (so a later manual steward/moderator assignment isn't clobbered
@@ -378,8 +476,49 @@ def ensure_schema_compatibility():
                     "recreate the dev DB or run a custom migration."
                 )
 
+        # Snapshot chunk store (ADR-0026): a snapshot keeps a chunk manifest and
+        # its graph_json goes NULL once converted. Add the column, drop NOT NULL
+        # on graph_json, and convert existing rows on the migrating startup
+        # (`snapshot_cols` is the pre-ALTER snapshot, as with event_cols).
+        snapshot_cols = _cols(db.session.execute(
+            text("SELECT column_name FROM information_schema.columns "
+                 "WHERE table_name = 'event_graph_snapshots'")
+            if dialect == 'postgresql' else text("PRAGMA table_info(event_graph_snapshots)")
+        ).fetchall())
+        if snapshot_cols and 'manifest_json' not in snapshot_cols:
+            db.session.execute(text("ALTER TABLE event_graph_snapshots ADD COLUMN manifest_json TEXT"))
+            altered = True
+            logger.info("Added missing column event_graph_snapshots.manifest_json")
+        if dialect == 'postgresql':
+            row = db.session.execute(text(
+                "SELECT is_nullable FROM information_schema.columns "
+                "WHERE table_name = 'event_graph_snapshots' AND column_name = 'graph_json'"
+            )).fetchone()
+            if row and row[0] == 'NO':
+                db.session.execute(text(
+                    "ALTER TABLE event_graph_snapshots ALTER COLUMN graph_json DROP NOT NULL"))
+                altered = True
+                logger.info("Dropped NOT NULL on event_graph_snapshots.graph_json")
+        elif dialect == 'sqlite':
+            srows = db.session.execute(text("PRAGMA table_info(event_graph_snapshots)")).fetchall()
+            if any(r[1] == 'graph_json' and r[3] == 1 for r in srows):
+                logger.warning(
+                    "event_graph_snapshots.graph_json is NOT NULL on this SQLite "
+                    "database. Chunked snapshot storage requires a manual table "
+                    "rebuild — recreate the dev DB or run a custom migration."
+                )
+
         if altered:
             db.session.commit()
+
+        if snapshot_cols and 'manifest_json' not in snapshot_cols:
+            try:
+                from app.events.snapshot_store import convert_legacy_snapshots
+                converted = convert_legacy_snapshots()
+                logger.info("Converted %d snapshots to the chunk store", converted)
+            except Exception as _cs:
+                db.session.rollback()
+                logger.warning("snapshot chunk conversion skipped: %s", _cs)
     except Exception as e:
         db.session.rollback()
         logger.warning("Schema compatibility check failed: %s", e)
@@ -7,14 +7,27 @@ frames throughout the video using two strategies:
 1. Interval-based: every N seconds (simple, predictable)
 2. Scene-change detection: histogram diff to find visual transitions
 
+Both strategies share one sequential decode (_scan). Seeking with
+CAP_PROP_POS_FRAMES before every read made long-GOP phone MP4s decode from
+the previous keyframe at each sample point, so a 2 fps scan decoded most of
+the video several times over, and hybrid mode ran two such scans. The scan
+instead grab()s every frame once and retrieve()s (converts) only the sample
+points; the scene histogram is taken on a downscaled copy.
+
+An ffmpeg engine is the alternative for long videos: it decodes only I-frames
+(-skip_frame nokey) or runs the select='gt(scene,T)' filter natively, and
+streams scaled JPEGs over a pipe straight into base64 -- no temp files. The
+'auto' strategy uses it for videos of LONG_VIDEO_SEC or more when ffmpeg is
+installed, and OpenCV hybrid otherwise.
+
 Returns frames as base64-encoded JPEG for GPT-4o multimodal analysis.
 """
 
 import base64
-import io
 import logging
-import os
-import tempfile
+import re
+import shutil
+import subprocess
 from typing import List, Optional
 
 logger = logging.getLogger(__name__)
@@ -23,80 +36,75 @@ logger = logging.getLogger(__name__)
 DEFAULT_INTERVAL_SEC = 5    # Sample every 5 seconds
 MAX_FRAMES = 8              # Cap to limit API cost
 SCENE_CHANGE_THRESHOLD = 0.4  # Histogram diff threshold (0-1)
+SCENE_SAMPLE_FPS = 2.0      # Scene-change sampling rate
 FRAME_JPEG_QUALITY = 75     # JPEG quality for base64 encoding
 MAX_FRAME_DIMENSION = 768   # Resize frames to limit token cost
+HIST_MAX_DIMENSION = 160    # Downscale before the scene-change histogram
+FFMPEG_SCENE_THRESHOLD = 0.3  # ffmpeg scene score threshold (0-1)
+FFMPEG_JPEG_QSCALE = 5      # mjpeg -q:v, roughly FRAME_JPEG_QUALITY
+LONG_VIDEO_SEC = 120        # 'auto' hands videos this long to ffmpeg
+MIN_SCENE_GAP_SEC = 1.0     # ffmpeg scene picks at least this far apart
 
+# A frame extraction is bounded by -frames:v, but decoding for the scene
+# filter still reads the whole video.
+_FFMPEG_TIMEOUT_SECONDS = 120
+_SHOWINFO_PTS = re.compile(r'\[Parsed_showinfo[^\]]*\][^\n]*?\bpts_time:\s*(-?[0-9.]+)')
 
-def _frame_to_base64(frame, max_dim: int = MAX_FRAME_DIMENSION) -> str:
-    """Convert an OpenCV frame (numpy array) to base64 JPEG string."""
+
+def _shrink(frame, max_dim: int, interpolation=None):
+    """Downscale an OpenCV frame so its longer side is at most max_dim."""
     import cv2
 
     h, w = frame.shape[:2]
-    if max(h, w) > max_dim:
-        scale = max_dim / max(h, w)
-        frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+    if max(h, w) <= max_dim:
+        return frame
+    scale = max_dim / max(h, w)
+    size = (max(1, int(w * scale)), max(1, int(h * scale)))
+    if interpolation is None:
+        return cv2.resize(frame, size)
+    return cv2.resize(frame, size, interpolation=interpolation)
+
+
+def _frame_to_base64(frame, max_dim: int = MAX_FRAME_DIMENSION) -> str:
+    """Convert an OpenCV frame (numpy array) to base64 JPEG string."""
+    import cv2
 
+    frame = _shrink(frame, max_dim)
     _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, FRAME_JPEG_QUALITY])
     return base64.b64encode(buffer.tobytes()).decode('utf-8')
 
 
-def _histogram_diff(frame_a, frame_b) -> float:
-    """
-    Compute normalized histogram difference between two frames.
-    Returns 0.0 (identical) to 1.0 (completely different).
-    """
+def _hsv_histogram(frame):
+    """Normalized hue/saturation histogram of a frame, downscaled first."""
     import cv2
 
-    # Convert to HSV for better color comparison
-    hsv_a = cv2.cvtColor(frame_a, cv2.COLOR_BGR2HSV)
-    hsv_b = cv2.cvtColor(frame_b, cv2.COLOR_BGR2HSV)
+    small = _shrink(frame, HIST_MAX_DIMENSION, cv2.INTER_AREA)
+    hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+    hist = cv2.calcHist([hsv], [0, 1], None, [50, 60], [0, 180, 0, 256])
+    cv2.normalize(hist, hist, 0, 1, cv2.NORM_MINMAX)
+    return hist
 
-    hist_a = cv2.calcHist([hsv_a], [0, 1], None, [50, 60], [0, 180, 0, 256])
-    hist_b = cv2.calcHist([hsv_b], [0, 1], None, [50, 60], [0, 180, 0, 256])
 
-    cv2.normalize(hist_a, hist_a, 0, 1, cv2.NORM_MINMAX)
-    cv2.normalize(hist_b, hist_b, 0, 1, cv2.NORM_MINMAX)
+def _hist_distance(hist_a, hist_b) -> float:
+    import cv2
 
     # Correlation: 1.0 = identical, -1.0 = opposite
     correlation = cv2.compareHist(hist_a, hist_b, cv2.HISTCMP_CORREL)
     return max(0.0, 1.0 - correlation)
 
 
-def extract_keyframes_interval(
-    video_path: str,
-    interval_sec: float = DEFAULT_INTERVAL_SEC,
-    max_frames: int = MAX_FRAMES,
-) -> List[dict]:
+def _histogram_diff(frame_a, frame_b) -> float:
     """
-    Extract frames at fixed intervals throughout the video.
-
-    Returns list of:
-        {
-            'base64': str  — base64-encoded JPEG
-            'time_sec': float — timestamp in seconds
-            'index': int — frame index
-        }
+    Compute normalized histogram difference between two frames.
+    Returns 0.0 (identical) to 1.0 (completely different).
     """
-    try:
-        import cv2
-    except ImportError:
-        logger.warning("opencv-python not installed — keyframe extraction unavailable")
-        return []
-
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        logger.error("Cannot open video: %s", video_path)
-        return []
-
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration_sec = total_frames / fps if fps > 0 else 0
+    return _hist_distance(_hsv_histogram(frame_a), _hsv_histogram(frame_b))
 
-    if duration_sec <= 0:
-        cap.release()
-        return []
 
-    # Calculate frame positions
+def _interval_positions(total_frames: int, fps: float, interval_sec: float,
+                        max_frames: int) -> List[int]:
+    """Frame indices every interval_sec, always including first and last,
+    thinned evenly to max_frames."""
     interval_frames = int(fps * interval_sec)
     positions = list(range(0, total_frames, max(1, interval_frames)))
 
@@ -111,21 +119,134 @@ def extract_keyframes_interval(
     if len(positions) > max_frames:
         step = len(positions) / max_frames
         positions = [positions[int(i * step)] for i in range(max_frames)]
+    return positions
+
+
+def _scan(
+    video_path: str,
+    max_frames: int,
+    threshold: Optional[float] = None,
+    sample_fps: float = SCENE_SAMPLE_FPS,
+    interval_sec: Optional[float] = None,
+) -> Optional[dict]:
+    """
+    Decode the video once, front to back, picking scene-change frames
+    (when `threshold` is given) and interval frames (when `interval_sec` is
+    given) in the same pass.
+
+    Frames between sample points are only grab()bed. Picks are kept as
+    frames shrunk to MAX_FRAME_DIMENSION, not yet encoded, so the caller
+    encodes only what it returns. With both strategies the interval picks are
+    a fallback for a scene scan that finds too few frames, so the decode stops
+    as soon as the scene picks are full.
+
+    Returns {'scene': [...], 'interval': [...], 'duration_sec': float} with
+    picks of {'frame', 'time_sec'}, or None when the video cannot be read.
+    """
+    try:
+        import cv2
+    except ImportError:
+        logger.warning("opencv-python not installed — keyframe extraction unavailable")
+        return None
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        logger.error("Cannot open video: %s", video_path)
+        return None
+
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        duration_sec = total_frames / fps if fps > 0 else 0
+        if duration_sec <= 0:
+            return None
+
+        scene = [] if threshold is not None else None
+        interval = [] if interval_sec is not None else None
+        positions = (set(_interval_positions(total_frames, fps, interval_sec, max_frames))
+                     if interval is not None else set())
+        last_position = max(positions, default=-1)
+        sample_interval = max(1, int(fps / sample_fps))
+        prev_hist = None
+
+        for frame_idx in range(total_frames):
+            # Done once the scene picks are full, or, interval-only, once
+            # past the last interval position
+            scene_open = scene is not None and len(scene) < max_frames
+            if not scene_open and (scene is not None or frame_idx > last_position):
+                break
+
+            scene_due = scene_open and frame_idx % sample_interval == 0
+            interval_due = frame_idx in positions
+            if not cap.grab():
+                break
+            if not (scene_due or interval_due):
+                continue
+            ret, frame = cap.retrieve()
+            if not ret or frame is None:
+                break
+
+            time_sec = round(frame_idx / fps, 2)
+            kept = None
+            if scene_due:
+                hist = _hsv_histogram(frame)
+                if prev_hist is None or _hist_distance(prev_hist, hist) >= threshold:
+                    kept = _shrink(frame, MAX_FRAME_DIMENSION)
+                    scene.append({'frame': kept, 'time_sec': time_sec})
+                    prev_hist = hist
+            if interval_due:
+                if kept is None:
+                    kept = _shrink(frame, MAX_FRAME_DIMENSION)
+                interval.append({'frame': kept, 'time_sec': time_sec})
+
+        return {'scene': scene or [], 'interval': interval or [], 'duration_sec': duration_sec}
+    finally:
+        cap.release()
+
+
+def _encode(picks: List[dict]) -> List[dict]:
+    return [
+        {'base64': _frame_to_base64(p['frame']), 'time_sec': p['time_sec'], 'index': i}
+        for i, p in enumerate(picks)
+    ]
+
 
-    frames = []
-    for idx, frame_pos in enumerate(positions):
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-        ret, frame = cap.read()
-        if ret and frame is not None:
-            frames.append({
-                'base64': _frame_to_base64(frame),
-                'time_sec': round(frame_pos / fps, 2),
-                'index': idx,
-            })
-
-    cap.release()
+def _merge(frames: List[dict], extra: List[dict], max_frames: int) -> List[dict]:
+    """Add `extra` frames not within 2 seconds of one already chosen, up to
+    max_frames, sorted by time and re-indexed."""
+    frames = list(frames)
+    existing_times = {f['time_sec'] for f in frames}
+    for f in extra:
+        if len(frames) >= max_frames:
+            break
+        if not any(abs(f['time_sec'] - t) < 2.0 for t in existing_times):
+            frames.append(f)
+            existing_times.add(f['time_sec'])
+    frames.sort(key=lambda f: f['time_sec'])
+    return [dict(f, index=i) for i, f in enumerate(frames)]
+
+
+def extract_keyframes_interval(
+    video_path: str,
+    interval_sec: float = DEFAULT_INTERVAL_SEC,
+    max_frames: int = MAX_FRAMES,
+) -> List[dict]:
+    """
+    Extract frames at fixed intervals throughout the video.
+
+    Returns list of:
+        {
+            'base64': str  — base64-encoded JPEG
+            'time_sec': float — timestamp in seconds
+            'index': int — frame index
+        }
+    """
+    scan = _scan(video_path, max_frames, interval_sec=interval_sec)
+    if scan is None:
+        return []
+    frames = _encode(scan['interval'])
     logger.info("Extracted %d keyframes from %.1fs video (interval=%ds)",
-                len(frames), duration_sec, interval_sec)
+                len(frames), scan['duration_sec'], interval_sec)
     return frames
 
 
@@ -133,79 +254,201 @@ def extract_keyframes_scene_change(
     video_path: str,
     threshold: float = SCENE_CHANGE_THRESHOLD,
     max_frames: int = MAX_FRAMES,
-    sample_fps: float = 2.0,
+    sample_fps: float = SCENE_SAMPLE_FPS,
 ) -> List[dict]:
     """
     Extract frames at scene changes detected by histogram difference.
 
-    Samples the video at `sample_fps` rate and compares consecutive frames.
-    When the difference exceeds `threshold`, the frame is captured.
+    Samples the video at `sample_fps` rate and compares each sample with the
+    last captured frame. When the difference exceeds `threshold`, the frame
+    is captured. The first frame is always captured.
 
     Returns same format as extract_keyframes_interval.
     """
-    try:
-        import cv2
-    except ImportError:
-        logger.warning("opencv-python not installed — keyframe extraction unavailable")
+    scan = _scan(video_path, max_frames, threshold=threshold, sample_fps=sample_fps)
+    if scan is None:
         return []
+    frames = _encode(scan['scene'])
+    logger.info("Extracted %d scene-change keyframes from %.1fs video (threshold=%.2f)",
+                len(frames), scan['duration_sec'], threshold)
+    return frames
 
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        logger.error("Cannot open video: %s", video_path)
-        return []
 
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration_sec = total_frames / fps if fps > 0 else 0
+# ── ffmpeg engine ───────────────────────────────────────────────────────
 
-    if duration_sec <= 0:
-        cap.release()
-        return []
+def ffmpeg_available() -> bool:
+    return shutil.which('ffmpeg') is not None
 
-    sample_interval = max(1, int(fps / sample_fps))
-    prev_frame = None
-    frames = []
-
-    # Always capture first frame
-    ret, first_frame = cap.read()
-    if ret and first_frame is not None:
-        frames.append({
-            'base64': _frame_to_base64(first_frame),
-            'time_sec': 0.0,
-            'index': 0,
-        })
-        prev_frame = first_frame
-
-    frame_idx = 0
-    while len(frames) < max_frames:
-        frame_idx += sample_interval
-        if frame_idx >= total_frames:
-            break
 
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        ret, frame = cap.read()
-        if not ret or frame is None:
-            break
+def _probe_duration(video_path: str) -> Optional[float]:
+    """Container duration in seconds from ffprobe, or None."""
+    ffprobe = shutil.which('ffprobe')
+    if not ffprobe:
+        return None
+    try:
+        proc = subprocess.run(
+            [ffprobe, '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=noprint_wrappers=1:nokey=1', video_path],
+            capture_output=True, timeout=30, check=False,
+        )
+        return float(proc.stdout.decode('ascii', errors='replace').strip())
+    except (subprocess.TimeoutExpired, OSError, ValueError):
+        return None
 
-        if prev_frame is not None:
-            diff = _histogram_diff(prev_frame, frame)
-            if diff >= threshold:
-                frames.append({
-                    'base64': _frame_to_base64(frame),
-                    'time_sec': round(frame_idx / fps, 2),
-                    'index': len(frames),
-                })
-                prev_frame = frame
-
-    cap.release()
-    logger.info("Extracted %d scene-change keyframes from %.1fs video (threshold=%.2f)",
-                len(frames), duration_sec, threshold)
+
+def _split_jpegs(data: bytes) -> List[bytes]:
+    """
+    Split an mjpeg image2pipe stream into its JPEGs.
+
+    Walks the marker segments to the start of scan, then looks for EOI in the
+    entropy-coded data, where 0xFF is always byte-stuffed -- so table bytes
+    that happen to read FFD9 never cut an image short. A truncated trailing
+    image is dropped.
+    """
+    images = []
+    pos = 0
+    while True:
+        start = data.find(b'\xff\xd8', pos)
+        if start < 0:
+            return images
+        i = start + 2
+        end = -1
+        while i + 4 <= len(data) and data[i] == 0xFF:
+            marker = data[i + 1]
+            seg_len = int.from_bytes(data[i + 2:i + 4], 'big')
+            if marker == 0xDA:
+                end = data.find(b'\xff\xd9', i + 2 + seg_len)
+                break
+            i += 2 + seg_len
+        if end < 0:
+            return images
+        images.append(data[start:end + 2])
+        pos = end + 2
+
+
+def _ffmpeg_frames(video_path: str, select: str, max_frames: int,
+                   keyframes_only: bool = False) -> Optional[List[dict]]:
+    """
+    Run ffmpeg with a select expression and read the chosen frames, scaled to
+    MAX_FRAME_DIMENSION, as JPEGs from stdout. Timestamps come from the
+    showinfo filter on stderr. Returns None when ffmpeg is missing or fails.
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        return None
+
+    box = MAX_FRAME_DIMENSION
+    vf = (f"select='{select}',showinfo,"
+          f"scale='min({box},iw)':'min({box},ih)':force_original_aspect_ratio=decrease")
+    cmd = [ffmpeg, '-hide_banner', '-nostats', '-loglevel', 'info']
+    if keyframes_only:
+        cmd += ['-skip_frame', 'nokey']   # decode I-frames only
+    cmd += [
+        '-i', video_path,
+        '-an', '-sn', '-dn',
+        '-vf', vf,
+        '-vsync', 'vfr',
+        '-frames:v', str(max_frames),
+        '-f', 'image2pipe', '-c:v', 'mjpeg', '-q:v', str(FFMPEG_JPEG_QSCALE),
+        'pipe:1',
+    ]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, timeout=_FFMPEG_TIMEOUT_SECONDS, check=False)
+    except subprocess.TimeoutExpired:
+        logger.error("ffmpeg timed out extracting keyframes from %s", video_path)
+        return None
+    except OSError as exc:
+        logger.error("ffmpeg invocation failed for %s: %s", video_path, exc)
+        return None
+
+    stderr = proc.stderr.decode('utf-8', errors='replace')
+    if proc.returncode != 0:
+        logger.error("ffmpeg returned %s extracting keyframes from %s: %s",
+                     proc.returncode, video_path, stderr[-500:])
+        return None
+
+    images = _split_jpegs(proc.stdout)
+    times = [float(t) for t in _SHOWINFO_PTS.findall(stderr)]
+    if len(times) < len(images):
+        logger.warning("ffmpeg reported %d timestamps for %d frames from %s",
+                       len(times), len(images), video_path)
+    return [
+        {'base64': base64.b64encode(jpeg).decode('utf-8'), 'time_sec': round(max(0.0, t), 2), 'index': i}
+        for i, (jpeg, t) in enumerate(zip(images, times))
+    ]
+
+
+def extract_keyframes_ffmpeg_iframes(
+    video_path: str,
+    max_frames: int = MAX_FRAMES,
+    duration_sec: Optional[float] = None,
+) -> Optional[List[dict]]:
+    """
+    I-frames only (-skip_frame nokey), spaced so `max_frames` of them span
+    the video: at least DEFAULT_INTERVAL_SEC apart, more when the duration is
+    known and long. Nothing between keyframes is decoded.
+
+    Returns the extract_keyframes_interval format, or None when ffmpeg is
+    unavailable or fails.
+    """
+    if duration_sec is None:
+        duration_sec = _probe_duration(video_path)
+    gap = DEFAULT_INTERVAL_SEC
+    if duration_sec:
+        gap = max(gap, duration_sec / max(1, max_frames))
+    frames = _ffmpeg_frames(
+        video_path, f'isnan(prev_selected_t)+gte(t-prev_selected_t,{gap:.3f})',
+        max_frames, keyframes_only=True,
+    )
+    if frames is not None:
+        logger.info("Extracted %d I-frame keyframes via ffmpeg (gap=%.1fs)", len(frames), gap)
     return frames
 
 
+def extract_keyframes_ffmpeg_scene(
+    video_path: str,
+    threshold: float = FFMPEG_SCENE_THRESHOLD,
+    max_frames: int = MAX_FRAMES,
+) -> Optional[List[dict]]:
+    """
+    The first frame plus frames whose ffmpeg scene score exceeds `threshold`,
+    at least MIN_SCENE_GAP_SEC apart.
+
+    Returns the extract_keyframes_interval format, or None when ffmpeg is
+    unavailable or fails.
+    """
+    frames = _ffmpeg_frames(
+        video_path,
+        f'isnan(prev_selected_t)+gt(scene,{threshold})*gte(t-prev_selected_t,{MIN_SCENE_GAP_SEC})',
+        max_frames,
+    )
+    if frames is not None:
+        logger.info("Extracted %d scene-change keyframes via ffmpeg (threshold=%.2f)",
+                    len(frames), threshold)
+    return frames
+
+
+def _ffmpeg_hybrid(video_path: str, max_frames: int,
+                   duration_sec: Optional[float] = None) -> Optional[List[dict]]:
+    """ffmpeg scene frames, supplemented with I-frames when too few."""
+    frames = extract_keyframes_ffmpeg_scene(video_path, max_frames=max_frames)
+    if frames is None:
+        return None
+    if len(frames) < 3:
+        logger.info("ffmpeg scene change found few frames (%d), supplementing with I-frames",
+                    len(frames))
+        extra = extract_keyframes_ffmpeg_iframes(video_path, max_frames, duration_sec) or []
+        frames = _merge(frames, extra, max_frames)
+    return frames
+
+
+# ffmpeg strategy -> the OpenCV strategy it falls back to
+_OPENCV_FALLBACK = {'ffmpeg_iframes': 'interval', 'ffmpeg_scene': 'scene_change', 'ffmpeg': 'hybrid'}
+
+
 def extract_keyframes(
     video_path: str,
-    strategy: str = 'hybrid',
+    strategy: str = 'auto',
     max_frames: int = MAX_FRAMES,
 ) -> List[dict]:
     """
@@ -214,39 +457,55 @@ def extract_keyframes(
     Parameters
     ----------
     video_path : str      — path to video file
-    strategy   : str      — 'interval', 'scene_change', or 'hybrid' (default)
+    strategy   : str      — OpenCV: 'interval', 'scene_change', 'hybrid';
+                            ffmpeg: 'ffmpeg_iframes', 'ffmpeg_scene', 'ffmpeg'
+                            (scene, supplemented with I-frames);
+                            'auto' (default): 'ffmpeg' for videos of
+                            LONG_VIDEO_SEC or more, else 'hybrid'
     max_frames : int      — maximum frames to return
 
+    An ffmpeg strategy falls back to its OpenCV counterpart when ffmpeg is
+    missing or fails.
+
     Returns
     -------
     list of {base64: str, time_sec: float, index: int}
     """
+    duration_sec = None
+    if strategy == 'auto':
+        strategy = 'hybrid'
+        if ffmpeg_available():
+            duration_sec = _probe_duration(video_path)
+            if duration_sec is not None and duration_sec >= LONG_VIDEO_SEC:
+                strategy = 'ffmpeg'
+
+    if strategy in _OPENCV_FALLBACK:
+        if strategy == 'ffmpeg_iframes':
+            frames = extract_keyframes_ffmpeg_iframes(video_path, max_frames, duration_sec)
+        elif strategy == 'ffmpeg_scene':
+            frames = extract_keyframes_ffmpeg_scene(video_path, max_frames=max_frames)
+        else:
+            frames = _ffmpeg_hybrid(video_path, max_frames, duration_sec)
+        if frames is not None:
+            return frames[:max_frames]
+        strategy = _OPENCV_FALLBACK[strategy]
+        logger.warning("ffmpeg keyframe extraction unavailable for %s — using OpenCV %s",
+                       video_path, strategy)
+
     if strategy == 'scene_change':
-        frames = extract_keyframes_scene_change(video_path, max_frames=max_frames)
-    elif strategy == 'interval':
-        frames = extract_keyframes_interval(video_path, max_frames=max_frames)
-    else:
-        # Hybrid: try scene change first, fall back to interval if too few
-        frames = extract_keyframes_scene_change(video_path, max_frames=max_frames)
-        if len(frames) < 3:
-            logger.info("Scene change found few frames (%d), supplementing with interval",
-                        len(frames))
-            interval_frames = extract_keyframes_interval(
-                video_path, max_frames=max_frames
-            )
-            # Merge, deduplicate by similar timestamp
-            existing_times = {f['time_sec'] for f in frames}
-            for f in interval_frames:
-                if len(frames) >= max_frames:
-                    break
-                # Skip if within 2 seconds of an existing frame
-                if not any(abs(f['time_sec'] - t) < 2.0 for t in existing_times):
-                    frames.append(f)
-                    existing_times.add(f['time_sec'])
-
-            # Re-sort by time and re-index
-            frames.sort(key=lambda f: f['time_sec'])
-            for i, f in enumerate(frames):
-                f['index'] = i
-
-    return frames[:max_frames]
+        return extract_keyframes_scene_change(video_path, max_frames=max_frames)[:max_frames]
+    if strategy == 'interval':
+        return extract_keyframes_interval(video_path, max_frames=max_frames)[:max_frames]
+
+    # Hybrid: scene change, supplemented with interval frames if too few.
+    # Both come from the same decode.
+    scan = _scan(video_path, max_frames, threshold=SCENE_CHANGE_THRESHOLD,
+                 interval_sec=DEFAULT_INTERVAL_SEC)
+    if scan is None:
+        return []
+    picks = scan['scene']
+    if len(picks) < 3:
+        logger.info("Scene change found few frames (%d), supplementing with interval",
+                    len(picks))
+        picks = _merge(picks, scan['interval'], max_frames)
+    return _encode(picks[:max_frames])
@@ -23,6 +23,7 @@ from werkzeug.utils import secure_filename
 from .exif_extractor import extract_exif
 from .transcriber import transcribe
 from .keyframes import extract_keyframes
+from app.utils.media_pool import media_pool
 
 logger = logging.getLogger(__name__)
 
@@ -125,7 +126,7 @@ def _analyze_image(image_path: str, steps: list) -> dict:
 
     # Step 1: EXIF extraction
     steps.append('Extracting photo metadata (EXIF)...')
-    exif = extract_exif(image_path)
+    exif = media_pool.run('exif', extract_exif, image_path)
 
     # Step 2: GPT-4o Vision analysis
     steps.append('Analyzing image with AI...')
@@ -157,7 +158,8 @@ def _analyze_video(video_path: str, steps: list) -> dict:
 
     # Step 1: Extract keyframes
     steps.append('Extracting video keyframes...')
-    keyframes = extract_keyframes(video_path, strategy='hybrid', max_frames=6)
+    keyframes = media_pool.run('keyframes', extract_keyframes, video_path,
+                               strategy='auto', max_frames=6)
 
     # Step 2: Transcribe audio
     steps.append('Transcribing audio (multilingual)...')
@@ -31,7 +31,7 @@ import logging
 from datetime import datetime, timezone
 
 from app.models import db, User, FileUpload, FileType, Event
-from app.events.service import process_new_report, recompute_event
+from app.events.service import mark_dirty, process_new_report
 
 logger = logging.getLogger(__name__)
 
@@ -168,14 +168,15 @@ def provision(db):
 
 
 # ── moderator / steward actions (the sole steward drives all of these) ──
+# Each marks the touched Events dirty; they are re-derived once at commit.
 
 def _verify(upload, steward):
+    first_approval = upload.verification_status == 'PENDING'
     upload.verification_status = 'VERIFIED'
     upload.verified_at = datetime.now(timezone.utc)
     upload.verified_by = steward.userid
     db.session.flush()
-    if upload.event_id:
-        recompute_event(db.session.get(Event, upload.event_id))
+    mark_dirty(upload.event_id, verified=upload if first_approval else None)
 
 
 def _reject(upload, steward, note):
@@ -184,8 +185,7 @@ def _reject(upload, steward, note):
     upload.verified_by = steward.userid
     upload.verification_note = note
     db.session.flush()
-    if upload.event_id:
-        recompute_event(db.session.get(Event, upload.event_id))
+    mark_dirty(upload.event_id)
 
 
 def _vouch(user, rung):
@@ -193,13 +193,13 @@ def _vouch(user, rung):
     db.session.flush()
     event_ids = {fu.event_id for fu in FileUpload.query.filter_by(user_id=user.userid).all() if fu.event_id}
     for eid in event_ids:
-        recompute_event(db.session.get(Event, eid))
+        mark_dirty(eid)
 
 
 def _dispute(event):
     event.status_override = 'DISPUTED'
     db.session.flush()
-    recompute_event(event)
+    mark_dirty(event.id)
 
 
 # ── simulation (dry-run / demo / self-test) ─────────────────────────
@@ -19,17 +19,21 @@ non-trivial relational structure. It is:
   * privacy-preserving -- never emits raw user_id (deanonymization, ADR-0007).
 
 Pure functions only: no request context, no commit. That keeps the graph usable
-from a reader endpoint, an export job, or a future snapshot writer alike.
+from a reader endpoint, an export job, or the snapshot writer alike.
 """
 
 import hashlib
 import json
 from collections import Counter
-from datetime import timezone
+from datetime import datetime, timezone
+from types import SimpleNamespace
 
-from app.story.serializers import serialize_reporter, confidence_band
+from app.story.serializers import (
+    serialize_reporter, preload_related, confidence_band,
+)
 from app.events.independence import analyze_independence
 from app.events.service import _independent_origins
+from app.models import User
 
 # Bump when the emitted shape changes in a way a stored/exported graph must be
 # able to distinguish (durability: an old archived graph declares its version).
@@ -93,6 +97,16 @@ def build_event_graph(event):
     same rule as events.service (reshares collapse to one origin), so the graph
     is self-consistent with the live Event without depending on stored counters.
     """
+    return graph_from_capture(capture_graph_inputs(event))
+
+
+def capture_graph_inputs(event):
+    """Everything build_event_graph reads from the database, as plain JSON-able
+    data: the emitted event block and source nodes, plus the few member fields
+    the independence analysis needs. Cheap (column reads and one reporter
+    preload); the expensive part -- analysis, canonical encoding, hashing --
+    is graph_from_capture, which needs no database. The snapshot writer
+    persists this at transition time and builds the graph later."""
     members = [m for m in (getattr(event, 'members', []) or [])
                if m.verification_status == 'VERIFIED']
 
@@ -104,19 +118,9 @@ def build_event_graph(event):
 
     # Deterministic order: earliest first, id as the stable tiebreaker.
     ordered = sorted(members, key=lambda m: (_iso(m.upload_date) or '', m.id))
-    nodes = [_node(m, fp_counts) for m in ordered]
-
-    # Independent sources, computed by the SAME rule as the live engine
-    # (person-based, reshares merged) so the graph and the Event never disagree.
-    origins = _independent_origins(members)
+    preload_related(ordered, 'user', User, 'user_id')
 
-    reshare_clusters = [
-        {'fingerprint': fp, 'size': n}
-        for fp, n in sorted(fp_counts.items()) if n > 1
-    ]
-
-    graph = {
-        'schema_version': GRAPH_SCHEMA_VERSION,
+    return {
         'event': {
             'id': event.id,
             'status': event.status_override or event.status,
@@ -140,6 +144,59 @@ def build_event_graph(event):
                 'closed_at': _iso(event.closed_at),
             },
         },
+        'nodes': [_node(m, fp_counts) for m in ordered],
+        # Member order is kept: the synchronized-submission scan breaks ties
+        # in arrival order.
+        'members': [{
+            'id': m.id,
+            'user_id': None if m.user_id is None else int(m.user_id),
+            'media_sha256': m.media_sha256,
+            'upload_date': _iso(m.upload_date),
+            'witness_statement': m.witness_statement,
+            'title': m.title,
+        } for m in members],
+    }
+
+
+def graph_from_capture(capture):
+    """Assemble the graph, integrity hash included, from capture_graph_inputs
+    output. Pure: no database, so it runs as well off the request path."""
+    graph = _assemble_graph(capture)
+    graph['integrity'] = {'graph_sha256': graph_content_hash(graph)}
+    return graph
+
+
+def _graph_and_json(capture):
+    """graph_from_capture plus the graph's stored JSON form and its node
+    chunks, all from the one canonical encoding (encode_graph)."""
+    graph = _assemble_graph(capture)
+    digest, stored, node_chunks = encode_graph(graph)
+    graph['integrity'] = {'graph_sha256': digest}
+    return graph, stored, node_chunks
+
+
+def _assemble_graph(capture):
+    members = [SimpleNamespace(**dict(m, upload_date=(
+        datetime.fromisoformat(m['upload_date']) if m['upload_date'] else None)))
+        for m in capture['members']]
+    fp_counts = Counter(
+        (m.media_sha256 or '').strip().lower()
+        for m in members
+        if m.user_id is not None and (m.media_sha256 or '').strip()
+    )
+
+    # Independent sources, computed by the SAME rule as the live engine
+    # (person-based, reshares merged) so the graph and the Event never disagree.
+    origins = _independent_origins(members)
+
+    reshare_clusters = [
+        {'fingerprint': fp, 'size': n}
+        for fp, n in sorted(fp_counts.items()) if n > 1
+    ]
+
+    graph = {
+        'schema_version': GRAPH_SCHEMA_VERSION,
+        'event': capture['event'],
         'corroboration': {
             'counted': len({m.user_id for m in members if m.user_id is not None}),
             'independent': len(origins),
@@ -151,24 +208,79 @@ def build_event_graph(event):
         # text/timing the same pattern marks genuine corroboration as much as
         # astroturf (see independence.py). Empty == nothing flagged.
         'coordination_flags': analyze_independence(members),
-        'nodes': nodes,
+        'nodes': capture['nodes'],
     }
-    graph['integrity'] = {'graph_sha256': graph_content_hash(graph)}
     return graph
 
 
+# Compact, sorted keys, raw UTF-8 (ADR-0014 canonical style). One encoder
+# shared by every canonical form below, so they agree byte for byte.
+_CANONICAL = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
 def canonical_graph_bytes(graph):
     """Deterministic bytes for a graph, excluding any attached integrity block
     (ADR-0014 canonical style: compact, sorted keys)."""
     body = {k: v for k, v in graph.items() if k != 'integrity'}
-    return json.dumps(body, sort_keys=True, separators=(',', ':'),
-                      ensure_ascii=False).encode('utf-8')
+    return _CANONICAL.encode(body).encode('utf-8')
+
+
+def _canonical_members(graph, encoded=None):
+    """Yield (key, b'"key":value') for each top-level member but integrity, in
+    canonical order. Each value is encoded exactly once; `encoded` supplies
+    members the caller has already encoded, by key."""
+    encoded = encoded or {}
+    for key in sorted(k for k in graph if k != 'integrity'):
+        if key in encoded:
+            yield key, encoded[key]
+        else:
+            yield key, (_CANONICAL.encode(key) + ':' + _CANONICAL.encode(graph[key])).encode('utf-8')
+
+
+def _members_digest(encoded_members):
+    """SHA-256 of '{' + members joined by ',' + '}', fed member by member."""
+    hasher = hashlib.sha256(b'{')
+    for i, encoded in enumerate(encoded_members):
+        if i:
+            hasher.update(b',')
+        hasher.update(encoded)
+    hasher.update(b'}')
+    return hasher.hexdigest()
+
+
+def encode_graph(graph):
+    """Single pass over a graph: returns (graph_sha256, stored JSON text,
+    node chunks).
+
+    Each top-level member is canonically encoded once (by the C encoder, one
+    member at a time); its bytes feed the SHA-256, which thereby covers exactly
+    canonical_graph_bytes, and are kept for the stored form. The node list is
+    encoded node by node, and those bytes are returned as (byte offset of the
+    list in the stored text, [node bytes]) for the chunk store
+    (snapshot_store.store_graph_json), so it need not parse the text again;
+    (0, []) when there is no node list. The integrity block is then spliced in
+    at its sorted position without re-encoding anything, giving the text
+    json.dumps(sort_keys=True, compact) produces for the graph with integrity
+    attached."""
+    nodes = graph.get('nodes')
+    nodes = [_CANONICAL.encode(n).encode('utf-8') for n in nodes] if isinstance(nodes, list) else []
+    parts = list(_canonical_members(
+        graph, {'nodes': b'"nodes":[' + b','.join(nodes) + b']'} if nodes else None))
+    digest = _members_digest(encoded for _, encoded in parts)
+    at = sum(1 for key, _ in parts if key < 'integrity')
+    parts.insert(at, ('integrity', b'"integrity":{"graph_sha256":"' + digest.encode('ascii') + b'"}'))
+    node_at = 0
+    if nodes:
+        before = [encoded for key, encoded in parts if key < 'nodes']
+        node_at = 1 + sum(len(b) + 1 for b in before) + len(b'"nodes":[')
+    stored = (b'{' + b','.join(encoded for _, encoded in parts) + b'}').decode('utf-8')
+    return digest, stored, (node_at, nodes)
 
 
 def graph_content_hash(graph):
     """Lowercase-hex SHA-256 over the canonical graph bytes -- a stable content
     address for integrity checks and preservation (UC9)."""
-    return hashlib.sha256(canonical_graph_bytes(graph)).hexdigest()
+    return _members_digest(encoded for _, encoded in _canonical_members(graph))
 
 
 def snapshot_event(event, reason=None):
@@ -176,27 +288,42 @@ def snapshot_event(event, reason=None):
     graph -- capture-before-deletion (UC9). Append-only and deduplicated: if the
     latest snapshot already has this exact graph hash, nothing material changed
     and the existing row is returned instead of storing a duplicate. Does not
-    commit -- the caller owns the transaction (matches events.service)."""
-    from app.models import db, EventGraphSnapshot
+    commit -- the caller owns the transaction (matches events.service).
+
+    Synchronous; transitions go through events.snapshot_writer instead, which
+    captures here and stores off the request path."""
+    graph, stored, node_chunks = _graph_and_json(capture_graph_inputs(event))
+    return _store_snapshot(event.id, graph, reason, _latest_snapshot(event.id), stored,
+                           node_chunks)
 
-    graph = build_event_graph(event)
-    digest = graph['integrity']['graph_sha256']
 
-    latest = (
+def _latest_snapshot(event_id):
+    from app.models import EventGraphSnapshot
+    return (
         EventGraphSnapshot.query
-        .filter_by(event_id=event.id)
+        .filter_by(event_id=event_id)
         .order_by(EventGraphSnapshot.id.desc())
         .first()
     )
+
+
+def _store_snapshot(event_id, graph, reason, latest, graph_json, node_chunks=None):
+    """Append `graph` (whose encode_graph text and node chunks are
+    `graph_json` and `node_chunks`) unless `latest` (the Event's newest
+    snapshot, or None) already holds the same hash; the text goes to the chunk
+    store. Returns the stored or the matching row."""
+    from app.models import db, EventGraphSnapshot
+    from app.events.snapshot_store import store_graph_json
+
+    digest = graph['integrity']['graph_sha256']
     if latest is not None and latest.graph_sha256 == digest:
         return latest
 
     snap = EventGraphSnapshot(
-        event_id=event.id,
+        event_id=event_id,
         schema_version=graph['schema_version'],
         graph_sha256=digest,
-        graph_json=json.dumps(graph, sort_keys=True, separators=(',', ':'),
-                              ensure_ascii=False),
+        manifest_json=store_graph_json(graph_json, node_chunks),
         status=graph['event']['status'],
         reason=reason,
     )
@@ -0,0 +1,249 @@
+"""
+app/events/campaigns.py
+
+Cross-event near-duplicate text detection (advisory, like events.independence).
+
+analyze_independence only compares one Event's members, so a copy-paste
+campaign spread over many nearby singleton Events goes unseen. This keeps a
+global LSH index over the stored report signatures (FileUpload.text_minhash):
+text_lsh_buckets holds one row per recent report per band, keyed
+(band, bucket). "Which recent reports anywhere read like this one" is then an
+indexed lookup of the report's band keys -- its cost follows the size of the
+buckets it lands in, not the number of reports -- and every candidate is
+checked with the exact Jaccard, so nothing below CAMPAIGN_DUP_JACCARD is
+reported.
+
+A lookup keeps at most CAMPAIGN_VERIFY_LIMIT candidates per report, newest
+first, ranked in SQL, so a hot bucket (a big campaign, boilerplate text)
+costs the database an index range but never ships more than that many rows.
+
+The index is kept current by FileUpload mapper hooks (events.service) on
+insert, text edit and delete, and only needs the last CAMPAIGN_WINDOW_HOURS:
+lookups ignore older rows and prune_campaign_index drops them -- at startup,
+and then at most every CAMPAIGN_PRUNE_INTERVAL_SECONDS per process from the
+moderation queue (maybe_prune_campaign_index), the index's only reader. It
+can be rebuilt from file_uploads at any time; startup does so when it is
+empty.
+
+Hits surface as flags on moderation queue items. Like every signal in
+events.independence they are advisory only and never touch corroboration.
+"""
+
+import hashlib
+import logging
+import struct
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.orm import aliased
+
+import config
+from app.models import db, FileUpload, TextLshBucket
+from app.events.independence import (
+    _MINHASH_PERMS, _jaccard, _member_text, _naive_utc, _shingles, _stored_signature,
+    minhash_signature,
+)
+
+logger = logging.getLogger(__name__)
+
+# 32 bands of 4: a pair at 0.85 shares a bucket with probability 1 - 6e-11,
+# at 0.8 with 1 - 5e-8. Changing this needs rebuild_campaign_index.
+_INDEX_ROWS = 4
+_FLAG_SOURCES = 10          # matching source ids listed per flag
+
+_prune_lock = threading.Lock()
+_pruned_at = None
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def _signature(upload):
+    sig = _stored_signature(upload)
+    if sig is None:
+        shingles = _shingles(_member_text(upload))
+        sig = minhash_signature(shingles) if shingles else None
+    return sig
+
+
+def _band_keys(sig):
+    """(band, bucket) per LSH band; the bucket is a signed 64-bit digest of
+    the band's values so it fits a BIGINT."""
+    keys = []
+    for band, lo in enumerate(range(0, _MINHASH_PERMS - _INDEX_ROWS + 1, _INDEX_ROWS)):
+        digest = hashlib.blake2b(struct.pack(f'<{_INDEX_ROWS}I', *sig[lo:lo + _INDEX_ROWS]),
+                                 digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return keys
+
+
+def _index_rows(upload):
+    sig = _signature(upload)
+    if sig is None:
+        return []
+    when = _naive_utc(upload.upload_date or datetime.utcnow())
+    return [{'band': band, 'bucket': bucket, 'upload_id': upload.id, 'upload_date': when}
+            for band, bucket in _band_keys(sig)]
+
+
+def index_report(connection, upload):
+    """(Re)index one report on `connection` -- safe inside a flush, which is
+    where the mapper hooks call it."""
+    unindex_report(connection, upload.id)
+    rows = _index_rows(upload)
+    if rows:
+        connection.execute(insert(TextLshBucket), rows)
+
+
+def unindex_report(connection, upload_id):
+    connection.execute(delete(TextLshBucket).where(TextLshBucket.upload_id == upload_id))
+
+
+def _cutoff(now=None):
+    return (now or datetime.utcnow()) - timedelta(hours=_cfg('CAMPAIGN_WINDOW_HOURS', 168))
+
+
+def near_duplicates(uploads, now=None):
+    """Advisory flag per report in `uploads` that recent reports from other
+    identities (anonymous included) share >= CAMPAIGN_DUP_JACCARD of its
+    wording: {upload_id: flag}, reports without hits omitted. One bucket join
+    for the whole batch, one query for the candidates' text. Each flag:
+    {type, match_count, source_ids (up to 10, most similar first),
+    event_ids (sorted), detail}."""
+    ids = [u.id for u in uploads]
+    if not ids:
+        return {}
+    mine, theirs = aliased(TextLshBucket), aliased(TextLshBucket)
+    pairs = (
+        select(mine.upload_id.label('subject'), theirs.upload_id.label('other'),
+               theirs.upload_date.label('upload_date'))
+        .join(theirs, and_(theirs.band == mine.band, theirs.bucket == mine.bucket,
+                           theirs.upload_id != mine.upload_id))
+        .where(mine.upload_id.in_(ids), theirs.upload_date >= _cutoff(now))
+        .distinct()
+        .subquery()
+    )
+    # Newest reports first, capped per subject in SQL; one row past the limit
+    # tells a truncated candidate list from a full one.
+    limit = _cfg('CAMPAIGN_VERIFY_LIMIT', 200)
+    ranked = select(pairs.c.subject, pairs.c.other, func.row_number().over(
+        partition_by=pairs.c.subject,
+        order_by=(pairs.c.upload_date.desc(), pairs.c.other.desc()),
+    ).label('rank')).subquery()
+    rows = db.session.execute(
+        select(ranked.c.subject, ranked.c.other)
+        .where(ranked.c.rank <= limit + 1)
+        .order_by(ranked.c.subject, ranked.c.rank)
+    ).all()
+    candidates = defaultdict(list)
+    for subject, other in rows:
+        candidates[subject].append(other)
+    truncated = set()
+    for subject, others in candidates.items():
+        if len(others) > limit:
+            truncated.add(subject)
+            del others[limit:]
+    wanted = {o for others in candidates.values() for o in others}
+    loaded = {u.id: u for u in FileUpload.query.filter(FileUpload.id.in_(wanted))} if wanted else {}
+
+    threshold = _cfg('CAMPAIGN_DUP_JACCARD', 0.85)
+    shingled = {}
+
+    def shingles(u):
+        if u.id not in shingled:
+            shingled[u.id] = _shingles(_member_text(u))
+        return shingled[u.id]
+
+    flags = {}
+    for subject in uploads:
+        hits = []
+        for other in map(loaded.get, candidates.get(subject.id, ())):
+            if other is None or (subject.user_id is not None and other.user_id == subject.user_id):
+                continue
+            sim = _jaccard(shingles(subject), shingles(other))
+            if sim >= threshold:
+                hits.append((sim, other))
+        if not hits:
+            continue
+        hits.sort(key=lambda h: (-h[0], h[1].id))
+        n = len(hits)
+        at_least = 'at least ' if subject.id in truncated else ''
+        flags[subject.id] = {
+            'type': 'duplicate_text_elsewhere',
+            'match_count': n,
+            'source_ids': [o.id for _, o in hits[:_FLAG_SOURCES]],
+            'event_ids': sorted({o.event_id for _, o in hits if o.event_id is not None}),
+            'detail': (f'{at_least}{n} recent report{"s" if n != 1 else ""} share '
+                       f'{round(threshold * 100)}%+ of its wording'),
+        }
+    return flags
+
+
+def prune_campaign_index(now=None):
+    """Drop index rows older than the window. Does not commit. Returns how
+    many were removed."""
+    return db.session.execute(
+        delete(TextLshBucket).where(TextLshBucket.upload_date < _cutoff(now))
+    ).rowcount
+
+
+def maybe_prune_campaign_index():
+    """prune_campaign_index and commit, if this process has not for
+    CAMPAIGN_PRUNE_INTERVAL_SECONDS. Never raises."""
+    global _pruned_at
+    with _prune_lock:
+        now = time.monotonic()
+        if _pruned_at is not None and now - _pruned_at < _cfg('CAMPAIGN_PRUNE_INTERVAL_SECONDS', 3600):
+            return
+        _pruned_at = now
+    try:
+        removed = prune_campaign_index()
+        db.session.commit()
+    except Exception:
+        logger.exception("Campaign index prune failed")
+        db.session.rollback()
+        return
+    if removed:
+        logger.info("Pruned %d expired campaign index rows", removed)
+
+
+def rebuild_campaign_index(now=None, batch=1000):
+    """Re-derive the whole index from the reports inside the window. Commits
+    per batch. Returns how many reports were indexed."""
+    db.session.execute(delete(TextLshBucket))
+    indexed = 0
+    last_id = 0
+    while True:
+        rows = (
+            FileUpload.query
+            .filter(FileUpload.id > last_id, FileUpload.upload_date >= _cutoff(now))
+            .order_by(FileUpload.id)
+            .limit(batch)
+            .all()
+        )
+        if not rows:
+            db.session.commit()
+            return indexed
+        entries = [e for up in rows for e in _index_rows(up)]
+        if entries:
+            db.session.execute(insert(TextLshBucket), entries)
+        indexed += len({e['upload_id'] for e in entries})
+        last_id = rows[-1].id
+        db.session.commit()
+
+
+def refresh_campaign_index():
+    """Startup upkeep: prune expired rows, and rebuild when the index is empty
+    (first start, or a wiped table) but recent reports exist."""
+    removed = prune_campaign_index()
+    db.session.commit()
+    if db.session.query(TextLshBucket.id).first() is None and (
+            db.session.query(FileUpload.id).filter(FileUpload.upload_date >= _cutoff()).first()):
+        n = rebuild_campaign_index()
+        logger.info("Rebuilt campaign index over %d recent reports", n)
+    elif removed:
+        logger.info("Pruned %d expired campaign index rows", removed)
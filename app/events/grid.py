@@ -0,0 +1,232 @@
+"""
+app/events/grid.py
+
+In-process index of open Events for clustering (opt-in: EVENT_GRID_INDEX).
+
+Open Events with a pin are bucketed by (time bucket, lat cell, lon cell): time
+buckets are EVENT_CLUSTER_WINDOW_HOURS wide and cells are square in degrees,
+sized to the clustering search box. A lookup walks only the cells and buckets
+that box and window can touch, O(neighbour cells) however many Events are
+open. The index holds every open pinned Event (reports may be back-dated, so
+old Events stay candidates until CLOSED): roughly a few hundred bytes each.
+
+The grid is a candidate-id PREFILTER, never the answer. _find_candidate_event
+re-reads the candidates from the database with the same filters and exact
+haversine as the SQL path, so a stale or phantom id costs a wasted lookup,
+never a wrong cluster. What the grid must guarantee is the opposite: it never
+misses a committed open Event. Hence:
+
+- Writes made in this process are noted immediately and ADDITIVELY (a moved
+  Event is filed under its new cell without leaving the old one), so a
+  rolled-back move leaves a harmless extra entry rather than a lost one.
+- Writes made by other workers are picked up through the `open_events` row in
+  index_versions. Every grid-relevant change (new Event, centroid moved to
+  another cell, entered/left CLOSED) bumps it and stamps Event.grid_version
+  with the new value, in the writer's transaction. A centroid drifting within
+  its cell files nowhere new, so it does not touch the row: the row lock is
+  taken only by the changes other workers actually need to see. Before each lookup the grid reads that
+  one row; if it moved, it fetches only Events stamped above its last synced
+  version and refiles them authoritatively. Bumps serialize on the row lock,
+  so a worker that sees version V has seen every change up to V.
+
+Startup creates the version row (ensure_version_row) and warms the grid from
+the events table (create_app); otherwise it warms lazily on the first lookup.
+"""
+
+import logging
+import math
+import threading
+from datetime import timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+import config
+from app.models import db, Event, IndexVersion
+
+logger = logging.getLogger(__name__)
+
+VERSION_NAME = 'open_events'
+
+# Past this many cells a lookup is no cheaper than the bounding-box query
+# (only near the poles, where longitude cells collapse); callers fall back.
+_MAX_CELLS = 256
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def enabled():
+    return bool(_cfg('EVENT_GRID_INDEX', False))
+
+
+def _ts(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class OpenEventGrid:
+    """Cell -> Event ids, plus enough per-Event state to refile on change."""
+
+    def __init__(self, cell_km=None, bucket_hours=None):
+        cell_km = cell_km or 2 * _cfg('EVENT_CLUSTER_RADIUS_KM', 1.0)
+        bucket_hours = bucket_hours or _cfg('EVENT_CLUSTER_WINDOW_HOURS', 24)
+        self.cell_deg = cell_km / 111.0
+        self.bucket_s = bucket_hours * 3600.0
+        self._n_lon = math.ceil(360.0 / self.cell_deg)
+        self._cells = {}      # (bucket, lat_cell, lon_cell) -> {event_id}
+        self._filed = {}      # event_id -> {cell keys}
+        self._version = None  # last synced index_versions value; None = cold
+        self._lock = threading.Lock()
+
+    # ── filing ──────────────────────────────────────────────────────────
+
+    def _key(self, lat, lon, created_at):
+        return (
+            math.floor(_ts(created_at) / self.bucket_s),
+            math.floor(lat / self.cell_deg),
+            math.floor((lon + 180.0) / self.cell_deg) % self._n_lon,
+        )
+
+    def _unfile(self, event_id):
+        for key in self._filed.pop(event_id, ()):
+            ids = self._cells.get(key)
+            if ids is not None:
+                ids.discard(event_id)
+                if not ids:
+                    del self._cells[key]
+
+    def _file(self, event_id, lat, lon, created_at):
+        key = self._key(lat, lon, created_at)
+        self._cells.setdefault(key, set()).add(event_id)
+        self._filed.setdefault(event_id, set()).add(key)
+
+    def _refile(self, event_id, status, lat, lon, created_at):
+        """Authoritative: the row as committed replaces whatever was filed."""
+        self._unfile(event_id)
+        if status != 'CLOSED' and lat is not None and lon is not None and created_at is not None:
+            self._file(event_id, lat, lon, created_at)
+
+    def note(self, event):
+        """Additively file `event` as this process just wrote it (see module
+        docstring: a rolled-back move must not drop the old cell)."""
+        if (event.id is None or event.status == 'CLOSED' or event.lat is None
+                or event.lon is None or event.created_at is None):
+            return
+        with self._lock:
+            self._file(event.id, event.lat, event.lon, event.created_at)
+
+    # ── sync ────────────────────────────────────────────────────────────
+
+    def _db_version(self):
+        return db.session.execute(
+            select(IndexVersion.version).where(IndexVersion.name == VERSION_NAME)
+        ).scalar() or 0
+
+    def sync(self):
+        """Bring the grid up to the committed index_versions value: a full warm
+        when cold, else only the Events stamped since the last sync."""
+        version = self._db_version()
+        with self._lock:
+            if self._version is not None and version == self._version:
+                return
+            cold = self._version is None
+            cols = (Event.id, Event.status, Event.lat, Event.lon, Event.created_at)
+            if cold:
+                rows = db.session.query(*cols).filter(
+                    Event.status != 'CLOSED', Event.lat.isnot(None), Event.lon.isnot(None)).all()
+                self._cells.clear()
+                self._filed.clear()
+            else:
+                rows = db.session.query(*cols).filter(Event.grid_version > self._version).all()
+            for row in rows:
+                self._refile(*row)
+            self._version = version
+        if cold:
+            logger.info("open-event grid warmed: %d events at version %s", len(rows), version)
+
+    def candidate_ids(self, lat, lon, when, box_km, window):
+        """Ids of open Events filed in any cell the box of half-side `box_km`
+        around (lat, lon) touches, in any bucket within `window` of `when`.
+        Returns None when the box spans too many cells to beat a query."""
+        self.sync()
+        dlat = box_km / 111.0
+        cos_lat = math.cos(math.radians(lat))
+        if cos_lat <= 1e-6:
+            return None
+        dlon = box_km / (111.0 * cos_lat)
+        lat_cells = range(math.floor((lat - dlat) / self.cell_deg),
+                          math.floor((lat + dlat) / self.cell_deg) + 1)
+        lo = math.floor((lon - dlon + 180.0) / self.cell_deg)
+        hi = math.floor((lon + dlon + 180.0) / self.cell_deg)
+        if hi - lo + 1 >= self._n_lon:
+            return None
+        lon_cells = [c % self._n_lon for c in range(lo, hi + 1)]
+        buckets = range(math.floor((_ts(when) - window.total_seconds()) / self.bucket_s),
+                        math.floor((_ts(when) + window.total_seconds()) / self.bucket_s) + 1)
+        if len(lat_cells) * len(lon_cells) * len(buckets) > _MAX_CELLS:
+            return None
+        found = set()
+        with self._lock:
+            for b in buckets:
+                for la in lat_cells:
+                    for lo_cell in lon_cells:
+                        found |= self._cells.get((b, la, lo_cell), set())
+        return found
+
+    def reset(self):
+        with self._lock:
+            self._cells.clear()
+            self._filed.clear()
+            self._version = None
+
+
+open_event_grid = OpenEventGrid()
+
+
+def grid_state(event):
+    """What the grid files `event` under: (cell key or None, closed). Two
+    states that compare equal need no refile anywhere."""
+    if event.lat is None or event.lon is None or event.created_at is None:
+        cell = None
+    else:
+        cell = open_event_grid._key(event.lat, event.lon, event.created_at)
+    return cell, event.status == 'CLOSED'
+
+
+def ensure_version_row():
+    """Create the `open_events` counter row if it is missing. Run once at
+    startup, so mark_changed's bump is a plain UPDATE; the insert sits in a
+    savepoint so two workers starting together cannot fail each other. Does
+    not commit."""
+    if db.session.get(IndexVersion, VERSION_NAME) is not None:
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(IndexVersion(name=VERSION_NAME, version=0))
+    except IntegrityError:
+        pass  # another worker created it first
+
+
+def mark_changed(event):
+    """Record a grid-relevant change to `event` (created, moved to another
+    cell, entered/left CLOSED): bump the shared version and stamp the Event in
+    the caller's transaction, and file it in this process right away. No-op
+    unless EVENT_GRID_INDEX is on. Does not commit."""
+    if not enabled():
+        return
+    bump = (update(IndexVersion)
+            .where(IndexVersion.name == VERSION_NAME)
+            .values(version=IndexVersion.version + 1)
+            .returning(IndexVersion.version))
+    version = db.session.execute(bump).scalar()
+    if version is None:
+        # Only when startup never ran (a script): create it race-free, once.
+        logger.warning("index_versions row %r missing; creating it", VERSION_NAME)
+        ensure_version_row()
+        version = db.session.execute(bump).scalar()
+    event.grid_version = version
+    db.session.flush()
+    open_event_grid.note(event)
@@ -21,11 +21,25 @@ deferred to a client-contract change, not half-built server-side.
 
 Pure functions; deterministic output (sorted) so it is safe inside the hashed
 corroboration graph.
+
+Text near-duplication scales past all-pairs with MinHash + LSH banding: each
+distinct shingle set gets a 128-value MinHash signature, bands of it bucket the
+sets, and only sets sharing a bucket become candidate pairs -- every one of
+which is then checked with the exact Jaccard, so nothing below the threshold is
+ever flagged. The band width is picked per threshold so a pair AT the threshold
+is missed with probability under 1e-9 (less the more similar it is). Small
+member sets, and thresholds LSH cannot serve at that miss rate, still compare
+every pair. A report's signature is computed once at ingest and stored
+(FileUpload.text_minhash, packed by pack_signature); members without one --
+not yet backfilled, or rebuilt from a snapshot capture -- are hashed here.
 """
 
+import hashlib
 import re
+import struct
+from collections import defaultdict
 from datetime import timezone
-from itertools import combinations
+from itertools import combinations, product
 
 import config
 
@@ -37,6 +51,8 @@ def _cfg(name, default):
 def _naive_utc(dt):
     """Coerce to naive UTC so tz-aware (fresh ORM / ingested) and tz-naive (read
     from a non-tz DB column) datetimes can be compared without raising."""
+    if dt is None:
+        return None
     if dt.tzinfo is not None:
         return dt.astimezone(timezone.utc).replace(tzinfo=None)
     return dt
@@ -69,6 +85,109 @@ def _member_text(m):
     return _norm_text(getattr(m, 'witness_statement', None) or getattr(m, 'title', None) or '')
 
 
+_MINHASH_PERMS = 128
+_LSH_MAX_MISS = 1e-9
+_LSH_MIN_SETS = 200             # below this, all-pairs is cheaper than hashing
+_ROW = struct.Struct(f'<{_MINHASH_PERMS}I')
+
+
+def _shingle_hashes(shingle):
+    """_MINHASH_PERMS independent 32-bit hashes of one shingle, from a single
+    SHAKE-128 digest (stable across processes, unlike the salted hash())."""
+    return _ROW.unpack(hashlib.shake_128(shingle.encode('utf-8')).digest(_ROW.size))
+
+
+def minhash_signature(shingles, cache=None):
+    """MinHash signature of a non-empty shingle set: per hash, the minimum over
+    its shingles. `cache` (shingle -> hashes) is shared across one analysis."""
+    if cache is None:
+        cache = {}
+    rows = []
+    for s in shingles:
+        row = cache.get(s)
+        if row is None:
+            row = cache[s] = _shingle_hashes(s)
+        rows.append(row)
+    return tuple(map(min, zip(*rows)))
+
+
+def member_signature(m):
+    """Packed MinHash signature of a member's report text (what
+    FileUpload.text_minhash stores), or None when it has no words."""
+    shingles = _shingles(_member_text(m))
+    return pack_signature(minhash_signature(shingles)) if shingles else None
+
+
+def pack_signature(sig):
+    return _ROW.pack(*sig)
+
+
+def _stored_signature(m):
+    """The member's stored signature, if it has one of the current shape."""
+    packed = getattr(m, 'text_minhash', None)
+    if packed is None or len(packed) != _ROW.size:
+        return None
+    return _ROW.unpack(packed)
+
+
+def _lsh_rows(threshold):
+    """Rows per LSH band: the widest band (fewest spurious candidates) whose
+    chance of missing a pair at exactly `threshold` is under _LSH_MAX_MISS, or
+    None if no banding gets there (a low threshold) and all pairs are needed."""
+    best = None
+    for rows in range(1, _MINHASH_PERMS + 1):
+        if (1 - threshold ** rows) ** (_MINHASH_PERMS // rows) <= _LSH_MAX_MISS:
+            best = rows
+    return best
+
+
+def _candidate_pairs(sets, groups, rows):
+    """Sorted index pairs (i < j) of `sets` that share at least one LSH bucket.
+    A set's signature comes from any of its members that stored one (members
+    with the same shingle set have the same signature), else is computed."""
+    cache = {}
+    sigs = []
+    for s in sets:
+        sig = next(filter(None, map(_stored_signature, groups[s])), None)
+        sigs.append(sig or minhash_signature(s, cache))
+    pairs = set()
+    for lo in range(0, _MINHASH_PERMS - rows + 1, rows):
+        buckets = defaultdict(list)
+        for i, sig in enumerate(sigs):
+            buckets[sig[lo:lo + rows]].append(i)
+        for idx in buckets.values():
+            if len(idx) > 1:
+                pairs.update(combinations(idx, 2))
+    return sorted(pairs)
+
+
+def _duplicate_text_pairs(named, threshold):
+    """Yield (m1, m2, similarity) for every pair of distinct identities whose
+    shingle sets reach `threshold`. Members with identical wording share one
+    set, compared once; distinct sets pair up through LSH when there are
+    enough of them, otherwise all against all."""
+    groups = {}
+    for m in named:
+        s = _shingles(_member_text(m))
+        if s:
+            groups.setdefault(frozenset(s), []).append(m)
+    sets = list(groups)
+    rows = _lsh_rows(threshold)
+    if rows is None or len(sets) < _LSH_MIN_SETS:
+        pairs = combinations(range(len(sets)), 2)
+    else:
+        pairs = _candidate_pairs(sets, groups, rows)
+    same = [(i, i) for i in range(len(sets))]
+    for i, j in same + list(pairs):
+        sim = _jaccard(sets[i], sets[j])
+        if sim < threshold:
+            continue
+        group = groups[sets[i]]
+        for m1, m2 in (combinations(group, 2) if i == j else product(group, groups[sets[j]])):
+            if m1.user_id != m2.user_id:
+                yield m1, m2, sim
+
+
 def analyze_independence(members):
     """Return a deterministic list of advisory coordination flags over VERIFIED,
     non-anonymous members. Empty list == no coordination detected. Each flag:
@@ -83,17 +202,12 @@ def analyze_independence(members):
 
     # --- text near-duplication (pairwise over distinct identities) ---
     threshold = _cfg('TEXT_DUP_JACCARD', 0.85)
-    shingled = [(m, _shingles(_member_text(m))) for m in named]
-    for (m1, s1), (m2, s2) in combinations(shingled, 2):
-        if m1.user_id == m2.user_id or not s1 or not s2:
-            continue
-        sim = _jaccard(s1, s2)
-        if sim >= threshold:
-            flags.append({
-                'type': 'duplicate_text',
-                'source_ids': sorted([m1.id, m2.id]),
-                'detail': f'reports share {round(sim * 100)}% of their wording',
-            })
+    for m1, m2, sim in _duplicate_text_pairs(named, threshold):
+        flags.append({
+            'type': 'duplicate_text',
+            'source_ids': sorted([m1.id, m2.id]),
+            'detail': f'reports share {round(sim * 100)}% of their wording',
+        })
 
     # --- synchronized submission (tight-window burst across identities) ---
     window = _cfg('COORDINATION_WINDOW_SECONDS', 30)
@@ -7,61 +7,91 @@ one VERIFIED member are surfaced — unverified content never reaches the public
 The feed leads with CORROBORATED and keeps DISPUTED prominent.
 """
 
-import json
+from datetime import datetime
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
+from sqlalchemy import and_, func, or_
 
-from app.models import db, Event, EventGraphSnapshot
+from app.models import db, Event, EventGraphSnapshot, EVENT_FEED_STATUS_RANK, event_feed_rank
 from app.story.serializers import serialize_event
 from app.events.archive import build_event_graph
+from app.events.snapshot_store import load_graph_json
+from app.utils.cursor import decode_cursor, encode_cursor
 
 events_bp = Blueprint('events', __name__, url_prefix='/api/events')
 
-# Feed ordering: lead with CORROBORATED, then DISPUTED (needs attention, kept
-# prominent), then DEVELOPING; CLOSED sinks to the bottom.
-_STATUS_RANK = {'CORROBORATED': 0, 'DISPUTED': 1, 'DEVELOPING': 2, 'CLOSED': 3}
+# Feed ordering (models.EVENT_FEED_STATUS_RANK): CORROBORATED, DISPUTED,
+# DEVELOPING, then CLOSED.
+_STATUS_RANK = EVENT_FEED_STATUS_RANK
 
 
 def _effective_status(ev):
     return ev.status_override or ev.status
 
 
-def _has_public_member(ev):
-    return any(m.verification_status == 'VERIFIED' for m in ev.members)
+def _status_rank_expr():
+    """_STATUS_RANK over the live status (override wins), as SQL -- the
+    expression ix_events_feed_rank indexes."""
+    return event_feed_rank(Event.status, Event.status_override)
+
+
+def _feed_after(rank, updated_at, event_id):
+    """Keyset predicate: Events strictly after (rank, updated_at, id) in feed
+    order -- status rank, then most recently updated (undated last), then
+    newest id (the tiebreak that keeps cursor pages stable)."""
+    rank_expr, ts, row_id = _status_rank_expr(), Event.updated_at, Event.id
+    if updated_at is None:
+        same_rank = and_(ts.is_(None), row_id < event_id)
+    else:
+        same_rank = or_(ts < updated_at, and_(ts == updated_at, row_id < event_id), ts.is_(None))
+    return or_(rank_expr > rank, and_(rank_expr == rank, same_rank))
 
 
 @events_bp.route('', methods=['GET'])
 def list_events():
-    """Event feed. Query: status=<STATUS>, limit=<int>."""
-    limit = request.args.get('limit', default=100, type=int)
+    """Event feed. Query: status=<STATUS>, q=<text>, limit=<int>,
+    cursor=<next_cursor> (keyset on status rank, updated_at, id).
+
+    Filtered, ordered and paged in one query on the Event's stored rollup
+    (has_public_member, member counts); members are never loaded."""
+    limit = max(1, request.args.get('limit', default=100, type=int))
     status_filter = (request.args.get('status') or '').strip().upper() or None
-    q = (request.args.get('q') or '').strip().lower()
-
-    # Pilot scale is small; filter/sort in Python for clarity. Replace with a
-    # join + window function if volume grows.
-    visible = []
-    for ev in Event.query.all():
-        if not _has_public_member(ev):
-            continue
-        if status_filter and _effective_status(ev) != status_filter:
-            continue
-        if q and q not in (ev.title or '').lower() and q not in (ev.city or '').lower():
-            continue
-        visible.append(ev)
-
-    visible.sort(key=lambda e: (
-        _STATUS_RANK.get(_effective_status(e), 9),
-        -(e.updated_at.timestamp() if e.updated_at else 0.0),
-    ))
-    visible = visible[:max(1, limit)]
-    return jsonify({'events': [serialize_event(e) for e in visible]}), 200
+    q = (request.args.get('q') or '').strip()
+
+    rank_expr = _status_rank_expr()
+    query = Event.query.filter(Event.has_public_member.is_(True))
+    if status_filter:
+        query = query.filter(func.coalesce(Event.status_override, Event.status) == status_filter)
+    if q:
+        query = query.filter(or_(Event.title.icontains(q, autoescape=True),
+                                 Event.city.icontains(q, autoescape=True)))
+    if request.args.get('cursor'):
+        try:
+            rank, updated_at, event_id = decode_cursor(request.args['cursor'], 3)
+            if not (isinstance(rank, int) and isinstance(event_id, int)
+                    and (updated_at is None or isinstance(updated_at, datetime))):
+                raise ValueError('invalid cursor')
+        except ValueError:
+            return jsonify({'error': 'invalid cursor'}), 400
+        query = query.filter(_feed_after(rank, updated_at, event_id))
+
+    rows = (query.order_by(rank_expr, Event.updated_at.desc().nulls_last(), Event.id.desc())
+            .limit(limit + 1).all())
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > len(page):
+        last = page[-1]
+        next_cursor = encode_cursor(
+            _STATUS_RANK.get(_effective_status(last), 9), last.updated_at, last.id)
+    return jsonify({'events': [serialize_event(e) for e in page],
+                    'next_cursor': next_cursor}), 200
 
 
 @events_bp.route('/<int:event_id>', methods=['GET'])
 def event_detail(event_id):
     """Single Event with its VERIFIED members (each a reporter-chip story)."""
     ev = db.session.get(Event, event_id)
-    if ev is None or not _has_public_member(ev):
+    if ev is None or not ev.has_public_member:
         return jsonify({'error': 'Event not found'}), 404
     return jsonify(serialize_event(ev, include_members=True)), 200
 
@@ -73,7 +103,7 @@ def event_graph(event_id):
     (ADR-0020 Phase 1). The archive-grade export -- same visibility as the
     detail view (VERIFIED members only, never a raw user_id)."""
     ev = db.session.get(Event, event_id)
-    if ev is None or not _has_public_member(ev):
+    if ev is None or not ev.has_public_member:
         return jsonify({'error': 'Event not found'}), 404
     return jsonify(build_event_graph(ev)), 200
 
@@ -85,7 +115,7 @@ def event_snapshots(event_id):
     archival moment. Metadata only (hash + status + reason + time); fetch a
     single snapshot's full graph via the detail route below."""
     ev = db.session.get(Event, event_id)
-    if ev is None or not _has_public_member(ev):
+    if ev is None or not ev.has_public_member:
         return jsonify({'error': 'Event not found'}), 404
     snaps = (
         EventGraphSnapshot.query
@@ -108,9 +138,11 @@ def event_snapshot_detail(event_id, snapshot_id):
     """The full, verbatim corroboration graph captured in one snapshot -- the
     preserved archive record, exactly as it was hashed."""
     ev = db.session.get(Event, event_id)
-    if ev is None or not _has_public_member(ev):
+    if ev is None or not ev.has_public_member:
         return jsonify({'error': 'Event not found'}), 404
     s = db.session.get(EventGraphSnapshot, snapshot_id)
     if s is None or s.event_id != event_id:
         return jsonify({'error': 'Snapshot not found'}), 404
-    return jsonify(json.loads(s.graph_json)), 200
+    # The stored bytes themselves, not a re-serialization, so a client can
+    # check graph_sha256 against exactly what was archived.
+    return Response(load_graph_json(s), status=200, mimetype='application/json')
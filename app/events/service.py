@@ -22,17 +22,30 @@ independent count nor the status. A moderator can pin status via status_override
 Semantic clustering is deferred; geo+time only.
 """
 
+import json
 import logging
 import math
-from datetime import timedelta, timezone
+from datetime import timedelta
+
+from sqlalchemy import and_, event as sa_event, inspect, or_
+from sqlalchemy.orm import Session
 
 import config
 from app.models import db, FileUpload, Event, User
+from app.events.grid import enabled as grid_enabled, grid_state, mark_changed, open_event_grid
+from app.events.campaigns import index_report, unindex_report
+from app.events.independence import _naive_utc, member_signature
+from app.story.track_record import refresh_track_records
 
 logger = logging.getLogger(__name__)
 
 _SEVERITY_RANK = {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3}
 
+# Kilometres per degree of latitude (and of longitude at the equator), on the
+# same 6371 km sphere _haversine_km uses. Rounded down a touch so the
+# clustering bounding box errs wide, never clipping a true match.
+_KM_PER_DEG_LAT = 111.0
+
 # Statuses worth preserving a durable graph snapshot for on first entry.
 _ARCHIVE_WORTHY_STATUS = {'CORROBORATED', 'DISPUTED', 'CLOSED'}
 
@@ -41,16 +54,6 @@ def _cfg(name, default):
     return getattr(config, name, default)
 
 
-def _naive_utc(dt):
-    """Normalize to naive UTC so aware datetimes (fresh ORM objects) and naive
-    ones (read back from non-tz DB columns) compare without raising."""
-    if dt is None:
-        return None
-    if dt.tzinfo is not None:
-        return dt.astimezone(timezone.utc).replace(tzinfo=None)
-    return dt
-
-
 def _haversine_km(lat1, lon1, lat2, lon2):
     r = 6371.0  # Earth radius, km
     p1, p2 = math.radians(lat1), math.radians(lat2)
@@ -62,11 +65,19 @@ def _haversine_km(lat1, lon1, lat2, lon2):
 
 def assign_event(upload):
     """Cluster `upload` into an open Event (geo+time) or start a singleton, set
-    upload.event_id, recompute the Event, and return it.
+    upload.event_id, fold it into the Event (add_member), and return it.
 
     Call AFTER the upload has been flushed (so it has an id and an upload_date).
     Does not commit -- the caller owns the transaction.
     """
+    event = _join_event(upload)
+    add_member(event, upload)
+    return event
+
+
+def _join_event(upload):
+    """The membership half of assign_event: pick or start the Event and set
+    upload.event_id, without folding the report in yet."""
     radius_km = _cfg('EVENT_CLUSTER_RADIUS_KM', 1.0)
     window_h = _cfg('EVENT_CLUSTER_WINDOW_HOURS', 24)
     when = _naive_utc(upload.upload_date)
@@ -82,11 +93,12 @@ def assign_event(upload):
             lon=upload.lon,
             severity=upload.severity,
         )
+        _save_state(event, _new_state())
         db.session.add(event)
         db.session.flush()
+        mark_changed(event)
     upload.event_id = event.id
     db.session.flush()
-    recompute_event(event)
     return event
 
 
@@ -94,33 +106,71 @@ def process_new_report(upload):
     """Full post-creation pipeline for a fresh report:
       1. cluster it into an Event (or start a singleton),
       2. apply the rung gate (initial publication status + safety override),
-      3. recompute the Event so an auto-published rung-2+ report immediately
-         counts toward corroboration.
+      3. fold it into the Event ONCE, with its post-gate status (add_member), so
+         an auto-published rung-2+ report immediately counts toward
+         corroboration -- one status derivation, one snapshot, one track-record
+         refresh per report.
     Does not commit -- the caller owns the transaction."""
     from app.moderation.gate import apply_rung_gate
-    event = assign_event(upload)
+    event = _join_event(upload)       # the gate's event checks need membership
     apply_rung_gate(upload)
     db.session.flush()
-    recompute_event(event)
+    add_member(event, upload)
     return event
 
 
+def _bbox_clause(lat, lon, radius_km):
+    """SQL prefilter: Events whose centroid lies in the lat/lon box around
+    (lat, lon) that circumscribes a `radius_km` circle. Backed by ix_events_geo,
+    so clustering only haversines the few Events the box lets through instead of
+    every open Event in the time window."""
+    dlat = radius_km / _KM_PER_DEG_LAT
+    clauses = [Event.lat.between(lat - dlat, lat + dlat)]
+    cos_lat = math.cos(math.radians(lat))
+    # Near the poles a degree of longitude shrinks to nothing; the latitude
+    # band alone is then the (still small) prefilter.
+    if cos_lat > 1e-6:
+        dlon = radius_km / (_KM_PER_DEG_LAT * cos_lat)
+        if dlon < 180:
+            lo, hi = lon - dlon, lon + dlon
+            if lo < -180:       # box wraps the antimeridian
+                clauses.append(or_(Event.lon >= lo + 360, Event.lon <= hi))
+            elif hi > 180:
+                clauses.append(or_(Event.lon >= lo, Event.lon <= hi - 360))
+            else:
+                clauses.append(Event.lon.between(lo, hi))
+    return and_(*clauses)
+
+
 def _find_candidate_event(upload, when, radius_km, window_h):
     """Return the nearest open Event within radius_km AND window_h of `upload`,
     or None. Logs a near-miss when the closest event is just outside the radius
-    (a tuning aid -- see the pilot calibration plan)."""
+    (a tuning aid -- see the pilot calibration plan).
+
+    The database narrows candidates first (time window plus a bounding box of
+    twice the radius, so near-misses are still seen); exact haversine runs only
+    on the survivors. With EVENT_GRID_INDEX on, the in-process grid
+    (events/grid.py) supplies the box's candidate ids instead."""
     if when is None:
         return None
     window = timedelta(hours=window_h)
-    candidates = (
+    open_in_window = (
         Event.query
         .filter(Event.status != 'CLOSED')
         .filter(Event.created_at >= when - window, Event.created_at <= when + window)
-        .all()
     )
 
     # Geo match when a pin is present.
     if upload.lat is not None and upload.lon is not None:
+        ids = None
+        if grid_enabled():
+            ids = open_event_grid.candidate_ids(upload.lat, upload.lon, when, radius_km * 2, window)
+        if ids is not None:
+            # Grid ids are only a prefilter: re-read them under the same filters.
+            candidates = open_in_window.filter(Event.id.in_(ids)).all() if ids else []
+        else:
+            candidates = open_in_window.filter(
+                _bbox_clause(upload.lat, upload.lon, radius_km * 2)).all()
         best, best_d = None, math.inf
         near, near_d = None, math.inf
         for ev in candidates:
@@ -141,26 +191,86 @@ def _find_candidate_event(upload, when, radius_km, window_h):
             )
         return best
 
-    # Pin withheld (safety) -> degrade to city + time.
+    # Pin withheld (safety) -> degrade to city + time. Compared in Python, not
+    # as SQL lower(trim(city)): SQLite folds only ASCII case and trims only
+    # spaces, so the database would disagree with strip().lower().
     if upload.city:
         city = upload.city.strip().lower()
-        for ev in candidates:
-            if ev.city and ev.city.strip().lower() == city:
+        for ev in open_in_window.filter(Event.city.isnot(None)).order_by(Event.id):
+            if ev.city.strip().lower() == city:
                 return ev
     return None
 
 
 def recompute_event(event):
     """Recompute corroboration_count, aggregates, and derived status from the
-    Event's current members. Reads members; writes the Event. Call after any
-    membership or verification change."""
-    members = FileUpload.query.filter_by(event_id=event.id).all()
+    Event's current members. Reads members; writes the Event.
+
+    This is the FULL recompute, O(members). It also rebuilds the Event's
+    incremental state (recompute_state), so it is the repair path after
+    anything add_member / member_verified can't apply as a delta: rejections,
+    reversals, rung changes, overrides, closures, deletions."""
+    # Re-derived from scratch, so any pending dirty mark is satisfied too.
+    db.session.info.get(_DIRTY_KEY, {}).pop(event.id, None)
+    members = FileUpload.query.filter_by(event_id=event.id).order_by(FileUpload.id).all()
     verified = [m for m in members if m.verification_status == 'VERIFIED']
+    prev_status = event.status
+    prev_grid_state = grid_state(event)
+
+    state = _new_state()
+    for m in members:
+        _fold_member(event, state, m)
+
+    # Distinct, non-anonymous identities among VERIFIED members -> the
+    # corroboration count; anonymous (user_id NULL) members count 0 toward the
+    # threshold (supporting context). Folding them also builds the union-find
+    # behind the independent-source count (see _add_origin).
+    event.verified_member_count = 0
+    event.supporting_count = 0
+    event.has_public_member = False
+    for m in verified:
+        _fold_verified(event, state, m, check_rung=False)
+    state['established'] = _has_established_member(set(state['parent']))
+
+    return _finish_recompute(event, state, prev_status, prev_grid_state,
+                             {m.user_id for m in members})
+
+
+def add_member(event, upload):
+    """Incremental recompute for `upload` having just joined `event` (its
+    event_id is set and flushed): O(1) in the Event's size. Folds the report
+    into the persisted running sums and, if it is already VERIFIED, into the
+    identity / independent-origin state. Falls back to recompute_event for
+    Events with no incremental state yet (legacy rows)."""
+    state = _load_state(event)
+    if state is None:
+        return recompute_event(event)
+    prev_status = event.status
+    prev_grid_state = grid_state(event)
+    _fold_member(event, state, upload)
+    if upload.verification_status == 'VERIFIED':
+        _fold_verified(event, state, upload)
+    return _finish_recompute(event, state, prev_status, prev_grid_state, {upload.user_id})
+
+
+def member_verified(event, upload):
+    """Incremental recompute for an existing member going PENDING -> VERIFIED
+    (moderator approval or the rung gate's auto-publish). Any other transition
+    -- a rejection, or re-verifying a rejected report -- can REMOVE a node from
+    the union-find, which has no delta; those go through recompute_event."""
+    state = _load_state(event)
+    if state is None:
+        return recompute_event(event)
+    prev_status = event.status
+    prev_grid_state = grid_state(event)
+    _fold_verified(event, state, upload)
+    return _finish_recompute(event, state, prev_status, prev_grid_state, {upload.user_id})
+
 
-    # Distinct, non-anonymous identities among VERIFIED members. Anonymous
-    # (user_id NULL) members count 0 toward the threshold (supporting context).
-    identities = {m.user_id for m in verified if m.user_id is not None}
-    event.corroboration_count = len(identities)
+def _finish_recompute(event, state, prev_status, prev_grid_state, user_ids):
+    """Shared tail of the full and incremental recomputes: publish the counts
+    from `state`, derive status, and run the side effects of a change."""
+    event.corroboration_count = len(state['parent'])
 
     # Independent-source count (ADR-0020 Phase 1, the fake-independence
     # detector). The unit is the PERSON: it counts distinct identities, then
@@ -169,24 +279,265 @@ def recompute_event(event):
     # posting several different files still counts once, and many keys reposting
     # one clip collapse to one. Two people filming the same event produce
     # different hashes and are not merged -> counted separately.
-    event.independent_source_count = len(_independent_origins(verified))
+    event.independent_source_count = state['roots']
 
-    _update_aggregates(event, members)
-    prev_status = event.status
-    event.status = _derive_status(event, _has_established_member(identities))
+    _save_state(event, state)
+    event.status = _derive_status(event, state['established'])
     db.session.flush()
+    if grid_state(event) != prev_grid_state:
+        mark_changed(event)     # changed cell or (un)closed: refile in the grid
+
+    # Members' stored track records (ADR-0024) can move with this Event's status
+    # or a member's verification, so re-derive them for the reporters touched --
+    # every member reporter when the status itself moved. A full recompute
+    # passes every member, including one just rejected (still a member here).
+    if event.status != prev_status:
+        user_ids = set(user_ids) | {
+            uid for (uid,) in db.session.query(FileUpload.user_id)
+            .filter(FileUpload.event_id == event.id).distinct()
+        }
+    refresh_track_records(user_ids)
 
     # Capture-before-deletion (ADR-0020 Phase 1 / UC9): the moment an Event
     # first enters an archival status, persist a durable, content-addressed
     # snapshot of its corroboration graph so it survives later mutation or
-    # takedown. snapshot_event dedups by hash, so repeated recomputes at the
-    # same status are cheap no-ops.
+    # takedown. The graph's inputs are captured here, in this transaction; the
+    # snapshot writer builds, dedups by hash and stores it after commit.
     if event.status != prev_status and event.status in _ARCHIVE_WORTHY_STATUS:
-        from app.events.archive import snapshot_event
-        snapshot_event(event, reason=event.status.lower())
+        from app.events.snapshot_writer import capture_snapshot
+        capture_snapshot(event, reason=event.status.lower())
     return event
 
 
+# ── dirty events (unit of work) ─────────────────────────────────────────
+# Request paths that change an Event's inputs (moderator verify/reject, rung
+# vouches, overrides) don't recompute on the spot: they mark the Event dirty
+# in the session, and every dirty Event is re-derived exactly once -- one
+# status derivation, one snapshot, one track-record refresh -- just before the
+# session commits. Any number of triggers on the same Event inside one
+# transaction coalesce; the Events themselves load with one IN query.
+#
+# A trigger is either FULL (anything that can remove a union-find node, see
+# member_verified) or a first approval naming the member that went VERIFIED.
+# An Event whose triggers are all first approvals takes the incremental folds;
+# a single full trigger makes the whole batch one recompute_event.
+
+_DIRTY_KEY = 'dirty_events'
+
+
+def mark_dirty(event_id, verified=None):
+    """Schedule `event_id` for re-derivation when this unit of work commits (or
+    at an explicit flush_dirty_events). Pass `verified` when the trigger is a
+    member going PENDING -> VERIFIED, so the Event can be folded incrementally
+    if nothing else touches it first. Does not query."""
+    if event_id is None:
+        return
+    dirty = db.session.info.setdefault(_DIRTY_KEY, {})
+    if verified is None or dirty.get(event_id, []) is None:
+        dirty[event_id] = None
+    else:
+        dirty.setdefault(event_id, []).append(verified.id)
+
+
+def flush_dirty_events():
+    """Re-derive every Event marked dirty in this session, each exactly once.
+    Runs automatically before commit; call it directly when the results are
+    needed earlier in the transaction. Returns the Events processed."""
+    dirty = db.session.info.pop(_DIRTY_KEY, None)
+    if not dirty:
+        return []
+    events = Event.query.filter(Event.id.in_(list(dirty))).order_by(Event.id).all()
+    folds = [uid for ids in dirty.values() if ids for uid in ids]
+    uploads = {
+        u.id: u for u in FileUpload.query.filter(FileUpload.id.in_(folds))
+    } if folds else {}
+    for event in events:
+        members = [uploads.get(uid) for uid in dirty[event.id] or ()]
+        if dirty[event.id] is None or _load_state(event) is None or any(
+                m is None or m.event_id != event.id or m.verification_status != 'VERIFIED'
+                for m in members):
+            recompute_event(event)
+            continue
+        for m in sorted(members, key=lambda m: m.id):
+            member_verified(event, m)
+    return events
+
+
+@sa_event.listens_for(Session, 'before_commit')
+def _flush_dirty_before_commit(session):
+    if session.info.get(_DIRTY_KEY):
+        flush_dirty_events()
+
+
+@sa_event.listens_for(Session, 'after_rollback')
+def _drop_dirty_on_rollback(session):
+    session.info.pop(_DIRTY_KEY, None)
+
+
+# ── stored text signatures ──────────────────────────────────────────────
+# FileUpload.text_minhash follows the report text on every ORM write path
+# (ingest, story edits, the drill), so independence analysis can trust it,
+# and the cross-event campaign index (events.campaigns) follows the signature.
+
+def _text_changed(upload):
+    state = inspect(upload)
+    return (state.attrs.witness_statement.history.has_changes()
+            or state.attrs.title.history.has_changes())
+
+
+@sa_event.listens_for(FileUpload, 'before_insert')
+def _sign_new_report(mapper, connection, upload):
+    upload.text_minhash = member_signature(upload)
+
+
+@sa_event.listens_for(FileUpload, 'before_update')
+def _resign_edited_report(mapper, connection, upload):
+    if _text_changed(upload):
+        upload.text_minhash = member_signature(upload)
+
+
+@sa_event.listens_for(FileUpload, 'after_insert')
+def _index_new_report(mapper, connection, upload):
+    index_report(connection, upload)
+
+
+@sa_event.listens_for(FileUpload, 'after_update')
+def _reindex_edited_report(mapper, connection, upload):
+    if _text_changed(upload) or inspect(upload).attrs.upload_date.history.has_changes():
+        index_report(connection, upload)
+
+
+@sa_event.listens_for(FileUpload, 'after_delete')
+def _unindex_deleted_report(mapper, connection, upload):
+    unindex_report(connection, upload.id)
+
+
+def backfill_text_signatures(batch=500):
+    """Stamp text_minhash on every report with text but no signature. Commits
+    per batch. Returns how many rows were signed."""
+    signed = 0
+    last_id = 0
+    while True:
+        rows = (
+            FileUpload.query
+            .filter(FileUpload.id > last_id, FileUpload.text_minhash.is_(None),
+                    or_(FileUpload.witness_statement.isnot(None), FileUpload.title.isnot(None)))
+            .order_by(FileUpload.id)
+            .limit(batch)
+            .all()
+        )
+        if not rows:
+            return signed
+        for up in rows:
+            up.text_minhash = member_signature(up)
+            signed += up.text_minhash is not None
+        last_id = rows[-1].id
+        db.session.commit()
+
+
+# ── incremental state ───────────────────────────────────────────────────
+# Persisted per Event as JSON in recompute_state: running sums for the
+# centroid and confidence, the severity max, the established-member flag, and
+# the independent-origin union-find (parent map, fingerprint -> first owner,
+# component count). Folding members in id order reproduces the full
+# recompute exactly, which test_incremental_recompute checks.
+
+def _new_state():
+    return {
+        'lat_sum': 0.0, 'lon_sum': 0.0, 'geo_n': 0,
+        'conf_sum': 0.0, 'conf_n': 0,
+        'severity': None,
+        'established': False,
+        'parent': {}, 'fp': {}, 'roots': 0,
+    }
+
+
+def _load_state(event):
+    if not event.recompute_state:
+        return None
+    state = json.loads(event.recompute_state)
+    # JSON object keys are strings; user ids are ints everywhere else.
+    state['parent'] = {int(k): v for k, v in state['parent'].items()}
+    return state
+
+
+def _save_state(event, state):
+    event.recompute_state = json.dumps(state, sort_keys=True, separators=(',', ':'))
+
+
+def _fold_member(event, state, m):
+    """Fold one member (any verification status) into the centroid, rolled-up
+    severity/confidence and display fallbacks."""
+    if m.lat is not None and m.lon is not None:
+        state['lat_sum'] += m.lat
+        state['lon_sum'] += m.lon
+        state['geo_n'] += 1
+        event.lat = state['lat_sum'] / state['geo_n']
+        event.lon = state['lon_sum'] / state['geo_n']
+    if m.severity and (state['severity'] is None
+                       or _SEVERITY_RANK.get(m.severity, 0) > _SEVERITY_RANK.get(state['severity'], 0)):
+        state['severity'] = m.severity
+    if state['severity']:
+        event.severity = state['severity']
+    if m.confidence_score is not None:
+        state['conf_sum'] += m.confidence_score
+        state['conf_n'] += 1
+        event.confidence_score = state['conf_sum'] / state['conf_n']
+    if not event.title and m.title:
+        event.title = m.title
+    if not event.city and m.city:
+        event.city = m.city
+
+
+def _fold_verified(event, state, m, check_rung=True):
+    """Fold one VERIFIED member into the identity / independent-origin state
+    and the public-visibility rollup. `check_rung` looks up the new reporter's
+    rung for the established-member gate; the full recompute batches that."""
+    _add_origin(state, m.user_id, m.media_sha256)
+    # Public-visibility rollup, stored so reader endpoints filter and count on
+    # columns instead of loading members (anonymous VERIFIED = supporting).
+    event.verified_member_count = (event.verified_member_count or 0) + 1
+    if m.user_id is None:
+        event.supporting_count = (event.supporting_count or 0) + 1
+    event.has_public_member = True
+    if check_rung and m.user_id is not None and not state['established']:
+        user = db.session.get(User, int(m.user_id))
+        state['established'] = bool(user is not None and (user.trust_rung or 0) >= 2)
+
+
+def _find(parent, x):
+    root = x
+    while parent[root] != root:
+        root = parent[root]
+    while parent[x] != root:      # path compression
+        parent[x], x = root, parent[x]
+    return root
+
+
+def _add_origin(state, user_id, media_sha256):
+    """Add one VERIFIED member to the independent-origin union-find: its
+    identity is a node, and identities sharing a media fingerprint are unioned
+    (same clip -> same source). Anonymous members never add a node."""
+    if user_id is None:
+        return
+    user_id = int(user_id)      # a fresh upload may still hold the JWT string
+    parent = state['parent']
+    if user_id not in parent:
+        parent[user_id] = user_id
+        state['roots'] += 1
+    h = (media_sha256 or '').strip().lower() or None
+    if not h:
+        return
+    owner = state['fp'].get(h)
+    if owner is None:
+        state['fp'][h] = user_id
+        return
+    ra, rb = _find(parent, owner), _find(parent, user_id)
+    if ra != rb:
+        parent[ra] = rb
+        state['roots'] -= 1
+
+
 def _independent_origins(verified):
     """Set of independent-source roots among VERIFIED members (len = the count).
 
@@ -197,61 +548,11 @@ def _independent_origins(verified):
     because identities are the nodes and extra media never adds nodes. Uses
     union-find: each distinct user is a node; users sharing a media fingerprint
     are unioned; the number of connected components is the independent count."""
-    users = {m.user_id for m in verified if m.user_id is not None}
-    if not users:
-        return set()
-
-    parent = {u: u for u in users}
-
-    def find(x):
-        root = x
-        while parent[root] != root:
-            root = parent[root]
-        while parent[x] != root:      # path compression
-            parent[x], x = root, parent[x]
-        return root
-
-    def union(a, b):
-        ra, rb = find(a), find(b)
-        if ra != rb:
-            parent[ra] = rb
-
-    # Link identities that share a media fingerprint (same clip -> same source).
-    fp_owner = {}
+    state = _new_state()
     for m in verified:
-        if m.user_id is None:
-            continue
-        h = (m.media_sha256 or '').strip().lower() or None
-        if not h:
-            continue
-        if h in fp_owner:
-            union(fp_owner[h], m.user_id)
-        else:
-            fp_owner[h] = m.user_id
-
-    return {find(u) for u in users}
-
-
-def _update_aggregates(event, members):
-    """Centroid + rolled-up severity/confidence + display fallbacks."""
-    geo = [(m.lat, m.lon) for m in members if m.lat is not None and m.lon is not None]
-    if geo:
-        event.lat = sum(p[0] for p in geo) / len(geo)
-        event.lon = sum(p[1] for p in geo) / len(geo)
-    sevs = [m.severity for m in members if m.severity]
-    if sevs:
-        event.severity = max(sevs, key=lambda s: _SEVERITY_RANK.get(s, 0))
-    confs = [m.confidence_score for m in members if m.confidence_score is not None]
-    if confs:
-        event.confidence_score = sum(confs) / len(confs)
-    if not event.title:
-        titles = [m.title for m in members if m.title]
-        if titles:
-            event.title = titles[0]
-    if not event.city:
-        cities = [m.city for m in members if m.city]
-        if cities:
-            event.city = cities[0]
+        _add_origin(state, m.user_id, m.media_sha256)
+    parent = state['parent']
+    return {_find(parent, u) for u in list(parent)}
 
 
 def _has_established_member(identity_ids):
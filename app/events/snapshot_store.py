@@ -0,0 +1,171 @@
+"""
+app/events/snapshot_store.py
+
+Content-addressed, compressed storage for corroboration-graph snapshots
+(ADR-0026, the storage side of ADR-0020 Phase 1 / ADR-0025).
+
+A snapshot's stored text (archive.encode_graph) is split into chunks: one per
+source node, plus a header -- the rest of the graph with the node list emptied.
+Each chunk is addressed by the SHA-256 of its raw bytes and stored ONCE in
+snapshot_chunks, compressed. A snapshot row keeps only a manifest: the header
+chunk, the byte offset where the node list goes, and the node chunks in order.
+An Event that moves CORROBORATED -> DISPUTED -> CORROBORATED re-stores a new
+header and whichever nodes changed, not the whole graph.
+
+Reassembly is byte-exact -- header[:at] + ','.join(nodes) + header[at:] -- so
+graph_sha256 still verifies against the reassembled text. Rows from before
+this store keep their verbatim graph_json until convert_legacy_snapshots
+chunks them; load_graph_json reads either shape.
+
+Codec is per chunk: zlib always works; zstd (the optional `zstandard`
+package) is used for new chunks when SNAPSHOT_CHUNK_CODEC=zstd and installed.
+"""
+
+import hashlib
+import json
+import logging
+import zlib
+
+import config
+from app.models import db, EventGraphSnapshot, SnapshotChunk
+
+logger = logging.getLogger(__name__)
+
+_NODES_KEY = b'"nodes":['
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _compress(raw):
+    if _cfg('SNAPSHOT_CHUNK_CODEC', 'zlib') == 'zstd':
+        zstd = _zstd()
+        if zstd is not None:
+            return 'zstd', zstd.ZstdCompressor(level=10).compress(raw)
+        logger.warning("SNAPSHOT_CHUNK_CODEC=zstd but zstandard is not installed; using zlib")
+    return 'zlib', zlib.compress(raw, 9)
+
+
+def _decompress(codec, data):
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'zstd':
+        zstd = _zstd()
+        if zstd is None:
+            raise RuntimeError("snapshot chunk is zstd-compressed but zstandard is not installed")
+        return zstd.ZstdDecompressor().decompress(data)
+    raise ValueError(f"unknown snapshot chunk codec {codec!r}")
+
+
+def split_graph_json(graph_json):
+    """Split stored graph text into (header, offset, [node bytes]). The node
+    list is located by re-encoding the parsed nodes canonically, so a text
+    that isn't canonical (a hand-edited legacy row) becomes a lone header with
+    no nodes -- still byte-exact, just not shared."""
+    from app.events.archive import _CANONICAL
+    raw = graph_json.encode('utf-8')
+    nodes = [_CANONICAL.encode(n).encode('utf-8')
+             for n in (json.loads(graph_json).get('nodes') or [])]
+    joined = b','.join(nodes)
+    at = raw.find(_NODES_KEY + joined + b']')
+    if not nodes or at < 0:
+        return raw, 0, []
+    at += len(_NODES_KEY)
+    return raw[:at] + raw[at + len(joined):], at, nodes
+
+
+def store_graph_json(graph_json, node_chunks=None):
+    """Store `graph_json`'s chunks (those not already present) and return its
+    manifest as JSON text. `node_chunks` is encode_graph's (offset, [node
+    bytes]) for the text; without it the text is parsed to find the nodes
+    (split_graph_json). One query finds the chunks already stored. Does not
+    commit."""
+    if node_chunks is None:
+        header, at, nodes = split_graph_json(graph_json)
+    else:
+        raw = graph_json.encode('utf-8')
+        at, nodes = node_chunks
+        header = raw[:at] + raw[at + len(b','.join(nodes)):]
+    chunks = {hashlib.sha256(c).hexdigest(): c for c in [header] + nodes}
+    known = {
+        sha for (sha,) in db.session.query(SnapshotChunk.sha256)
+        .filter(SnapshotChunk.sha256.in_(list(chunks)))
+    }
+    for sha, raw in chunks.items():
+        if sha in known:
+            continue
+        codec, data = _compress(raw)
+        _insert_chunk(dict(sha256=sha, codec=codec, size=len(raw), data=data))
+    return json.dumps({
+        'header': hashlib.sha256(header).hexdigest(),
+        'at': at,
+        'nodes': [hashlib.sha256(n).hexdigest() for n in nodes],
+    }, separators=(',', ':'))
+
+
+def _insert_chunk(row):
+    """Insert one chunk, tolerating another worker having just stored it."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        db.session.merge(SnapshotChunk(**row))
+        return
+    db.session.execute(insert(SnapshotChunk).values(**row)
+                       .on_conflict_do_nothing(index_elements=['sha256']))
+
+
+def load_graph_json(snapshot):
+    """The snapshot's stored graph text, byte for byte as it was hashed:
+    reassembled from its chunks (one query), or the legacy verbatim column."""
+    if not snapshot.manifest_json:
+        return snapshot.graph_json
+    manifest = json.loads(snapshot.manifest_json)
+    wanted = {manifest['header'], *manifest['nodes']}
+    raw = {
+        c.sha256: _decompress(c.codec, c.data)
+        for c in SnapshotChunk.query.filter(SnapshotChunk.sha256.in_(list(wanted)))
+    }
+    missing = wanted - set(raw)
+    if missing:
+        raise LookupError(f"snapshot {snapshot.id} is missing chunks {sorted(missing)}")
+    header, at = raw[manifest['header']], manifest['at']
+    body = b','.join(raw[sha] for sha in manifest['nodes'])
+    return (header[:at] + body + header[at:]).decode('utf-8')
+
+
+def convert_legacy_snapshots(batch=200):
+    """Move every snapshot still holding verbatim graph_json into the chunk
+    store, checking each reassembles to the same bytes before dropping the
+    text. Commits per batch. Returns how many rows were converted."""
+    converted = 0
+    while True:
+        rows = (
+            EventGraphSnapshot.query
+            .filter(EventGraphSnapshot.manifest_json.is_(None))
+            .order_by(EventGraphSnapshot.id)
+            .limit(batch)
+            .all()
+        )
+        if not rows:
+            return converted
+        for snap in rows:
+            text = snap.graph_json
+            snap.manifest_json = store_graph_json(text)
+            db.session.flush()
+            if load_graph_json(snap) != text:
+                raise RuntimeError(f"snapshot {snap.id} did not reassemble byte-identically")
+            snap.graph_json = None
+        db.session.commit()
+        converted += len(rows)
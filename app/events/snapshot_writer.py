@@ -0,0 +1,175 @@
+"""
+app/events/snapshot_writer.py
+
+Background writer for corroboration-graph snapshots (ADR-0025, building on
+ADR-0020 Phase 1 / UC9).
+
+An Event entering an archival status used to build, encode, hash and store its
+graph inside the ingest or moderation transaction. Now the transition only
+CAPTURES: archive.capture_graph_inputs (column reads) goes into a
+pending_snapshots row in the same transaction. A daemon thread per worker then
+builds the graph from the capture, dedups it against the latest snapshot and
+stores it, off the request path.
+
+Capture-before-deletion still holds. The capture is the graph's inputs as they
+were at the transition, so later edits or deletions cannot change what gets
+archived, and it commits or rolls back with the transition itself. The writer
+deletes a pending row in the same transaction that stores its snapshot (the
+delete is also the claim between workers), so a crash at any point leaves the
+row for the next pass. On start the writer also sweeps for Events sitting in an
+archival status with no matching snapshot or capture (rows from before this
+writer, or written behind the app's back) and captures them.
+
+Per Event, a pass coalesces: pending rows are handled in order with one
+latest-snapshot lookup, a capture identical to the one before it is dropped
+unbuilt, and a graph identical to the latest stored one adds nothing.
+"""
+
+import json
+import logging
+import threading
+from itertools import groupby
+
+from sqlalchemy import delete, exists, func, or_, select
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session
+
+import config
+from app.models import db, Event, EventGraphSnapshot, PendingSnapshot
+from app.events.service import _ARCHIVE_WORTHY_STATUS
+
+logger = logging.getLogger(__name__)
+
+_CAPTURED_KEY = 'snapshots_captured'
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def enabled():
+    return bool(_cfg('SNAPSHOT_WRITER_ASYNC', True))
+
+
+def capture_snapshot(event, reason=None):
+    """Record an archival transition of `event`: capture the graph's inputs
+    now, in the caller's transaction, for the writer to store after commit.
+    With SNAPSHOT_WRITER_ASYNC off, stores the snapshot synchronously instead.
+    Does not commit."""
+    from app.events.archive import capture_graph_inputs, snapshot_event
+    if not enabled():
+        return snapshot_event(event, reason=reason)
+    row = PendingSnapshot(
+        event_id=event.id, reason=reason,
+        capture_json=json.dumps(capture_graph_inputs(event), sort_keys=True,
+                                separators=(',', ':'), ensure_ascii=False),
+    )
+    db.session.add(row)
+    db.session.flush()
+    db.session.info[_CAPTURED_KEY] = True
+    return row
+
+
+def write_pending_snapshots(limit=500):
+    """Store snapshots for up to `limit` pending captures, oldest first, and
+    delete those rows. Rows another worker claimed first are skipped. Returns
+    how many pending rows it took, so a caller can loop until 0. Does not
+    commit -- the caller commits the snapshots and the deletes together."""
+    from app.events.archive import _graph_and_json, _latest_snapshot, _store_snapshot
+    rows = PendingSnapshot.query.order_by(PendingSnapshot.id).limit(limit).all()
+    for event_id, group in groupby(sorted(rows, key=lambda r: (r.event_id, r.id)),
+                                   key=lambda r: r.event_id):
+        latest = _latest_snapshot(event_id)
+        previous = None
+        for row in group:
+            claimed = db.session.execute(
+                delete(PendingSnapshot).where(PendingSnapshot.id == row.id)
+            ).rowcount
+            if not claimed or row.capture_json == previous:
+                continue
+            previous = row.capture_json
+            graph, stored, node_chunks = _graph_and_json(json.loads(row.capture_json))
+            latest = _store_snapshot(event_id, graph, row.reason, latest, stored, node_chunks)
+    db.session.flush()
+    return len(rows)
+
+
+def sweep_missed_snapshots():
+    """Capture every Event sitting in an archival status whose newest
+    transition snapshot (manual ones aside) is for another status, and which has
+    no capture pending. Returns how many were captured. Does not commit."""
+    latest_reason = (
+        select(EventGraphSnapshot.reason)
+        .where(EventGraphSnapshot.event_id == Event.id,
+               or_(EventGraphSnapshot.reason.is_(None), EventGraphSnapshot.reason != 'manual'))
+        .order_by(EventGraphSnapshot.id.desc())
+        .limit(1)
+        .correlate(Event)
+        .scalar_subquery()
+    )
+    missed = (
+        Event.query
+        .filter(Event.status.in_(sorted(_ARCHIVE_WORTHY_STATUS)))
+        .filter(~exists().where(PendingSnapshot.event_id == Event.id))
+        .filter(or_(latest_reason.is_(None), latest_reason != func.lower(Event.status)))
+        .order_by(Event.id)
+        .all()
+    )
+    for event in missed:
+        capture_snapshot(event, reason=event.status.lower())
+    if missed:
+        logger.warning("snapshot sweep: captured %d missed archival transitions", len(missed))
+    return len(missed)
+
+
+class SnapshotWriter:
+    """One daemon thread per worker: sweeps once on start, then drains pending
+    captures whenever this worker commits one, and every poll interval for the
+    captures other workers commit."""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._thread = None
+
+    def start(self, app):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(app,),
+                                        name='snapshot-writer', daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self, app):
+        sweep = True
+        while True:
+            with app.app_context():
+                try:
+                    if sweep:
+                        sweep_missed_snapshots()
+                        sweep = False
+                    while write_pending_snapshots():
+                        db.session.commit()
+                    db.session.commit()
+                except Exception:
+                    logger.exception("snapshot writer pass failed; retrying next pass")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            self._wake.wait(_cfg('SNAPSHOT_WRITER_POLL_SECONDS', 30))
+            self._wake.clear()
+
+
+snapshot_writer = SnapshotWriter()
+
+
+@sa_event.listens_for(Session, 'after_commit')
+def _wake_writer_after_commit(session):
+    if session.info.pop(_CAPTURED_KEY, False):
+        snapshot_writer.wake()
+
+
+@sa_event.listens_for(Session, 'after_rollback')
+def _forget_capture_on_rollback(session):
+    session.info.pop(_CAPTURED_KEY, None)
@@ -0,0 +1,144 @@
+"""
+Cross-event campaign detection tests (events.campaigns).
+
+A copy-paste campaign spread over many singleton Events is found through the
+global LSH index: every report is indexed at ingest, re-indexed when its text
+changes and dropped when deleted; lookups only reach recent reports from other
+identities and only report exact-Jaccard hits, at most CAMPAIGN_VERIFY_LIMIT
+candidates each (capped in SQL). The index rebuilds from file_uploads to the
+same answers and is pruned on a schedule.
+
+In-memory SQLite with a minimal Flask app, matching test_corroboration.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+import config
+from app.models import db, User, FileUpload, FileType, TextLshBucket
+from app.events import campaigns
+from app.events.campaigns import (
+    maybe_prune_campaign_index, near_duplicates, prune_campaign_index, rebuild_campaign_index,
+    refresh_campaign_index,
+)
+from app.events.service import assign_event
+
+_SCRIPT = 'Enemy drones struck the bakery queue on Salah al-Din street at dawn, dozens hurt'
+
+
+@pytest.fixture
+def ctx():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.commit()
+        yield ft
+        db.session.remove()
+
+
+def _report(ft, i, text, handle=None, when=None):
+    uid = None
+    if handle is not None:
+        u = User.query.filter_by(display_handle=handle).first()
+        if u is None:
+            u = User(display_handle=handle, identity_type='pseudonymous', trust_rung=1)
+            db.session.add(u)
+            db.session.flush()
+        uid = u.userid
+    up = FileUpload(
+        filename='x', file_path='x', file_type_id=ft.filetypeid, user_id=uid,
+        lat=31.0 + i * 0.1, lon=34.3, upload_date=when or datetime.utcnow(),
+        witness_statement=text, verification_status='PENDING',
+    )
+    db.session.add(up)
+    db.session.flush()
+    assign_event(up)
+    return up
+
+
+def _campaign(ft):
+    """Four copies of one script, lightly edited, each in its own Event."""
+    ups = [
+        _report(ft, 0, _SCRIPT, 'k-a'),
+        _report(ft, 1, _SCRIPT + '!', 'k-b'),
+        _report(ft, 2, _SCRIPT.upper(), None),
+        _report(ft, 3, _SCRIPT + ' today', 'k-c'),
+    ]
+    db.session.commit()
+    assert len({u.event_id for u in ups}) == 4
+    return ups
+
+
+def test_campaign_across_events_is_flagged(ctx):
+    a, b, c, d = _campaign(ctx)
+    organic = _report(ctx, 4, 'Power cut across the camp since the evening', 'k-d')
+    flags = near_duplicates([a, b, c, d, organic])
+
+    assert organic.id not in flags
+    assert flags[a.id]['source_ids'][:2] == [b.id, c.id]     # identical wording first
+    assert sorted(flags[a.id]['source_ids']) == [b.id, c.id, d.id]
+    assert flags[a.id]['event_ids'] == sorted([b.event_id, c.event_id, d.event_id])
+    assert flags[a.id]['match_count'] == 3
+    assert flags[d.id]['type'] == 'duplicate_text_elsewhere'
+
+
+def test_same_identity_and_old_reports_are_not_hits(ctx):
+    a = _report(ctx, 0, _SCRIPT, 'k-a')
+    _report(ctx, 1, _SCRIPT, 'k-a')
+    _report(ctx, 2, _SCRIPT, 'k-b', when=datetime.utcnow() - timedelta(days=30))
+    db.session.commit()
+    assert near_duplicates([a]) == {}
+
+
+def test_index_follows_edits_and_deletes(ctx):
+    a, b, c, d = _campaign(ctx)
+    d.witness_statement = 'Sirens near the coastal road at night'
+    db.session.delete(c)
+    db.session.commit()
+    assert sorted(near_duplicates([a])[a.id]['source_ids']) == [b.id]
+    assert TextLshBucket.query.filter_by(upload_id=c.id).count() == 0
+
+
+def test_rebuild_and_prune(ctx):
+    ups = _campaign(ctx)
+    before = near_duplicates(ups)
+    TextLshBucket.query.delete()
+    db.session.commit()
+    assert near_duplicates(ups) == {}
+
+    refresh_campaign_index()            # empty index -> rebuilt
+    assert near_duplicates(ups) == before
+    assert rebuild_campaign_index() == 4
+    assert near_duplicates(ups) == before
+
+    assert prune_campaign_index(now=datetime.utcnow() + timedelta(days=30)) == 4 * 32
+
+
+def test_hot_bucket_is_capped_in_sql(ctx, monkeypatch):
+    monkeypatch.setattr(config, 'CAMPAIGN_VERIFY_LIMIT', 2, raising=False)
+    a, b, c, d = _campaign(ctx)
+    flag = near_duplicates([a])[a.id]
+    assert sorted(flag['source_ids']) == sorted([c.id, d.id])      # the two newest only
+    assert flag['match_count'] == 2 and flag['detail'].startswith('at least 2 ')
+
+
+def test_prune_runs_on_a_schedule(ctx, monkeypatch):
+    monkeypatch.setattr(config, 'CAMPAIGN_PRUNE_INTERVAL_SECONDS', 3600, raising=False)
+    monkeypatch.setattr(campaigns, '_pruned_at', None)
+    _report(ctx, 0, _SCRIPT, 'k-a', when=datetime.utcnow() - timedelta(days=30))
+    db.session.commit()
+    assert TextLshBucket.query.count() == 32
+
+    maybe_prune_campaign_index()
+    assert TextLshBucket.query.count() == 0
+    _report(ctx, 1, _SCRIPT, 'k-b', when=datetime.utcnow() - timedelta(days=30))
+    db.session.commit()
+    maybe_prune_campaign_index()                    # within the interval: no-op
+    assert TextLshBucket.query.count() == 32
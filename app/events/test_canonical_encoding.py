@@ -0,0 +1,138 @@
+"""
+Byte-for-byte compatibility of the single-pass graph encoder.
+
+encode_graph / graph_content_hash must reproduce, exactly, what the original
+two-pass code produced: the SHA-256 of canonical_graph_bytes, and the stored
+text json.dumps(sort_keys=True, compact, ensure_ascii=False) of the graph with
+integrity attached. Every snapshot hash already stored depends on it. The
+reference implementations below are that original code, frozen here.
+
+Cases: real graphs built from the engine (one per fixture shape) and
+randomized graphs stressing key order around 'integrity', non-ASCII text and
+keys, escapes, floats, and empty containers.
+"""
+
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+from app.models import db, User, FileUpload, FileType, Event
+from app.events.archive import (
+    build_event_graph, canonical_graph_bytes, encode_graph, graph_content_hash,
+)
+from app.events.service import assign_event
+
+
+def _reference_bytes(graph):
+    body = {k: v for k, v in graph.items() if k != 'integrity'}
+    return json.dumps(body, sort_keys=True, separators=(',', ':'),
+                      ensure_ascii=False).encode('utf-8')
+
+
+def _reference_stored(graph):
+    digest = hashlib.sha256(_reference_bytes(graph)).hexdigest()
+    full = dict(graph, integrity={'graph_sha256': digest})
+    return digest, json.dumps(full, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def _assert_compatible(graph):
+    digest, stored = _reference_stored(graph)
+    assert canonical_graph_bytes(graph) == _reference_bytes(graph)
+    assert graph_content_hash(graph) == digest
+    got_digest, got_stored, (at, nodes) = encode_graph(graph)
+    assert (got_digest, got_stored) == (digest, stored)
+    # The node chunks handed to the snapshot store put the text back exactly.
+    raw = stored.encode('utf-8')
+    joined = b','.join(nodes)
+    assert raw[:at] + joined + raw[at + len(joined):] == raw
+    if isinstance(graph.get('nodes'), list) and graph['nodes']:
+        assert raw[at - len(b'"nodes":['):at] == b'"nodes":['
+        assert nodes == [json.dumps(n, sort_keys=True, separators=(',', ':'),
+                                    ensure_ascii=False).encode('utf-8') for n in graph['nodes']]
+
+
+_TEXT = ['', 'Rafah', 'غزة', 'naïve "quoted"', 'back\\slash', 'tab\there\nnewline',
+         ' sep', '\x00ctl', 'emoji \U0001F4F7', 'ascii']
+_KEYS = ['a', 'event', 'i', 'inte', 'integrity0', 'integrityx', 'Integrity', 'nodes',
+         'z', 'ή', '_', '0', 'schema_version', 'coordination_flags', 'zzé']
+
+
+def _value(rnd, depth):
+    kind = rnd.randrange(9 if depth < 3 else 6)
+    if kind == 0:
+        return None
+    if kind == 1:
+        return rnd.choice((True, False))
+    if kind == 2:
+        return rnd.randint(-10**12, 10**12)
+    if kind == 3:
+        return rnd.choice((0.0, -0.0, 1e-7, 31.5004, 1e21, 2.5e-320, float('inf'),
+                           rnd.uniform(-180, 180)))
+    if kind in (4, 5):
+        return rnd.choice(_TEXT)
+    if kind == 6:
+        return [_value(rnd, depth + 1) for _ in range(rnd.randrange(4))]
+    return {rnd.choice(_KEYS + _TEXT): _value(rnd, depth + 1) for _ in range(rnd.randrange(4))}
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_random_graphs_match_reference(seed):
+    rnd = random.Random(seed)
+    graph = {k: _value(rnd, 0) for k in rnd.sample(_KEYS, rnd.randrange(len(_KEYS)))}
+    if rnd.random() < 0.3:
+        graph['integrity'] = {'graph_sha256': 'stale'}
+    _assert_compatible(graph)
+
+
+def test_degenerate_graphs_match_reference():
+    _assert_compatible({})
+    _assert_compatible({'integrity': {'graph_sha256': 'x'}})
+    _assert_compatible({'a': {}, 'z': []})
+
+
+@pytest.fixture
+def ctx():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.flush()
+        yield ft
+        db.session.remove()
+
+
+@pytest.mark.parametrize('members', [1, 2, 7, 40])
+def test_engine_graphs_match_reference(ctx, members):
+    rnd = random.Random(members)
+    start = datetime.utcnow()
+    ev = None
+    for i in range(members):
+        u = User(display_handle=f'k-{i}', identity_type='pseudonymous', trust_rung=rnd.choice((1, 2)))
+        db.session.add(u)
+        db.session.flush()
+        up = FileUpload(
+            filename='x', file_path='x', file_type_id=ctx.filetypeid,
+            user_id=u.userid if rnd.random() < 0.8 else None,
+            lat=31.5 + rnd.random() / 1000, lon=34.46 + rnd.random() / 1000,
+            city=rnd.choice(('Rafah', 'رفح', None)), severity='MEDIUM',
+            upload_date=start + timedelta(seconds=rnd.randrange(120)),
+            media_sha256=rnd.choice(('a' * 64, 'b' * 64, None)),
+            witness_statement=rnd.choice(('smoke over the market', 'دخان فوق السوق', None)),
+            verification_status='VERIFIED',
+        )
+        db.session.add(up)
+        db.session.flush()
+        ev = assign_event(up)
+    db.session.expire_all()         # reload the members collection
+    graph = build_event_graph(db.session.get(Event, ev.id))
+    assert len(graph['nodes']) == members
+    _assert_compatible(graph)
+    assert graph['integrity']['graph_sha256'] == hashlib.sha256(_reference_bytes(graph)).hexdigest()
@@ -162,6 +162,21 @@ def test_anonymous_member_counts_zero(ctx):
     assert ev.status == 'DEVELOPING'        # threshold of 2 not met
 
 
+def test_recompute_maintains_visibility_rollup(ctx):
+    ft, now = _ft(), datetime.utcnow()
+    r1 = _report(ft, _user(2), 31.5000, 34.4600, now)
+    anon = _report(ft, None, 31.5001, 34.4601, now)
+    ev = db.session.get(Event, r1.event_id)
+    assert (ev.has_public_member, ev.verified_member_count, ev.supporting_count) == (False, 0, 0)
+    _verify(r1)
+    _verify(anon)
+    assert (ev.has_public_member, ev.verified_member_count, ev.supporting_count) == (True, 2, 1)
+    for up in (r1, anon):
+        up.verification_status = 'REJECTED'
+    recompute_event(ev)
+    assert (ev.has_public_member, ev.verified_member_count, ev.supporting_count) == (False, 0, 0)
+
+
 def test_geo_separation_starts_new_event(ctx):
     ft, now = _ft(), datetime.utcnow()
     u1 = _user(2)
@@ -170,6 +185,21 @@ def test_geo_separation_starts_new_event(ctx):
     assert r1.event_id != r2.event_id
 
 
+def test_bbox_prefilter_keeps_true_matches(ctx):
+    """The SQL bounding box must never clip a report the haversine would
+    cluster: east-west at high latitude (degrees of longitude are short there)
+    and across the antimeridian."""
+    ft, now = _ft(), datetime.utcnow()
+    u1, u2 = _user(2), _user(2)
+    r1 = _report(ft, u1, 60.0, 10.0, now)
+    r2 = _report(ft, u2, 60.0, 10.017, now)       # ~0.95 km due east
+    assert r1.event_id == r2.event_id
+    w1 = _report(ft, u1, 0.0, 179.9996, now)
+    w2 = _report(ft, u2, 0.0, -179.9996, now)     # ~0.09 km, other side of 180
+    assert w1.event_id == w2.event_id
+    assert w1.event_id != r1.event_id
+
+
 def test_time_separation_starts_new_event(ctx):
     ft, now = _ft(), datetime.utcnow()
     u1 = _user(2)
@@ -184,3 +214,11 @@ def test_city_degrade_when_pin_withheld(ctx):
     r1 = _report(ft, u1, None, None, now, city='Gaza')
     r2 = _report(ft, u2, None, None, now, city='gaza')  # case-insensitive, no pins
     assert r1.event_id == r2.event_id
+
+
+def test_city_degrade_folds_like_python(ctx):
+    ft, now = _ft(), datetime.utcnow()
+    u1, u2 = _user(2), _user(2)
+    r1 = _report(ft, u1, None, None, now, city='Łódź')
+    r2 = _report(ft, u2, None, None, now, city='ŁÓDŹ\t')  # non-ASCII case, tab
+    assert r1.event_id == r2.event_id
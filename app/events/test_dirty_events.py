@@ -0,0 +1,171 @@
+"""
+Dirty-events unit of work tests.
+
+Moderator verify/reject, rung vouches and overrides mark Events dirty instead of
+recomputing on the spot; the commit re-derives each dirty Event exactly once.
+These check the coalescing (many triggers, one recompute, one snapshot), that a
+batch of first approvals still takes the incremental fold, that a prolific
+reporter's vouch loads its Events in one query, and that a rollback drops the
+marks.
+
+In-memory SQLite with a minimal Flask app, matching test_corroboration.
+"""
+
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy import event as sa_event
+
+from app.models import db, User, FileUpload, FileType, Event, EventGraphSnapshot
+from app.events import service
+from app.events.service import assign_event, flush_dirty_events, mark_dirty, process_new_report
+from app.events.snapshot_writer import write_pending_snapshots
+
+
+@pytest.fixture
+def ctx():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.commit()
+        yield ft
+        db.session.remove()
+
+
+def _user(rung, handle):
+    u = User(display_handle=handle, identity_type='pseudonymous', trust_rung=rung)
+    db.session.add(u)
+    db.session.flush()
+    return u
+
+
+def _report(ft, user, lat, lon, status='PENDING', sha=None):
+    up = FileUpload(
+        filename='x', file_path='ingest:no-media', file_type_id=ft.filetypeid,
+        user_id=user.userid, lat=lat, lon=lon, media_sha256=sha,
+        upload_date=datetime.utcnow(), verification_status=status,
+    )
+    db.session.add(up)
+    db.session.flush()
+    assign_event(up)
+    return up
+
+
+def _count_calls(monkeypatch, name):
+    calls = []
+    real = getattr(service, name)
+
+    def wrapper(event, *args, **kwargs):
+        calls.append(event.id)
+        return real(event, *args, **kwargs)
+    monkeypatch.setattr(service, name, wrapper)
+    return calls
+
+
+def test_many_triggers_one_recompute_and_one_snapshot_at_commit(ctx, monkeypatch):
+    a, b, c = _user(2, 'k-a'), _user(2, 'k-b'), _user(1, 'k-c')
+    ra = _report(ctx, a, 31.5000, 34.4600, sha='a' * 64)
+    rb = _report(ctx, b, 31.5004, 34.4604, sha='b' * 64)
+    rc = _report(ctx, c, 31.5002, 34.4602, sha='c' * 64)
+    ev = db.session.get(Event, ra.event_id)
+    assert ev.status == 'DEVELOPING'
+    db.session.commit()
+
+    full = _count_calls(monkeypatch, 'recompute_event')
+    for up in (ra, rb):
+        up.verification_status = 'VERIFIED'
+        mark_dirty(ev.id, verified=up)
+    rc.verification_status = 'REJECTED'
+    mark_dirty(ev.id)
+    mark_dirty(ev.id)
+    assert full == [] and ev.status == 'DEVELOPING'     # nothing ran yet
+
+    db.session.commit()
+    assert full == [ev.id]
+    assert ev.status == 'CORROBORATED'
+    write_pending_snapshots()
+    assert EventGraphSnapshot.query.filter_by(event_id=ev.id).count() == 1
+
+
+def test_first_approvals_alone_fold_incrementally(ctx, monkeypatch):
+    a, b = _user(2, 'k-a'), _user(2, 'k-b')
+    ra = _report(ctx, a, 31.5000, 34.4600, sha='a' * 64)
+    rb = _report(ctx, b, 31.5004, 34.4604, sha='b' * 64)
+    db.session.commit()
+
+    full = _count_calls(monkeypatch, 'recompute_event')
+    folds = _count_calls(monkeypatch, 'member_verified')
+    for up in (ra, rb):
+        up.verification_status = 'VERIFIED'
+        mark_dirty(up.event_id, verified=up)
+    db.session.commit()
+    ev = db.session.get(Event, ra.event_id)
+    assert full == [] and folds == [ev.id, ev.id]
+    assert (ev.corroboration_count, ev.status) == (2, 'CORROBORATED')
+
+
+def test_direct_recompute_satisfies_pending_mark(ctx):
+    a = _user(2, 'k-a')
+    ra = _report(ctx, a, 31.5, 34.46)
+    ra.verification_status = 'VERIFIED'
+    mark_dirty(ra.event_id, verified=ra)
+    ev = db.session.get(Event, ra.event_id)
+    service.recompute_event(ev)          # already folds ra...
+    db.session.commit()                  # ...so the mark must not fold it again
+    assert ev.verified_member_count == 1
+
+
+def test_rollback_drops_marks(ctx, monkeypatch):
+    ra = _report(ctx, _user(2, 'k-a'), 31.5, 34.46)
+    db.session.commit()
+    mark_dirty(ra.event_id)
+    db.session.rollback()
+    full = _count_calls(monkeypatch, 'recompute_event')
+    db.session.commit()
+    assert full == [] and flush_dirty_events() == []
+
+
+def test_vouch_loads_a_prolific_reporters_events_in_one_query(ctx):
+    from app.moderation.routes import _vouch_user_to_rung
+    prolific = _user(1, 'k-p')
+    for i in range(12):                  # twelve separate Events
+        _report(ctx, prolific, 31.0 + i * 0.1, 34.0, status='VERIFIED')
+    db.session.commit()
+
+    selects = []
+
+    def on_execute(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM events' in statement:
+            selects.append(statement)
+    sa_event.listen(db.engine, 'before_cursor_execute', on_execute)
+    try:
+        _vouch_user_to_rung(prolific, 2)
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', on_execute)
+    assert len(selects) == 1, selects
+
+
+def test_new_report_is_folded_once(ctx, monkeypatch):
+    """The gate runs before the fold, so an auto-published report derives its
+    Event's status (and snapshots/refreshes) once, not once per step."""
+    _report(ctx, _user(2, 'k-a'), 31.5000, 34.4600, status='VERIFIED', sha='a' * 64)
+    finishes = _count_calls(monkeypatch, '_finish_recompute')
+    up = FileUpload(
+        filename='x', file_path='ingest:no-media', file_type_id=ctx.filetypeid,
+        user_id=_user(2, 'k-b').userid, lat=31.5004, lon=34.4604,
+        upload_date=datetime.utcnow(),
+    )
+    db.session.add(up)
+    db.session.flush()
+    ev = process_new_report(up)
+    assert up.verification_status == 'VERIFIED'
+    assert finishes == [ev.id]
+    assert ev.status == 'CORROBORATED'
+    write_pending_snapshots()
+    assert EventGraphSnapshot.query.filter_by(event_id=ev.id).count() == 1
@@ -0,0 +1,154 @@
+"""
+Reader-facing Event feed tests.
+
+The feed is public-members-only, leads with CORROBORATED, and keyset-pages on
+(status rank, updated_at, id): walking next_cursor visits every visible Event
+exactly once, in feed order.
+
+Minimal Flask app with only the events blueprint on in-memory SQLite.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from sqlalchemy import event as sa_event
+
+from app.models import db, FileUpload, FileType, Event
+from app.events.routes import events_bp
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    app.register_blueprint(events_bp)
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+
+
+def _event(ft, status, updated_at, public=True, title=None, override=None, city=None):
+    ev = Event(status=status, title=title, status_override=override, city=city)
+    db.session.add(ev)
+    db.session.flush()
+    db.session.add(FileUpload(
+        filename='x', file_path='x', file_type_id=ft.filetypeid, event_id=ev.id,
+        verification_status='VERIFIED' if public else 'PENDING',
+    ))
+    ev.verified_member_count = 1 if public else 0      # set by recompute in real flow
+    ev.has_public_member = public
+    db.session.flush()
+    ev.updated_at = updated_at      # after the flushes, so onupdate can't bump it
+    db.session.commit()
+    return ev
+
+
+@pytest.fixture
+def ft(client):
+    ft = FileType(type_name='Other', allowed_extensions='*')
+    db.session.add(ft)
+    db.session.flush()
+    return ft
+
+
+def _ids(resp):
+    assert resp.status_code == 200, resp.data
+    return [e['id'] for e in resp.get_json()['events']]
+
+
+def test_feed_order_and_visibility(client, ft):
+    now = datetime.utcnow()
+    dev = _event(ft, 'DEVELOPING', now)
+    corr = _event(ft, 'CORROBORATED', now - timedelta(hours=1))
+    _event(ft, 'CORROBORATED', now, public=False)        # no verified member
+    disp = _event(ft, 'DISPUTED', now - timedelta(hours=2))
+    assert _ids(client.get('/api/events')) == [corr.id, disp.id, dev.id]
+
+
+def test_cursor_walks_every_event_once(client, ft):
+    now = datetime.utcnow()
+    for i in range(7):
+        _event(ft, ('CORROBORATED', 'DEVELOPING', 'DISPUTED')[i % 3],
+               now - timedelta(minutes=i // 2))          # repeated timestamps
+    expected = _ids(client.get('/api/events?limit=100'))
+    seen, cursor = [], None
+    while True:
+        url = '/api/events?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        resp = client.get(url)
+        seen.extend(_ids(resp))
+        cursor = resp.get_json()['next_cursor']
+        if cursor is None:
+            break
+    assert seen == expected and len(seen) == 7
+
+
+def test_bad_cursor_is_400(client, ft):
+    assert client.get('/api/events?cursor=garbage').status_code == 400
+
+
+def test_status_and_text_filters_use_live_status(client, ft):
+    now = datetime.utcnow()
+    pinned = _event(ft, 'CORROBORATED', now, override='DISPUTED', title='Bridge strike')
+    _event(ft, 'CORROBORATED', now, title='Market fire')
+    gaza = _event(ft, 'DEVELOPING', now, city='Gaza City')
+    assert _ids(client.get('/api/events?status=disputed')) == [pinned.id]
+    assert _ids(client.get('/api/events?q=BRIDGE')) == [pinned.id]
+    assert _ids(client.get('/api/events?q=gaza')) == [gaza.id]
+
+
+def test_text_filter_matches_wildcards_literally(client, ft):
+    now = datetime.utcnow()
+    pct = _event(ft, 'DEVELOPING', now, title='Prices up 50% overnight')
+    _event(ft, 'DEVELOPING', now, title='Prices up 50 cents')
+    under = _event(ft, 'DEVELOPING', now, title='Camp_7 shelter')
+    _event(ft, 'DEVELOPING', now, title='Camp 7 shelter')
+    assert _ids(client.get('/api/events?q=50%25')) == [pct.id]
+    assert _ids(client.get('/api/events?q=camp_7')) == [under.id]
+
+
+def test_feed_page_query_count_is_fixed(client, ft):
+    """One query for the page, however many Events match: visibility and
+    member counts are stored on the Event."""
+    now = datetime.utcnow()
+    for i in range(12):
+        _event(ft, 'DEVELOPING', now - timedelta(minutes=i))
+    db.session.expunge_all()
+    seen = []
+
+    def _before(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    sa_event.listen(db.engine, 'before_cursor_execute', _before)
+    try:
+        resp = client.get('/api/events?limit=10')
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', _before)
+    assert len(_ids(resp)) == 10
+    assert all(e['member_count'] == 1 for e in resp.get_json()['events'])
+    assert len(seen) == 1, seen
+
+
+def test_feed_page_is_an_index_scan_in_feed_order(client, ft):
+    """ix_events_feed_rank is on the very expression the page query orders
+    by, so SQLite walks the index instead of sorting."""
+    _event(ft, 'DEVELOPING', datetime.utcnow())
+    db.session.expunge_all()
+    plans = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM events' in statement:
+            plans.append(cursor.connection.execute('EXPLAIN QUERY PLAN ' + statement,
+                                                   parameters).fetchall())
+
+    sa_event.listen(db.engine, 'before_cursor_execute', _before)
+    try:
+        assert _ids(client.get('/api/events?limit=10'))
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', _before)
+    details = [row[-1] for row in plans[0]]
+    assert any('ix_events_feed_rank' in d for d in details), details
+    assert not any('TEMP B-TREE' in d for d in details), details
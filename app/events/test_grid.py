@@ -0,0 +1,152 @@
+"""
+Open-event grid tests.
+
+The grid is only allowed to be a faster route to the SAME clustering decision:
+these replay randomized ingests (with centroid moves and closures) and check
+every decision against the bounding-box SQL path, then check that a second
+process's grid picks up committed changes through the shared version counter.
+
+In-memory SQLite with a minimal Flask app, matching test_corroboration.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+import config
+from app.models import db, User, FileUpload, FileType, Event, IndexVersion
+from app.events import grid
+from app.events.grid import OpenEventGrid, open_event_grid
+from app.events.service import _find_candidate_event, _naive_utc, assign_event, recompute_event
+
+
+@pytest.fixture
+def ctx(monkeypatch):
+    monkeypatch.setattr(config, 'EVENT_GRID_INDEX', True, raising=False)
+    open_event_grid.reset()
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        grid.ensure_version_row()           # create_app does this at startup
+        db.session.commit()
+        yield ft
+        db.session.remove()
+    open_event_grid.reset()
+
+
+def _upload(ft, lat, lon, when, user=None):
+    up = FileUpload(
+        filename='x', file_path='x', file_type_id=ft.filetypeid,
+        user_id=(user.userid if user else None), lat=lat, lon=lon,
+        upload_date=when, verification_status='VERIFIED',
+    )
+    db.session.add(up)
+    db.session.flush()
+    return up
+
+
+def _both_paths(monkeypatch, up):
+    radius = config.EVENT_CLUSTER_RADIUS_KM
+    window = config.EVENT_CLUSTER_WINDOW_HOURS
+    when = _naive_utc(up.upload_date)
+    via_grid = _find_candidate_event(up, when, radius, window)
+    monkeypatch.setattr(config, 'EVENT_GRID_INDEX', False)
+    via_sql = _find_candidate_event(up, when, radius, window)
+    monkeypatch.setattr(config, 'EVENT_GRID_INDEX', True)
+    return via_grid, via_sql
+
+
+def test_grid_matches_sql_path_over_random_ingests(ctx, monkeypatch):
+    rnd = random.Random(7)
+    start = datetime.utcnow()
+    reporters = [User(display_handle=f'g{i}', identity_type='pseudonymous', trust_rung=2)
+                 for i in range(5)]
+    db.session.add_all(reporters)
+    db.session.flush()
+    decisions = 0
+    for i in range(250):
+        when = start + timedelta(hours=rnd.uniform(0, 72))
+        # A ~6 km square: dense enough that clustering and near-misses both
+        # happen, including across grid-cell edges.
+        up = _upload(ctx, 31.5 + rnd.uniform(0, 0.05), 34.45 + rnd.uniform(0, 0.06),
+                     when, user=rnd.choice(reporters))
+        via_grid, via_sql = _both_paths(monkeypatch, up)
+        assert via_grid is via_sql, f'ingest {i}: grid {via_grid} != sql {via_sql}'
+        decisions += via_sql is not None
+        assign_event(up)
+        if rnd.random() < 0.05:
+            ev = db.session.get(Event, up.event_id)
+            ev.closed_at = datetime.utcnow()
+            recompute_event(ev)
+            assert ev.status == 'CLOSED'
+        if rnd.random() < 0.3:
+            db.session.commit()
+    assert decisions > 50        # the replay actually exercised clustering
+
+
+def test_other_worker_sees_committed_changes(ctx):
+    now = datetime.utcnow()
+    window = timedelta(hours=24)
+    other = OpenEventGrid()                     # a second worker's grid
+    assert other.candidate_ids(31.5, 34.46, now, 2.0, window) == set()
+
+    ev = assign_event(_upload(ctx, 31.5, 34.46, now))
+    db.session.commit()
+    assert other.candidate_ids(31.5, 34.46, now, 2.0, window) == {ev.id}
+
+    # Closing it is a grid-relevant change too.
+    ev.closed_at = datetime.utcnow()
+    recompute_event(ev)
+    db.session.commit()
+    assert other.candidate_ids(31.5, 34.46, now, 2.0, window) == set()
+
+
+def test_rolled_back_move_does_not_lose_the_committed_cell(ctx):
+    now = datetime.utcnow()
+    window = timedelta(hours=24)
+    ev = assign_event(_upload(ctx, 31.5, 34.46, now))
+    db.session.commit()
+    ev.lat, ev.lon = 31.9, 34.9                 # moved in this process...
+    grid.mark_changed(ev)
+    db.session.rollback()                       # ...then abandoned
+    assert ev.id in open_event_grid.candidate_ids(31.5, 34.46, now, 2.0, window)
+
+
+def _version():
+    return db.session.get(IndexVersion, grid.VERSION_NAME).version
+
+
+def test_only_a_cell_change_bumps_the_shared_version(ctx):
+    now = datetime.utcnow()
+    ev = assign_event(_upload(ctx, 31.5, 34.46, now))
+    db.session.commit()
+    created = _version()
+    assert ev.grid_version == created
+
+    # A second report a few metres away drifts the centroid inside its cell:
+    # nothing another worker's grid files changes, so the hot row is untouched.
+    assert assign_event(_upload(ctx, 31.5001, 34.4601, now)) is ev
+    db.session.commit()
+    assert (ev.lat, ev.lon) != (31.5, 34.46)
+    assert _version() == created
+
+    # Closing it does change what is filed.
+    ev.closed_at = datetime.utcnow()
+    recompute_event(ev)
+    db.session.commit()
+    assert _version() == created + 1 == ev.grid_version
+
+
+def test_bump_recreates_a_missing_row(ctx):
+    db.session.delete(db.session.get(IndexVersion, grid.VERSION_NAME))
+    db.session.commit()
+    ev = assign_event(_upload(ctx, 31.5, 34.46, datetime.utcnow()))
+    db.session.commit()
+    assert ev.grid_version == _version() == 1
@@ -0,0 +1,213 @@
+"""
+Incremental recompute property test.
+
+add_member / member_verified fold one report into an Event's persisted state
+instead of re-reading every member. The property: after ANY sequence of joins
+and first approvals, the incrementally-maintained Event equals what a full
+recompute_event produces from the same members. Each randomized sequence is
+replayed into two mirror Events -- one maintained incrementally, one by full
+recompute after every step -- and every derived field is compared each step.
+
+Sequences draw reporters of mixed rungs, anonymous members, a small pool of
+media fingerprints (so reshares merge origins), missing pins/scores/severities,
+and late approvals of earlier PENDING members.
+
+In-memory SQLite with a minimal Flask app, matching test_corroboration.
+"""
+
+import random
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+from app.models import db, User, FileUpload, FileType, Event
+from app.events.service import add_member, member_verified, recompute_event
+
+_FIELDS = (
+    'status', 'corroboration_count', 'independent_source_count',
+    'verified_member_count', 'supporting_count', 'has_public_member',
+    'severity', 'title', 'city',
+)
+
+
+@pytest.fixture
+def ctx():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.flush()
+        yield ft
+        db.session.remove()
+
+
+def _snapshot(ev):
+    out = {f: getattr(ev, f) for f in _FIELDS}
+    out['lat'], out['lon'], out['confidence'] = ev.lat, ev.lon, ev.confidence_score
+    return out
+
+
+def _assert_same(inc, full, step):
+    a, b = _snapshot(inc), _snapshot(full)
+    for key in ('lat', 'lon', 'confidence'):
+        assert a.pop(key) == pytest.approx(b.pop(key)), (step, key)
+    assert a == b, step
+
+
+def _new_event():
+    from app.events.service import _new_state, _save_state
+    ev = Event(status='DEVELOPING')
+    _save_state(ev, _new_state())
+    db.session.add(ev)
+    db.session.flush()
+    return ev
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_incremental_matches_full_recompute(ctx, seed):
+    rnd = random.Random(seed)
+    users = [User(display_handle=f's{seed}u{i}', identity_type='pseudonymous',
+                  trust_rung=rnd.choice((1, 1, 2))) for i in range(6)]
+    db.session.add_all(users)
+    db.session.flush()
+    fingerprints = [f'{i:064x}' for i in range(4)]
+
+    inc, full = _new_event(), _new_event()
+    pending = []      # (incremental copy, full copy) awaiting approval
+    for step in range(40):
+        if pending and rnd.random() < 0.3:
+            a, b = pending.pop(rnd.randrange(len(pending)))
+            a.verification_status = b.verification_status = 'VERIFIED'
+            db.session.flush()
+            member_verified(inc, a)
+        else:
+            user = rnd.choice(users + [None])
+            fields = dict(
+                filename='x', file_path='x', file_type_id=ctx.filetypeid,
+                user_id=user.userid if user else None,
+                lat=rnd.choice((None, 31.5 + rnd.random() / 100)),
+                lon=rnd.choice((None, 34.4 + rnd.random() / 100)),
+                severity=rnd.choice((None, 'LOW', 'MEDIUM', 'HIGH')),
+                confidence_score=rnd.choice((None, rnd.random())),
+                title=rnd.choice((None, f'title {step}')),
+                city=rnd.choice((None, 'Gaza', 'Rafah')),
+                media_sha256=rnd.choice(fingerprints + [None]),
+                verification_status=rnd.choice(('PENDING', 'VERIFIED')),
+                upload_date=datetime.utcnow(),
+            )
+            a = FileUpload(event_id=inc.id, **fields)
+            b = FileUpload(event_id=full.id, **fields)
+            db.session.add_all([a, b])
+            db.session.flush()
+            add_member(inc, a)
+            if a.verification_status == 'PENDING':
+                pending.append((a, b))
+        recompute_event(full)
+        _assert_same(inc, full, step)
+
+    # The persisted state survives a round-trip through the database.
+    db.session.commit()
+    db.session.expire_all()
+    fields = dict(filename='x', file_path='x', file_type_id=ctx.filetypeid,
+                  user_id=users[0].userid, media_sha256=fingerprints[0],
+                  lat=31.5, lon=34.4, verification_status='VERIFIED')
+    a = FileUpload(event_id=inc.id, **fields)
+    db.session.add_all([a, FileUpload(event_id=full.id, **fields)])
+    db.session.flush()
+    add_member(inc, a)
+    recompute_event(full)
+    _assert_same(inc, full, 'after reload')
+
+
+def test_legacy_event_without_state_falls_back_to_full(ctx):
+    ev = Event(status='DEVELOPING')
+    db.session.add(ev)
+    db.session.flush()
+    up = FileUpload(filename='x', file_path='x', file_type_id=ctx.filetypeid,
+                    event_id=ev.id, verification_status='VERIFIED', lat=31.5, lon=34.4)
+    db.session.add(up)
+    db.session.flush()
+    assert ev.recompute_state is None
+    add_member(ev, up)
+    assert ev.recompute_state is not None
+    assert (ev.verified_member_count, ev.lat) == (1, 31.5)
+
+
+def test_analysis_refolds_a_member_that_already_joined(ctx, monkeypatch):
+    """Reports join their Event before analysis runs; when analysis then sets
+    the pin from EXIF and scores the report, the Event must end up as a full
+    recompute would have it, not with what was folded at join time."""
+    from app.file_upload import analysis_service
+
+    monkeypatch.setattr(analysis_service.media_pool, 'run', lambda stage, fn, *a: fn(*a))
+    monkeypatch.setattr(analysis_service, 'extract_exif',
+                        lambda path: {'lat': 31.52, 'lon': 34.45, 'has_gps': True})
+    monkeypatch.setattr(analysis_service, 'score_and_classify',
+                        lambda data: {'confidence_score': 0.9, 'severity': 'HIGH'})
+    inc, full = _new_event(), _new_event()
+    fields = dict(filename='x.jpg', file_path='x', file_type_id=ctx.filetypeid,
+                  verification_status='VERIFIED', upload_date=datetime.utcnow())
+    for ev in (inc, full):
+        db.session.add(FileUpload(event_id=ev.id, lat=31.5, lon=34.4, confidence_score=0.2,
+                                  severity='LOW', **fields))
+    late = FileUpload(event_id=inc.id, **fields)       # no pin, score or severity yet
+    db.session.add_all([late, FileUpload(event_id=full.id, lat=31.52, lon=34.45,
+                                         confidence_score=0.9, severity='HIGH', **fields)])
+    db.session.flush()
+    for m in FileUpload.query.filter_by(event_id=inc.id).order_by(FileUpload.id):
+        add_member(inc, m)
+    db.session.commit()
+
+    analysis_service.analyze_upload(late.id, '/tmp/x.jpg')
+    db.session.commit()
+    recompute_event(full)
+    _assert_same(inc, full, 'after analysis')
+    assert inc.severity == 'HIGH'
+
+
+def test_owner_edit_refolds_before_the_next_join(ctx):
+    """A member moved through PUT /api/file_upload/<id> must not leave its old
+    pin in the Event's running sums for the next add_member to build on."""
+    from flask import current_app
+    from flask_jwt_extended import JWTManager, create_access_token
+    from app.file_upload.routes import file_upload_bp
+
+    app = current_app._get_current_object()
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-at-least-32-bytes'
+    JWTManager(app)
+    app.register_blueprint(file_upload_bp)
+    owner = User(display_handle='editor', identity_type='pseudonymous', trust_rung=1)
+    db.session.add(owner)
+    db.session.flush()
+    inc, full = _new_event(), _new_event()
+    fields = dict(filename='x', file_path='x', file_type_id=ctx.filetypeid, user_id=owner.userid,
+                  verification_status='VERIFIED', upload_date=datetime.utcnow())
+    edited = FileUpload(event_id=inc.id, lat=31.5, lon=34.4, **fields)
+    mirror = FileUpload(event_id=full.id, lat=31.5, lon=34.4, **fields)
+    db.session.add_all([edited, mirror])
+    db.session.flush()
+    add_member(inc, edited)
+    recompute_event(full)
+    db.session.commit()
+
+    token = create_access_token(identity=str(owner.userid))
+    resp = app.test_client().put(f'/api/file_upload/{edited.id}',
+                                 json={'lat': 31.6, 'lon': 34.5, 'title': 'moved', 'city': 'Rafah'},
+                                 headers={'Authorization': f'Bearer {token}'})
+    assert resp.status_code == 200, resp.data
+    mirror.lat, mirror.lon, mirror.title, mirror.city = 31.6, 34.5, 'moved', 'Rafah'
+    db.session.flush()
+    db.session.expire_all()                 # the edit committed in the request's session
+    late = dict(fields, lat=31.7, lon=34.6)
+    a = FileUpload(event_id=inc.id, **late)
+    db.session.add_all([a, FileUpload(event_id=full.id, **late)])
+    db.session.flush()
+    add_member(inc, a)
+    recompute_event(full)
+    _assert_same(inc, full, 'edit then join')
+    assert (inc.title, inc.city) == ('moved', 'Rafah')
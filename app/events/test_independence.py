@@ -9,14 +9,17 @@ Two layers:
     (the count is untouched) while the coordination flag is surfaced.
 """
 
+import random
 from datetime import datetime, timedelta
+from itertools import combinations
 from types import SimpleNamespace
 
 import pytest
 from flask import Flask
 
 from app.models import db, User, FileUpload, FileType, Event
-from app.events.service import assign_event, recompute_event
+from app.events.service import assign_event, backfill_text_signatures, recompute_event
+from app.events import independence
 from app.events.independence import analyze_independence
 from app.events.archive import build_event_graph
 
@@ -55,6 +58,65 @@ def test_same_identity_pair_not_flagged():
     assert 'duplicate_text' not in _types(flags)
 
 
+def _brute_force_text_flags(members, threshold):
+    """The original all-pairs scan, frozen: the LSH path must match it."""
+    shingled = [(m, independence._shingles(independence._member_text(m)))
+                for m in members if m.user_id is not None]
+    flags = []
+    for (m1, s1), (m2, s2) in combinations(shingled, 2):
+        if m1.user_id == m2.user_id or not s1 or not s2:
+            continue
+        sim = independence._jaccard(s1, s2)
+        if sim >= threshold:
+            flags.append({'type': 'duplicate_text', 'source_ids': sorted([m1.id, m2.id]),
+                          'detail': f'reports share {round(sim * 100)}% of their wording'})
+    return sorted(flags, key=lambda f: f['source_ids'])
+
+
+_WORDS = ('smoke fire market hospital road strike north south near the of a school '
+          'bridge heavy light crowd night morning sirens building collapsed').split()
+
+
+def _campaign(rnd, n):
+    """Organic reports plus a few templates copied with small edits."""
+    templates = [[rnd.choice(_WORDS) for _ in range(rnd.randrange(6, 16))] for _ in range(5)]
+    members = []
+    for i in range(n):
+        if rnd.random() < 0.5:
+            words = list(rnd.choice(templates))
+            for _ in range(rnd.randrange(3)):
+                words[rnd.randrange(len(words))] = rnd.choice(_WORDS)
+        else:
+            words = [rnd.choice(_WORDS) for _ in range(rnd.randrange(1, 14))]
+        members.append(_m(i + 1, rnd.choice((None, *range(n // 2))), ' '.join(words)))
+    return members
+
+
+@pytest.mark.parametrize('threshold', [0.0, 0.5, 0.7, 0.85, 1.0])
+@pytest.mark.parametrize('seed', range(4))
+def test_lsh_matches_brute_force(monkeypatch, threshold, seed):
+    monkeypatch.setattr(independence, '_LSH_MIN_SETS', 2)    # take the LSH path
+    monkeypatch.setattr('config.TEXT_DUP_JACCARD', threshold, raising=False)
+    members = _campaign(random.Random(seed), 300)
+    flags = [f for f in analyze_independence(members) if f['type'] == 'duplicate_text']
+    assert flags == _brute_force_text_flags(members, threshold)
+    random.Random(seed).shuffle(members)
+    assert [f for f in analyze_independence(members) if f['type'] == 'duplicate_text'] == flags
+
+
+def test_stored_signatures_stand_in_for_hashing(monkeypatch):
+    monkeypatch.setattr(independence, '_LSH_MIN_SETS', 2)
+    members = _campaign(random.Random(7), 300)
+    expected = analyze_independence(members)
+    for m in members:
+        m.text_minhash = independence.member_signature(m)
+
+    def no_hashing(*a, **k):
+        raise AssertionError('signature should have come from text_minhash')
+    monkeypatch.setattr(independence, 'minhash_signature', no_hashing)
+    assert analyze_independence(members) == expected
+
+
 # --- pure-function: synchronized submission ---
 
 def test_synchronized_submission_flagged():
@@ -129,3 +191,38 @@ def test_similar_text_still_corroborates(ctx):
     g = build_event_graph(ev)
     assert 'duplicate_text' in _types(g['coordination_flags'])
     assert g['corroboration']['independent'] == 2
+
+
+def test_text_signature_stamped_at_ingest_and_on_edit(ctx):
+    ft = FileType(type_name='Other', allowed_extensions='*')
+    db.session.add(ft)
+    db.session.flush()
+    up = FileUpload(filename='x', file_path='x', file_type_id=ft.filetypeid,
+                    witness_statement='Smoke over the market this morning')
+    db.session.add(up)
+    db.session.flush()
+    assert up.text_minhash == independence.member_signature(up)
+
+    before = up.text_minhash
+    up.witness_statement = 'Sirens near the coastal road at night'
+    db.session.flush()
+    assert up.text_minhash != before
+    assert up.text_minhash == independence.member_signature(up)
+
+
+def test_backfill_signs_legacy_rows(ctx):
+    ft = FileType(type_name='Other', allowed_extensions='*')
+    db.session.add(ft)
+    db.session.flush()
+    texts = ['Smoke over the market', None, 'Crowd at the bakery queue', '...']
+    for t in texts:
+        db.session.add(FileUpload(filename='x', file_path='x', file_type_id=ft.filetypeid,
+                                  witness_statement=t))
+    db.session.commit()
+    FileUpload.query.update({FileUpload.text_minhash: None})    # as before the column
+    db.session.commit()
+
+    assert backfill_text_signatures(batch=1) == 2
+    assert backfill_text_signatures() == 0
+    for up in FileUpload.query.all():
+        assert up.text_minhash == independence.member_signature(up)
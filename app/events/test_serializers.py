@@ -8,13 +8,22 @@ identities) vs supporting (anonymous) SEPARATELY, verified-only, with sticky
 status override.
 """
 
+from contextlib import contextmanager
+
 import pytest
 from flask import Flask
+from sqlalchemy import event as sa_event
 
 from app.models import db, User, FileUpload, FileType, Event
 from app.story.serializers import (
-    confidence_band, serialize_reporter, serialize_upload, serialize_event,
+    confidence_band, serialize_reporter, serialize_upload, serialize_uploads,
+    serialize_event,
+)
+from app.story.track_record import (
+    compute_track_records, refresh_track_records, rebuild_track_records,
 )
+from app.events.archive import build_event_graph
+from app.events.service import recompute_event
 
 
 @pytest.fixture
@@ -82,10 +91,10 @@ def test_reporter_pseudonymous_signed(ctx):
     assert r['is_signed'] is True
 
 
-def test_reporter_track_record_computed_on_read(ctx):
-    """Track record is derived from current rows (ADR-0012), not stored counters:
-    only VERIFIED reports count, and corroborated_count counts the reporter's
-    VERIFIED reports whose event's live status is CORROBORATED (report-vs-report)."""
+def test_reporter_track_record_definitions(ctx):
+    """The stored track record follows the ADR-0012 definitions: only VERIFIED
+    reports count, and corroborated_count counts the reporter's VERIFIED reports
+    whose event's live status is CORROBORATED (report-vs-report)."""
     ft = _ft()
     u = _user(rung=2, handle='abu-karim')
 
@@ -101,28 +110,45 @@ def test_reporter_track_record_computed_on_read(ctx):
     _mk(ft, user=u, event=developing, status='VERIFIED')
     # PENDING report: not published, must not count toward reports_count.
     _mk(ft, user=u, event=corro, status='PENDING')
-    db.session.flush()
+    refresh_track_records({u.userid})
 
     r = serialize_reporter(_mk(ft, user=u, signed=True))  # chip's own report is PENDING
     assert r['reports_count'] == 3          # only the 3 VERIFIED reports; PENDING excluded
     assert r['corroborated_count'] == 2     # 2 VERIFIED reports sit in a CORROBORATED event
 
 
-def test_reporter_corroborated_count_reflects_status_override(ctx):
-    """A sticky override that pulls an event OUT of CORROBORATED immediately drops
-    the count — the drift a stored counter would have to chase (ADR-0012)."""
+def test_reporter_corroborated_count_follows_status_override(ctx):
+    """A sticky override that pulls an event OUT of CORROBORATED drops the count
+    as soon as the event is recomputed -- the reversal path a delta counter
+    would have to get right (ADR-0012), handled by re-deriving the members."""
     ft = _ft()
     u = _user(rung=2)
-    ev = Event(status='CORROBORATED')
+    other = _user(rung=2, handle='r2')
+    ev = Event(status='DEVELOPING')
     db.session.add(ev)
     db.session.flush()
     _mk(ft, user=u, event=ev, status='VERIFIED')
-    db.session.flush()
-
+    _mk(ft, user=other, event=ev, status='VERIFIED')
+    recompute_event(ev)
+    assert ev.status == 'CORROBORATED'
     assert serialize_reporter(_mk(ft, user=u))['corroborated_count'] == 1
+
     ev.status_override = 'DISPUTED'         # moderator pins it out of CORROBORATED
-    db.session.flush()
+    recompute_event(ev)
     assert serialize_reporter(_mk(ft, user=u))['corroborated_count'] == 0
+    assert compute_track_records({u.userid, other.userid}) == {
+        u.userid: (1, 0), other.userid: (1, 0)}
+
+
+def test_rebuild_reports_and_fixes_drift(ctx):
+    ft = _ft()
+    u = _user(rung=2, reports=7, corr=7)    # stale cache
+    clean = _user(handle='clean')
+    _mk(ft, user=u, status='VERIFIED')
+    assert rebuild_track_records() == [(u.userid, (7, 7), (1, 0))]
+    assert (u.reports_count, u.corroborated_count) == (1, 0)
+    assert (clean.reports_count, clean.corroborated_count) == (0, 0)
+    assert rebuild_track_records() == []
 
 
 def test_serialize_upload_uses_band_and_reporter(ctx):
@@ -152,6 +178,8 @@ def test_serialize_event_counted_vs_supporting(ctx):
     _mk(ft, user=_user(rung=2), event=ev, status='PENDING')    # not public
     ev.corroboration_count = 1        # set by recompute in real flow
     ev.independent_source_count = 1    # one real source = one independent origin
+    ev.verified_member_count = 2
+    ev.supporting_count = 1
     db.session.flush()
 
     d = serialize_event(ev, include_members=True)
@@ -168,3 +196,98 @@ def test_serialize_event_status_override_is_sticky(ctx):
     db.session.flush()
     d = serialize_event(ev)
     assert d['status'] == 'DISPUTED' and d['is_overridden'] is True
+
+
+@contextmanager
+def _count_queries():
+    seen = []
+
+    def _before(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    sa_event.listen(db.engine, 'before_cursor_execute', _before)
+    try:
+        yield seen
+    finally:
+        sa_event.remove(db.engine, 'before_cursor_execute', _before)
+
+
+def _feed(n):
+    """n VERIFIED reports, each by a distinct reporter in its own CORROBORATED
+    event, plus one anonymous report. Returns the ids, with the session cleared
+    so nothing is pre-loaded."""
+    ft = _ft()
+    ids = []
+    for i in range(n):
+        ev = Event(status='CORROBORATED')
+        db.session.add(ev)
+        db.session.flush()
+        ids.append(_mk(ft, user=_user(rung=2, handle=f'h{i}'), event=ev, status='VERIFIED').id)
+    ids.append(_mk(ft, status='VERIFIED').id)
+    rebuild_track_records()
+    db.session.commit()
+    db.session.expunge_all()
+    return ids
+
+
+def test_stored_track_records_match_computed_on_read(ctx):
+    ids = _feed(4)
+    uploads = FileUpload.query.filter(FileUpload.id.in_(ids)).all()
+    computed = compute_track_records({u.user_id for u in uploads})
+    for u in uploads:
+        if u.user_id is not None:
+            assert computed[u.user_id] == (1, 1)
+            chip = serialize_reporter(u)
+            assert (chip['reports_count'], chip['corroborated_count']) == (1, 1)
+
+
+@pytest.mark.parametrize('n', [3, 12])
+def test_serialize_uploads_query_count_is_fixed(ctx, n):
+    """Regression guard for the per-chip N+1: a page costs one User load (which
+    carries the track record) + one Event load, whatever its size."""
+    ids = _feed(n)
+    uploads = FileUpload.query.filter(FileUpload.id.in_(ids)).all()
+    with _count_queries() as seen:
+        stories = serialize_uploads(uploads)
+    assert len(stories) == n + 1
+    assert len(seen) == 2, seen
+    assert stories[0]['provenance']['reporter']['corroborated_count'] == 1
+
+
+@pytest.mark.parametrize('n', [3, 12])
+def test_event_members_and_graph_query_count_is_fixed(ctx, n):
+    ft = _ft()
+    ev = Event(status='CORROBORATED')
+    db.session.add(ev)
+    db.session.flush()
+    for i in range(n):
+        _mk(ft, user=_user(rung=2, handle=f'm{i}'), event=ev, status='VERIFIED')
+    db.session.commit()
+    event_id = ev.id
+
+    db.session.expunge_all()
+    ev = db.session.get(Event, event_id)
+    with _count_queries() as seen:
+        d = serialize_event(ev, include_members=True)
+    assert len(d['members']) == n
+    assert len(seen) == 2, seen      # members + users
+
+    db.session.expunge_all()
+    ev = db.session.get(Event, event_id)
+    with _count_queries() as seen:
+        g = build_event_graph(ev)
+    assert len(g['nodes']) == n
+    assert len(seen) == 2, seen      # members + users
+
+
+def test_unclustered_verification_refreshes_reporter(ctx):
+    """A moderator decision on a report with no Event still moves the stored
+    record, via the reporter refresh instead of recompute_event."""
+    from app.moderation.routes import _recompute_owning_event
+    u = _user(rung=2)
+    up = _mk(_ft(), user=u, status='VERIFIED')
+    _recompute_owning_event(up)
+    assert (u.reports_count, u.corroborated_count) == (1, 0)
+    up.verification_status = 'REJECTED'
+    _recompute_owning_event(up)
+    assert (u.reports_count, u.corroborated_count) == (0, 0)
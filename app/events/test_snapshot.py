@@ -18,6 +18,8 @@ from flask import Flask
 from app.models import db, User, FileUpload, FileType, Event, EventGraphSnapshot
 from app.events.service import assign_event, recompute_event
 from app.events.archive import snapshot_event, graph_content_hash
+from app.events.snapshot_store import load_graph_json
+from app.events.snapshot_writer import write_pending_snapshots
 
 
 @pytest.fixture
@@ -64,6 +66,7 @@ def _report(ft, user, lat, lon, when, media_sha256=None):
 
 
 def _snaps(event_id):
+    write_pending_snapshots()       # what the background writer does after commit
     return EventGraphSnapshot.query.filter_by(event_id=event_id).all()
 
 
@@ -80,7 +83,7 @@ def test_snapshot_captured_on_corroboration(ctx):
     s = snaps[0]
     assert s.reason == 'corroborated' and s.status == 'CORROBORATED'
     # Stored graph is verbatim + integrity-consistent.
-    stored = json.loads(s.graph_json)
+    stored = json.loads(load_graph_json(s))
     assert stored['integrity']['graph_sha256'] == s.graph_sha256
     assert graph_content_hash(stored) == s.graph_sha256
 
@@ -0,0 +1,165 @@
+"""
+Chunked snapshot store tests (ADR-0026).
+
+Snapshots are stored as a manifest over content-addressed, compressed chunks
+(one header, one per node). These check byte-identical reassembly -- through
+the detail endpoint too, so graph_sha256 verifies against the served bytes --
+that an oscillating Event re-stores only what changed, that legacy verbatim
+rows convert losslessly, and that non-canonical legacy text survives as a lone
+header.
+
+Minimal Flask app with only the events blueprint on in-memory SQLite.
+"""
+
+import hashlib
+import json
+import zlib
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+import config
+from app.models import db, User, FileUpload, FileType, Event, EventGraphSnapshot, SnapshotChunk
+from app.events.archive import canonical_graph_bytes, snapshot_event
+from app.events.routes import events_bp
+from app.events.service import assign_event, recompute_event
+from app.events.snapshot_store import (
+    convert_legacy_snapshots, load_graph_json, split_graph_json, store_graph_json,
+)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(config, 'SNAPSHOT_WRITER_ASYNC', False)   # store inline
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    app.register_blueprint(events_bp)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.commit()
+        yield app.test_client(), ft
+        db.session.remove()
+
+
+def _corroborated(ft, n=4):
+    ups = []
+    for i in range(n):
+        u = User(display_handle=f'k-{i}', identity_type='pseudonymous', trust_rung=2)
+        db.session.add(u)
+        db.session.flush()
+        up = FileUpload(
+            filename='x', file_path='x', file_type_id=ft.filetypeid, user_id=u.userid,
+            lat=31.5 + i / 10000, lon=34.46, upload_date=datetime.utcnow(),
+            media_sha256=f'{i:064x}', city='رفح', verification_status='VERIFIED',
+            witness_statement=f'report {i}',
+        )
+        db.session.add(up)
+        db.session.flush()
+        assign_event(up)
+        ups.append(up)
+    db.session.expire_all()
+    ev = db.session.get(Event, ups[0].event_id)
+    assert ev.status == 'CORROBORATED'
+    return ev
+
+
+def test_detail_endpoint_serves_the_hashed_bytes(client):
+    http, ft = client
+    ev = _corroborated(ft)
+    (snap,) = EventGraphSnapshot.query.filter_by(event_id=ev.id).all()
+    assert snap.graph_json is None and snap.manifest_json
+
+    resp = http.get(f'/api/events/{ev.id}/snapshots/{snap.id}')
+    assert resp.status_code == 200
+    assert resp.get_data(as_text=True) == load_graph_json(snap)
+    graph = json.loads(resp.data)
+    assert hashlib.sha256(canonical_graph_bytes(graph)).hexdigest() == snap.graph_sha256
+    assert graph['integrity']['graph_sha256'] == snap.graph_sha256
+
+
+def test_oscillating_event_shares_node_chunks(client):
+    _, ft = client
+    ev = _corroborated(ft, n=6)
+    snapshot_event(ev, reason='manual')             # all six members
+    chunks_before = SnapshotChunk.query.count()
+
+    for override in ('DISPUTED', None, 'DISPUTED'):
+        ev.status_override = override
+        snapshot_event(ev, reason='manual')
+    snaps = EventGraphSnapshot.query.filter_by(event_id=ev.id).all()
+    assert len(snaps) == 5
+    # Only the DISPUTED header was new; every node chunk is shared.
+    assert SnapshotChunk.query.count() == chunks_before + 1
+    for s in snaps:
+        assert json.loads(load_graph_json(s))['integrity']['graph_sha256'] == s.graph_sha256
+
+
+def test_snapshot_chunks_nodes_without_reparsing(client, monkeypatch):
+    from app.events import snapshot_store
+
+    def reparse(text):
+        raise AssertionError('graph text parsed again')
+    monkeypatch.setattr(snapshot_store, 'split_graph_json', reparse)
+    _, ft = client
+    ev = _corroborated(ft, n=3)
+    snap = snapshot_event(ev, reason='manual')
+    stored = json.loads(load_graph_json(snap))
+    assert stored['integrity']['graph_sha256'] == snap.graph_sha256
+    assert len(json.loads(snap.manifest_json)['nodes']) == len(stored['nodes']) > 0
+
+
+def test_chunks_are_compressed_and_addressed_by_raw_bytes(client):
+    _, ft = client
+    _corroborated(ft)
+    for c in SnapshotChunk.query.all():
+        assert c.codec == 'zlib'
+        raw = zlib.decompress(c.data)
+        assert hashlib.sha256(raw).hexdigest() == c.sha256 and len(raw) == c.size
+
+
+def test_legacy_rows_convert_losslessly(client):
+    _, ft = client
+    ev = _corroborated(ft)
+    (snap,) = EventGraphSnapshot.query.filter_by(event_id=ev.id).all()
+    text = load_graph_json(snap)
+    SnapshotChunk.query.delete()
+    snap.manifest_json, snap.graph_json = None, text     # as stored before the chunk store
+    odd = EventGraphSnapshot(event_id=ev.id, schema_version=1, graph_sha256='0' * 64,
+                             graph_json='{"nodes": [ {"a": 1} ], "x": "hand edited"}')
+    db.session.add(odd)
+    db.session.commit()
+
+    assert convert_legacy_snapshots(batch=1) == 2
+    assert convert_legacy_snapshots() == 0
+    assert snap.graph_json is None and load_graph_json(snap) == text
+    assert load_graph_json(odd) == '{"nodes": [ {"a": 1} ], "x": "hand edited"}'
+
+
+def test_split_puts_nodes_back_in_place():
+    text = '{"a":[],"nodes":[{"id":1},{"id":2,"s":"\\"nodes\\":["}],"z":{"nodes":[]}}'
+    header, at, nodes = split_graph_json(text)
+    assert nodes == [b'{"id":1}', b'{"id":2,"s":"\\"nodes\\":["}']
+    assert (header[:at] + b','.join(nodes) + header[at:]).decode() == text
+
+
+def test_store_is_idempotent(client):
+    text = '{"event":{"id":1},"nodes":[{"id":1},{"id":1}]}'
+    first = store_graph_json(text)
+    assert store_graph_json(text) == first
+    assert SnapshotChunk.query.count() == 2           # header + one shared node
+    snap = EventGraphSnapshot(event_id=1, schema_version=1, graph_sha256='x', manifest_json=first)
+    assert load_graph_json(snap) == text
+
+
+def test_recompute_transition_stores_chunks(client):
+    _, ft = client
+    ev = _corroborated(ft)
+    ev.closed_at = datetime.utcnow()
+    recompute_event(ev)
+    reasons = [s.reason for s in EventGraphSnapshot.query.filter_by(event_id=ev.id)]
+    assert reasons == ['corroborated', 'closed']
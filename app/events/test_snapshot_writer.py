@@ -0,0 +1,142 @@
+"""
+Background snapshot writer tests (ADR-0025).
+
+A transition captures the graph's inputs in its own transaction; the writer
+stores the snapshot later. These check that what is archived is the state AT
+the transition even if members are rejected or deleted before the writer runs,
+that a capture round-trips to the same graph and hash as a direct build, that
+identical captures coalesce, that a rolled-back transition leaves nothing, and
+that the startup sweep recovers transitions with no snapshot or capture.
+
+In-memory SQLite with a minimal Flask app, matching test_corroboration.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+import config
+from app.models import db, User, FileUpload, FileType, Event, EventGraphSnapshot, PendingSnapshot
+from app.events.archive import build_event_graph, capture_graph_inputs, graph_from_capture
+from app.events.service import assign_event, recompute_event
+from app.events.snapshot_store import load_graph_json
+from app.events.snapshot_writer import (
+    capture_snapshot, sweep_missed_snapshots, write_pending_snapshots,
+)
+
+
+@pytest.fixture
+def ctx():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.commit()
+        yield ft
+        db.session.remove()
+
+
+def _report(ft, handle, lat, lon, sha):
+    u = User(display_handle=handle, identity_type='pseudonymous', trust_rung=2)
+    db.session.add(u)
+    db.session.flush()
+    up = FileUpload(
+        filename='x', file_path='x', file_type_id=ft.filetypeid, user_id=u.userid,
+        lat=lat, lon=lon, upload_date=datetime.utcnow(), media_sha256=sha,
+        verification_status='VERIFIED', witness_statement=f'seen by {handle}',
+    )
+    db.session.add(up)
+    db.session.flush()
+    assign_event(up)
+    return up
+
+
+def _corroborated(ft):
+    a = _report(ft, 'k-a', 31.5000, 34.4600, 'a' * 64)
+    b = _report(ft, 'k-b', 31.5004, 34.4604, 'b' * 64)
+    ev = db.session.get(Event, a.event_id)
+    assert ev.status == 'CORROBORATED'
+    return ev, a, b
+
+
+def _snaps(ev):
+    return EventGraphSnapshot.query.filter_by(event_id=ev.id).order_by(EventGraphSnapshot.id).all()
+
+
+def test_transition_only_captures_until_the_writer_runs(ctx):
+    ev, _, _ = _corroborated(ctx)
+    assert _snaps(ev) == []
+    assert PendingSnapshot.query.filter_by(event_id=ev.id, reason='corroborated').count() == 1
+    db.session.commit()
+
+    write_pending_snapshots()
+    db.session.commit()
+    (snap,) = _snaps(ev)
+    assert snap.reason == 'corroborated' and snap.status == 'CORROBORATED'
+    assert PendingSnapshot.query.count() == 0
+
+
+def test_archives_the_state_at_transition_despite_later_deletion(ctx):
+    ev, a, b = _corroborated(ctx)
+    at_transition = build_event_graph(ev)
+    db.session.commit()
+
+    db.session.delete(b)            # taken down before the writer got to it
+    db.session.flush()
+    recompute_event(ev)
+    db.session.commit()
+
+    write_pending_snapshots()
+    (snap,) = _snaps(ev)
+    assert snap.graph_sha256 == at_transition['integrity']['graph_sha256']
+    assert [n['source_id'] for n in json.loads(load_graph_json(snap))['nodes']] == [a.id, b.id]
+
+
+def test_capture_round_trips_to_the_direct_build(ctx):
+    ev, _, _ = _corroborated(ctx)
+    db.session.commit()
+    db.session.expire_all()         # naive datetimes after a DB round-trip
+    capture = json.loads(json.dumps(capture_graph_inputs(ev)))
+    assert graph_from_capture(capture) == build_event_graph(ev)
+
+
+def test_identical_captures_coalesce(ctx):
+    ev, _, _ = _corroborated(ctx)
+    capture_snapshot(ev, reason='corroborated')
+    capture_snapshot(ev, reason='corroborated')
+    assert PendingSnapshot.query.count() == 3
+    assert write_pending_snapshots() == 3
+    assert len(_snaps(ev)) == 1
+    assert PendingSnapshot.query.count() == 0
+
+
+def test_rolled_back_transition_leaves_no_capture(ctx):
+    _corroborated(ctx)
+    db.session.rollback()
+    assert PendingSnapshot.query.count() == 0
+
+
+def test_sweep_recovers_missed_transitions(ctx):
+    ev, _, _ = _corroborated(ctx)
+    PendingSnapshot.query.delete()  # as if captured before this writer existed
+    db.session.commit()
+
+    assert sweep_missed_snapshots() == 1
+    assert sweep_missed_snapshots() == 0    # already pending
+    write_pending_snapshots()
+    db.session.commit()
+    assert [s.reason for s in _snaps(ev)] == ['corroborated']
+    assert sweep_missed_snapshots() == 0    # now archived
+
+
+def test_synchronous_mode_stores_inline(ctx, monkeypatch):
+    monkeypatch.setattr(config, 'SNAPSHOT_WRITER_ASYNC', False)
+    ev, _, _ = _corroborated(ctx)
+    assert len(_snaps(ev)) == 1
+    assert PendingSnapshot.query.count() == 0
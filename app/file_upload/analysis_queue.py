@@ -0,0 +1,326 @@
+"""
+app/file_upload/analysis_queue.py
+
+Durable, bounded media-analysis queue backed by the analysis_jobs table.
+
+Uploads used to start one daemon thread per report: no cap (a burst of videos
+ran that many ffmpeg/Whisper jobs at once), no retry, and a restart lost the
+work, leaving the report PROCESSING forever. Now the API only ENQUEUES -- an
+analysis_jobs row in the ingest transaction -- and worker processes
+(scripts/analysis_worker.py) run them:
+
+- claiming is a conditional UPDATE (QUEUED -> RUNNING), so two workers never
+  run the same job and no table lock or Redis is needed;
+- each worker process runs a fixed pool of threads, with a per-media-kind cap
+  (ANALYSIS_MAX_<KIND>_JOBS) on how many of them may be busy with that kind;
+- a failure is retried with exponential backoff up to
+  ANALYSIS_JOB_MAX_ATTEMPTS, then the job and its report are marked FAILED;
+- a running job's locked_at is refreshed every ANALYSIS_JOB_HEARTBEAT_SECONDS
+  from a thread of its own, so a RUNNING job untouched for
+  ANALYSIS_JOB_TIMEOUT_SECONDS belongs to a dead worker; it is reclaimed as a
+  failed attempt, and reports left PROCESSING by the old thread model, which
+  have no job to resume, are marked FAILED;
+- a run only finishes or fails its job while its worker still holds the lock,
+  so a run that was reclaimed (and may be running again elsewhere) cannot.
+
+The staged raw copy is removed once the job completes or finally fails, never
+while a retry is still due. A completed job's row is deleted. A job for a
+direct upload starts from the object in storage and first sanitizes and
+publishes it (direct_upload.ingest_from_storage).
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, exists, update
+
+import config
+from app.models import db, AnalysisJob, FileUpload
+from app.file_upload import analysis_service, direct_upload
+from app.file_upload.media_sanitizer import safe_remove
+
+logger = logging.getLogger(__name__)
+
+_KINDS = ('video', 'audio', 'image', 'other')
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def in_process():
+    """Whether the API process also runs a worker pool (dev setups)."""
+    return bool(_cfg('ANALYSIS_WORKER_IN_PROCESS', False))
+
+
+def kind_limits():
+    return {
+        'video': _cfg('ANALYSIS_MAX_VIDEO_JOBS', 1),
+        'audio': _cfg('ANALYSIS_MAX_AUDIO_JOBS', 1),
+        'image': _cfg('ANALYSIS_MAX_IMAGE_JOBS', 2),
+        'other': _cfg('ANALYSIS_MAX_OTHER_JOBS', 1),
+    }
+
+
+def enqueue_analysis(upload_id, source_path):
+    """Queue analysis of `source_path` for an upload, in the caller's
+    transaction. Does not commit."""
+    job = AnalysisJob(upload_id=upload_id, source_path=source_path,
+                      media_kind=analysis_service.media_kind(source_path),
+                      status='QUEUED', attempts=0, run_after=datetime.utcnow())
+    db.session.add(job)
+    return job
+
+
+def claim_job(worker_id, kinds=_KINDS, now=None):
+    """Claim the next due job of one of `kinds` for `worker_id`: mark it
+    RUNNING (attempts + 1) and its report PROCESSING, and commit. Returns the
+    job, or None when nothing is due. A job another worker claimed first is
+    passed over."""
+    now = now or datetime.utcnow()
+    if not kinds:
+        return None
+    due = (
+        AnalysisJob.query
+        .filter(AnalysisJob.status == 'QUEUED', AnalysisJob.run_after <= now,
+                AnalysisJob.media_kind.in_(list(kinds)))
+        .order_by(AnalysisJob.run_after, AnalysisJob.id)
+        .limit(10)
+        .all()
+    )
+    for job in due:
+        claimed = db.session.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job.id, AnalysisJob.status == 'QUEUED')
+            .values(status='RUNNING', locked_by=worker_id, locked_at=now,
+                    attempts=AnalysisJob.attempts + 1)
+        ).rowcount
+        if not claimed:
+            continue
+        db.session.execute(update(FileUpload).where(FileUpload.id == job.upload_id)
+                           .values(analysis_status='PROCESSING'))
+        db.session.commit()
+        db.session.refresh(job)
+        return job
+    db.session.rollback()
+    return None
+
+
+def heartbeat(job_id, worker_id, now=None):
+    """Refresh the locked_at of a job `worker_id` is running. Commits. False
+    when the job is no longer its own (reclaimed, or gone)."""
+    beat = db.session.execute(
+        update(AnalysisJob)
+        .where(AnalysisJob.id == job_id, AnalysisJob.status == 'RUNNING',
+               AnalysisJob.locked_by == worker_id)
+        .values(locked_at=now or datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    return bool(beat)
+
+
+class _Heartbeat:
+    """Calls heartbeat() every ANALYSIS_JOB_HEARTBEAT_SECONDS while the block
+    runs, from a thread with its own app context (so its own session)."""
+
+    def __init__(self, app, job_id, worker_id):
+        self.app, self.job_id, self.worker_id = app, job_id, worker_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f'heartbeat-{job_id}', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        interval = _cfg('ANALYSIS_JOB_HEARTBEAT_SECONDS', 60)
+        while not self._stop.wait(interval):
+            with self.app.app_context():
+                try:
+                    if not heartbeat(self.job_id, self.worker_id):
+                        logger.warning("Analysis job %s is no longer held by %s",
+                                       self.job_id, self.worker_id)
+                        return
+                except Exception:
+                    logger.exception("heartbeat for analysis job %s failed", self.job_id)
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+
+
+def run_job(job, now=None):
+    """Run one claimed job. Success deletes the job and the staged file;
+    failure goes through _fail (retry or FAILED). Commits either way. If the
+    job was reclaimed meanwhile, this run's results are rolled back and the
+    job is left to its new owner."""
+    job_id, upload_id, path, worker_id = job.id, job.upload_id, job.source_path, job.locked_by
+    try:
+        with _Heartbeat(current_app._get_current_object(), job_id, worker_id):
+            if direct_upload.is_object_source(path):
+                # A direct upload: sanitize and publish it first (ADR-0030).
+                path = direct_upload.ingest_from_storage(job)
+            analysis_service.analyze_upload(upload_id, path)
+        finished = db.session.execute(
+            delete(AnalysisJob)
+            .where(AnalysisJob.id == job_id, AnalysisJob.status == 'RUNNING',
+                   AnalysisJob.locked_by == worker_id)
+        ).rowcount
+        if not finished:
+            db.session.rollback()
+            logger.warning("Analysis job %s was reclaimed from %s; dropping its results",
+                           job_id, worker_id)
+            return False
+        db.session.commit()
+    except Exception as e:
+        logger.error("Analysis job %s (upload %s) failed: %s", job_id, upload_id, e, exc_info=True)
+        db.session.rollback()
+        job = db.session.get(AnalysisJob, job_id, with_for_update=True)
+        if job is not None and (job.status, job.locked_by) == ('RUNNING', worker_id):
+            _fail(job, f"{type(e).__name__}: {e}", now)
+        db.session.commit()
+        return False
+    safe_remove(path)
+    return True
+
+
+def _fail(job, error, now=None):
+    """Record a failed attempt: requeue with backoff while attempts remain,
+    otherwise mark the job and its report FAILED and drop the staged file (or
+    a direct upload's incoming object not yet ingested). Does not commit."""
+    now = now or datetime.utcnow()
+    job.last_error = error
+    job.locked_by = job.locked_at = None
+    upload = db.session.get(FileUpload, job.upload_id)
+    if job.attempts < _cfg('ANALYSIS_JOB_MAX_ATTEMPTS', 3):
+        delay = _cfg('ANALYSIS_JOB_BACKOFF_SECONDS', 30) * 2 ** (job.attempts - 1)
+        job.status = 'QUEUED'
+        job.run_after = now + timedelta(seconds=delay)
+        if upload is not None:
+            upload.analysis_status = 'PENDING'
+        return
+    job.status = 'FAILED'
+    if upload is not None:
+        upload.analysis_status = 'FAILED'
+    if direct_upload.is_object_source(job.source_path):
+        direct_upload.delete_incoming(job.source_path)
+    else:
+        safe_remove(job.source_path)
+
+
+def reclaim_stuck_jobs(now=None):
+    """Treat RUNNING jobs untouched for ANALYSIS_JOB_TIMEOUT_SECONDS as a
+    failed attempt of a dead worker, and fail reports stuck PROCESSING with no
+    job behind them. Commits. Returns (jobs reclaimed, reports failed)."""
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(seconds=_cfg('ANALYSIS_JOB_TIMEOUT_SECONDS', 3600))
+    stuck = (
+        AnalysisJob.query
+        .filter(AnalysisJob.status == 'RUNNING', AnalysisJob.locked_at < cutoff)
+        .order_by(AnalysisJob.id)
+        .with_for_update(skip_locked=True)      # not one a heartbeat is refreshing
+        .all()
+    )
+    for job in stuck:
+        logger.warning("Reclaiming analysis job %s from %s", job.id, job.locked_by)
+        _fail(job, f"worker {job.locked_by} lost the job", now)
+    orphaned = db.session.execute(
+        update(FileUpload)
+        .where(FileUpload.analysis_status == 'PROCESSING',
+               ~exists().where(AnalysisJob.upload_id == FileUpload.id,
+                               AnalysisJob.status.in_(['QUEUED', 'RUNNING'])))
+        .values(analysis_status='FAILED')
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if orphaned:
+        logger.warning("Marked %d report(s) stuck in PROCESSING with no job as FAILED", orphaned)
+    db.session.commit()
+    return len(stuck), orphaned
+
+
+def run_pending(worker_id='inline', now=None):
+    """Run every due job in this thread, one at a time, until none is left.
+    Returns how many ran. For `--once` and tests."""
+    ran = 0
+    while True:
+        job = claim_job(worker_id, now=now)
+        if job is None:
+            return ran
+        run_job(job, now=now)
+        ran += 1
+
+
+class AnalysisWorkerPool:
+    """A fixed pool of threads in one worker process. Each claims only kinds
+    still under their per-process limit, so a video burst can occupy at most
+    ANALYSIS_MAX_VIDEO_JOBS threads while images keep flowing."""
+
+    def __init__(self, app, size=None):
+        self.app = app
+        self.size = size or _cfg('ANALYSIS_WORKERS', 2)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._lock = threading.Lock()
+        self._running = dict.fromkeys(_KINDS, 0)
+        self._stop = threading.Event()
+        self._threads = []
+        self._reclaimed_at = None
+
+    def start(self):
+        if self._threads:
+            return
+        for i in range(self.size):
+            t = threading.Thread(target=self._run, args=(i,), name=f'analysis-{i}', daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self):
+        for t in self._threads:
+            t.join()
+
+    def _reserve(self):
+        """Claim the next job of a kind with a free slot, counting it."""
+        with self._lock:
+            limits = kind_limits()
+            free = [k for k in _KINDS if self._running[k] < limits[k]]
+            job = claim_job(self.worker_id, kinds=free)
+            if job is not None:
+                self._running[job.media_kind] += 1
+            return job
+
+    def _run(self, index):
+        poll = _cfg('ANALYSIS_POLL_SECONDS', 5)
+        while not self._stop.is_set():
+            job = None
+            with self.app.app_context():
+                try:
+                    if index == 0 and (self._reclaimed_at is None
+                                       or datetime.utcnow() - self._reclaimed_at
+                                       >= timedelta(seconds=poll)):
+                        reclaim_stuck_jobs()
+                        self._reclaimed_at = datetime.utcnow()
+                    job = self._reserve()
+                    if job is not None:
+                        kind = job.media_kind
+                        try:
+                            run_job(job)
+                        finally:
+                            with self._lock:
+                                self._running[kind] -= 1
+                except Exception:
+                    logger.exception("analysis worker pass failed; retrying next pass")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+            if job is None:
+                self._stop.wait(poll)
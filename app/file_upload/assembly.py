@@ -0,0 +1,190 @@
+"""
+app/file_upload/assembly.py
+
+Upload assembly pipeline: chunks -> final file -> raw analysis copy ->
+sanitized file, touching each byte as few times as the platform allows.
+
+The old path read every chunk into a Python bytes object and wrote it back,
+then made a full shutil.copy2 raw copy for the analyzer, then let the
+sanitizer rewrite the file -- a 100 MB video crossed the disk four or five
+times and held a whole chunk in RAM. Now:
+
+- concatenation is done by the kernel (os.copy_file_range, else os.sendfile,
+  else a write from an mmap of the chunk); SHA-256 and size are taken from
+  the same mmap while the chunk is hot in the page cache, so no chunk is
+  ever copied onto the Python heap;
+- the raw analysis copy is a reflink (FICLONE, copy-on-write) where the
+  filesystem supports it, else a hard link, and only then a real copy. A
+  hard link is safe because the served file is never rewritten in place:
+  the sanitizer writes a sibling and os.replace()s it over the name, which
+  leaves the raw inode behind the analysis name untouched.
+
+Each stage records count, bytes, seconds and how it was done (stats()),
+served at /api/health/upload-pipeline.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+from .media_sanitizer import safe_remove, sanitize_for_upload
+
+logger = logging.getLogger(__name__)
+
+RAW_SUFFIX = '.raw-for-analysis'
+
+# linux/fs.h FICLONE = _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+_lock = threading.Lock()
+_stats = {}
+# Kernel copy primitives that turned out to be unusable here (ENOSYS,
+# EXDEV, ...). Tried once per process, then skipped.
+_unsupported = set()
+
+
+@contextmanager
+def measure(stage):
+    """Time a pipeline stage. The block fills in `bytes` and `method`."""
+    sample = {'bytes': 0, 'method': None}
+    started = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        seconds = time.perf_counter() - started
+        with _lock:
+            counts = _stats.setdefault(stage, {'count': 0, 'bytes': 0, 'seconds': 0.0, 'methods': {}})
+            counts['count'] += 1
+            counts['bytes'] += sample['bytes']
+            counts['seconds'] += seconds
+            if sample['method']:
+                counts['methods'][sample['method']] = counts['methods'].get(sample['method'], 0) + 1
+
+
+def stats():
+    """Per-stage {count, bytes, seconds, methods: {how: count}}."""
+    with _lock:
+        return {
+            stage: dict(c, seconds=round(c['seconds'], 3), methods=dict(c['methods']))
+            for stage, c in sorted(_stats.items())
+        }
+
+
+def _kernel_copy(src_fd, dst_fd, size):
+    """Append `size` bytes from src_fd (from offset 0) at dst_fd's position
+    without a user-space buffer. Returns the primitive used, or None when
+    neither is available (nothing copied)."""
+    for name in ('copy_file_range', 'sendfile'):
+        fn = getattr(os, name, None)
+        if fn is None or name in _unsupported:
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                if name == 'copy_file_range':
+                    n = fn(src_fd, dst_fd, size - offset, offset)
+                else:
+                    n = fn(dst_fd, src_fd, offset, size - offset)
+                if n == 0:
+                    raise OSError(f'{name} stopped at {offset} of {size} bytes')
+                offset += n
+            return name
+        except OSError as exc:
+            if offset:
+                raise       # partly written: not safe to retry another way
+            logger.info("%s unavailable for chunk assembly (%s); trying the next method", name, exc)
+            _unsupported.add(name)
+    return None
+
+
+def assemble_chunks(chunk_paths, dest_path, remove=True):
+    """
+    Concatenate `chunk_paths` in order into `dest_path`, hashing as it goes.
+    Chunks are removed once appended when `remove` is set.
+    Returns {'size': int, 'sha256': hex str}.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with measure('assemble') as sample, open(dest_path, 'wb') as out:
+        out_fd = out.fileno()
+        for path in chunk_paths:
+            with open(path, 'rb') as chunk:
+                length = os.fstat(chunk.fileno()).st_size
+                if length:
+                    with mmap.mmap(chunk.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                        digest.update(view)
+                        method = _kernel_copy(chunk.fileno(), out_fd, length)
+                        if method is None:
+                            out.write(view)
+                            out.flush()     # later chunks may go through the fd
+                            method = 'mmap'
+                    sample['method'] = method
+            size += length
+            if remove:
+                os.remove(path)
+        sample['bytes'] = size
+    return {'size': size, 'sha256': digest.hexdigest()}
+
+
+def _reflink(src, dst):
+    import fcntl
+
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+
+
+def stage_raw_copy(path):
+    """
+    Stage the raw file for the analyzer beside `path` (reflink, else hard
+    link, else copy) and return the staged path -- or `path` itself when no
+    copy could be made, in which case analysis sees the sanitized file.
+    """
+    raw_path = path + RAW_SUFFIX
+    with measure('stage_raw') as sample:
+        sample['bytes'] = os.path.getsize(path)
+        if os.path.lexists(raw_path):
+            os.remove(raw_path)
+        if 'reflink' not in _unsupported:
+            try:
+                _reflink(path, raw_path)
+                sample['method'] = 'reflink'
+                return raw_path
+            except (ImportError, OSError):
+                _unsupported.add('reflink')
+                if os.path.exists(raw_path):
+                    os.remove(raw_path)
+        try:
+            os.link(path, raw_path)
+            sample['method'] = 'hardlink'
+            return raw_path
+        except OSError:
+            pass
+        try:
+            shutil.copy2(path, raw_path)
+            sample['method'] = 'copy'
+            return raw_path
+        except OSError as exc:
+            logger.warning("Could not stage raw analysis copy: %s", exc)
+            sample['method'] = 'none'
+            return path
+
+
+def sanitize_in_place(path):
+    """Replace `path` with its metadata-stripped copy. On failure the raw
+    file stays in place (logged loudly by the sanitizer or here)."""
+    with measure('sanitize') as sample:
+        sample['bytes'] = os.path.getsize(path)
+        sanitized_path = sanitize_for_upload(path)
+        sample['method'] = 'unchanged'
+        if sanitized_path != path:
+            try:
+                os.replace(sanitized_path, path)
+                sample['method'] = 'rewritten'
+            except OSError as exc:
+                logger.error("Sanitized file replace failed for %s: %s — uploading raw file", path, exc)
+                safe_remove(sanitized_path)
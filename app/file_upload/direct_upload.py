@@ -0,0 +1,262 @@
+"""
+app/file_upload/direct_upload.py
+
+Web uploads that go straight to object storage, in parts (ADR-0030).
+
+/upload and /chunk stream every byte through an API worker, which is then
+held for assembly, sanitizing and the store upload as well -- a 2 GB video
+ties one up for minutes. The mobile lane already PUTs straight to storage
+(presigned_upload_url); this gives the web lane the same, at any size:
+
+- start_upload() opens an S3 multipart upload or Azure block staging (via
+  modules.object_storage) under incoming/<id>/<name>, and records it as a
+  direct_uploads row so any worker can serve the next call;
+- part_urls() signs one PUT URL per part; the browser sends the parts in
+  parallel, straight to the bucket;
+- complete_upload() is claimed once (OPEN -> COMPLETING, as for chunked
+  sessions) and joins the parts in storage. The caller creates the report
+  with file_path PENDING_MEDIA and queues its analysis job with the incoming
+  object as the source; if that fails, drop_completed() deletes the object
+  and the row, since joined parts cannot be re-joined;
+- the analysis worker first runs ingest_from_storage(): download, stage the
+  raw analysis copy, sanitize, publish the sanitized copy, delete the
+  incoming object. No served URL ever points at unsanitized media;
+- uploads not completed within DIRECT_UPLOAD_TTL_HOURS are aborted by the
+  upload janitor (upload_sessions.maybe_expire_stale_sessions).
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import update
+
+import config
+from app.models import db, DirectUpload, FileUpload
+from modules import object_storage
+from . import upload_sessions
+from .assembly import measure, sanitize_in_place, stage_raw_copy
+from .media_sanitizer import safe_remove
+
+logger = logging.getLogger(__name__)
+
+# AnalysisJob.source_path prefix for media still in the incoming area.
+OBJECT_SOURCE = 'object:'
+INCOMING_PREFIX = 'incoming/'
+
+_MIB = 1024 * 1024
+# S3's limits; Azure's (50,000 blocks of up to 4000 MiB) are looser.
+_MAX_PARTS = 10_000
+_MIN_PART_SIZE = 5 * _MIB
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def part_plan(size):
+    """(part_size, part_count) for a file of `size` bytes. Raises ValueError
+    for an empty file or one over DIRECT_UPLOAD_MAX_MB."""
+    max_mb = _cfg('DIRECT_UPLOAD_MAX_MB', 4096)
+    if size < 1:
+        raise ValueError('size must be at least 1 byte')
+    if size > max_mb * _MIB:
+        raise ValueError(f'file is larger than {max_mb} MB')
+    part_size = max(_cfg('DIRECT_UPLOAD_PART_MB', 16) * _MIB, _MIN_PART_SIZE, -(-size // _MAX_PARTS))
+    return part_size, -(-size // part_size)
+
+
+def start_upload(owner, filename, size, content_type=None):
+    """
+    Open a direct upload of `size` bytes for `owner`. Raises ValueError for a
+    bad size and RuntimeError when no object storage is configured. Commits.
+    """
+    upload_sessions.maybe_expire_stale_sessions()
+    part_size, part_count = part_plan(size)
+    upload_id = str(uuid.uuid4())
+    object_key = f'{INCOMING_PREFIX}{upload_id}/{filename}'
+    storage_upload_id = object_storage.start_multipart(object_key, content_type)
+    upload = DirectUpload(id=upload_id, owner=str(owner), backend=config.STORAGE_BACKEND,
+                          object_key=object_key, storage_upload_id=storage_upload_id,
+                          filename=filename, content_type=content_type, size=size,
+                          part_size=part_size, part_count=part_count)
+    db.session.add(upload)
+    db.session.commit()
+    return upload
+
+
+def get_upload(upload_id, owner):
+    """The caller's direct upload, or None (unknown, finished, or not theirs)."""
+    upload = db.session.get(DirectUpload, upload_id) if upload_id else None
+    if upload is None or upload.owner != str(owner):
+        return None
+    return upload
+
+
+def describe(upload):
+    ttl = timedelta(hours=_cfg('DIRECT_UPLOAD_TTL_HOURS', 24))
+    return {
+        'upload_id': upload.id,
+        'filename': upload.filename,
+        'size': upload.size,
+        'part_size': upload.part_size,
+        'part_count': upload.part_count,
+        'status': upload.status,
+        'expires_at': (upload.created_at + ttl).isoformat(),
+    }
+
+
+def part_urls(upload, part_numbers=None):
+    """
+    Signed PUT URLs for `part_numbers` (1-based; all parts by default), each
+    with the byte range the client must send. Raises ValueError for a part
+    number out of range.
+    """
+    numbers = sorted(set(part_numbers or range(1, upload.part_count + 1)))
+    if numbers[0] < 1 or numbers[-1] > upload.part_count:
+        raise ValueError(f'part numbers must be between 1 and {upload.part_count}')
+    urls = object_storage.part_upload_urls(upload.object_key, upload.storage_upload_id, numbers,
+                                           _cfg('DIRECT_UPLOAD_URL_TTL_MINUTES', 60))
+    return [{
+        'part_number': n,
+        'upload_url': urls[n],
+        'offset': (n - 1) * upload.part_size,
+        'size': min(upload.part_size, upload.size - (n - 1) * upload.part_size),
+    } for n in numbers]
+
+
+def claim_for_completion(upload):
+    """Move an OPEN upload to COMPLETING. False if another request got there
+    first. Commits."""
+    claimed = db.session.execute(
+        update(DirectUpload)
+        .where(DirectUpload.id == upload.id, DirectUpload.status == 'OPEN')
+        .values(status='COMPLETING')
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def complete_upload(upload, parts=None):
+    """
+    Join a claimed upload's parts in storage and return the analysis source
+    reference for the incoming object. `parts` is the client's
+    [{part_number, etag}] and must then name every part; without it (or
+    without ETags) the backend's own record of the parts is used. Raises
+    ValueError when a part is missing. On any failure the upload goes back to
+    OPEN so the client can re-send parts or retry. Commits on failure only.
+    """
+    expected = list(range(1, upload.part_count + 1))
+    try:
+        etags = {int(part['part_number']): part.get('etag') for part in parts or []}
+        if etags and sorted(etags) != expected:
+            raise ValueError(f'parts must list part numbers 1 to {upload.part_count}')
+        object_storage.complete_multipart(upload.object_key, upload.storage_upload_id,
+                                          [(n, etags.get(n)) for n in expected],
+                                          upload.content_type)
+    except Exception:
+        db.session.rollback()
+        upload.status = 'OPEN'
+        db.session.commit()
+        raise
+    return OBJECT_SOURCE + upload.object_key
+
+
+def discard(upload_id):
+    """Delete the direct_uploads row. Does not commit."""
+    DirectUpload.query.filter_by(id=upload_id).delete(synchronize_session=False)
+
+
+def abort_upload(upload):
+    """Abort the backend upload (best effort) and delete the row. Commits."""
+    try:
+        object_storage.abort_multipart(upload.object_key, upload.storage_upload_id)
+    except Exception as exc:  # noqa: BLE001 — the bucket's lifecycle rule is the backstop
+        logger.warning("Could not abort direct upload %s: %s", upload.id, exc)
+    discard(upload.id)
+    db.session.commit()
+
+
+def drop_completed(upload):
+    """Delete the joined incoming object (best effort) and the row of an
+    upload whose report could not be created. Its parts are gone once
+    joined, so it cannot go back to OPEN; the client starts over. Commits."""
+    db.session.rollback()
+    try:
+        object_storage.delete_object(upload.object_key)
+    except Exception as exc:  # noqa: BLE001 — the bucket's lifecycle rule is the backstop
+        logger.warning("Could not delete incoming object %s: %s", upload.object_key, exc)
+    discard(upload.id)
+    db.session.commit()
+
+
+def expire_stale_uploads(now=None):
+    """Abort direct uploads started more than DIRECT_UPLOAD_TTL_HOURS ago
+    (COMPLETING ones too -- their request died). Commits. Returns how many."""
+    now = now or datetime.utcnow()
+    cutoff = now - timedelta(hours=_cfg('DIRECT_UPLOAD_TTL_HOURS', 24))
+    stale = DirectUpload.query.filter(DirectUpload.created_at < cutoff).all()
+    for upload in stale:
+        logger.info("Aborting abandoned direct upload %s", upload.id)
+        abort_upload(upload)
+    return len(stale)
+
+
+def is_object_source(path):
+    return bool(path) and path.startswith(OBJECT_SOURCE)
+
+
+def delete_incoming(source_path):
+    """Delete the incoming object behind an `object:` analysis source (best
+    effort): a job that finally failed before ingest_from_storage ran must not
+    leave unsanitized media in the bucket, and no row points at it any more."""
+    object_key = source_path[len(OBJECT_SOURCE):]
+    try:
+        object_storage.delete_object(object_key)
+    except Exception as exc:  # noqa: BLE001 — the bucket's lifecycle rule is the backstop
+        logger.warning("Could not delete incoming object %s: %s", object_key, exc)
+
+
+def ingest_from_storage(job):
+    """
+    First step of analysing a direct upload: fetch the incoming object,
+    stage the raw analysis copy, sanitize, publish the sanitized file and
+    point the report at it, then delete the incoming object. Leaves
+    job.source_path on the raw copy (committed) so a retry of the analysis
+    itself does not ingest again. Returns that path. Raises on failure; the
+    queue retries the job.
+    """
+    object_key = job.source_path[len(OBJECT_SOURCE):]
+    upload = db.session.get(FileUpload, job.upload_id)
+    if upload is None:
+        raise RuntimeError(f'upload {job.upload_id} no longer exists')
+    upload_folder = current_app.config.get('UPLOAD_FOLDER', '/tmp')
+    os.makedirs(upload_folder, exist_ok=True)
+    local_path = os.path.join(upload_folder, upload.filename)
+
+    with measure('download') as sample:
+        object_storage.download_object(object_key, local_path)
+        sample['bytes'] = os.path.getsize(local_path)
+    raw_path = stage_raw_copy(local_path)
+    sanitize_in_place(local_path)
+    with measure('store') as sample:
+        sample['bytes'] = os.path.getsize(local_path)
+        media_url = object_storage.upload_local_file(local_path)
+    if not media_url:
+        if raw_path != local_path:
+            safe_remove(raw_path)
+        safe_remove(local_path)
+        raise RuntimeError(f'could not publish sanitized media for upload {upload.id}')
+
+    upload.file_path = media_url
+    job.source_path = raw_path
+    db.session.commit()
+    if raw_path != local_path:
+        safe_remove(local_path)
+    try:
+        object_storage.delete_object(object_key)
+    except Exception as exc:  # noqa: BLE001 — a leftover incoming object is harmless
+        logger.warning("Could not delete incoming object %s: %s", object_key, exc)
+    return raw_path
@@ -9,6 +9,8 @@ the reporter's location via embedded tags.
 Images are re-encoded into a fresh PIL Image so no EXIF survives.
 Orientation is baked into pixel data via ImageOps.exif_transpose so the
 visual rotation is preserved even after the orientation tag is dropped.
+The re-encode is CPU-bound, so it runs in the shared media compute pool
+(app/utils/media_pool.py), path in and path out.
 
 Videos are stream-copied through ffmpeg with ``-map_metadata -1`` so the
 container is rewritten without metadata atoms (location, device, encoder
@@ -48,7 +50,8 @@ def sanitize_for_upload(input_path: str) -> str:
     ext = os.path.splitext(input_path)[1].lower()
 
     if ext in _IMAGE_EXTS:
-        sanitized = _sanitize_image(input_path)
+        from app.utils.media_pool import media_pool
+        sanitized = media_pool.run('sanitize', _sanitize_image, input_path)
         return sanitized or input_path
 
     if ext in _VIDEO_EXTS:
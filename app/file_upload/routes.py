@@ -1,15 +1,17 @@
 import os
-import shutil
 from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from flask_limiter import Limiter
 from werkzeug.utils import secure_filename
 from datetime import datetime
-from app.models import db, FileUpload, FileType
+from app.models import db, FileUpload, FileType, Event
 from app.utils.azure_blob import upload_file_to_azure_storage, delete_file_from_azure_storage
 from app.utils.rate_limit import per_user_or_ip_key
-from .analysis_service import start_analysis_thread
-from .media_sanitizer import sanitize_for_upload, safe_remove
+from modules.object_storage import PENDING_MEDIA
+from .analysis_queue import enqueue_analysis
+from . import direct_upload, upload_sessions
+from .assembly import assemble_chunks, measure, sanitize_in_place, stage_raw_copy
+from .media_sanitizer import safe_remove
 
 file_upload_bp = Blueprint('file_upload', __name__, url_prefix='/api/file_upload')
 
@@ -171,26 +173,12 @@ def upload_file():
         # Keep a raw copy for the background analyzer so it can still extract
         # EXIF GPS/timestamp/device for confidence scoring and map placement.
         # The public-served file (file_path) gets sanitized in place below.
-        analysis_source_path = file_path + '.raw-for-analysis'
-        try:
-            shutil.copy2(file_path, analysis_source_path)
-        except OSError as exc:
-            current_app.logger.warning("Could not stage raw analysis copy: %s", exc)
-            analysis_source_path = file_path
+        analysis_source_path = stage_raw_copy(file_path)
 
         # Strip EXIF (GPS + device tags) from the file we will hand to Azure
         # or serve via /api/uploads. Failures fall back to the raw file but are
         # logged loudly — reporter location can leak via embedded GPS otherwise.
-        sanitized_path = sanitize_for_upload(file_path)
-        if sanitized_path != file_path:
-            try:
-                os.replace(sanitized_path, file_path)
-            except OSError as exc:
-                current_app.logger.error(
-                    "Sanitized file replace failed for %s: %s — uploading raw file",
-                    file_path, exc,
-                )
-                safe_remove(sanitized_path)
+        sanitize_in_place(file_path)
 
         # Default to local URL; upgrade to Azure URL only when upload succeeds.
         blob_url = f"/api/uploads/{unique_filename}"
@@ -198,7 +186,9 @@ def upload_file():
             try:
                 container_name = current_app.config.get('AZURE_BLOB_CONTAINER', 'uploads')
                 storage_account = os.getenv('AZURE_STORAGE_ACCOUNT_NAME')
-                upload_file_to_azure_storage(file_path, unique_filename, container_name)
+                with measure('store') as sample:
+                    sample['bytes'] = os.path.getsize(file_path)
+                    upload_file_to_azure_storage(file_path, unique_filename, container_name)
                 blob_url = f"https://{storage_account}.blob.core.windows.net/{container_name}/{unique_filename}"
                 used_azure = True
                 # The sanitized local copy is no longer needed once it's in Azure.
@@ -232,10 +222,9 @@ def upload_file():
         # safety override (severity/is_sensitive must already be set above).
         from app.events.service import process_new_report
         process_new_report(new_upload)
-        db.session.commit()
-
         if has_media:
-            start_analysis_thread(new_upload.id, analysis_source_path)
+            enqueue_analysis(new_upload.id, analysis_source_path)
+        db.session.commit()
 
         msg_suffix = '' if (used_azure or not has_media) else ' (local storage fallback)'
         return jsonify({
@@ -285,6 +274,8 @@ def edit_upload(upload_id):
         return jsonify({'message': 'Forbidden'}), 403
 
     data = request.get_json(silent=True) or {}
+    # Fields the member's Event folded in when it joined; see below.
+    folded = (upload.lat, upload.lon, upload.title, upload.city)
 
     editable = ['title', 'tags', 'subject', 'city', 'country', 'witness_statement', 'source_type']
     for field in editable:
@@ -301,6 +292,12 @@ def edit_upload(upload_id):
             except (ValueError, TypeError):
                 pass
 
+    # The Event keeps running sums of its members' pins (and their titles and
+    # cities): re-derive it rather than let later joins build on stale ones.
+    if upload.event_id is not None and folded != (upload.lat, upload.lon, upload.title, upload.city):
+        from app.events.service import mark_dirty
+        mark_dirty(upload.event_id)
+
     try:
         db.session.commit()
         return jsonify(_serialize_upload(upload)), 200
@@ -349,6 +346,15 @@ def delete_upload(upload_id):
 
     try:
         db.session.delete(upload)
+        db.session.flush()
+        # A deleted report drops out of its Event's stored counts/visibility and
+        # out of the owner's stored track record.
+        from app.events.service import recompute_event
+        from app.story.track_record import refresh_track_records
+        event = db.session.get(Event, upload.event_id) if upload.event_id else None
+        if event is not None:
+            recompute_event(event)
+        refresh_track_records({upload.user_id})
         db.session.commit()
         return jsonify({'message': 'Deleted'}), 200
     except Exception as e:
@@ -360,43 +366,103 @@ def delete_upload(upload_id):
 # ── Chunked upload support ────────────────────────────────────────────────────
 
 import uuid
-import tempfile
 
-# In-memory chunk registry: { upload_id: { 'dir': str, 'chunks': set, 'total': int, 'filename': str, 'file_type': str } }
-_CHUNK_REGISTRY = {}
+# Sessions and received chunks are kept in the database and the chunk files
+# on the shared CHUNK_UPLOAD_DIR (upload_sessions.py), so every API worker
+# sees every upload and a client can resume one.
+
+
+def _report_from_json(data, user_id, unique_filename, file_path, file_type_id):
+    """An unsaved FileUpload from a JSON completion body (chunked and direct
+    lanes)."""
+    try:
+        lat = float(data['lat']) if data.get('lat') is not None else None
+        lon = float(data['lon']) if data.get('lon') is not None else None
+    except (ValueError, TypeError):
+        lat = lon = None
+
+    return FileUpload(
+        filename=unique_filename,
+        file_path=file_path,
+        title=data.get('title'),
+        tags=data.get('tags'),
+        subject=data.get('subject'),
+        city=data.get('city'),
+        country=data.get('country'),
+        upload_date=datetime.utcnow(),
+        user_id=user_id,
+        file_type_id=file_type_id,
+        lat=lat,
+        lon=lon,
+        witness_statement=data.get('witness_statement'),
+        source_type=data.get('source_type', 'eyewitness'),
+        is_sensitive=bool(data.get('is_sensitive', False)),
+        severity=_normalize_severity(data.get('severity')),
+    )
+
+
+def _session_view(session):
+    return jsonify(upload_sessions.describe(session))
+
+
+@file_upload_bp.route('/chunk-session', methods=['POST'])
+@limiter.limit('100 per hour')
+@jwt_required()
+def open_chunk_session():
+    """Start (or resume) a chunked upload. Clients sending chunks in parallel
+    open the session first so they all share one upload_id."""
+    data = request.get_json(silent=True) or {}
+    try:
+        session = upload_sessions.open_session(
+            get_jwt_identity(),
+            secure_filename(data.get('filename') or 'upload'),
+            int(data.get('total_chunks') or 0),
+            file_type=data.get('file_type', 'application/octet-stream'),
+            upload_id=data.get('upload_id'),
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'message': str(e)}), 400
+    return _session_view(session), 200
+
+
+@file_upload_bp.route('/chunk-session/<upload_id>', methods=['GET'])
+@limiter.limit('1000 per hour')
+@jwt_required()
+def chunk_session_status(upload_id):
+    """Which chunks the server holds and which are still missing."""
+    session = upload_sessions.get_session(upload_id, get_jwt_identity())
+    if session is None:
+        return jsonify({'message': 'Unknown upload_id'}), 404
+    return _session_view(session), 200
 
 
 @file_upload_bp.route('/chunk', methods=['POST'])
 @limiter.limit('1000 per hour')
 @jwt_required()
 def receive_chunk():
-    """Accept a single chunk of a multi-part upload."""
+    """Accept a single chunk of a multi-part upload. The first chunk opens
+    the session when the client has not; `chunk_sha256`, when sent, must
+    match the chunk's bytes."""
     chunk = request.files.get('chunk')
     if not chunk:
         return jsonify({'message': 'No chunk provided'}), 400
 
-    chunk_index = int(request.form.get('chunk_index', 0))
-    total_chunks = int(request.form.get('total_chunks', 1))
-    filename = secure_filename(request.form.get('filename', 'upload'))
-    file_type = request.form.get('file_type', 'application/octet-stream')
-    upload_id = request.form.get('upload_id') or str(uuid.uuid4())
-
-    if upload_id not in _CHUNK_REGISTRY:
-        tmp_dir = tempfile.mkdtemp(prefix='melo_chunk_')
-        _CHUNK_REGISTRY[upload_id] = {
-            'dir': tmp_dir,
-            'chunks': set(),
-            'total': total_chunks,
-            'filename': filename,
-            'file_type': file_type,
-        }
-
-    reg = _CHUNK_REGISTRY[upload_id]
-    chunk_path = os.path.join(reg['dir'], f'chunk_{chunk_index:05d}')
-    chunk.save(chunk_path)
-    reg['chunks'].add(chunk_index)
+    try:
+        chunk_index = int(request.form.get('chunk_index', 0))
+        session = upload_sessions.open_session(
+            get_jwt_identity(),
+            secure_filename(request.form.get('filename', 'upload')),
+            int(request.form.get('total_chunks', 1)),
+            file_type=request.form.get('file_type', 'application/octet-stream'),
+            upload_id=request.form.get('upload_id'),
+        )
+        saved = upload_sessions.save_chunk(session, chunk_index, chunk.stream,
+                                           request.form.get('chunk_sha256'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
 
-    return jsonify({'upload_id': upload_id, 'received': chunk_index}), 200
+    return jsonify({'upload_id': session.id, 'received': chunk_index,
+                    'size': saved['size'], 'sha256': saved['sha256']}), 200
 
 
 @file_upload_bp.route('/chunk-complete', methods=['POST'])
@@ -408,15 +474,19 @@ def complete_chunk_upload():
     data = request.get_json(silent=True) or {}
 
     upload_id = data.get('upload_id')
-    if not upload_id or upload_id not in _CHUNK_REGISTRY:
+    session = upload_sessions.get_session(upload_id, user_id)
+    if session is None:
         return jsonify({'message': 'Unknown upload_id'}), 400
 
-    reg = _CHUNK_REGISTRY.pop(upload_id)
+    missing = upload_sessions.missing_chunks(session)
+    if missing:
+        return jsonify({'message': f"Missing chunks: expected {session.total_chunks}, "
+                                   f"got {session.total_chunks - len(missing)}",
+                        'missing': missing}), 400
+    if not upload_sessions.claim_for_assembly(session):
+        return jsonify({'message': 'Upload is already being completed'}), 409
 
-    if len(reg['chunks']) != reg['total']:
-        return jsonify({'message': f"Missing chunks: expected {reg['total']}, got {len(reg['chunks'])}"}), 400
-
-    filename = reg['filename']
+    filename = session.filename
 
     file_type_id = _resolve_file_type(filename, data.get('file_type_id')).filetypeid
 
@@ -426,88 +496,174 @@ def complete_chunk_upload():
     os.makedirs(upload_folder, exist_ok=True)
     final_path = os.path.join(upload_folder, unique_filename)
 
-    with open(final_path, 'wb') as out:
-        for i in range(reg['total']):
-            chunk_path = os.path.join(reg['dir'], f'chunk_{i:05d}')
-            with open(chunk_path, 'rb') as cf:
-                out.write(cf.read())
-            os.remove(chunk_path)
-
-    shutil.rmtree(reg['dir'], ignore_errors=True)
-
-    # Stage a raw copy for the analyzer so EXIF-derived lat/lon survives.
-    analysis_source_path = final_path + '.raw-for-analysis'
+    # Concatenate in the kernel, hashing in the same pass.
     try:
-        shutil.copy2(final_path, analysis_source_path)
+        assembled = assemble_chunks(upload_sessions.chunk_paths(session), final_path)
     except OSError as exc:
-        current_app.logger.warning("Could not stage raw analysis copy: %s", exc)
-        analysis_source_path = final_path
+        current_app.logger.error("Chunk assembly failed for %s: %s", upload_id, exc)
+        safe_remove(final_path)
+        upload_sessions.release_claim(session)
+        return jsonify({'message': 'Could not assemble upload'}), 500
+
+    # On a mismatch the chunks stay, so the client can re-send and retry.
+    expected_sha = (data.get('sha256') or '').strip().lower()
+    if expected_sha and expected_sha != assembled['sha256']:
+        safe_remove(final_path)
+        upload_sessions.release_claim(session)
+        return jsonify({'message': 'Checksum mismatch: assembled file does not match sha256',
+                        'sha256': assembled['sha256'], 'size': assembled['size']}), 400
 
-    # Strip EXIF before the file leaves the server.
-    sanitized_path = sanitize_for_upload(final_path)
-    if sanitized_path != final_path:
-        try:
-            os.replace(sanitized_path, final_path)
-        except OSError as exc:
-            current_app.logger.error(
-                "Sanitized file replace failed for %s: %s — uploading raw file",
-                final_path, exc,
-            )
-            safe_remove(sanitized_path)
+    analysis_source_path = None
+    try:
+        # Stage the raw file for the analyzer so EXIF-derived lat/lon survives.
+        analysis_source_path = stage_raw_copy(final_path)
 
-    blob_url = f"/api/uploads/{unique_filename}"
-    if _should_use_azure():
-        try:
-            container_name = current_app.config.get('AZURE_BLOB_CONTAINER', 'uploads')
-            storage_account = os.getenv('AZURE_STORAGE_ACCOUNT_NAME')
-            upload_file_to_azure_storage(final_path, unique_filename, container_name)
-            blob_url = f"https://{storage_account}.blob.core.windows.net/{container_name}/{unique_filename}"
-            safe_remove(final_path)
-        except Exception as e:
-            current_app.logger.warning("Azure upload failed for chunk assembly: %s", e)
+        # Strip EXIF before the file leaves the server.
+        sanitize_in_place(final_path)
 
-    try:
-        lat = float(data['lat']) if data.get('lat') is not None else None
-        lon = float(data['lon']) if data.get('lon') is not None else None
-    except (ValueError, TypeError):
-        lat = lon = None
+        blob_url = f"/api/uploads/{unique_filename}"
+        if _should_use_azure():
+            try:
+                container_name = current_app.config.get('AZURE_BLOB_CONTAINER', 'uploads')
+                storage_account = os.getenv('AZURE_STORAGE_ACCOUNT_NAME')
+                with measure('store') as sample:
+                    sample['bytes'] = assembled['size']
+                    upload_file_to_azure_storage(final_path, unique_filename, container_name)
+                blob_url = f"https://{storage_account}.blob.core.windows.net/{container_name}/{unique_filename}"
+                safe_remove(final_path)
+            except Exception as e:
+                current_app.logger.warning("Azure upload failed for chunk assembly: %s", e)
+
+        new_upload = _report_from_json(data, user_id, unique_filename, blob_url, file_type_id)
+        db.session.add(new_upload)
+        db.session.flush()
+        from app.events.service import process_new_report
+        process_new_report(new_upload)
+        enqueue_analysis(new_upload.id, analysis_source_path)
+        # The session goes with the report insert: a failure keeps the chunks.
+        upload_sessions.discard_session(upload_id, files=False)
+        db.session.commit()
+    except Exception as e:
+        current_app.logger.error('Chunk complete error: %s', e)
+        upload_sessions.release_claim(session)
+        safe_remove(final_path)
+        safe_remove(analysis_source_path)
+        return jsonify({'message': str(e)}), 500
+
+    upload_sessions.remove_chunk_files(upload_id)
+    return jsonify({
+        'message': 'Upload complete.',
+        'file_id': new_upload.id,
+        'file_url': blob_url,
+        'sha256': assembled['sha256'],
+        'size': assembled['size'],
+        'severity': new_upload.severity,
+        'analysis_status': new_upload.analysis_status,
+        'verification_status': new_upload.verification_status,
+    }), 200
 
-    severity = _normalize_severity(data.get('severity'))
 
+# ── Direct-to-storage uploads (ADR-0030) ──────────────────────────────────────
+
+# The browser PUTs parts straight to the bucket with signed URLs, so no API
+# worker carries the bytes; sanitizing runs later in the analysis worker.
+
+
+@file_upload_bp.route('/direct', methods=['POST'])
+@limiter.limit('30 per hour; 100 per day')
+@jwt_required()
+def start_direct_upload():
+    """Open a multipart upload to object storage. Body: filename, size
+    (bytes), content_type. Returns the part size and count; fetch the part
+    URLs from /direct/<upload_id>/parts."""
+    data = request.get_json(silent=True) or {}
     try:
-        new_upload = FileUpload(
-            filename=unique_filename,
-            file_path=blob_url,
-            title=data.get('title'),
-            tags=data.get('tags'),
-            subject=data.get('subject'),
-            city=data.get('city'),
-            country=data.get('country'),
-            upload_date=datetime.utcnow(),
-            user_id=user_id,
-            file_type_id=file_type_id,
-            lat=lat,
-            lon=lon,
-            witness_statement=data.get('witness_statement'),
-            source_type=data.get('source_type', 'eyewitness'),
-            is_sensitive=bool(data.get('is_sensitive', False)),
-            severity=severity,
+        upload = direct_upload.start_upload(
+            get_jwt_identity(),
+            secure_filename(data.get('filename') or 'upload'),
+            int(data.get('size') or 0),
+            content_type=data.get('content_type'),
         )
+    except (TypeError, ValueError) as e:
+        return jsonify({'message': str(e)}), 400
+    except RuntimeError as e:
+        current_app.logger.warning("Direct upload unavailable: %s", e)
+        return jsonify({'message': 'Direct upload is not available; use /chunk'}), 503
+    return jsonify(direct_upload.describe(upload)), 200
+
+
+@file_upload_bp.route('/direct/<upload_id>/parts', methods=['POST'])
+@limiter.limit('1000 per hour')
+@jwt_required()
+def direct_upload_parts(upload_id):
+    """Signed PUT URLs for `part_numbers` (all parts when omitted), with the
+    byte range each part must carry. Ask again for fresh URLs on expiry."""
+    upload = direct_upload.get_upload(upload_id, get_jwt_identity())
+    if upload is None:
+        return jsonify({'message': 'Unknown upload_id'}), 404
+    data = request.get_json(silent=True) or {}
+    try:
+        parts = direct_upload.part_urls(upload, [int(n) for n in data.get('part_numbers') or []])
+    except (TypeError, ValueError) as e:
+        return jsonify({'message': str(e)}), 400
+    return jsonify({'upload_id': upload.id, 'parts': parts}), 200
+
+
+@file_upload_bp.route('/direct/<upload_id>/complete', methods=['POST'])
+@limiter.limit('30 per hour; 100 per day')
+@jwt_required()
+def complete_direct_upload(upload_id):
+    """Join the parts in storage and create the FileUpload record. Body: the
+    report fields as for /chunk-complete, plus `parts` ([{part_number, etag}],
+    optional). The media is published once the worker has sanitized it."""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+    upload = direct_upload.get_upload(upload_id, user_id)
+    if upload is None:
+        return jsonify({'message': 'Unknown upload_id'}), 404
+    if not direct_upload.claim_for_completion(upload):
+        return jsonify({'message': 'Upload is already being completed'}), 409
+
+    try:
+        source = direct_upload.complete_upload(upload, data.get('parts'))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'message': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error("Direct upload %s could not be completed: %s", upload_id, e)
+        return jsonify({'message': 'Could not complete upload; try again'}), 502
+
+    unique_filename = f"{datetime.utcnow().strftime('%Y%m%d%H%M%S')}_{upload.filename}"
+    try:
+        file_type_id = _resolve_file_type(upload.filename, data.get('file_type_id')).filetypeid
+        new_upload = _report_from_json(data, user_id, unique_filename, PENDING_MEDIA, file_type_id)
         db.session.add(new_upload)
         db.session.flush()
         from app.events.service import process_new_report
         process_new_report(new_upload)
+        enqueue_analysis(new_upload.id, source)
+        direct_upload.discard(upload_id)
         db.session.commit()
-        start_analysis_thread(new_upload.id, analysis_source_path)
         return jsonify({
             'message': 'Upload complete.',
             'file_id': new_upload.id,
-            'file_url': blob_url,
-            'severity': severity,
+            'file_url': None,
+            'severity': new_upload.severity,
             'analysis_status': new_upload.analysis_status,
             'verification_status': new_upload.verification_status,
         }), 200
     except Exception as e:
-        db.session.rollback()
-        current_app.logger.error('Chunk complete error: %s', e)
+        current_app.logger.error('Direct upload complete error: %s', e)
+        direct_upload.drop_completed(upload)
         return jsonify({'message': str(e)}), 500
+
+
+@file_upload_bp.route('/direct/<upload_id>', methods=['DELETE'])
+@limiter.limit('100 per hour')
+@jwt_required()
+def abort_direct_upload(upload_id):
+    """Abandon a direct upload and free the parts already stored."""
+    upload = direct_upload.get_upload(upload_id, get_jwt_identity())
+    if upload is None:
+        return jsonify({'message': 'Unknown upload_id'}), 404
+    direct_upload.abort_upload(upload)
+    return jsonify({'message': 'Aborted'}), 200
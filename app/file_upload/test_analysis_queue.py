@@ -0,0 +1,211 @@
+"""
+Media-analysis job queue tests (app/file_upload/analysis_queue.py).
+
+The API enqueues; workers claim atomically, run, retry with backoff, give up
+after the last attempt, and reclaim jobs whose worker died (stopped its
+heartbeat) -- a run that was reclaimed cannot finish its job. The analysis
+itself is replaced with a stub so no EXIF/Whisper work runs.
+
+In-memory SQLite with a minimal Flask app.
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+from sqlalchemy import update
+
+import config
+from app.models import db, AnalysisJob, FileType, FileUpload
+from app.file_upload import analysis_queue
+from app.file_upload.analysis_queue import (
+    claim_job, enqueue_analysis, reclaim_stuck_jobs, run_job, run_pending,
+)
+
+
+@pytest.fixture
+def ctx(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'ANALYSIS_JOB_MAX_ATTEMPTS', 3, raising=False)
+    monkeypatch.setattr(config, 'ANALYSIS_JOB_BACKOFF_SECONDS', 10, raising=False)
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.commit()
+        yield ft, tmp_path
+        db.session.remove()
+
+
+@pytest.fixture
+def analyzed(monkeypatch):
+    """Stub analysis: records calls, fails while `failures` is positive."""
+    calls = {'ran': [], 'failures': 0}
+
+    def analyze(upload_id, path):
+        calls['ran'].append(upload_id)
+        if calls['failures']:
+            calls['failures'] -= 1
+            raise RuntimeError('whisper crashed')
+        db.session.get(FileUpload, upload_id).analysis_status = 'COMPLETED'
+
+    monkeypatch.setattr(analysis_queue.analysis_service, 'analyze_upload', analyze)
+    return calls
+
+
+def _upload(ctx, name='clip.mp4'):
+    ft, tmp = ctx
+    path = tmp / f'{name}.raw-for-analysis'
+    path.write_bytes(b'x')
+    up = FileUpload(filename=name, file_path=f'/api/uploads/{name}', file_type_id=ft.filetypeid,
+                    analysis_status='PENDING')
+    db.session.add(up)
+    db.session.flush()
+    enqueue_analysis(up.id, str(path))
+    db.session.commit()
+    return up, path
+
+
+def test_enqueued_job_runs_once_and_cleans_up(ctx, analyzed):
+    up, path = _upload(ctx, 'photo.jpg')
+    (job,) = AnalysisJob.query.all()
+    assert (job.status, job.media_kind) == ('QUEUED', 'image')
+
+    assert run_pending() == 1
+    assert run_pending() == 0
+    assert analyzed['ran'] == [up.id]
+    assert db.session.get(FileUpload, up.id).analysis_status == 'COMPLETED'
+    assert AnalysisJob.query.count() == 0
+    assert not path.exists()
+
+
+def test_failures_retry_with_backoff_then_fail(ctx, analyzed):
+    up, path = _upload(ctx)
+    analyzed['failures'] = 5
+    t0 = datetime.utcnow()
+
+    assert run_pending(now=t0) == 1
+    job = AnalysisJob.query.one()
+    assert (job.status, job.attempts) == ('QUEUED', 1)
+    assert job.run_after == t0 + timedelta(seconds=10)
+    assert db.session.get(FileUpload, up.id).analysis_status == 'PENDING'
+    assert path.exists()                                     # kept for the retry
+    assert run_pending(now=t0 + timedelta(seconds=5)) == 0   # not due yet
+
+    assert run_pending(now=t0 + timedelta(seconds=10)) == 1
+    assert AnalysisJob.query.one().run_after == t0 + timedelta(seconds=30)   # 10 + 20
+
+    assert run_pending(now=t0 + timedelta(seconds=30)) == 1
+    job = AnalysisJob.query.one()
+    assert (job.status, job.attempts) == ('FAILED', 3)
+    assert 'whisper crashed' in job.last_error
+    assert db.session.get(FileUpload, up.id).analysis_status == 'FAILED'
+    assert not path.exists()
+    assert run_pending(now=t0 + timedelta(days=1)) == 0
+
+
+def test_claim_is_exclusive_and_respects_kinds(ctx, analyzed):
+    video, _ = _upload(ctx, 'clip.mp4')
+    image, _ = _upload(ctx, 'photo.jpg')
+
+    job = claim_job('w1', kinds=['image', 'audio'])
+    assert job.upload_id == image.id and job.locked_by == 'w1'
+    assert db.session.get(FileUpload, image.id).analysis_status == 'PROCESSING'
+    assert claim_job('w2', kinds=['image']) is None          # already RUNNING
+    assert claim_job('w2', kinds=[]) is None
+    assert claim_job('w2').upload_id == video.id
+
+
+def test_dead_worker_jobs_and_orphans_are_reclaimed(ctx, analyzed, monkeypatch):
+    monkeypatch.setattr(config, 'ANALYSIS_JOB_TIMEOUT_SECONDS', 60, raising=False)
+    up, _ = _upload(ctx)
+    t0 = datetime.utcnow()
+    claim_job('dead-worker', now=t0)
+    ft, _ = ctx
+    legacy = FileUpload(filename='old.mp4', file_path='x', file_type_id=ft.filetypeid,
+                        analysis_status='PROCESSING')       # thread lost in a restart
+    db.session.add(legacy)
+    db.session.commit()
+
+    assert reclaim_stuck_jobs(now=t0 + timedelta(seconds=30)) == (0, 1)
+    assert reclaim_stuck_jobs(now=t0 + timedelta(seconds=61)) == (1, 0)
+    job = AnalysisJob.query.one()
+    assert (job.status, job.attempts, job.locked_by) == ('QUEUED', 1, None)
+    assert db.session.get(FileUpload, up.id).analysis_status == 'PENDING'
+    assert db.session.get(FileUpload, legacy.id).analysis_status == 'FAILED'
+
+    assert run_pending(now=t0 + timedelta(seconds=71)) == 1
+    assert db.session.get(FileUpload, up.id).analysis_status == 'COMPLETED'
+
+
+def test_pool_never_exceeds_a_kind_limit(ctx, analyzed, monkeypatch):
+    monkeypatch.setattr(config, 'ANALYSIS_MAX_VIDEO_JOBS', 1, raising=False)
+    _upload(ctx, 'a.mp4')
+    _upload(ctx, 'b.mp4')
+    image, _ = _upload(ctx, 'c.jpg')
+    pool = analysis_queue.AnalysisWorkerPool(app=None, size=3)
+
+    first = pool._reserve()
+    assert first.media_kind == 'video'
+    second = pool._reserve()
+    assert second.upload_id == image.id          # the other video must wait
+    assert pool._reserve() is None
+    run_job(first)
+    pool._running['video'] -= 1
+    assert pool._reserve().media_kind == 'video'
+
+
+def test_heartbeat_keeps_a_long_job_from_being_reclaimed(ctx, analyzed, monkeypatch):
+    monkeypatch.setattr(config, 'ANALYSIS_JOB_TIMEOUT_SECONDS', 60, raising=False)
+    _upload(ctx)
+    t0 = datetime.utcnow()
+    job = claim_job('w1', now=t0)
+
+    assert analysis_queue.heartbeat(job.id, 'w1', now=t0 + timedelta(seconds=50))
+    assert reclaim_stuck_jobs(now=t0 + timedelta(seconds=61)) == (0, 0)
+    assert not analysis_queue.heartbeat(job.id, 'w2')
+    assert reclaim_stuck_jobs(now=t0 + timedelta(seconds=111)) == (1, 0)
+    assert not analysis_queue.heartbeat(job.id, 'w1')        # reclaimed: no longer ours
+
+
+def test_heartbeat_thread_refreshes_the_lock(ctx, analyzed, monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'ANALYSIS_JOB_HEARTBEAT_SECONDS', 0.01, raising=False)
+    # A file database: the heartbeat thread needs a connection of its own.
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'jobs.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(AnalysisJob(upload_id=1, source_path='x', media_kind='other',
+                                   status='RUNNING', attempts=1, locked_by='w1',
+                                   locked_at=datetime(2000, 1, 1), run_after=datetime.utcnow()))
+        db.session.commit()
+        with analysis_queue._Heartbeat(app, 1, 'w1'):
+            time.sleep(0.2)
+        db.session.expire_all()
+        assert db.session.get(AnalysisJob, 1).locked_at > datetime(2000, 1, 1)
+        db.session.remove()
+
+
+@pytest.mark.parametrize('fails', [False, True])
+def test_reclaimed_run_cannot_finish_or_fail_the_job(ctx, monkeypatch, fails):
+    up, path = _upload(ctx)
+
+    def analyze(upload_id, p):
+        # Meanwhile the job was reclaimed, and another worker claimed it.
+        db.session.execute(update(AnalysisJob).values(locked_by='w2'))
+        db.session.commit()
+        db.session.get(FileUpload, upload_id).analysis_status = 'COMPLETED'
+        if fails:
+            raise RuntimeError('whisper crashed')
+
+    monkeypatch.setattr(analysis_queue.analysis_service, 'analyze_upload', analyze)
+    assert run_job(claim_job('w1')) is False
+    job = AnalysisJob.query.one()
+    assert (job.status, job.locked_by, job.attempts, job.last_error) == ('RUNNING', 'w2', 1, None)
+    assert db.session.get(FileUpload, up.id).analysis_status == 'PROCESSING'
+    assert path.exists()                                     # the new run needs it
@@ -0,0 +1,82 @@
+"""
+Upload assembly pipeline tests (app/file_upload/assembly.py).
+
+Chunks concatenate byte-exactly with the right SHA-256 and size whichever copy
+primitive is available; the staged raw analysis file keeps the original bytes
+after the served file is sanitized (replaced) in place; and every stage is
+counted.
+"""
+
+import hashlib
+import os
+
+import pytest
+
+from app.file_upload import assembly
+from app.file_upload.assembly import assemble_chunks, stage_raw_copy
+
+
+def _chunks(tmp_path, sizes):
+    paths, data = [], b''
+    for i, n in enumerate(sizes):
+        body = os.urandom(n)
+        path = tmp_path / f'chunk_{i:05d}'
+        path.write_bytes(body)
+        paths.append(str(path))
+        data += body
+    return paths, data
+
+
+@pytest.mark.parametrize('unusable', [set(), {'copy_file_range'}, {'copy_file_range', 'sendfile'}])
+def test_assembly_is_byte_exact_with_each_copy_method(tmp_path, monkeypatch, unusable):
+    monkeypatch.setattr(assembly, '_unsupported', set(unusable))
+    paths, data = _chunks(tmp_path, [300_000, 0, 1, 65_536])
+    dest = tmp_path / 'final.mp4'
+
+    result = assemble_chunks(paths, str(dest))
+
+    assert dest.read_bytes() == data
+    assert result == {'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+    assert not any(os.path.exists(p) for p in paths)
+
+
+def test_raw_copy_survives_sanitizing_the_served_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(assembly, '_unsupported', set())
+    served = tmp_path / 'photo.jpg'
+    served.write_bytes(b'raw with gps')
+
+    raw = stage_raw_copy(str(served))
+    sanitized = tmp_path / 'photo.sanitized.jpg'
+    sanitized.write_bytes(b'clean')
+    os.replace(sanitized, served)               # what sanitize_in_place does
+
+    assert raw == str(served) + assembly.RAW_SUFFIX
+    assert open(raw, 'rb').read() == b'raw with gps'
+    assert served.read_bytes() == b'clean'
+    assert assembly.stats()['stage_raw']['methods'].keys() & {'reflink', 'hardlink'}
+
+
+def test_raw_copy_falls_back_to_a_real_copy(tmp_path, monkeypatch):
+    monkeypatch.setattr(assembly, '_unsupported', {'reflink'})
+
+    def no_links(src, dst):
+        raise OSError('cross-device link')
+    monkeypatch.setattr(assembly.os, 'link', no_links)
+    served = tmp_path / 'clip.mp4'
+    served.write_bytes(b'frames')
+
+    before = assembly.stats().get('stage_raw', {}).get('methods', {}).get('copy', 0)
+    raw = stage_raw_copy(str(served))
+    assert open(raw, 'rb').read() == b'frames'
+    assert os.stat(raw).st_ino != served.stat().st_ino
+    assert assembly.stats()['stage_raw']['methods']['copy'] == before + 1
+
+
+def test_stages_are_counted(tmp_path):
+    before = assembly.stats().get('assemble', {'count': 0, 'bytes': 0})
+    paths, data = _chunks(tmp_path, [1000, 2000])
+    assemble_chunks(paths, str(tmp_path / 'out'))
+    after = assembly.stats()['assemble']
+    assert after['count'] == before['count'] + 1
+    assert after['bytes'] == before['bytes'] + len(data)
+    assert after['seconds'] >= 0
@@ -0,0 +1,209 @@
+"""
+Direct-to-storage web upload tests (app/file_upload/direct_upload.py).
+
+Parts are planned within S3's limits, completion is claimed once and goes
+back to OPEN when a part is missing, the analysis worker sanitizes and
+publishes the incoming object before analysing the raw copy, and the janitor
+aborts abandoned uploads. Object storage is replaced with an in-memory fake.
+
+In-memory SQLite with a minimal Flask app.
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+import config
+from app.models import db, AnalysisJob, DirectUpload, FileType, FileUpload
+from app.file_upload import analysis_queue, direct_upload, upload_sessions
+from app.file_upload.analysis_queue import enqueue_analysis, run_pending
+from modules import object_storage
+
+MIB = 1024 * 1024
+
+
+class FakeStorage:
+    def __init__(self):
+        self.objects, self.parts, self.aborted, self.published = {}, {}, [], {}
+
+    def start_multipart(self, key, content_type=None):
+        self.parts[key] = {}
+        return f'mpu-{len(self.parts)}'
+
+    def part_upload_urls(self, key, upload_id, numbers, expiry_minutes=60):
+        return {n: f'https://bucket.test/{key}?uploadId={upload_id}&partNumber={n}' for n in numbers}
+
+    def complete_multipart(self, key, upload_id, parts, content_type=None):
+        missing = [n for n, _ in parts if n not in self.parts[key]]
+        if missing:
+            raise ValueError(f'parts not uploaded: {missing}')
+        held = self.parts.pop(key)
+        self.objects[key] = b''.join(held[n] for n, _ in parts)
+        return f'https://bucket.test/{key}'
+
+    def abort_multipart(self, key, upload_id):
+        self.aborted.append(key)
+        self.parts.pop(key, None)
+
+    def download_object(self, key, local_path):
+        with open(local_path, 'wb') as out:
+            out.write(self.objects[key])
+
+    def delete_object(self, key):
+        del self.objects[key]
+
+    def upload_local_file(self, local_path):
+        with open(local_path, 'rb') as f:
+            self.published[os.path.basename(local_path)] = f.read()
+        return f'https://bucket.test/{os.path.basename(local_path)}'
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = FakeStorage()
+    for name in ('start_multipart', 'part_upload_urls', 'complete_multipart', 'abort_multipart',
+                 'download_object', 'delete_object', 'upload_local_file'):
+        monkeypatch.setattr(object_storage, name, getattr(fake, name))
+    return fake
+
+
+@pytest.fixture
+def ctx(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'DIRECT_UPLOAD_PART_MB', 5, raising=False)
+    monkeypatch.setattr(config, 'DIRECT_UPLOAD_MAX_MB', 1024 * 1024, raising=False)
+    monkeypatch.setattr(config, 'DIRECT_UPLOAD_TTL_HOURS', 1, raising=False)
+    monkeypatch.setattr(upload_sessions, '_janitor_ran_at', time.monotonic())  # janitor off
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.commit()
+        yield ft, tmp_path
+        db.session.remove()
+
+
+def _send_parts(storage, upload, body):
+    for part in direct_upload.part_urls(upload):
+        start = part['offset']
+        storage.parts[upload.object_key][part['part_number']] = body[start:start + part['size']]
+
+
+def test_part_plan_stays_within_s3_limits(ctx):
+    assert direct_upload.part_plan(1) == (5 * MIB, 1)
+    assert direct_upload.part_plan(12 * MIB) == (5 * MIB, 3)
+    part_size, count = direct_upload.part_plan(100 * 1024 * MIB)   # 100 GiB
+    assert count <= 10_000 and part_size * count >= 100 * 1024 * MIB
+    with pytest.raises(ValueError):
+        direct_upload.part_plan(0)
+
+
+def test_completed_upload_is_sanitized_and_published_by_the_worker(ctx, storage, monkeypatch):
+    ft, tmp = ctx
+    body = os.urandom(11 * MIB)
+    upload = direct_upload.start_upload(7, 'clip.mp4', len(body), 'video/mp4')
+    assert (upload.part_size, upload.part_count) == (5 * MIB, 3)
+    _send_parts(storage, upload, body)
+
+    assert direct_upload.claim_for_completion(upload)
+    source = direct_upload.complete_upload(upload)
+    assert source == 'object:' + upload.object_key
+    report = FileUpload(filename='20261018000000_clip.mp4', file_path=object_storage.PENDING_MEDIA,
+                        file_type_id=ft.filetypeid, analysis_status='PENDING')
+    db.session.add(report)
+    db.session.flush()
+    enqueue_analysis(report.id, source)
+    direct_upload.discard(upload.id)
+    db.session.commit()
+    assert object_storage.read_url(report.file_path) is None
+    assert AnalysisJob.query.one().media_kind == 'video'
+
+    def sanitize(path):
+        with open(path + '.clean', 'wb') as f:
+            f.write(b'sanitized')
+        os.replace(path + '.clean', path)
+    monkeypatch.setattr(direct_upload, 'sanitize_in_place', sanitize)
+    analysed = {}
+
+    def analyze(upload_id, path):
+        with open(path, 'rb') as f:
+            analysed[upload_id] = f.read()
+    monkeypatch.setattr(analysis_queue.analysis_service, 'analyze_upload', analyze)
+
+    assert run_pending() == 1
+    assert analysed[report.id] == body                      # analyser saw the raw bytes
+    assert storage.published == {'20261018000000_clip.mp4': b'sanitized'}
+    assert db.session.get(FileUpload, report.id).file_path == 'https://bucket.test/20261018000000_clip.mp4'
+    assert storage.objects == {}                            # incoming object deleted
+    assert AnalysisJob.query.count() == 0 and DirectUpload.query.count() == 0
+    assert os.listdir(tmp) == []
+
+
+def test_missing_part_reopens_the_upload(ctx, storage):
+    upload = direct_upload.start_upload(7, 'clip.mp4', 6 * MIB)
+    storage.parts[upload.object_key][1] = b'x'
+    assert direct_upload.claim_for_completion(upload)
+    assert not direct_upload.claim_for_completion(upload)
+    with pytest.raises(ValueError, match='not uploaded'):
+        direct_upload.complete_upload(upload)
+    assert db.session.get(DirectUpload, upload.id).status == 'OPEN'
+
+    assert direct_upload.claim_for_completion(upload)
+    with pytest.raises(ValueError, match='part numbers'):
+        direct_upload.complete_upload(upload, [{'part_number': 1, 'etag': '"a"'}])
+    assert direct_upload.get_upload(upload.id, 8) is None
+
+
+def test_janitor_aborts_abandoned_uploads(ctx, storage):
+    old = direct_upload.start_upload(7, 'old.mp4', MIB)
+    fresh = direct_upload.start_upload(7, 'new.mp4', MIB)
+    old.created_at = datetime.utcnow() - timedelta(hours=2)
+    db.session.commit()
+    old_key, fresh_id = old.object_key, fresh.id
+
+    assert direct_upload.expire_stale_uploads() == 1
+    assert storage.aborted == [old_key]
+    assert [u.id for u in DirectUpload.query] == [fresh_id]
+
+
+def test_failed_report_drops_the_joined_upload(ctx, storage):
+    upload = direct_upload.start_upload(7, 'clip.mp4', MIB)
+    _send_parts(storage, upload, os.urandom(MIB))
+    assert direct_upload.claim_for_completion(upload)
+    direct_upload.complete_upload(upload)
+    assert upload.object_key in storage.objects
+
+    db.session.add(FileUpload(filename='x', file_path='x', file_type_id=None))   # bad row
+    direct_upload.drop_completed(upload)
+    assert storage.objects == {}
+    assert DirectUpload.query.count() == 0 and FileUpload.query.count() == 0
+
+
+def test_finally_failed_job_deletes_the_incoming_object(ctx, storage, monkeypatch):
+    ft, _ = ctx
+    monkeypatch.setattr(config, 'ANALYSIS_JOB_MAX_ATTEMPTS', 1, raising=False)
+    upload = direct_upload.start_upload(7, 'clip.mp4', MIB)
+    _send_parts(storage, upload, os.urandom(MIB))
+    assert direct_upload.claim_for_completion(upload)
+    source = direct_upload.complete_upload(upload)
+    report = FileUpload(filename='20261018000000_clip.mp4', file_path=object_storage.PENDING_MEDIA,
+                        file_type_id=ft.filetypeid, analysis_status='PENDING')
+    db.session.add(report)
+    db.session.flush()
+    enqueue_analysis(report.id, source)
+    direct_upload.discard(upload.id)
+    db.session.commit()
+
+    def broken_download(key, local_path):
+        raise OSError('bucket unreachable')
+    monkeypatch.setattr(object_storage, 'download_object', broken_download)
+    assert run_pending() == 1
+    assert AnalysisJob.query.one().status == 'FAILED'
+    assert storage.objects == {}                            # no unsanitized leftover
@@ -0,0 +1,176 @@
+"""
+Chunked-upload session store tests (app/file_upload/upload_sessions.py).
+
+Sessions and received chunks live in the database and chunk files under
+CHUNK_UPLOAD_DIR, so any worker can take any chunk: chunks arrive in any
+order, a re-sent chunk replaces the old one, a bad per-chunk checksum is
+rejected, a client can ask what is missing, completion is claimed once, and
+the janitor removes idle sessions and orphaned chunk dirs.
+
+In-memory SQLite with a minimal Flask app.
+"""
+
+import hashlib
+import io
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from flask import Flask
+
+import config
+from app.models import db, UploadChunk, UploadSession
+from app.file_upload import upload_sessions as us
+from app.file_upload.assembly import assemble_chunks
+
+
+@pytest.fixture
+def ctx(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'CHUNK_UPLOAD_DIR', str(tmp_path / 'chunks'), raising=False)
+    monkeypatch.setattr(config, 'CHUNK_SESSION_TTL_HOURS', 1, raising=False)
+    monkeypatch.setattr(us, '_janitor_ran_at', time.monotonic())    # janitor off unless called
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield tmp_path
+        db.session.remove()
+
+
+def _send(session, index, body, sha=None):
+    return us.save_chunk(session, index, io.BytesIO(body), sha)
+
+
+def test_out_of_order_chunks_resume_and_assemble(ctx):
+    parts = [os.urandom(1000), os.urandom(10), os.urandom(500)]
+    session = us.open_session(7, 'clip.mp4', 3, upload_id='upload-0001')
+
+    _send(session, 2, parts[2])
+    _send(session, 0, b'garbage')
+    assert us.missing_chunks(session) == [1]
+
+    # A later request (any worker) resumes the same session from the database.
+    db.session.expunge_all()
+    session = us.get_session('upload-0001', '7')
+    assert us.describe(session)['received'] == [0, 2]
+    _send(session, 0, parts[0])                         # re-sent chunk replaces
+    _send(session, 1, parts[1], hashlib.sha256(parts[1]).hexdigest())
+    assert us.missing_chunks(session) == []
+
+    out = ctx / 'final.mp4'
+    assert assemble_chunks(us.chunk_paths(session), str(out))['size'] == 1510
+    assert out.read_bytes() == b''.join(parts)
+    assert UploadChunk.query.filter_by(session_id='upload-0001').count() == 3
+
+
+def test_checksum_mismatch_and_bad_index_are_rejected(ctx):
+    session = us.open_session(7, 'clip.mp4', 2)
+    with pytest.raises(ValueError, match='checksum'):
+        _send(session, 0, b'abc', hashlib.sha256(b'abd').hexdigest())
+    with pytest.raises(ValueError):
+        _send(session, 2, b'abc')
+    assert us.missing_chunks(session) == [0, 1]
+    assert os.listdir(us.session_dir(session.id)) == []
+
+
+def test_sessions_are_private_to_their_owner(ctx):
+    us.open_session(7, 'clip.mp4', 2, upload_id='upload-0002')
+    assert us.get_session('upload-0002', 8) is None
+    with pytest.raises(ValueError):
+        us.open_session(8, 'clip.mp4', 2, upload_id='upload-0002')
+    with pytest.raises(ValueError):
+        us.open_session(7, 'clip.mp4', 2, upload_id='../../etc')
+
+
+def test_completion_is_claimed_once(ctx):
+    session = us.open_session(7, 'clip.mp4', 1)
+    _send(session, 0, b'x')
+    assert us.claim_for_assembly(session)
+    assert not us.claim_for_assembly(session)
+    db.session.refresh(session)
+    with pytest.raises(ValueError):
+        _send(session, 0, b'late')
+    upload_id = session.id
+    us.discard_session(upload_id)
+    db.session.commit()
+    assert UploadSession.query.count() == 0
+    assert not os.path.exists(us.session_dir(upload_id))
+
+
+def test_janitor_expires_idle_sessions_and_orphan_dirs(ctx, monkeypatch):
+    monkeypatch.setattr(us.tempfile, 'gettempdir', lambda: str(ctx))
+    legacy = ctx / 'melo_chunk_abc123'                  # old in-memory registry dir
+    legacy.mkdir()
+    idle = us.open_session(7, 'old.mp4', 2)
+    _send(idle, 0, b'x')
+    active = us.open_session(7, 'new.mp4', 2)
+    orphan = os.path.join(us.chunk_root(), 'orphan-from-a-crash')
+    os.makedirs(orphan)
+    old = time.time() - 7200
+    os.utime(orphan, (old, old))
+    os.utime(legacy, (old, old))
+    idle.updated_at = datetime.utcnow() - timedelta(hours=2)
+    db.session.commit()
+    idle_id, active_id = idle.id, active.id
+
+    assert us.expire_stale_sessions() == (1, 2)
+    assert [s.id for s in UploadSession.query] == [active_id]
+    assert UploadChunk.query.count() == 0
+    assert not os.path.exists(us.session_dir(idle_id))
+    assert os.path.isdir(us.session_dir(active_id))
+    assert not os.path.exists(orphan) and not legacy.exists()
+
+
+def test_released_claim_keeps_chunks_for_a_retry(ctx):
+    session = us.open_session(7, 'clip.mp4', 2)
+    _send(session, 0, b'good')
+    _send(session, 1, b'corrupt')
+    assert us.claim_for_assembly(session)
+
+    us.release_claim(session)                   # e.g. the whole-file sha256 did not match
+    db.session.refresh(session)
+    assert session.status == 'OPEN'
+    _send(session, 1, b'fixed')
+    assert us.missing_chunks(session) == []
+    assert us.claim_for_assembly(session)
+    out = ctx / 'final.mp4'
+    assert assemble_chunks(us.chunk_paths(session), str(out))['size'] == 9
+
+
+def test_failed_report_keeps_the_session_and_cleans_local_files(ctx, monkeypatch):
+    """/chunk-complete discards the session in the report's transaction: when
+    the report cannot be created, the chunks stay for a retry and the
+    assembled and staged files are removed."""
+    from flask import current_app
+    from flask_jwt_extended import JWTManager, create_access_token
+    from app.models import FileType
+    from app.file_upload import routes
+
+    app = current_app._get_current_object()
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-of-at-least-32-bytes'
+    app.config['UPLOAD_FOLDER'] = str(ctx / 'uploads')
+    JWTManager(app)
+    app.register_blueprint(routes.file_upload_bp)
+    db.session.add(FileType(type_name='Other', allowed_extensions='*'))
+    db.session.commit()
+    monkeypatch.setattr(routes, 'sanitize_in_place', lambda path: None)
+    monkeypatch.setattr(routes, '_should_use_azure', lambda: False)
+
+    def broken(*args, **kwargs):
+        raise RuntimeError('database went away')
+    monkeypatch.setattr(routes, '_report_from_json', broken)
+
+    session = us.open_session(7, 'photo.jpg', 1)
+    _send(session, 0, b'jpeg bytes')
+    upload_id = session.id
+    resp = app.test_client().post('/api/file_upload/chunk-complete', json={'upload_id': upload_id},
+                                  headers={'Authorization': f'Bearer {create_access_token("7")}'})
+    assert resp.status_code == 500, resp.data
+
+    db.session.expire_all()
+    assert db.session.get(UploadSession, upload_id).status == 'OPEN'
+    assert us.missing_chunks(db.session.get(UploadSession, upload_id)) == []
+    assert os.listdir(ctx / 'uploads') == []
@@ -0,0 +1,293 @@
+"""
+app/file_upload/upload_sessions.py
+
+Durable chunked-upload sessions, shared by every API worker.
+
+The chunk registry used to be a module-level dict, so under gunicorn the
+chunks of one upload landed in different processes and /chunk-complete
+answered "Unknown upload_id" from whichever worker had not seen the first
+chunk; a restart lost every upload in flight; and abandoned uploads leaked
+their melo_chunk_ temp dirs forever. Now:
+
+- a session is an upload_sessions row, and each received chunk an
+  upload_chunks row (index, size, SHA-256), so any worker can take any chunk
+  and chunks may arrive in parallel and in any order;
+- chunk files live under the shared CHUNK_UPLOAD_DIR/<upload_id>/, written
+  to a temp name and renamed, so a re-sent chunk replaces the old one whole;
+- a chunk is hashed while it streams to disk and rejected when the client's
+  chunk_sha256 does not match;
+- missing_chunks() lets a client resume after a dropped connection by
+  sending only what the server lacks;
+- completion is claimed with a conditional UPDATE (OPEN -> ASSEMBLING), so
+  two /chunk-complete calls never assemble the same upload twice; a failed
+  assembly, checksum or report insert releases the claim and keeps the
+  chunks, and the session rows go in the report's own transaction;
+- a janitor deletes sessions idle for CHUNK_SESSION_TTL_HOURS with their
+  files, plus chunk dirs no session owns (including the legacy melo_chunk_
+  temp dirs). Each API process runs it at most every
+  CHUNK_JANITOR_INTERVAL_SECONDS; scripts/expire_upload_sessions.py runs it
+  on demand.
+"""
+
+import glob
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+import config
+from app.models import db, UploadChunk, UploadSession
+
+logger = logging.getLogger(__name__)
+
+_UPLOAD_ID = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+_COPY_BLOCK = 1 << 20
+
+_janitor_lock = threading.Lock()
+_janitor_ran_at = None
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def chunk_root():
+    return _cfg('CHUNK_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'melo_chunks'))
+
+
+def session_dir(upload_id):
+    return os.path.join(chunk_root(), upload_id)
+
+
+def chunk_path(upload_id, index):
+    return os.path.join(session_dir(upload_id), f'chunk_{index:05d}')
+
+
+def open_session(owner, filename, total_chunks, file_type=None, upload_id=None):
+    """
+    Return the caller's session for `upload_id`, creating it (and its chunk dir)
+    when new. A new id is generated when none is given. Raises ValueError for
+    a malformed id or chunk count, or an id owned by someone else. Commits.
+    """
+    maybe_expire_stale_sessions()
+    upload_id = upload_id or str(uuid.uuid4())
+    if not _UPLOAD_ID.match(upload_id):
+        raise ValueError('invalid upload_id')
+    session = db.session.get(UploadSession, upload_id)
+    if session is None:
+        if total_chunks < 1:
+            raise ValueError('total_chunks must be at least 1')
+        os.makedirs(session_dir(upload_id), exist_ok=True)
+        db.session.add(UploadSession(id=upload_id, owner=str(owner), filename=filename,
+                                     file_type=file_type, total_chunks=total_chunks))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Another worker opened it first with the same client-made id.
+            db.session.rollback()
+        session = db.session.get(UploadSession, upload_id)
+    if session.owner != str(owner):
+        raise ValueError('Unknown upload_id')
+    return session
+
+
+def get_session(upload_id, owner):
+    """The caller's session, or None (unknown, expired, or not theirs)."""
+    if not upload_id or not _UPLOAD_ID.match(upload_id):
+        return None
+    session = db.session.get(UploadSession, upload_id)
+    if session is None or session.owner != str(owner):
+        return None
+    return session
+
+
+def received_chunks(session):
+    return sorted(i for (i,) in db.session.query(UploadChunk.chunk_index)
+                  .filter(UploadChunk.session_id == session.id))
+
+
+def missing_chunks(session):
+    have = set(received_chunks(session))
+    return [i for i in range(session.total_chunks) if i not in have]
+
+
+def describe(session):
+    """The resumable-upload view of a session."""
+    received = received_chunks(session)
+    have = set(received)
+    ttl = timedelta(hours=_cfg('CHUNK_SESSION_TTL_HOURS', 24))
+    return {
+        'upload_id': session.id,
+        'filename': session.filename,
+        'total_chunks': session.total_chunks,
+        'status': session.status,
+        'received': received,
+        'missing': [i for i in range(session.total_chunks) if i not in have],
+        'expires_at': (session.updated_at + ttl).isoformat(),
+    }
+
+
+def save_chunk(session, index, stream, expected_sha256=None):
+    """
+    Stream one chunk to disk, hashing it as it goes, and record it. A chunk
+    already received is replaced. Raises ValueError for an index out of
+    range, a session already being assembled, or a checksum mismatch (the
+    chunk is then discarded). Commits. Returns {'index', 'size', 'sha256'}.
+    """
+    if session.status != 'OPEN':
+        raise ValueError('upload is already being completed')
+    if not 0 <= index < session.total_chunks:
+        raise ValueError(f'chunk_index must be between 0 and {session.total_chunks - 1}')
+
+    final = chunk_path(session.id, index)
+    os.makedirs(os.path.dirname(final), exist_ok=True)
+    tmp = f'{final}.{uuid.uuid4().hex[:8]}.part'
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp, 'wb') as out:
+            while True:
+                block = stream.read(_COPY_BLOCK)
+                if not block:
+                    break
+                digest.update(block)
+                out.write(block)
+                size += len(block)
+        sha = digest.hexdigest()
+        expected = (expected_sha256 or '').strip().lower()
+        if expected and expected != sha:
+            raise ValueError(f'chunk {index} checksum mismatch')
+        os.replace(tmp, final)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    row = db.session.get(UploadChunk, (session.id, index))
+    if row is None:
+        db.session.add(UploadChunk(session_id=session.id, chunk_index=index, size=size, sha256=sha))
+    else:
+        row.size, row.sha256, row.received_at = size, sha, datetime.utcnow()
+    session.updated_at = datetime.utcnow()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # The same chunk, re-sent in parallel, was recorded by another worker;
+        # the file on disk is whole either way, so record this copy's hash.
+        db.session.rollback()
+        db.session.execute(update(UploadChunk)
+                           .where(UploadChunk.session_id == session.id,
+                                  UploadChunk.chunk_index == index)
+                           .values(size=size, sha256=sha, received_at=datetime.utcnow()))
+        db.session.commit()
+    return {'index': index, 'size': size, 'sha256': sha}
+
+
+def claim_for_assembly(session):
+    """Move an OPEN session to ASSEMBLING. False if another request got
+    there first. Commits."""
+    claimed = db.session.execute(
+        update(UploadSession)
+        .where(UploadSession.id == session.id, UploadSession.status == 'OPEN')
+        .values(status='ASSEMBLING', updated_at=datetime.utcnow())
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def release_claim(session):
+    """Move an ASSEMBLING session back to OPEN after a failed assembly,
+    checksum or report insert (rolled back here), keeping its chunks so the
+    client can re-send what was wrong and complete again. Commits."""
+    db.session.rollback()
+    db.session.execute(
+        update(UploadSession)
+        .where(UploadSession.id == session.id, UploadSession.status == 'ASSEMBLING')
+        .values(status='OPEN', updated_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+
+def chunk_paths(session):
+    return [chunk_path(session.id, i) for i in range(session.total_chunks)]
+
+
+def discard_session(upload_id, files=True):
+    """Delete a session's rows and, with `files`, its chunk files. Does not
+    commit; a caller discarding inside a transaction that may still roll back
+    passes files=False and calls remove_chunk_files after the commit."""
+    UploadChunk.query.filter_by(session_id=upload_id).delete(synchronize_session=False)
+    UploadSession.query.filter_by(id=upload_id).delete(synchronize_session=False)
+    if files:
+        remove_chunk_files(upload_id)
+
+
+def remove_chunk_files(upload_id):
+    shutil.rmtree(session_dir(upload_id), ignore_errors=True)
+
+
+def expire_stale_sessions(now=None):
+    """
+    Delete sessions idle for CHUNK_SESSION_TTL_HOURS (ASSEMBLING ones too --
+    their request died), then chunk dirs older than that which no session
+    owns, including legacy melo_chunk_* temp dirs. Commits.
+    Returns (sessions expired, orphan dirs removed).
+    """
+    now = now or datetime.utcnow()
+    ttl = timedelta(hours=_cfg('CHUNK_SESSION_TTL_HOURS', 24))
+    stale = [sid for (sid,) in db.session.query(UploadSession.id)
+             .filter(UploadSession.updated_at < now - ttl)]
+    for sid in stale:
+        logger.info("Expiring abandoned upload session %s", sid)
+        discard_session(sid)
+    db.session.commit()
+
+    # The same cutoff on the file-mtime clock.
+    cutoff = time.time() + (now - ttl - datetime.utcnow()).total_seconds()
+    live = {sid for (sid,) in db.session.query(UploadSession.id)}
+    root = chunk_root()
+    candidates = [os.path.join(root, name) for name in os.listdir(root)] if os.path.isdir(root) else []
+    candidates += glob.glob(os.path.join(tempfile.gettempdir(), 'melo_chunk_*'))
+    orphans = 0
+    for path in candidates:
+        if os.path.basename(path) in live or not os.path.isdir(path):
+            continue
+        try:
+            if os.path.getmtime(path) >= cutoff:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        orphans += 1
+    if stale or orphans:
+        logger.info("Upload janitor: %d session(s) expired, %d orphan chunk dir(s) removed",
+                    len(stale), orphans)
+    return len(stale), orphans
+
+
+def maybe_expire_stale_sessions():
+    """Run the janitor (chunked sessions, then direct uploads) if this process
+    has not for CHUNK_JANITOR_INTERVAL_SECONDS. Never raises."""
+    global _janitor_ran_at
+    with _janitor_lock:
+        now = time.monotonic()
+        if (_janitor_ran_at is not None
+                and now - _janitor_ran_at < _cfg('CHUNK_JANITOR_INTERVAL_SECONDS', 900)):
+            return
+        _janitor_ran_at = now
+    from .direct_upload import expire_stale_uploads
+
+    for sweep in (expire_stale_sessions, expire_stale_uploads):
+        try:
+            sweep()
+        except Exception:
+            logger.exception("Upload janitor failed")
+            db.session.rollback()
@@ -2,6 +2,7 @@
 
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime, timezone
+from sqlalchemy import case, func, literal_column
 from sqlalchemy.dialects.postgresql import JSON
 
 db = SQLAlchemy()
@@ -100,7 +101,7 @@ class FileUpload(db.Model):
     # can submit without creating an account. Anonymous submissions land
     # as PENDING and are always reviewed by a moderator before going
     # public; the public endpoint is rate-limited per IP.
-    user_id = db.Column(db.Integer, db.ForeignKey('users.userid'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.userid'), nullable=True, index=True)
     file_type_id = db.Column(db.Integer, db.ForeignKey('file_types.filetypeid'), nullable=False)
 
     # Idempotency key from Android local queue — prevents relay duplicates
@@ -136,6 +137,44 @@ class FileUpload(db.Model):
     # (UC3/UC8). Null when text-only or on the unsigned lane.
     media_sha256 = db.Column(db.String(64), nullable=True, index=True)
 
+    # Packed MinHash signature of the report's text (128 x uint32), stamped at
+    # ingest and whenever witness_statement/title change, so near-duplicate
+    # detection (events.independence) need not re-hash every member on every
+    # graph build. Null for text-less reports and rows not yet backfilled
+    # (scripts/backfill_text_signatures.py); readers then hash on the fly.
+    text_minhash = db.Column(db.LargeBinary, nullable=True)
+
+    # Backs the public story feed: filter on verification_status, ORDER BY
+    # upload_date (undated rows last), id, LIMIT -- an index range scan instead
+    # of a full sort. PostgreSQL needs the NULLS LAST spelled into the index to
+    # match the ORDER BY; SQLite already sorts NULL lowest and rejects the
+    # clause, so it gets the plain column list.
+    __table_args__ = (
+        db.Index('ix_file_uploads_feed', verification_status, upload_date, id)
+        .ddl_if(dialect='sqlite'),
+        db.Index('ix_file_uploads_feed', verification_status,
+                 upload_date.desc().nulls_last(), id.desc())
+        .ddl_if(dialect='postgresql'),
+    )
+
+
+# Event feed order: lead with CORROBORATED, then DISPUTED (needs attention,
+# kept prominent), then DEVELOPING; CLOSED sinks to the bottom.
+EVENT_FEED_STATUS_RANK = {'CORROBORATED': 0, 'DISPUTED': 1, 'DEVELOPING': 2, 'CLOSED': 3}
+
+
+def event_feed_rank(status, status_override):
+    """EVENT_FEED_STATUS_RANK over the live status (override wins), as SQL.
+    The literals are inlined, not bound, so the feed query and
+    ix_events_feed_rank render the same expression -- a database only uses an
+    expression index for that exact expression."""
+    live_status = func.coalesce(status_override, status)
+    return case(
+        *[(live_status == literal_column(f"'{name}'"), literal_column(str(rank)))
+          for name, rank in EVENT_FEED_STATUS_RANK.items()],
+        else_=literal_column('9'),
+    )
+
 
 # Event (Incident) model — the primary reader-facing unit. Reports cluster
 # into Events (geo+time, Stage D); corroboration = an Event accumulating
@@ -174,6 +213,26 @@ class Event(db.Model):
     # number the CORROBORATED gate and the reader display should trust.
     independent_source_count = db.Column(db.Integer, default=0, nullable=False)
 
+    # Public-visibility rollup, maintained by recompute_event (which already
+    # reads every member) so read paths never load members to count them.
+    # verified_member_count = VERIFIED members; supporting_count = the anonymous
+    # ones among them; has_public_member = verified_member_count > 0, the gate
+    # for every reader endpoint (unverified content never reaches the public).
+    verified_member_count = db.Column(db.Integer, default=0, nullable=False)
+    supporting_count = db.Column(db.Integer, default=0, nullable=False)
+    has_public_member = db.Column(db.Boolean, default=False, nullable=False, index=True)
+
+    # Version stamp for the in-process open-event grid (app/events/grid.py):
+    # the index_versions counter value at this Event's last grid-relevant
+    # change, so workers fetch only what moved since they last synced.
+    grid_version = db.Column(db.Integer, default=0, nullable=False, index=True)
+
+    # Incremental-recompute state (events/service.py): JSON running sums for the
+    # centroid/confidence, severity max, established-member flag and the
+    # independent-origin union-find, so a new or newly-verified member is folded
+    # in O(1). NULL (legacy rows) means "do a full recompute first".
+    recompute_state = db.Column(db.Text, nullable=True)
+
     # Aggregated metrics (confidence is shown to readers as a band, not raw).
     severity = db.Column(db.String(20), nullable=True)
     confidence_score = db.Column(db.Float, nullable=True)
@@ -191,6 +250,24 @@ class Event(db.Model):
         foreign_keys='FileUpload.event_id',
     )
 
+    # Backs the Event feed's keyset pages: the public-member filter, then an
+    # index scan in feed order (status rank over the live status, then newest
+    # update, undated last, then id).
+    # PostgreSQL needs the NULLS LAST spelled out; SQLite already sorts NULL
+    # lowest and rejects the clause.
+    __table_args__ = (
+        db.Index('ix_events_feed_rank', has_public_member,
+                 event_feed_rank(status, status_override),
+                 updated_at.desc(), id.desc())
+        .ddl_if(dialect='sqlite'),
+        db.Index('ix_events_feed_rank', has_public_member,
+                 event_feed_rank(status, status_override),
+                 updated_at.desc().nulls_last(), id.desc())
+        .ddl_if(dialect='postgresql'),
+        # Bounding-box prefilter for clustering (_find_candidate_event).
+        db.Index('ix_events_geo', lat, lon),
+    )
+
 
 # Durable corroboration-graph snapshot (ADR-0020 Phase 1). An append-only,
 # content-addressed capture of an Event's corroboration state at an archival
@@ -208,14 +285,157 @@ class EventGraphSnapshot(db.Model):
     schema_version = db.Column(db.Integer, nullable=False)
     # Content address of the graph (lowercase-hex SHA-256), also the dedup key.
     graph_sha256 = db.Column(db.String(64), nullable=False, index=True)
-    # The full canonical graph JSON, verbatim and exportable.
-    graph_json = db.Column(db.Text, nullable=False)
+    # Where the graph lives (ADR-0026): a manifest of content-addressed chunks
+    # in snapshot_chunks, reassembled byte-identically by
+    # events.snapshot_store.load_graph_json. graph_json holds the verbatim
+    # canonical text only on rows not yet converted to chunks.
+    manifest_json = db.Column(db.Text, nullable=True)
+    graph_json = db.Column(db.Text, nullable=True)
     # Effective status + what triggered the capture, for cheap querying.
     status = db.Column(db.String(20), nullable=True)
     reason = db.Column(db.String(40), nullable=True)  # corroborated|disputed|closed|manual
     created_at = db.Column(db.DateTime, default=_utcnow, index=True)
 
 
+# One unique piece of stored snapshot text (ADR-0026): a graph header or a
+# single source node, addressed by the SHA-256 of its raw bytes and stored once
+# however many snapshots reference it. New table -> created by
+# db.create_all().
+class SnapshotChunk(db.Model):
+    __tablename__ = 'snapshot_chunks'
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    codec = db.Column(db.String(8), nullable=False)      # zlib | zstd
+    size = db.Column(db.Integer, nullable=False)         # raw bytes
+    data = db.Column(db.LargeBinary, nullable=False)
+
+
+# Archival transitions awaiting the background snapshot writer
+# (events/snapshot_writer.py). Written in the transition's own transaction with
+# the graph's inputs captured as they were, so a committed transition always
+# has either a snapshot or one of these rows; the writer deletes the row in the
+# transaction that stores the snapshot. New table -> created by
+# db.create_all(); no ensure_schema_compatibility entry needed.
+class PendingSnapshot(db.Model):
+    __tablename__ = 'pending_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
+    reason = db.Column(db.String(40), nullable=True)
+    # archive.capture_graph_inputs output, as JSON.
+    capture_json = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=_utcnow)
+
+
+# Cross-event near-duplicate text index (events/campaigns.py): one row per
+# recent report per LSH band of its text signature, so "which recent reports
+# share a bucket with this one" is an index lookup, not a scan. Maintained by
+# FileUpload mapper hooks, pruned to CAMPAIGN_WINDOW_HOURS, and rebuildable
+# from file_uploads at any time. New table -> created by db.create_all().
+class TextLshBucket(db.Model):
+    __tablename__ = 'text_lsh_buckets'
+
+    id = db.Column(db.Integer, primary_key=True)
+    band = db.Column(db.SmallInteger, nullable=False)
+    bucket = db.Column(db.BigInteger, nullable=False)
+    upload_id = db.Column(db.Integer, nullable=False, index=True)
+    upload_date = db.Column(db.DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        db.Index('ix_text_lsh_buckets_lookup', band, bucket, upload_date),
+    )
+
+
+# Durable media-analysis queue (file_upload/analysis_queue.py). The API only
+# inserts rows, in the ingest transaction; worker processes claim them with a
+# conditional UPDATE, so a job survives restarts and runs once at a time.
+# source_path is the raw copy staged on the shared uploads volume. A job row is
+# deleted when it completes; FAILED rows stay for inspection. New table ->
+# created by db.create_all().
+class AnalysisJob(db.Model):
+    __tablename__ = 'analysis_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    upload_id = db.Column(db.Integer, db.ForeignKey('file_uploads.id'), nullable=False, index=True)
+    source_path = db.Column(db.String(512), nullable=False)
+    media_kind = db.Column(db.String(10), nullable=False)       # image|video|audio|other
+    status = db.Column(db.String(10), default='QUEUED', nullable=False)  # QUEUED|RUNNING|FAILED
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    run_after = db.Column(db.DateTime, default=_utcnow, nullable=False)
+    locked_by = db.Column(db.String(64), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=_utcnow)
+
+    __table_args__ = (
+        db.Index('ix_analysis_jobs_next', status, run_after, id),
+    )
+
+
+# Chunked-upload sessions (file_upload/upload_sessions.py). The session and
+# one row per received chunk live here, and the chunk files on the shared
+# CHUNK_UPLOAD_DIR, so any API worker can take any chunk, a client can ask
+# which chunks are still missing, and a restart loses nothing. Rows are
+# deleted on completion or by the idle-session janitor. New tables ->
+# created by db.create_all().
+class UploadSession(db.Model):
+    __tablename__ = 'upload_sessions'
+
+    id = db.Column(db.String(64), primary_key=True)             # the client's upload_id
+    owner = db.Column(db.String(64), nullable=True, index=True)  # JWT identity
+    filename = db.Column(db.String(255), nullable=False)
+    file_type = db.Column(db.String(100), nullable=True)
+    total_chunks = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(12), default='OPEN', nullable=False)  # OPEN|ASSEMBLING
+    created_at = db.Column(db.DateTime, default=_utcnow)
+    updated_at = db.Column(db.DateTime, default=_utcnow, nullable=False, index=True)
+
+
+class UploadChunk(db.Model):
+    __tablename__ = 'upload_chunks'
+
+    session_id = db.Column(db.String(64), db.ForeignKey('upload_sessions.id'), primary_key=True)
+    chunk_index = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    size = db.Column(db.Integer, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=False)
+    received_at = db.Column(db.DateTime, default=_utcnow)
+
+
+# Web uploads going straight to object storage in parts (file_upload/
+# direct_upload.py, ADR-0030). The row ties our upload id to the backend's
+# multipart upload so any API worker can sign part URLs or complete it. Deleted
+# once the report is created, or when the upload is aborted or expires. New
+# table -> created by db.create_all().
+class DirectUpload(db.Model):
+    __tablename__ = 'direct_uploads'
+
+    id = db.Column(db.String(64), primary_key=True)
+    owner = db.Column(db.String(64), nullable=True, index=True)  # JWT identity
+    backend = db.Column(db.String(10), nullable=False)           # s3|azure
+    object_key = db.Column(db.String(512), nullable=False)       # incoming/<id>/<name>
+    storage_upload_id = db.Column(db.String(1024), nullable=True)  # S3 UploadId
+    filename = db.Column(db.String(255), nullable=False)
+    content_type = db.Column(db.String(100), nullable=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    part_size = db.Column(db.BigInteger, nullable=False)
+    part_count = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(12), default='OPEN', nullable=False)  # OPEN|COMPLETING
+    created_at = db.Column(db.DateTime, default=_utcnow, nullable=False, index=True)
+
+
+# Named monotonic counters that let per-process caches notice writes made by
+# other workers (gunicorn runs several). A writer bumps the row in the same
+# transaction as the change; readers compare it with the value they last synced
+# at. The row lock orders concurrent bumps, so versions commit in sequence.
+# New table -> created by db.create_all(); no ensure_schema_compatibility entry
+# needed.
+class IndexVersion(db.Model):
+    __tablename__ = 'index_versions'
+
+    name = db.Column(db.String(40), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+
+
 # Append-only audit log of moderator + steward actions. Every verify/reject
 # (incl. reversals) and every rung/role change writes one row here, so a decision
 # is never silently overwritten -- the FileUpload/User carries the *current*
@@ -82,10 +82,11 @@ def apply_rung_gate(upload):
     return upload.verification_status
 
 
-def compute_priority(upload):
+def compute_priority(upload, now=None):
     """Attention score for the PENDING queue (higher = reviewed sooner). Not
     FIFO: severity + sensitivity + media + low-rung + would-tip-to-CORROBORATED,
-    with an anti-starvation aging nudge."""
+    with an anti-starvation aging nudge. `now` pins the aging clock, so a paged
+    queue scores every page against the same instant (defaults to the present)."""
     score = float(_SEVERITY_PRIORITY.get((upload.severity or 'LOW').upper(), 10))
     if getattr(upload, 'is_sensitive', False):
         score += 50
@@ -105,6 +106,6 @@ def compute_priority(upload):
         when = upload.upload_date
         if when.tzinfo is None:
             when = when.replace(tzinfo=timezone.utc)
-        age_min = max(0.0, (_utcnow() - when).total_seconds() / 60.0)
+        age_min = max(0.0, ((now or _utcnow()) - when).total_seconds() / 60.0)
         score += min(age_min * 0.5, 120)
     return score
@@ -23,9 +23,12 @@ from functools import wraps
 from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-from app.models import db, FileUpload, User, Event, AuditLog
-from app.story.serializers import serialize_upload
+from app.models import db, FileUpload, User, AuditLog
+from app.story.serializers import serialize_upload, serialize_uploads
+from app.story.track_record import refresh_track_records
+from app.events.campaigns import maybe_prune_campaign_index, near_duplicates
 from app.moderation import audit
+from app.utils.cursor import decode_cursor, encode_cursor
 
 moderation_bp = Blueprint('moderation', __name__, url_prefix='/api/moderation')
 
@@ -76,6 +79,14 @@ def queue():
     status : PENDING (default) | VERIFIED | REJECTED
     limit  : int (default 50, max 200)
     offset : int (default 0)
+    cursor : paging.next_cursor from the previous page (replaces offset).
+             PENDING pages on (priority, id) scored at the first page's
+             instant, so aging can't reshuffle items across pages; the audit
+             views page on (upload_date, id).
+
+    Each item carries ``campaign_flags``: advisory hits from the cross-event
+    near-duplicate index (events.campaigns) -- recent reports elsewhere that
+    share most of its wording. Empty when there are none.
     """
     status = (request.args.get('status') or 'PENDING').upper()
     if status not in _VALID_STATUSES:
@@ -83,36 +94,92 @@ def queue():
 
     limit = min(max(request.args.get('limit', default=50, type=int), 1), 200)
     offset = max(request.args.get('offset', default=0, type=int), 0)
+    cursor = request.args.get('cursor') or None
 
     q = FileUpload.query.filter(FileUpload.verification_status == status)
 
-    if status == 'PENDING':
-        # Attention-ordered, not FIFO: priority depends on event state + age, so
-        # sort in Python. Pilot scale is small; revisit with a SQL score if it grows.
-        from app.moderation.gate import compute_priority
-        all_rows = q.all()
-        all_rows.sort(key=compute_priority, reverse=True)
-        total = len(all_rows)
-        rows = all_rows[offset:offset + limit]
-    else:
-        # Audit views (VERIFIED / REJECTED) stay newest-first.
-        q = q.order_by(FileUpload.upload_date.desc())
-        total = q.count()
-        rows = q.limit(limit).offset(offset).all()
+    try:
+        if status == 'PENDING':
+            rows, has_more, next_cursor, total = _pending_page(q, limit, offset, cursor)
+        else:
+            rows, has_more, next_cursor = _audit_page(q, limit, offset, cursor)
+            total = q.count()
+    except ValueError:
+        return jsonify({'error': 'invalid cursor'}), 400
+    if cursor:
+        offset = 0
+
+    items = serialize_uploads(rows)
+    maybe_prune_campaign_index()
+    campaign = near_duplicates(rows)
+    for item, row in zip(items, rows):
+        item['campaign_flags'] = [campaign[row.id]] if row.id in campaign else []
 
     return jsonify({
-        'items': [serialize_upload(r) for r in rows],
+        'items': items,
         'paging': {
             'limit': limit,
             'offset': offset,
             'returned': len(rows),
             'total': total,
-            'has_more': (offset + limit) < total,
+            'has_more': has_more,
+            'next_cursor': next_cursor,
         },
         'filters': {'status': status},
     }), 200
 
 
+def _pending_page(q, limit, offset, cursor):
+    """Attention-ordered, not FIFO: priority depends on event state + age, so
+    score in Python. Pilot scale is small; revisit with a SQL score if it grows.
+
+    Every page therefore loads and scores the whole PENDING queue: O(queue
+    size) per request, however small the page. A stored priority column would
+    go stale (age, the Event's corroboration and the reporter's rung all move
+    without the report changing), so there is no index to page on yet. The
+    total comes from the rows already loaded rather than a second COUNT.
+
+    The cursor carries the scoring instant along with the last (priority, id),
+    so every page ranks the same snapshot of ages and a deep page neither
+    repeats nor skips an item that aged past the cursor in the meantime."""
+    from app.moderation.gate import compute_priority, _utcnow
+    if cursor:
+        as_of, prio, last_id = decode_cursor(cursor, 3)
+        if not (isinstance(as_of, datetime) and isinstance(prio, (int, float))
+                and isinstance(last_id, int)):
+            raise ValueError('invalid cursor')
+        as_of = as_of.replace(tzinfo=timezone.utc)
+        offset = 0
+    else:
+        as_of = _utcnow()
+    scored = sorted(((compute_priority(r, now=as_of), r.id, r) for r in q.all()),
+                    key=lambda t: (t[0], t[1]), reverse=True)
+    total = len(scored)
+    if cursor:
+        scored = [t for t in scored if (t[0], t[1]) < (prio, last_id)]
+    page = scored[offset:offset + limit]
+    has_more = len(scored) > offset + limit
+    next_cursor = encode_cursor(as_of, page[-1][0], page[-1][1]) if has_more and page else None
+    return [r for _, _, r in page], has_more, next_cursor, total
+
+
+def _audit_page(q, limit, offset, cursor):
+    """Audit views (VERIFIED / REJECTED) stay newest-first, keyset-paged on
+    (upload_date, id) over ix_file_uploads_feed like the public story feed."""
+    from app.story.service import _order_by, _published_after
+    if cursor:
+        when, last_id = decode_cursor(cursor, 2)
+        if not (isinstance(last_id, int) and (when is None or isinstance(when, datetime))):
+            raise ValueError('invalid cursor')
+        q = q.filter(_published_after(when, last_id, order='desc'))
+        offset = 0
+    rows = q.order_by(*_order_by('published_at', 'desc')).offset(offset).limit(limit + 1).all()
+    page = rows[:limit]
+    has_more = len(rows) > limit
+    next_cursor = encode_cursor(page[-1].upload_date, page[-1].id) if has_more and page else None
+    return page, has_more, next_cursor
+
+
 @moderation_bp.route('/<int:upload_id>/verify', methods=['POST'])
 @moderator_required
 def verify(upload_id):
@@ -141,7 +208,7 @@ def verify(upload_id):
     )
 
     # A verification changes the Event's corroboration — recompute its status.
-    _recompute_owning_event(upload)
+    _recompute_owning_event(upload, prev)
 
     try:
         db.session.commit()
@@ -191,16 +258,19 @@ def reject(upload_id):
     return jsonify(serialize_upload(upload)), 200
 
 
-def _recompute_owning_event(upload):
-    """Recompute the Event a report belongs to after its verification changes.
-    No-op for reports that aren't clustered (shouldn't happen post-Stage-D, but
-    older rows may predate event assignment)."""
-    if not upload.event_id:
-        return
-    from app.events.service import recompute_event
-    event = db.session.get(Event, upload.event_id)
-    if event:
-        recompute_event(event)
+def _recompute_owning_event(upload, prev=None):
+    """Mark the Event a report belongs to dirty after its verification changes
+    from `prev`; it is re-derived (members' track records included) once at
+    commit. A first approval can be folded in incrementally; rejections and
+    reversals take the full recompute. Reports that aren't clustered
+    (shouldn't happen post-Stage-D, but older rows may predate event
+    assignment) only refresh their reporter's track record."""
+    from app.events.service import mark_dirty
+    if upload.event_id:
+        first_approval = prev == 'PENDING' and upload.verification_status == 'VERIFIED'
+        mark_dirty(upload.event_id, verified=upload if first_approval else None)
+    else:
+        refresh_track_records({upload.user_id})
 
 
 @moderation_bp.route('/users', methods=['GET'])
@@ -266,17 +336,17 @@ def _parse_rung(data):
 def _vouch_user_to_rung(user, rung):
     """Set the user's rung and re-derive their events. A bump to rung 2+ can
     immediately let the reporter's existing corroborated events auto-reach
-    CORROBORATED, so re-evaluate those events here. Commits."""
+    CORROBORATED, so mark those events dirty; the commit re-derives each once,
+    loaded in one query however many reports the user has. Commits."""
     user.trust_rung = rung
-    from app.events.service import recompute_event
-    event_ids = {
-        fu.event_id for fu in FileUpload.query.filter_by(user_id=user.userid).all()
-        if fu.event_id
-    }
-    for eid in event_ids:
-        ev = db.session.get(Event, eid)
-        if ev:
-            recompute_event(ev)
+    from app.events.service import mark_dirty
+    event_ids = (
+        db.session.query(FileUpload.event_id)
+        .filter(FileUpload.user_id == user.userid, FileUpload.event_id.isnot(None))
+        .distinct()
+    )
+    for (eid,) in event_ids:
+        mark_dirty(eid)
     db.session.commit()
 
 
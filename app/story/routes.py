@@ -25,7 +25,7 @@ from app.utils.rate_limit import per_user_or_ip_key
 from app.models import db, FileUpload, FileType
 from app.utils.azure_blob import upload_file_to_azure_storage
 from app.file_upload.media_sanitizer import sanitize_for_upload, safe_remove
-from app.file_upload.analysis_service import start_analysis_thread
+from app.file_upload.analysis_queue import enqueue_analysis
 from .service import list_stories, list_story_markers, get_story, get_facets, ingest_story
 
 logger = logging.getLogger(__name__)
@@ -110,6 +110,7 @@ def stories_list():
       order=desc|asc
       limit=<int>   (max 500)
       offset=<int>
+      cursor=<paging.next_cursor>   keyset paging; sort=published_at only
     """
     source = request.args.get('source', 'all')
     if source not in _VALID_SOURCES:
@@ -123,21 +124,25 @@ def stories_list():
     if order not in _VALID_ORDERS:
         order = 'desc'
 
-    result = list_stories(
-        source=source,
-        q=request.args.get('q'),
-        city=request.args.get('city'),
-        country=request.args.get('country'),
-        severity=request.args.get('severity'),
-        has_location=_parse_bool(request.args.get('has_location')),
-        has_media=_parse_bool(request.args.get('has_media')),
-        from_date=_parse_date(request.args.get('from')),
-        to_date=_parse_date(request.args.get('to')),
-        sort=sort,
-        order=order,
-        limit=min(request.args.get('limit', default=50, type=int), 500),
-        offset=max(request.args.get('offset', default=0, type=int), 0),
-    )
+    try:
+        result = list_stories(
+            source=source,
+            q=request.args.get('q'),
+            city=request.args.get('city'),
+            country=request.args.get('country'),
+            severity=request.args.get('severity'),
+            has_location=_parse_bool(request.args.get('has_location')),
+            has_media=_parse_bool(request.args.get('has_media')),
+            from_date=_parse_date(request.args.get('from')),
+            to_date=_parse_date(request.args.get('to')),
+            sort=sort,
+            order=order,
+            limit=min(request.args.get('limit', default=50, type=int), 500),
+            offset=max(request.args.get('offset', default=0, type=int), 0),
+            cursor=request.args.get('cursor') or None,
+        )
+    except ValueError as exc:
+        return jsonify({'error': str(exc)}), 400
 
     result['filters'] = {
         'source': source,
@@ -402,15 +407,14 @@ def stories_anonymous_ingest():
         # The rung gate keeps anonymous (rung 0) reports pre-moderated.
         from app.events.service import process_new_report
         process_new_report(record)
+        if analysis_source_path:
+            enqueue_analysis(record.id, analysis_source_path)
         db.session.commit()
     except Exception as exc:
         db.session.rollback()
         current_app.logger.exception("anonymous ingest commit failed")
         return jsonify({'error': 'Submission failed'}), 500
 
-    if analysis_source_path:
-        start_analysis_thread(record.id, analysis_source_path)
-
     # Opaque acknowledgement — no IDs returned. Anonymous means the
     # submitter has no handle to come back with.
     return jsonify({'status': 'received', 'pending_review': True}), 201
@@ -8,9 +8,11 @@ summary, analytics) should consume going forward.
 
 import re
 
-from sqlalchemy import func
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import db, FileUpload, Event
+from app.models import db, Event, User
 
 _IMAGE_EXTS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
 _VIDEO_EXTS = {'mp4', 'avi', 'mpeg', 'mov', 'webm', 'ogv'}
@@ -41,50 +43,29 @@ def confidence_band(score):
     return 'HIGH'
 
 
-def reporter_track_record(user_id):
-    """Compute a reporter's public track record from current state (ADR-0012).
-
-    Derived on read, never a stored counter: `corroborated_count` is volatile
-    (an Event can leave CORROBORATED when a member is rejected/disputed/closed),
-    so a maintained counter would drift on every reversal path. Mirrors how
-    `events.service.recompute_event` derives corroboration fresh.
-
-    Both counts are REPORTS, so the chip's "X of Y reports corroborated" ratio
-    never mixes units (refines ADR-0012, which originally counted the numerator
-    as distinct events — that made "1 of 2" show when a reporter filed twice into
-    one corroborated event, misreading as "only one report corroborated").
-
-    - reports_count      = the reporter's VERIFIED (published) reports only.
-    - corroborated_count = of those, the ones whose Event's live status is
-      CORROBORATED (honors status_override). Always <= reports_count.
-
-    Returns (reports_count, corroborated_count). At pilot scale these are two
-    cheap indexed counts; one chip per report means the feed does N of them —
-    fine here, batch by user_id if it ever isn't.
-    """
-    reports_count = (
-        db.session.query(func.count(FileUpload.id))
-        .filter(
-            FileUpload.user_id == user_id,
-            FileUpload.verification_status == 'VERIFIED',
-        )
-        .scalar()
-    ) or 0
-
-    live_status = func.coalesce(Event.status_override, Event.status)
-    corroborated_count = (
-        db.session.query(func.count(FileUpload.id))
-        .select_from(FileUpload)
-        .join(Event, FileUpload.event_id == Event.id)
-        .filter(
-            FileUpload.user_id == user_id,
-            FileUpload.verification_status == 'VERIFIED',
-            live_status == 'CORROBORATED',
-        )
-        .scalar()
-    ) or 0
-
-    return reports_count, corroborated_count
+def preload_related(uploads, relation, model, fk):
+    """Fill `upload.<relation>` (a many-to-one such as user or event) for every
+    upload from at most one IN query, so serializing a page never falls back to
+    one lazy SELECT per item. Rows already in the session are reused without a
+    query; relations that are already loaded are left alone."""
+    pk = model.__mapper__.primary_key[0]
+    pending = [u for u in uploads
+               if getattr(u, fk) is not None and relation in sa_inspect(u).unloaded]
+    if not pending:
+        return
+    found = {}
+    missing = set()
+    for key in {getattr(u, fk) for u in pending}:
+        obj = db.session.identity_map.get(identity_key(model, key))
+        if obj is None:
+            missing.add(key)
+        else:
+            found[key] = obj
+    if missing:
+        found.update((getattr(obj, pk.key), obj)
+                     for obj in model.query.filter(pk.in_(missing)).all())
+    for u in pending:
+        set_committed_value(u, relation, found.get(getattr(u, fk)))
 
 
 def serialize_reporter(upload):
@@ -92,9 +73,10 @@ def serialize_reporter(upload):
 
     Shows the *basis* of trust: a pseudonymous handle + trust rung + track
     record, or an explicit anonymous/unverifiable marker. The track record is
-    computed on read (ADR-0012), not read off a stored counter. is_signed
-    reflects an on-device cryptographic signature (tamper-evidence); web/anon
-    reports are the unsigned lane.
+    the User's maintained reports_count / corroborated_count (ADR-0024, with
+    the ADR-0012 definitions; see story/track_record.py), so a chip costs no
+    query beyond its User row. is_signed reflects an on-device cryptographic
+    signature (tamper-evidence); web/anon reports are the unsigned lane.
     """
     is_signed = bool(getattr(upload, 'report_signature', None))
     user = getattr(upload, 'user', None)
@@ -107,12 +89,11 @@ def serialize_reporter(upload):
             'is_anonymous': True,
             'is_signed': is_signed,
         }
-    reports_count, corroborated_count = reporter_track_record(upload.user_id)
     return {
         'handle': user.display_handle or user.username,
         'rung': getattr(user, 'trust_rung', 1),
-        'reports_count': reports_count,
-        'corroborated_count': corroborated_count,
+        'reports_count': user.reports_count or 0,
+        'corroborated_count': user.corroborated_count or 0,
         'is_anonymous': False,
         'is_signed': is_signed,
     }
@@ -146,6 +127,16 @@ def _media_ext(value):
     return seg.rsplit('.', 1)[-1].lower() if '.' in seg else ''
 
 
+def serialize_uploads(uploads):
+    """Serialize a page of FileUploads with a fixed number of queries — the
+    page's User rows (which carry the track record) and Events in one query
+    each — instead of several per item."""
+    uploads = list(uploads)
+    preload_related(uploads, 'user', User, 'user_id')
+    preload_related(uploads, 'event', Event, 'event_id')
+    return [serialize_upload(u) for u in uploads]
+
+
 def serialize_upload(upload):
     """Convert a FileUpload ORM record to a normalized Story dict."""
     # Type the media from the stored PATH (which carries the real .mp4/.jpg
@@ -229,13 +220,9 @@ def serialize_event(event, include_members=False):
     two SEPARATE numbers — `counted` (distinct non-anonymous VERIFIED
     identities, the falsifiable signal) and `supporting` (anonymous VERIFIED
     members, context only). status reflects a sticky moderator override when
-    present. Confidence is a band, never a raw decimal.
+    present. Confidence is a band, never a raw decimal. The member counts are
+    the rollup recompute_event stores, so only include_members loads members.
     """
-    # Public view: only VERIFIED members count and are listed — unverified
-    # reports never reach the public feed.
-    verified = [m for m in (getattr(event, 'members', []) or [])
-                if m.verification_status == 'VERIFIED']
-    supporting = sum(1 for m in verified if m.user_id is None)
     data = {
         'id': event.id,
         'status': event.status_override or event.status,
@@ -261,10 +248,10 @@ def serialize_event(event, include_members=False):
             'independent': (event.independent_source_count
                             if event.independent_source_count is not None
                             else (event.corroboration_count or 0)),
-            'supporting': supporting,
+            'supporting': event.supporting_count or 0,
         },
         'dispute_count': event.dispute_count or 0,
-        'member_count': len(verified),
+        'member_count': event.verified_member_count or 0,
         'timestamps': {
             'created_at': event.created_at.isoformat() if event.created_at else None,
             'updated_at': event.updated_at.isoformat() if event.updated_at else None,
@@ -276,7 +263,11 @@ def serialize_event(event, include_members=False):
         # developing — one account, then another independently backing it. ISO
         # timestamps sort lexically; a missing time sorts first. Ordering uses
         # the reporter's self-declared signed published_at (narrative, not proof).
-        members = [serialize_upload(m) for m in verified]
+        # Public view: only VERIFIED members are listed — unverified reports
+        # never reach the public feed.
+        verified = [m for m in (event.members or [])
+                    if m.verification_status == 'VERIFIED']
+        members = serialize_uploads(verified)
         members.sort(key=lambda s: (s.get('timestamps') or {}).get('published_at') or '')
         data['members'] = members
     return data
@@ -1,18 +1,20 @@
 """
 app/story/service.py
 
-Citizen story retrieval. Queries FileUpload, normalizes each record via
-serializers, sorts, and pages the result.
+Citizen story retrieval. Filters, sorts and pages FileUpload in SQL, then
+normalizes only the returned page via serializers.
 """
 
 import logging
 from datetime import datetime, timezone
 
-from sqlalchemy import or_, distinct
+from sqlalchemy import and_, asc, case, desc, distinct, or_
 from sqlalchemy.exc import IntegrityError
 
 from app.models import db, FileUpload
-from .serializers import serialize_upload
+from app.utils.cursor import decode_cursor, encode_cursor
+from modules.object_storage import _NO_MEDIA
+from .serializers import serialize_upload, serialize_uploads
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +40,7 @@ def list_stories(
     limit=50,
     offset=0,
     include_unverified=False,
+    cursor=None,
 ):
     """
     Return a paged list of normalized Story dicts from one or more sources.
@@ -56,34 +59,46 @@ def list_stories(
     include_unverified : when False (default), citizen uploads that are
         still PENDING or REJECTED are excluded — only moderator-approved
         stories reach the public feed. Set True for moderator views.
+    cursor : opaque paging.next_cursor from a previous page. Keyset paging
+        on (published_at, id) — replaces offset, and stays stable while new
+        stories are ingested. Only valid with sort='published_at'; raises
+        ValueError on a malformed cursor or another sort.
     """
-    stories = []
-
-    if source in ('all', 'upload'):
-        stories.extend(_query_uploads(
-            q, city, country, severity, has_location, from_date, to_date,
-            include_unverified=include_unverified,
-        ))
-
+    after = None
+    if cursor is not None:
+        if sort != 'published_at':
+            raise ValueError('cursor paging requires sort=published_at')
+        after = decode_cursor(cursor, 2)
+        if not (isinstance(after[1], int)
+                and (after[0] is None or isinstance(after[0], datetime))):
+            raise ValueError('invalid cursor')
+        offset = 0
+
+    if source not in ('all', 'upload'):
+        return _page([], limit, offset, sort)
+
+    fq = _upload_query(
+        q, city, country, severity, has_location, from_date, to_date,
+        include_unverified=include_unverified,
+    )
     if has_media is True:
-        stories = [s for s in stories if s['media']['primary_url']]
+        fq = fq.filter(_has_media_expr())
     elif has_media is False:
-        stories = [s for s in stories if not s['media']['primary_url']]
-
-    _sort_stories(stories, sort, order)
-
-    total = len(stories)
-    page = stories[offset: offset + limit]
+        fq = fq.filter(~_has_media_expr())
+    if after is not None:
+        fq = fq.filter(_published_after(*after, order=order))
+    fq = fq.order_by(*_order_by(sort, order))
+
+    # Only the requested page is fetched and serialized (presigning and the
+    # reporter chip are per-row costs). One extra row is read so has_more is
+    # known without a COUNT over the whole filtered set.
+    try:
+        rows = fq.offset(offset).limit(limit + 1).all()
+    except Exception as exc:
+        logger.error("story service: upload query failed: %s", exc)
+        rows = []
 
-    return {
-        'items': page,
-        'paging': {
-            'limit': limit,
-            'offset': offset,
-            'returned': len(page),
-            'has_more': (offset + limit) < total,
-        },
-    }
+    return _page(rows, limit, offset, sort)
 
 
 def list_story_markers(
@@ -358,36 +373,85 @@ def get_story(source_type, source_record_id, include_unverified=False):
 # Private helpers
 # ---------------------------------------------------------------------------
 
-def _published_at_key(story):
-    ts = story['timestamps']['published_at']
-    if ts:
-        try:
-            dt = datetime.fromisoformat(ts)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except (ValueError, OverflowError):
-            pass
-    return datetime.min.replace(tzinfo=timezone.utc)
+def _page(rows, limit, offset, sort):
+    page = rows[:limit]
+    has_more = len(rows) > limit
+    next_cursor = None
+    if has_more and page and sort == 'published_at':
+        next_cursor = encode_cursor(page[-1].upload_date, page[-1].id)
+    return {
+        'items': serialize_uploads(page),
+        'paging': {
+            'limit': limit,
+            'offset': offset,
+            'returned': len(page),
+            'has_more': has_more,
+            'next_cursor': next_cursor,
+        },
+    }
+
+
+def _has_media_expr():
+    """SQL twin of `read_url(file_path) is not None` -- the Story's primary_url
+    is set exactly when file_path is a real reference, not a no-media sentinel."""
+    return and_(
+        FileUpload.file_path.isnot(None),
+        FileUpload.file_path.notin_(sorted(_NO_MEDIA)),
+    )
+
+
+def _severity_rank_expr():
+    """Mirrors _SEVERITY_ORDER; NULL/unknown rank as LOW like the old sort."""
+    return case(
+        *[(FileUpload.severity == sev, rank) for sev, rank in _SEVERITY_ORDER.items()],
+        else_=1,
+    )
+
 
+def _confidence_rank_expr():
+    """Rank by confidence *band* (serializers.confidence_band thresholds), not
+    the raw score -- the feed never orders on precision it doesn't show."""
+    score = FileUpload.confidence_score
+    return case(
+        (score.is_(None), 0),
+        (score < 0.34, 1),
+        (score < 0.67, 2),
+        else_=3,
+    )
 
-def _sort_stories(stories, sort, order):
-    reverse = order != 'asc'
+
+def _order_by(sort, order):
+    """ORDER BY clauses for the feed. Every sort ends on id so paging is stable
+    across requests (equal keys would otherwise shuffle between pages)."""
+    direction = asc if order == 'asc' else desc
     if sort == 'confidence':
-        # The Story dict exposes a band, not the raw score (ADR-0006); rank it.
-        _band_rank = {'HIGH': 3, 'MEDIUM': 2, 'LOW': 1}
-        stories.sort(key=lambda s: _band_rank.get(s['metrics']['confidence_band'], 0),
-                     reverse=reverse)
+        keys = [_confidence_rank_expr()]
     elif sort == 'severity':
-        stories.sort(
-            key=lambda s: _SEVERITY_ORDER.get(s['metrics']['severity'] or 'LOW', 1),
-            reverse=reverse,
-        )
+        keys = [_severity_rank_expr()]
     else:
-        stories.sort(key=_published_at_key, reverse=reverse)
-
-
-def _query_uploads(q, city, country, severity, has_location, from_date, to_date, include_unverified=False):
+        # An undated row sorts as the oldest possible story in either
+        # direction (SQLite and PostgreSQL disagree on where NULLs go by
+        # default). Spelled so ix_file_uploads_feed serves it directly.
+        published = direction(FileUpload.upload_date)
+        keys = [published.nulls_first() if order == 'asc' else published.nulls_last()]
+        return keys + [direction(FileUpload.id)]
+    return [direction(k) for k in keys] + [direction(FileUpload.id)]
+
+
+def _published_after(when, upload_id, order):
+    """Keyset predicate: rows strictly after (when, upload_id) in the
+    published_at order _order_by produces (undated rows are the oldest)."""
+    date, row_id = FileUpload.upload_date, FileUpload.id
+    if order == 'asc':
+        if when is None:
+            return or_(and_(date.is_(None), row_id > upload_id), date.isnot(None))
+        return or_(date > when, and_(date == when, row_id > upload_id))
+    if when is None:
+        return and_(date.is_(None), row_id < upload_id)
+    return or_(date < when, and_(date == when, row_id < upload_id), date.is_(None))
+
+
+def _upload_query(q, city, country, severity, has_location, from_date, to_date, include_unverified=False):
     fq = FileUpload.query
 
     if not include_unverified:
@@ -413,9 +477,4 @@ def _query_uploads(q, city, country, severity, has_location, from_date, to_date,
         fq = fq.filter(FileUpload.upload_date >= from_date)
     if to_date:
         fq = fq.filter(FileUpload.upload_date <= to_date)
-
-    try:
-        return [serialize_upload(r) for r in fq.all()]
-    except Exception as exc:
-        logger.error("story service: upload query failed: %s", exc)
-        return []
+    return fq
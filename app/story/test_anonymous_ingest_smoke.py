@@ -27,11 +27,14 @@ ANON_INGEST = '/api/stories/anonymous-ingest'
 
 
 @pytest.fixture
-def client():
+def client(tmp_path):
     """Fresh full app (anon-ingest enabled) + in-memory DB + test client, one
-    per test so the rate limiter and DB never bleed across tests."""
+    per test so the rate limiter and DB never bleed across tests. Media goes
+    to a tmp UPLOAD_FOLDER: analysis is only enqueued here, so the staged raw
+    copies would otherwise pile up in the source tree."""
     app = create_app('testing')
     app.config['ANONYMOUS_INGEST_ENABLED'] = True
+    app.config['UPLOAD_FOLDER'] = str(tmp_path)
     with app.app_context():
         db.create_all()
         populate_initial_data()
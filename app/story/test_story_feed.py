@@ -0,0 +1,155 @@
+"""
+Story feed paging tests.
+
+list_stories filters, orders and pages in SQL and serializes only the returned
+page. These pin the ordering contract the old in-Python sort had (severity and
+confidence BAND ranks, undated rows last, stable id tiebreak), the has_media
+predicate, and that a page never serializes more rows than it returns.
+
+In-memory SQLite with a minimal Flask app, matching events/test_corroboration.
+"""
+
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from flask import Flask
+
+from app.models import db, FileUpload, FileType
+from app.story import serializers
+from app.story.service import list_stories
+from app.utils.cursor import encode_cursor
+
+
+@pytest.fixture
+def ctx():
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        ft = FileType(type_name='Other', allowed_extensions='*')
+        db.session.add(ft)
+        db.session.flush()
+        yield ft
+        db.session.remove()
+
+
+def _mk(ft, when=None, severity='LOW', conf=None, path='/x.jpg', status='VERIFIED'):
+    up = FileUpload(
+        filename='x', file_path=path, file_type_id=ft.filetypeid,
+        upload_date=when, severity=severity, confidence_score=conf,
+        verification_status=status,
+    )
+    db.session.add(up)
+    db.session.flush()
+    return up
+
+
+def _ids(result):
+    return [s['source_record_id'] for s in result['items']]
+
+
+def test_published_at_desc_pages_with_has_more(ctx):
+    now = datetime.utcnow()
+    rows = [_mk(ctx, when=now - timedelta(minutes=i)) for i in range(5)]
+    first = list_stories(limit=2, offset=0)
+    assert _ids(first) == [rows[0].id, rows[1].id]
+    assert first['paging']['has_more'] is True
+    last = list_stories(limit=2, offset=4)
+    assert _ids(last) == [rows[4].id]
+    assert last['paging']['has_more'] is False
+
+
+def test_undated_rows_sort_oldest_in_both_directions(ctx):
+    now = datetime.utcnow()
+    dated = _mk(ctx, when=now)
+    undated = _mk(ctx, when=None)
+    undated.upload_date = None   # defeat the column default
+    db.session.flush()
+    assert _ids(list_stories(order='desc')) == [dated.id, undated.id]
+    assert _ids(list_stories(order='asc')) == [undated.id, dated.id]
+
+
+def test_severity_and_confidence_band_ordering(ctx):
+    now = datetime.utcnow()
+    low = _mk(ctx, when=now, severity='LOW', conf=0.1)
+    high = _mk(ctx, when=now, severity='HIGH', conf=0.5)
+    med = _mk(ctx, when=now, severity='MEDIUM', conf=0.9)
+    unscored = _mk(ctx, when=now, severity=None)
+    unscored.confidence_score = None   # defeat the column default
+    db.session.flush()
+    assert _ids(list_stories(sort='severity'))[:2] == [high.id, med.id]
+    # Band rank: HIGH(0.9) > MEDIUM(0.5) > LOW(0.1) > no score.
+    assert _ids(list_stories(sort='confidence')) == [med.id, high.id, low.id, unscored.id]
+
+
+def test_has_media_matches_primary_url(ctx):
+    media = _mk(ctx, path='https://cdn.example/a.mp4')
+    text_only = _mk(ctx, path='ingest:no-media')
+    with_media = list_stories(has_media=True)
+    assert _ids(with_media) == [media.id]
+    assert all(s['media']['primary_url'] for s in with_media['items'])
+    assert _ids(list_stories(has_media=False)) == [text_only.id]
+
+
+def test_unverified_excluded_unless_requested(ctx):
+    pub = _mk(ctx)
+    pending = _mk(ctx, status='PENDING')
+    assert _ids(list_stories()) == [pub.id]
+    assert set(_ids(list_stories(include_unverified=True))) == {pub.id, pending.id}
+
+
+def test_only_returned_page_is_serialized(ctx):
+    now = datetime.utcnow()
+    for i in range(30):
+        _mk(ctx, when=now - timedelta(minutes=i))
+    with mock.patch.object(serializers, 'serialize_upload',
+                           wraps=serializers.serialize_upload) as spy:
+        result = list_stories(limit=5)
+    assert result['paging']['returned'] == 5
+    assert spy.call_count == 5
+
+
+def _walk(limit, **kwargs):
+    seen, cursor = [], None
+    while True:
+        page = list_stories(limit=limit, cursor=cursor, **kwargs)
+        seen.extend(_ids(page))
+        cursor = page['paging']['next_cursor']
+        if cursor is None:
+            assert page['paging']['has_more'] is False
+            return seen
+
+
+def test_cursor_walks_every_row_once_in_order(ctx):
+    now = datetime.utcnow()
+    for i in range(7):
+        _mk(ctx, when=now - timedelta(minutes=i // 2))   # pairs share a timestamp
+    undated = _mk(ctx)
+    undated.upload_date = None
+    db.session.flush()
+    for order in ('desc', 'asc'):
+        expected = _ids(list_stories(limit=100, order=order))
+        assert _walk(3, order=order) == expected
+        assert len(expected) == 8
+
+
+def test_cursor_pages_do_not_shift_when_newer_rows_arrive(ctx):
+    now = datetime.utcnow()
+    rows = [_mk(ctx, when=now - timedelta(minutes=i)) for i in range(4)]
+    first = list_stories(limit=2)
+    _mk(ctx, when=now + timedelta(minutes=5))   # ingested between page fetches
+    second = list_stories(limit=2, cursor=first['paging']['next_cursor'])
+    assert _ids(second) == [rows[2].id, rows[3].id]
+
+
+def test_cursor_rejects_garbage_and_other_sorts(ctx):
+    _mk(ctx)
+    with pytest.raises(ValueError):
+        list_stories(cursor='not-a-cursor')
+    with pytest.raises(ValueError):
+        list_stories(cursor=encode_cursor('x', 'y'))
+    with pytest.raises(ValueError):
+        list_stories(sort='severity', cursor=encode_cursor(None, 1))
@@ -0,0 +1,89 @@
+"""
+app/story/track_record.py
+
+Reporter track record (ADR-0012 definitions, stored per ADR-0024).
+
+`User.reports_count` / `User.corroborated_count` are a maintained cache of the
+computed-on-read aggregate, so the reader chip is a column read instead of a
+query. There is no delta arithmetic: every write path that can move a number
+(verification change, Event status change, override, closure, deletion) calls
+refresh_track_records for the reporters it touched, which re-derives just
+those users from current rows. rebuild_track_records re-derives everyone and
+reports any drift it corrected -- the check that the cache still equals the
+computed-on-read answer.
+"""
+
+import logging
+
+from sqlalchemy import case, func
+
+from app.models import db, FileUpload, Event, User
+
+logger = logging.getLogger(__name__)
+
+
+def compute_track_records(user_ids):
+    """{user_id: (reports_count, corroborated_count)} from current rows, one
+    GROUP BY query. This is the ADR-0012 computed-on-read definition:
+
+    - reports_count      = the reporter's VERIFIED (published) reports only.
+    - corroborated_count = of those, the ones whose Event's live status is
+      CORROBORATED (honors status_override). Always <= reports_count.
+
+    Users with no VERIFIED reports map to (0, 0). Ids are coerced to int: a
+    freshly-assigned user_id may still hold the JWT identity string.
+    """
+    user_ids = {int(uid) for uid in user_ids if uid is not None}
+    if not user_ids:
+        return {}
+    live_status = func.coalesce(Event.status_override, Event.status)
+    rows = (
+        db.session.query(
+            FileUpload.user_id,
+            func.count(FileUpload.id),
+            func.sum(case((live_status == 'CORROBORATED', 1), else_=0)),
+        )
+        .outerjoin(Event, FileUpload.event_id == Event.id)
+        .filter(
+            FileUpload.user_id.in_(user_ids),
+            FileUpload.verification_status == 'VERIFIED',
+        )
+        .group_by(FileUpload.user_id)
+        .all()
+    )
+    records = {uid: (0, 0) for uid in user_ids}
+    records.update({uid: (reports or 0, corroborated or 0)
+                    for uid, reports, corroborated in rows})
+    return records
+
+
+def refresh_track_records(user_ids):
+    """Re-derive the stored track record of just these reporters. Call after
+    any change that can move their numbers; anonymous (None) ids are ignored.
+    Does not commit -- the caller owns the transaction."""
+    records = compute_track_records(user_ids)
+    if not records:
+        return
+    for user in User.query.filter(User.userid.in_(records)).all():
+        user.reports_count, user.corroborated_count = records[user.userid]
+
+
+def rebuild_track_records(batch=500):
+    """Reconcile every user's stored track record against the computed-on-read
+    aggregate, fixing any that differ. Returns [(user_id, stored, computed)] for
+    each corrected row, so an empty list means the cache had not drifted.
+    Does not commit."""
+    drift = []
+    user_ids = [uid for (uid,) in db.session.query(User.userid).order_by(User.userid)]
+    for lo in range(0, len(user_ids), batch):
+        chunk = user_ids[lo:lo + batch]
+        records = compute_track_records(chunk)
+        for user in User.query.filter(User.userid.in_(chunk)).all():
+            stored = (user.reports_count, user.corroborated_count)
+            computed = records[user.userid]
+            if stored != computed:
+                drift.append((user.userid, stored, computed))
+                user.reports_count, user.corroborated_count = computed
+    if drift:
+        logger.warning("track-record rebuild corrected %d user(s)", len(drift))
+    return drift
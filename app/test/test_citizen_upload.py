@@ -255,6 +255,134 @@ class TestKeyframes:
         assert len(frames) > 0
         assert len(frames) <= 6
 
+    def test_hybrid_is_one_sequential_decode(self, tmp_path, monkeypatch):
+        """Hybrid opens the video once and never seeks."""
+        from app.ai_analyzer.keyframes import extract_keyframes
+
+        video_path = tmp_path / "test.avi"
+        self._create_test_video(video_path, frames=50, fps=10)
+        import cv2
+
+        calls = {'opened': 0, 'seeks': 0}
+
+        class RecordingCapture(cv2.VideoCapture):
+            def __init__(self, *args):
+                calls['opened'] += 1
+                super().__init__(*args)
+
+            def set(self, prop, value):
+                if prop == cv2.CAP_PROP_POS_FRAMES:
+                    calls['seeks'] += 1
+                return super().set(prop, value)
+
+        monkeypatch.setattr(cv2, 'VideoCapture', RecordingCapture)
+        frames = extract_keyframes(str(video_path), strategy='hybrid', max_frames=6)
+
+        assert 0 < len(frames) <= 6
+        assert [f['index'] for f in frames] == list(range(len(frames)))
+        assert calls == {'opened': 1, 'seeks': 0}
+
+    @staticmethod
+    def _jpeg(payload):
+        """A minimal JPEG-shaped blob: a table segment whose bytes read FFD9,
+        a start of scan, and `payload` as entropy data."""
+        dqt = b'\xff\xdb' + (2 + 4).to_bytes(2, 'big') + b'\x00\xff\xd9\x01'
+        sos = b'\xff\xda' + (2 + 2).to_bytes(2, 'big') + b'\x01\x00'
+        return b'\xff\xd8' + dqt + sos + payload + b'\xff\xd9'
+
+    def _fake_ffmpeg(self, monkeypatch, duration, stdout, pts):
+        """Route keyframes' ffprobe/ffmpeg calls to canned output."""
+        import subprocess
+        from app.ai_analyzer import keyframes
+
+        calls = []
+
+        def run(cmd, **kwargs):
+            calls.append(cmd)
+            if 'ffprobe' in cmd[0]:
+                return subprocess.CompletedProcess(cmd, 0, f'{duration}\n'.encode(), b'')
+            stderr = ''.join(f'[Parsed_showinfo_1 @ 0x5] n:{i} pts:{int(t * 1000)} pts_time:{t} '
+                             f'duration:1\n' for i, t in enumerate(pts))
+            return subprocess.CompletedProcess(cmd, 0, stdout, stderr.encode())
+
+        monkeypatch.setattr(keyframes.shutil, 'which', lambda name: f'/usr/bin/{name}')
+        monkeypatch.setattr(keyframes.subprocess, 'run', run)
+        return calls
+
+    def test_split_jpegs(self):
+        """The pipe splitter cuts at each EOI, not at FFD9 inside a table."""
+        from app.ai_analyzer.keyframes import _split_jpegs
+
+        a, b = self._jpeg(b'\x12\xff\x00\x34'), self._jpeg(b'\x56')
+        assert _split_jpegs(a + b + a[:9]) == [a, b]
+        assert _split_jpegs(b'') == []
+
+    def test_ffmpeg_iframes_contract(self, monkeypatch):
+        """ffmpeg I-frame frames come back in the usual contract, spaced to span the video."""
+        import base64
+        from app.ai_analyzer.keyframes import extract_keyframes
+
+        jpegs = [self._jpeg(bytes([i])) for i in range(3)]
+        calls = self._fake_ffmpeg(monkeypatch, 600.0, b''.join(jpegs), [0.0, 200.2, 400.4])
+
+        frames = extract_keyframes('/tmp/long.mp4', strategy='ffmpeg_iframes', max_frames=3)
+
+        assert [f['time_sec'] for f in frames] == [0.0, 200.2, 400.4]
+        assert [f['index'] for f in frames] == [0, 1, 2]
+        assert base64.b64decode(frames[1]['base64']) == jpegs[1]
+        cmd = calls[-1]
+        assert cmd[cmd.index('-skip_frame') + 1] == 'nokey'
+        assert 'gte(t-prev_selected_t,200.000)' in cmd[cmd.index('-vf') + 1]
+        assert cmd[cmd.index('-frames:v') + 1] == '3'
+
+    def test_auto_uses_ffmpeg_only_for_long_videos(self, monkeypatch):
+        """'auto' hands long videos to ffmpeg and short ones to OpenCV hybrid."""
+        from app.ai_analyzer import keyframes
+
+        jpegs = b''.join(self._jpeg(bytes([i])) for i in range(4))
+        calls = self._fake_ffmpeg(monkeypatch, 900.0, jpegs, [0.0, 31.5, 90.0, 300.0])
+        frames = keyframes.extract_keyframes('/tmp/long.mp4', max_frames=6)
+        assert len(frames) == 4
+        assert "gt(scene,0.3)" in calls[-1][calls[-1].index('-vf') + 1]
+
+        self._fake_ffmpeg(monkeypatch, 20.0, jpegs, [])
+        opencv = []
+        monkeypatch.setattr(keyframes, '_scan', lambda *a, **k: opencv.append(a) or None)
+        assert keyframes.extract_keyframes('/tmp/short.mp4') == []
+        assert len(opencv) == 1
+
+    def test_ffmpeg_missing_falls_back_to_opencv(self, monkeypatch):
+        """Without ffmpeg an ffmpeg strategy runs its OpenCV counterpart."""
+        from app.ai_analyzer import keyframes
+
+        monkeypatch.setattr(keyframes.shutil, 'which', lambda name: None)
+        called = []
+        monkeypatch.setattr(keyframes, 'extract_keyframes_scene_change',
+                            lambda path, max_frames: called.append(path) or [])
+        assert keyframes.extract_keyframes('/tmp/v.mp4', strategy='ffmpeg_scene') == []
+        assert called == ['/tmp/v.mp4']
+
+    def test_ffmpeg_engine_on_real_video(self, tmp_path):
+        """End to end against a real ffmpeg, when installed."""
+        import base64
+        import shutil
+        import subprocess
+        from app.ai_analyzer.keyframes import extract_keyframes
+
+        if not shutil.which('ffmpeg'):
+            pytest.skip("ffmpeg not installed")
+        video_path = str(tmp_path / "test.mp4")
+        subprocess.run(['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y', '-f', 'lavfi',
+                        '-i', 'testsrc=duration=12:size=320x240:rate=10', '-g', '20', video_path],
+                       check=True)
+
+        for strategy in ('ffmpeg_iframes', 'ffmpeg_scene', 'ffmpeg'):
+            frames = extract_keyframes(video_path, strategy=strategy, max_frames=4)
+            assert 0 < len(frames) <= 4
+            assert frames[0]['time_sec'] == 0.0
+            assert [f['index'] for f in frames] == list(range(len(frames)))
+            assert base64.b64decode(frames[0]['base64'])[:2] == b'\xff\xd8'
+
     def test_invalid_video(self):
         """Invalid video path returns empty list."""
         from app.ai_analyzer.keyframes import extract_keyframes
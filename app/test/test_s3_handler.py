@@ -19,6 +19,7 @@ def _configure_s3(monkeypatch):
     monkeypatch.setattr(config, 'S3_PUBLIC_BASE_URL', None, raising=False)
     monkeypatch.setattr(config, 'S3_ADDRESSING_STYLE', 'virtual', raising=False)
     s3_handler._client = None  # rebuild lazily with the patched config
+    object_storage._read_url_cache.clear()
 
 
 def test_presigned_upload_url_shape(monkeypatch):
@@ -91,6 +92,52 @@ def test_read_url_presigns_our_s3_object(monkeypatch):
     assert 'X-Amz-Signature=' in out and 'field-reports/7/abc.jpg' in out
 
 
+def test_read_url_reuses_the_signed_url(monkeypatch):
+    _configure_s3(monkeypatch)
+    monkeypatch.setattr(config, 'STORAGE_BACKEND', 's3', raising=False)
+    signed = []
+    real = s3_handler.presigned_get_url
+
+    def counting(key, expiry_minutes=60):
+        signed.append((key, expiry_minutes))
+        return real(key, expiry_minutes)
+    monkeypatch.setattr(s3_handler, 'presigned_get_url', counting)
+    virtual = 'https://melo-media.fsn1.your-objectstorage.com/field-reports/7/abc.jpg'
+    path_style = 'https://fsn1.your-objectstorage.com/melo-media/field-reports/7/abc.jpg'
+
+    first = object_storage.read_url(virtual)
+    assert object_storage.read_url(path_style) == first         # same object key
+    assert object_storage.read_url(virtual, expiry_minutes=30) != first
+    assert signed == [('field-reports/7/abc.jpg', 60), ('field-reports/7/abc.jpg', 30)]
+    stats = object_storage.read_url_cache_stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 2, 2)
+
+
+def test_presigned_url_cache_margin_and_lru():
+    now = [0.0]
+    cache = object_storage.PresignedUrlCache(2, margin_seconds=600, clock=lambda: now[0])
+    n = [0]
+
+    def sign(key, ttl):
+        n[0] += 1
+        return f'{key}?sig={n[0]}'
+
+    assert cache.get_or_sign('a', 60, sign) == 'a?sig=1'
+    now[0] = 2999                                   # 601 s of life left: reuse
+    assert cache.get_or_sign('a', 60, sign) == 'a?sig=1'
+    now[0] = 3000                                   # inside the margin: re-sign
+    assert cache.get_or_sign('a', 60, sign) == 'a?sig=2'
+
+    cache.get_or_sign('b', 60, sign)
+    cache.get_or_sign('a', 60, sign)                # 'a' most recently used
+    cache.get_or_sign('c', 60, sign)                # evicts 'b'
+    assert cache.get_or_sign('a', 60, sign) == 'a?sig=2'
+    assert cache.get_or_sign('b', 60, sign) == 'b?sig=5'
+    assert cache.get_or_sign('x', 5, sign) != cache.get_or_sign('x', 5, sign)   # TTL under margin
+    assert cache.stats() == {'entries': 2, 'max_entries': 2, 'hits': 3, 'misses': 7,
+                             'evictions': 2, 'hit_rate': 0.3}
+
+
 def test_read_url_sentinels_and_passthrough(monkeypatch):
     _configure_s3(monkeypatch)
     monkeypatch.setattr(config, 'STORAGE_BACKEND', 's3', raising=False)
@@ -114,3 +161,62 @@ def test_dispatcher_azure_default_uses_azure(monkeypatch):
     import modules.azure_handler as az
     monkeypatch.setattr(az, 'generate_sas_upload_url', lambda name, expiry_minutes=15: sentinel)
     assert object_storage.presigned_upload_url('field-reports/1/z.png') is sentinel
+
+
+# ── Multipart direct uploads (ADR-0030) ───────────────────────────────────────
+
+def test_presigned_part_urls_shape(monkeypatch):
+    _configure_s3(monkeypatch)
+    urls = s3_handler.presigned_part_urls('incoming/u1/clip.mp4', 'mpu-123', [1, 2], expiry_minutes=60)
+    assert set(urls) == {1, 2}
+    assert 'partNumber=2' in urls[2] and 'uploadId=mpu-123' in urls[2]
+    assert 'X-Amz-Signature=' in urls[1] and 'X-Amz-Expires=3600' in urls[1]
+
+
+def test_complete_multipart_fills_missing_etags_and_refuses_gaps(monkeypatch):
+    from botocore.stub import Stubber
+
+    _configure_s3(monkeypatch)
+    key = 'incoming/u1/clip.mp4'
+    stubber = Stubber(s3_handler._get_client())
+    listing = {'Bucket': 'melo-media', 'Key': key, 'UploadId': 'mpu-1', 'PartNumberMarker': 0}
+    stubber.add_response('list_parts', {'Parts': [{'PartNumber': 1, 'ETag': '"e1"'},
+                                                  {'PartNumber': 2, 'ETag': '"e2"'}],
+                                        'IsTruncated': False}, listing)
+    stubber.add_response('complete_multipart_upload', {}, {
+        'Bucket': 'melo-media', 'Key': key, 'UploadId': 'mpu-1',
+        'MultipartUpload': {'Parts': [{'PartNumber': 1, 'ETag': '"e1"'},
+                                      {'PartNumber': 2, 'ETag': '"e2"'}]},
+    })
+    stubber.add_response('list_parts', {'Parts': [{'PartNumber': 1, 'ETag': '"e1"'}],
+                                        'IsTruncated': False}, listing)
+    with stubber:
+        url = s3_handler.complete_multipart_upload(key, 'mpu-1', [(1, None), (2, None)])
+        assert url == 'https://fsn1.your-objectstorage.com/melo-media/' + key
+        with pytest.raises(ValueError, match=r'\[2\]'):
+            s3_handler.complete_multipart_upload(key, 'mpu-1', [(1, None), (2, None)])
+    stubber.assert_no_pending_responses()
+
+
+def test_azure_block_urls_use_fixed_width_ids(monkeypatch):
+    import base64
+    import modules.azure_handler as az
+    monkeypatch.setattr(az, 'AZURE_CONNECTION_STRING',
+                        'DefaultEndpointsProtocol=https;AccountName=acct;'
+                        'AccountKey=' + base64.b64encode(b'k' * 32).decode() + ';')
+    assert len({len(az.block_id(n)) for n in (1, 99, 10_000)}) == 1
+    urls = az.generate_sas_block_urls('incoming/u1/clip.mp4', [1, 2])
+    assert urls[1].startswith('https://acct.blob.core.windows.net/')
+    assert '&comp=block&blockid=' in urls[2] and 'sig=' in urls[2]
+    assert urls[1] != urls[2]
+
+
+def test_multipart_dispatch_to_azure(monkeypatch):
+    monkeypatch.setattr(config, 'STORAGE_BACKEND', 'azure', raising=False)
+    import modules.azure_handler as az
+    committed = {}
+    monkeypatch.setattr(az, 'commit_blocks',
+                        lambda name, numbers, content_type=None: committed.setdefault(name, numbers))
+    object_storage.complete_multipart('incoming/u1/a.mp4', None, [(1, None), (2, '"x"')])
+    assert committed == {'incoming/u1/a.mp4': [1, 2]}
+    object_storage.abort_multipart('incoming/u1/a.mp4', None)   # Azure: nothing to call
@@ -1,28 +1,178 @@
+"""
+Azure Blob Storage uploads and deletes for the web lanes, on pooled clients.
+
+Every call used to build a BlobServiceClient from the connection string (a
+new HTTP session, so a fresh TLS handshake) and every upload first sent a
+create_container request. Now:
+
+- one BlobServiceClient per connection string per process, on a requests
+  session whose connection pool holds AZURE_CONNECTION_POOL_SIZE sockets, so
+  concurrent request threads and block uploads reuse warm connections;
+  modules/azure_handler._get_clients shares it. A forked child builds its own
+  (the parent's sockets are not safe to share);
+- the container is created at most once per process and container (memo);
+- files above AZURE_SINGLE_PUT_MB go up as AZURE_UPLOAD_BLOCK_MB blocks,
+  AZURE_UPLOAD_MAX_CONCURRENCY at a time;
+- upload_file_to_azure_storage_async does the same on the asyncio SDK (needs
+  aiohttp), with one client per event loop; close_async_clients() closes
+  them before the loop ends.
+"""
+
 import logging
 import os
+import threading
+import weakref
+
 from azure.storage.blob import BlobServiceClient
-from azure.core.exceptions import ResourceNotFoundError
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+
+import config
 
 logger = logging.getLogger(__name__)
 
+_MIB = 1024 * 1024
 
-def upload_file_to_azure_storage(file_path, blob_name, container_name):
-    connect_str = os.getenv('AZURE_STORAGE_CONNECTION_STRING')
+_lock = threading.Lock()
+_clients = {}           # connection string -> BlobServiceClient
+_containers = set()     # (connection string, container) known to exist
+_owner_pid = None
+_async_clients = weakref.WeakKeyDictionary()    # event loop -> {connection string: client}
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def _connection_string(connect_str=None):
+    connect_str = connect_str or os.getenv('AZURE_STORAGE_CONNECTION_STRING')
     if not connect_str:
         raise Exception("AZURE_STORAGE_CONNECTION_STRING not set in environment variables.")
+    return connect_str
 
-    blob_service_client = BlobServiceClient.from_connection_string(connect_str)
-    container_client = blob_service_client.get_container_client(container_name)
 
-    # Create container if it doesn't exist
-    try:
-        container_client.create_container()
-    except Exception:
-        pass  # Container may already exist
+def _transfer_options():
+    return {
+        'max_single_put_size': int(_cfg('AZURE_SINGLE_PUT_MB', 16) * _MIB),
+        'max_block_size': int(_cfg('AZURE_UPLOAD_BLOCK_MB', 8) * _MIB),
+    }
+
+
+def _new_client(connect_str):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from azure.core.pipeline.transport import RequestsTransport
+    from urllib3.util.retry import Retry
+
+    pool_size = _cfg('AZURE_CONNECTION_POOL_SIZE', 16)
+    session = requests.Session()
+    # The SDK's pipeline retries; the adapter must not retry as well.
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=Retry(total=False, redirect=False, raise_on_status=False))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return BlobServiceClient.from_connection_string(
+        connect_str, transport=RequestsTransport(session=session, session_owner=False),
+        **_transfer_options())
+
+
+def get_blob_service_client(connect_str=None):
+    """The process-wide client for `connect_str` (default: the environment's)."""
+    global _owner_pid
+    connect_str = _connection_string(connect_str)
+    with _lock:
+        if _owner_pid != os.getpid():
+            _clients.clear()
+            _containers.clear()
+            _owner_pid = os.getpid()
+        client = _clients.get(connect_str)
+        if client is None:
+            client = _clients[connect_str] = _new_client(connect_str)
+        return client
 
-    # Upload the file
+
+def get_container_client(container_name, connect_str=None, create=True):
+    """A container client on the pooled connection. With `create`, the
+    container is created the first time this process asks for it."""
+    connect_str = _connection_string(connect_str)
+    container_client = get_blob_service_client(connect_str).get_container_client(container_name)
+    key = (connect_str, container_name)
+    if create and key not in _containers:
+        try:
+            container_client.create_container()
+        except ResourceExistsError:
+            pass
+        except Exception as exc:
+            # e.g. a key without create rights: the upload itself will say
+            # whether the container is really missing.
+            logger.warning("Could not create container %s: %s", container_name, exc)
+        with _lock:
+            _containers.add(key)
+    return container_client
+
+
+def upload_concurrency():
+    return _cfg('AZURE_UPLOAD_MAX_CONCURRENCY', 4)
+
+
+def reset_clients():
+    """Drop the cached clients (tests, or after rotating the connection string)."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+        _containers.clear()
+
+
+def upload_file_to_azure_storage(file_path, blob_name, container_name):
+    connect_str = _connection_string()
+    container_client = get_container_client(container_name, connect_str)
     with open(file_path, "rb") as data:
-        container_client.upload_blob(name=blob_name, data=data, overwrite=True)
+        length = os.fstat(data.fileno()).st_size
+        try:
+            container_client.upload_blob(name=blob_name, data=data, overwrite=True, length=length,
+                                         max_concurrency=upload_concurrency())
+        except ResourceNotFoundError:
+            # The container was deleted since we memoised it: create it again.
+            _containers.discard((connect_str, container_name))
+            container_client = get_container_client(container_name, connect_str)
+            data.seek(0)
+            container_client.upload_blob(name=blob_name, data=data, overwrite=True, length=length,
+                                         max_concurrency=upload_concurrency())
+
+
+async def upload_file_to_azure_storage_async(file_path, blob_name, container_name):
+    """upload_file_to_azure_storage for asyncio callers. Needs aiohttp. The
+    client is kept for the running event loop; see close_async_clients."""
+    import asyncio
+    from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+
+    connect_str = _connection_string()
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(connect_str)
+    if client is None:
+        client = clients[connect_str] = AsyncBlobServiceClient.from_connection_string(
+            connect_str, **_transfer_options())
+    container_client = client.get_container_client(container_name)
+    key = (connect_str, container_name)
+    if key not in _containers:
+        try:
+            await container_client.create_container()
+        except ResourceExistsError:
+            pass
+        with _lock:
+            _containers.add(key)
+    with open(file_path, "rb") as data:
+        await container_client.upload_blob(name=blob_name, data=data, overwrite=True,
+                                           length=os.fstat(data.fileno()).st_size,
+                                           max_concurrency=upload_concurrency())
+
+
+async def close_async_clients():
+    """Close the running loop's async clients (their aiohttp sessions)."""
+    import asyncio
+
+    for client in _async_clients.pop(asyncio.get_running_loop(), {}).values():
+        await client.close()
 
 
 def delete_file_from_azure_storage(blob_name: str, container_name: str) -> bool:
@@ -41,8 +191,7 @@ def delete_file_from_azure_storage(blob_name: str, container_name: str) -> bool:
         return False
 
     try:
-        blob_service_client = BlobServiceClient.from_connection_string(connect_str)
-        container_client = blob_service_client.get_container_client(container_name)
+        container_client = get_container_client(container_name, connect_str, create=False)
         container_client.delete_blob(blob_name)
         return True
     except ResourceNotFoundError:
@@ -51,4 +200,4 @@ def delete_file_from_azure_storage(blob_name: str, container_name: str) -> bool:
         return True
     except Exception as exc:
         logger.error("Azure delete failed for %s/%s: %s", container_name, blob_name, exc)
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,56 @@
+"""
+Opaque keyset-pagination cursors for the read feeds.
+
+A cursor is the sort key of the last row a client has seen, packed as
+base64url JSON so clients treat it as an opaque token rather than parsing or
+constructing it. The next page is "rows strictly after this key", which costs
+one index range scan however deep the client has paged, and does not shift
+when new rows are ingested ahead of it (offset paging does both wrong).
+
+Datetimes are carried as naive-UTC ISO strings, the form they read back from
+the non-tz DB columns, so a key compares the same whether it was taken from a
+fresh ORM object or a reloaded one.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from app.events.independence import _naive_utc
+
+
+def encode_cursor(*values):
+    """Pack a sort key into an opaque token. Values: str/int/float/None/datetime."""
+    packed = [
+        {'t': _naive_utc(v).isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(packed, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, arity):
+    """Unpack a token from encode_cursor into a list of `arity` values.
+
+    Raises ValueError on anything malformed, so routes can turn a tampered or
+    stale token into a 400 instead of a 500.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        packed = json.loads(raw.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError('invalid cursor') from exc
+    if not isinstance(packed, list) or len(packed) != arity:
+        raise ValueError('invalid cursor')
+    values = []
+    for v in packed:
+        if isinstance(v, dict):
+            try:
+                v = datetime.fromisoformat(v['t'])
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError('invalid cursor') from exc
+        elif not (v is None or isinstance(v, (str, int, float))):
+            raise ValueError('invalid cursor')
+        values.append(v)
+    return values
@@ -0,0 +1,178 @@
+"""
+Shared, bounded process pool for CPU-bound media stages.
+
+Image re-encoding (media_sanitizer), EXIF parsing and OpenCV keyframe
+extraction are CPU-bound Python/C work. Run on request threads or analysis
+threads they serialize on the GIL and starve each other. Instead each process
+lazily starts one ProcessPoolExecutor (MEDIA_POOL_WORKERS processes, spawned,
+with cv2 and PIL imported once per worker), and callers submit a stage by
+passing the module-level function and a file PATH -- the bytes never cross a
+pickle, only the small result does (a path, an EXIF dict, a few base64 frames).
+
+Bounded: at most workers + MEDIA_POOL_MAX_QUEUE stages are outstanding per
+process; further callers block until one finishes. A broken pool is logged
+and the stage re-run in the caller's thread, so a pool failure never skips
+sanitization. A stage overrunning MEDIA_POOL_TIMEOUT_SECONDS is not re-run:
+the pool's processes are terminated (the hung one would otherwise keep
+burning CPU) and StageTimeout is raised, leaving the retry to the caller (the
+analysis queue's backoff). Exceptions raised by the stage itself propagate
+unchanged. MEDIA_POOL_WORKERS=0 runs every stage inline.
+
+stats() reports per-stage queue depth and counters, served at
+/api/health/media-pool.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import config
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimeout(TimeoutError):
+    """A pooled stage overran MEDIA_POOL_TIMEOUT_SECONDS."""
+
+
+def _cfg(name, default):
+    return getattr(config, name, default)
+
+
+def _warm_worker():
+    """Pool initializer: pay the heavy imports once per worker process."""
+    try:
+        import cv2  # noqa: F401
+    except ImportError:
+        pass
+    from PIL import Image, ImageOps  # noqa: F401
+    import app.ai_analyzer.exif_extractor  # noqa: F401
+    import app.ai_analyzer.keyframes  # noqa: F401
+    import app.file_upload.media_sanitizer  # noqa: F401
+
+
+class MediaComputePool:
+    """One per process (`media_pool`); the executor starts on first use, so
+    a process that never touches media never spawns workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._stats = {}
+
+    def _stage(self, name):
+        return self._stats.setdefault(name, {
+            'waiting': 0, 'in_flight': 0, 'completed': 0, 'failed': 0,
+            'inline': 0, 'seconds': 0.0,
+        })
+
+    def _ensure(self):
+        """The executor and its slot semaphore, started on first use; None
+        when the pool is disabled."""
+        workers = _cfg('MEDIA_POOL_WORKERS', 2)
+        if workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker,
+                )
+                self._slots = threading.BoundedSemaphore(workers + _cfg('MEDIA_POOL_MAX_QUEUE', 16))
+            return self._executor
+
+    def _discard(self, executor, terminate=False):
+        """Stop handing work to `executor`; the next run starts a new one.
+        With `terminate`, kill its processes too -- shutdown() alone leaves a
+        hung stage running. Other stages in flight on it then fail over to
+        inline as for a broken pool."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        if terminate:
+            for process in processes:
+                process.terminate()
+
+    def run(self, stage, fn, *args, **kwargs):
+        """Run `fn(*args, **kwargs)` in the pool and return its result.
+        `fn` must be a module-level function; pass paths, not file contents."""
+        executor = self._ensure()
+        if executor is None:
+            return self._inline(stage, fn, args, kwargs)
+
+        slots = self._slots
+        with self._lock:
+            self._stage(stage)['waiting'] += 1
+        slots.acquire()
+        with self._lock:
+            counts = self._stage(stage)
+            counts['waiting'] -= 1
+            counts['in_flight'] += 1
+        started = time.perf_counter()
+        outcome = 'failed'
+        timeout = _cfg('MEDIA_POOL_TIMEOUT_SECONDS', 300)
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+            result = future.result(timeout=timeout)
+            outcome = 'completed'
+            return result
+        except FutureTimeout:
+            logger.error("media pool %s stage overran %ss; terminating the pool", stage, timeout)
+            self._discard(executor, terminate=True)
+            raise StageTimeout(f'{stage} stage overran {timeout}s') from None
+        except (BrokenProcessPool, CancelledError) as exc:
+            logger.error("media pool %s stage failed in the pool (%s); running inline",
+                         stage, type(exc).__name__)
+            self._discard(executor)
+            outcome = None
+        finally:
+            slots.release()
+            with self._lock:
+                counts = self._stage(stage)
+                counts['in_flight'] -= 1
+                if outcome:
+                    counts[outcome] += 1
+                    counts['seconds'] += time.perf_counter() - started
+        return self._inline(stage, fn, args, kwargs)
+
+    def _inline(self, stage, fn, args, kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                counts = self._stage(stage)
+                counts['inline'] += 1
+                counts['seconds'] += time.perf_counter() - started
+
+    def stats(self):
+        """Per-stage {queued (waiting + in flight), waiting, in_flight,
+        completed, failed, inline, seconds}, plus the pool size."""
+        with self._lock:
+            stages = {
+                name: dict(c, queued=c['waiting'] + c['in_flight'], seconds=round(c['seconds'], 3))
+                for name, c in sorted(self._stats.items())
+            }
+            return {
+                'workers': _cfg('MEDIA_POOL_WORKERS', 2),
+                'started': self._executor is not None,
+                'stages': stages,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+media_pool = MediaComputePool()
+atexit.register(media_pool.shutdown)
@@ -0,0 +1,91 @@
+"""
+Pooled Azure blob client tests (app/utils/azure_blob.py).
+
+One client per connection string per process, shared with
+modules/azure_handler; the container is created once; uploads pass the tuned
+transfer settings; a forked process builds its own client. Clients are built
+from a fake connection string (no network); requests are stubbed.
+"""
+
+import base64
+
+import pytest
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import ContainerClient
+
+import config
+from app.utils import azure_blob
+
+CONN = ('DefaultEndpointsProtocol=https;AccountName=acct;AccountKey='
+        + base64.b64encode(b'k' * 32).decode() + ';EndpointSuffix=core.windows.net')
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    monkeypatch.setenv('AZURE_STORAGE_CONNECTION_STRING', CONN)
+    monkeypatch.setattr(config, 'AZURE_UPLOAD_MAX_CONCURRENCY', 6, raising=False)
+    monkeypatch.setattr(config, 'AZURE_UPLOAD_BLOCK_MB', 4, raising=False)
+    azure_blob.reset_clients()
+    seen = {'create': 0, 'upload': []}
+
+    def create(self, **kwargs):
+        seen['create'] += 1
+        raise ResourceExistsError('exists')
+
+    def upload(self, name, data, **kwargs):
+        seen['upload'].append((name, data.read(), kwargs))
+    monkeypatch.setattr(ContainerClient, 'create_container', create)
+    monkeypatch.setattr(ContainerClient, 'upload_blob', upload)
+    yield seen
+    azure_blob.reset_clients()
+
+
+def test_uploads_share_one_client_and_create_the_container_once(calls, tmp_path):
+    path = tmp_path / 'photo.jpg'
+    path.write_bytes(b'pixels')
+    azure_blob.upload_file_to_azure_storage(str(path), 'a.jpg', 'uploads')
+    azure_blob.upload_file_to_azure_storage(str(path), 'b.jpg', 'uploads')
+
+    assert calls['create'] == 1
+    assert [(n, body) for n, body, _ in calls['upload']] == [('a.jpg', b'pixels'), ('b.jpg', b'pixels')]
+    assert calls['upload'][0][2]['max_concurrency'] == 6
+    assert calls['upload'][0][2]['length'] == 6
+    client = azure_blob.get_blob_service_client()
+    assert client is azure_blob.get_blob_service_client(CONN)
+    assert client._config.max_block_size == 4 * 1024 * 1024
+    adapter = client._pipeline._transport.session.get_adapter('https://acct.blob.core.windows.net')
+    assert adapter._pool_maxsize == config.AZURE_CONNECTION_POOL_SIZE
+
+
+def test_azure_handler_uses_the_shared_client(calls, monkeypatch):
+    import modules.azure_handler as az
+    monkeypatch.setattr(az, 'AZURE_CONNECTION_STRING', CONN)
+    service, container = az._get_clients()
+    assert service is azure_blob.get_blob_service_client(CONN)
+    assert container.container_name == az.AZURE_CONTAINER_NAME
+    az._get_clients()
+    assert calls['create'] == 1
+
+
+def test_deleted_container_is_recreated_once(calls, monkeypatch, tmp_path):
+    path = tmp_path / 'clip.mp4'
+    path.write_bytes(b'frames')
+    azure_blob.upload_file_to_azure_storage(str(path), 'a.mp4', 'uploads')
+    missing = {'left': 1}
+
+    def upload(self, name, data, **kwargs):
+        if missing['left']:
+            missing['left'] -= 1
+            raise ResourceNotFoundError('ContainerNotFound')
+        calls['upload'].append((name, data.read(), kwargs))
+    monkeypatch.setattr(ContainerClient, 'upload_blob', upload)
+
+    azure_blob.upload_file_to_azure_storage(str(path), 'b.mp4', 'uploads')
+    assert calls['create'] == 2
+    assert calls['upload'][-1][:2] == ('b.mp4', b'frames')
+
+
+def test_a_forked_process_builds_its_own_client(calls, monkeypatch):
+    parent = azure_blob.get_blob_service_client()
+    monkeypatch.setattr(azure_blob.os, 'getpid', lambda: -1)
+    assert azure_blob.get_blob_service_client() is not parent
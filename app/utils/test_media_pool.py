@@ -0,0 +1,85 @@
+"""
+Media compute pool tests (app/utils/media_pool.py).
+
+Stages run in a separate worker process and report per-stage counters; a
+stage's own exception propagates; a broken pool re-runs the stage inline; a
+stage that overruns its timeout is killed and raises, never re-run inline;
+and MEDIA_POOL_WORKERS=0 runs everything inline.
+"""
+
+import os
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import config
+from app.utils.media_pool import MediaComputePool, StageTimeout
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(config, 'MEDIA_POOL_WORKERS', 1, raising=False)
+    p = MediaComputePool()
+    yield p
+    p.shutdown()
+
+
+def test_stage_runs_in_a_worker_process(pool):
+    assert pool.run('probe', os.getpid) != os.getpid()
+    assert pool.run('probe', os.getpid) == pool.run('probe', os.getpid)    # warm worker reused
+    stats = pool.stats()
+    assert stats['started'] and stats['workers'] == 1
+    probe = stats['stages']['probe']
+    assert (probe['completed'], probe['queued'], probe['inline']) == (3, 0, 0)
+
+
+def test_stage_exception_propagates(pool, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        pool.run('stat', os.stat, str(tmp_path / 'missing'))
+    assert pool.stats()['stages']['stat']['failed'] == 1
+
+
+def test_broken_pool_falls_back_inline(pool, monkeypatch):
+    executor = pool._ensure()
+
+    def broken(*a, **k):
+        f = Future()
+        f.set_exception(BrokenProcessPool('worker died'))
+        return f
+    monkeypatch.setattr(executor, 'submit', broken)
+
+    assert pool.run('probe', os.getpid) == os.getpid()
+    assert pool.stats()['stages']['probe']['inline'] == 1
+    assert pool._executor is None                   # restarted on next use
+
+
+def test_timed_out_stage_is_killed_not_rerun(pool, monkeypatch):
+    pool.run('probe', os.getpid)                    # spawn and warm the worker first
+    processes = list(pool._executor._processes.values())
+
+    # Only the hung stage runs under the short timeout: spawning a worker on a
+    # loaded machine can itself take longer than a second.
+    with monkeypatch.context() as m:
+        m.setattr(config, 'MEDIA_POOL_TIMEOUT_SECONDS', 1, raising=False)
+        started = time.monotonic()
+        with pytest.raises(StageTimeout):
+            pool.run('sleep', time.sleep, 60)
+    assert time.monotonic() - started < 10          # not run again inline
+    for process in processes:
+        process.join(5)
+        assert not process.is_alive()
+    sleep = pool.stats()['stages']['sleep']
+    assert (sleep['failed'], sleep['inline']) == (1, 0)
+    assert pool._executor is None
+    assert pool.run('probe', os.getpid) != os.getpid()      # a fresh pool takes over
+
+
+def test_disabled_pool_runs_inline(monkeypatch):
+    monkeypatch.setattr(config, 'MEDIA_POOL_WORKERS', 0, raising=False)
+    p = MediaComputePool()
+    assert p.run('probe', os.getpid) == os.getpid()
+    stats = p.stats()
+    assert not stats['started']
+    assert stats['stages']['probe']['inline'] == 1
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Event clustering (ingest) latency benchmark.
+
+Seeds N open Events inside the clustering time window, scattered over a
+~220 km square, then times the clustering step of ingest for fresh pinned
+reports:
+
+  candidates  _find_candidate_event alone -- the bounding-box query plus
+              haversine over its survivors
+  assign      assign_event end to end (cluster + flush + recompute), rolled
+              back after each report so N stays fixed
+  window scan the old cost for comparison: load every open Event in the time
+              window (what clustering did before the bounding box)
+
+With the ix_events_geo prefilter, `candidates` and `assign` should stay
+roughly flat as N grows while `window scan` grows linearly.
+
+    python benchmark_event_clustering.py                  # 10k, 100k
+    python benchmark_event_clustering.py --sizes 1000,10000 --repeat 50
+
+Events are bulk-inserted through SQLAlchemy Core.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask  # noqa: E402
+
+from app.models import db, Event, FileUpload, FileType  # noqa: E402
+from app.events.service import _find_candidate_event, _naive_utc, assign_event  # noqa: E402
+
+_LAT0, _LON0, _SPAN = 31.0, 34.0, 2.0      # ~220 km square
+_RADIUS_KM, _WINDOW_H = 1.0, 24
+
+
+def _seed(n, now, batch=20000):
+    rnd = random.Random(n)
+    table = Event.__table__
+    for lo in range(0, n, batch):
+        rows = [{
+            'status': 'DEVELOPING',
+            'title': f'event {i}',
+            'lat': _LAT0 + rnd.random() * _SPAN,
+            'lon': _LON0 + rnd.random() * _SPAN,
+            'created_at': now - timedelta(hours=rnd.random() * _WINDOW_H),
+            'updated_at': now,
+            'corroboration_count': 0,
+            'independent_source_count': 0,
+            'dispute_count': 0,
+            'verified_member_count': 0,
+            'supporting_count': 0,
+            'has_public_member': False,
+        } for i in range(lo, min(lo + batch, n))]
+        db.session.execute(table.insert(), rows)
+    ft = FileType(type_name='Other', allowed_extensions='*')
+    db.session.add(ft)
+    db.session.commit()
+    return ft
+
+
+def _report(ft, rnd, now):
+    up = FileUpload(
+        filename='x', file_path='ingest:no-media', file_type_id=ft.filetypeid,
+        lat=_LAT0 + rnd.random() * _SPAN, lon=_LON0 + rnd.random() * _SPAN,
+        upload_date=now, verification_status='PENDING',
+    )
+    db.session.add(up)
+    db.session.flush()
+    return up
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def run(size, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            now = datetime.utcnow()
+            ft = _seed(size, now)
+            rnd = random.Random(0)
+            when = _naive_utc(now)
+
+            def candidates():
+                up = _report(ft, rnd, now)
+                _find_candidate_event(up, when, _RADIUS_KM, _WINDOW_H)
+                db.session.rollback()
+
+            def assign():
+                up = _report(ft, rnd, now)
+                assign_event(up)
+                db.session.rollback()
+
+            def window_scan():
+                window = timedelta(hours=_WINDOW_H)
+                Event.query.filter(
+                    Event.status != 'CLOSED',
+                    Event.created_at >= when - window, Event.created_at <= when + window,
+                ).all()
+                db.session.rollback()
+
+            cases = {
+                'candidates': _median_ms(candidates, repeat),
+                'assign': _median_ms(assign, repeat),
+                'window scan': _median_ms(window_scan, max(3, repeat // 10)),
+            }
+            db.session.remove()
+            db.engine.dispose()
+    return cases
+
+
+def main():
+    p = argparse.ArgumentParser(description='event clustering latency vs open events')
+    p.add_argument('--sizes', default='10000,100000', help='comma-separated open-event counts')
+    p.add_argument('--repeat', type=int, default=30, help='timed reports per case')
+    args = p.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    cols = ('candidates', 'assign', 'window scan')
+    print(f"{'events':>9}  " + '  '.join(f'{c:>11}' for c in cols) + '   (median ms)')
+    for n in sizes:
+        cases = run(n, args.repeat)
+        print(f'{n:>9}  ' + '  '.join(f'{cases[c]:>11.2f}' for c in cols))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Coordination-signal (analyze_independence) latency benchmark.
+
+Builds N named members where half are a handful of campaign templates copied
+with a word or two changed and half are organic reports, then times
+analyze_independence -- what every graph build and snapshot runs:
+
+  lsh         the MinHash + LSH candidate path (the default above a couple
+              hundred distinct texts)
+  all pairs   the same analysis forced onto the all-pairs comparison, run only
+              up to --brute-max members; where both run, their flags are
+              checked to be identical
+
+    python benchmark_independence.py                      # 100, 1k, 10k
+    python benchmark_independence.py --sizes 2000 --brute-max 2000
+
+Members are plain stand-ins; no database is involved.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.events import independence  # noqa: E402
+
+_WORDS = ('smoke fire market hospital road strike north south near the of a school bridge '
+          'heavy light crowd night morning sirens building collapsed street camp tent water '
+          'queue bakery convoy shelling drone clinic ambulance power cut fuel border').split()
+
+
+def _members(n):
+    rnd = random.Random(n)
+    templates = [[rnd.choice(_WORDS) for _ in range(rnd.randrange(12, 30))] for _ in range(20)]
+    members = []
+    for i in range(n):
+        if i % 2:
+            words = list(rnd.choice(templates))
+            for _ in range(rnd.randrange(3)):
+                words[rnd.randrange(len(words))] = rnd.choice(_WORDS)
+        else:
+            words = [rnd.choice(_WORDS) for _ in range(rnd.randrange(8, 30))]
+        members.append(SimpleNamespace(id=i + 1, user_id=i + 1, witness_statement=' '.join(words),
+                                       title=None, upload_date=None))
+    return members
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples), result
+
+
+def run(size, repeat, brute_max):
+    members = _members(size)
+    cases = {}
+    cases['lsh'], flags = _median_ms(lambda: independence.analyze_independence(members), repeat)
+    cases['flags'] = len(flags)
+    if size <= brute_max:
+        lsh_min = independence._LSH_MIN_SETS
+        independence._LSH_MIN_SETS = float('inf')
+        try:
+            cases['all pairs'], brute = _median_ms(
+                lambda: independence.analyze_independence(members), max(1, repeat // 3))
+        finally:
+            independence._LSH_MIN_SETS = lsh_min
+        if brute != flags:
+            raise SystemExit(f'{size} members: LSH flags differ from all-pairs flags')
+    return cases
+
+
+def main():
+    p = argparse.ArgumentParser(description='analyze_independence latency vs member count')
+    p.add_argument('--sizes', default='100,1000,10000', help='comma-separated member counts')
+    p.add_argument('--repeat', type=int, default=5, help='timed runs per case')
+    p.add_argument('--brute-max', type=int, default=2000,
+                   help='largest member count to also time all pairs for')
+    args = p.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    print(f"{'members':>9}  {'lsh':>11}  {'all pairs':>11}  {'flags':>9}   (median ms)")
+    for n in sizes:
+        cases = run(n, args.repeat, args.brute_max)
+        brute = f"{cases['all pairs']:>11.1f}" if 'all pairs' in cases else f"{'-':>11}"
+        print(f"{n:>9}  {cases['lsh']:>11.1f}  {brute}  {cases['flags']:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Keyframe extraction decode-time benchmark.
+
+Times extract_keyframes on 1- and 10-minute clips, per strategy:
+
+  seek        the previous extractor, reproduced here: a
+              CAP_PROP_POS_FRAMES seek before every sampled read, and hybrid
+              running the scene scan and then the interval scan
+  single      app.ai_analyzer.keyframes: one sequential decode, grab() between
+              sample points, the histogram on a downscaled copy
+
+Clips are synthesized with cv2.VideoWriter (slowly panning gradient with a hard
+cut every --cut-sec seconds) unless real files are given; phone MP4s with long
+GOPs show the seek cost much more than the writer's short-GOP output does.
+
+    python benchmark_keyframes.py                        # 1 and 10 minute clips
+    python benchmark_keyframes.py --minutes 1 --repeat 3
+    python benchmark_keyframes.py --video clip1.mp4 --video clip2.mp4
+
+Needs opencv-python and numpy.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.ai_analyzer import keyframes  # noqa: E402
+
+
+def _synthesize(path, minutes, fps, width, height, cut_sec):
+    import cv2
+    import numpy as np
+
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    ramp = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(int(minutes * 60 * fps)):
+        scene = int(i / (fps * cut_sec))
+        shift = np.roll(ramp, i % width, axis=1)
+        frame = np.dstack([shift, np.full_like(shift, (scene * 70) % 256),
+                           np.full_like(shift, (scene * 130 + 60) % 256)])
+        out.write(frame)
+    out.release()
+
+
+# ── The seek-per-sample extractor this replaced ─────────────────────────
+
+def _seek_open(video_path):
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    return cap, fps, int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+
+def _seek_interval(video_path, max_frames):
+    import cv2
+
+    cap, fps, total = _seek_open(video_path)
+    positions = keyframes._interval_positions(total, fps, keyframes.DEFAULT_INTERVAL_SEC, max_frames)
+    frames = []
+    for frame_pos in positions:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
+        ret, frame = cap.read()
+        if ret:
+            frames.append({'base64': keyframes._frame_to_base64(frame),
+                           'time_sec': round(frame_pos / fps, 2)})
+    cap.release()
+    return frames
+
+
+def _full_size_diff(frame_a, frame_b):
+    import cv2
+
+    hists = []
+    for f in (frame_a, frame_b):
+        hsv = cv2.cvtColor(f, cv2.COLOR_BGR2HSV)
+        h = cv2.calcHist([hsv], [0, 1], None, [50, 60], [0, 180, 0, 256])
+        cv2.normalize(h, h, 0, 1, cv2.NORM_MINMAX)
+        hists.append(h)
+    return keyframes._hist_distance(*hists)
+
+
+def _seek_scene(video_path, max_frames):
+    import cv2
+
+    cap, fps, total = _seek_open(video_path)
+    step = max(1, int(fps / keyframes.SCENE_SAMPLE_FPS))
+    ret, prev = cap.read()
+    frames = [{'base64': keyframes._frame_to_base64(prev), 'time_sec': 0.0}] if ret else []
+    frame_idx = 0
+    while len(frames) < max_frames:
+        frame_idx += step
+        if frame_idx >= total:
+            break
+        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if _full_size_diff(prev, frame) >= keyframes.SCENE_CHANGE_THRESHOLD:
+            frames.append({'base64': keyframes._frame_to_base64(frame),
+                           'time_sec': round(frame_idx / fps, 2)})
+            prev = frame
+    cap.release()
+    return frames
+
+
+def _seek_extract(video_path, strategy, max_frames):
+    if strategy == 'interval':
+        return _seek_interval(video_path, max_frames)
+    frames = _seek_scene(video_path, max_frames)
+    if strategy == 'hybrid' and len(frames) < 3:
+        frames += _seek_interval(video_path, max_frames)
+    return frames[:max_frames]
+
+
+# ── Timing ──────────────────────────────────────────────────────────────
+
+def _median_ms(fn, repeat):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples), result
+
+
+def run(video_path, repeat, max_frames):
+    rows = []
+    for strategy in ('interval', 'scene_change', 'hybrid'):
+        seek_ms, _ = _median_ms(lambda: _seek_extract(video_path, strategy, max_frames), repeat)
+        single_ms, frames = _median_ms(
+            lambda: keyframes.extract_keyframes(video_path, strategy=strategy, max_frames=max_frames),
+            repeat)
+        rows.append((strategy, seek_ms, single_ms, len(frames)))
+    return rows
+
+
+def main():
+    p = argparse.ArgumentParser(description='keyframe extraction time, seek-per-sample vs single pass')
+    p.add_argument('--minutes', default='1,10', help='comma-separated synthetic clip lengths')
+    p.add_argument('--video', action='append', default=[], help='benchmark this file instead (repeatable)')
+    p.add_argument('--fps', type=int, default=30)
+    p.add_argument('--width', type=int, default=1280)
+    p.add_argument('--height', type=int, default=720)
+    p.add_argument('--cut-sec', type=float, default=20.0, help='seconds between hard cuts')
+    p.add_argument('--max-frames', type=int, default=6)
+    p.add_argument('--repeat', type=int, default=3, help='timed runs per case')
+    args = p.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = [(os.path.basename(v), v) for v in args.video]
+        if not clips:
+            for m in [float(s) for s in args.minutes.split(',') if s.strip()]:
+                path = os.path.join(tmp, f'clip_{m:g}min.mp4')
+                print(f"=== Writing {m:g} minute {args.width}x{args.height} clip ===")
+                _synthesize(path, m, args.fps, args.width, args.height, args.cut_sec)
+                clips.append((f'{m:g} min', path))
+
+        print(f"{'clip':>14}  {'strategy':>12}  {'seek':>10}  {'single':>10}  {'speedup':>8}  {'frames':>6}"
+              "   (median ms)")
+        for label, path in clips:
+            for strategy, seek_ms, single_ms, n in run(path, args.repeat, args.max_frames):
+                print(f"{label:>14}  {strategy:>12}  {seek_ms:>10.0f}  {single_ms:>10.0f}  "
+                      f"{seek_ms / single_ms if single_ms else 0:>7.1f}x  {n:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Presigned read-URL cache benchmark (modules/object_storage.read_url).
+
+Replays story-feed media lookups against a fake S3 configuration (boto3 signs
+locally, no network) and times read_url with the cache off and on:
+
+  uncached    one SigV4 generate_presigned_url per lookup
+  cached      PresignedUrlCache: reuse until the margin before expiry, LRU
+
+Lookups follow a Zipf distribution over --objects stories (rank 1 = newest),
+which is how map refreshes and feed pages hit recent stories.
+
+    python benchmark_read_url_cache.py
+    python benchmark_read_url_cache.py --objects 50000 --lookups 200000 --skew 1.2
+    python benchmark_read_url_cache.py --cache-size 1000
+"""
+
+import argparse
+import bisect
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config  # noqa: E402
+from modules import object_storage, s3_handler  # noqa: E402
+
+
+def _configure():
+    config.STORAGE_BACKEND = 's3'
+    config.S3_ENDPOINT_URL = 'https://fsn1.your-objectstorage.com'
+    config.S3_REGION = 'auto'
+    config.S3_BUCKET = 'melo-media'
+    config.S3_ACCESS_KEY_ID = 'AKIAEXAMPLE'
+    config.S3_SECRET_ACCESS_KEY = 'secretexample'
+    config.S3_PUBLIC_BASE_URL = None
+    config.S3_ADDRESSING_STYLE = 'virtual'
+    s3_handler._client = None
+
+
+def _zipf_urls(objects, lookups, skew, seed):
+    weights = [1 / (rank ** skew) for rank in range(1, objects + 1)]
+    cumulative = list(itertools.accumulate(weights))
+    rng = random.Random(seed)
+    base = 'https://melo-media.fsn1.your-objectstorage.com/field-reports'
+    return [f'{base}/{bisect.bisect(cumulative, rng.random() * cumulative[-1])}.jpg'
+            for _ in range(lookups)]
+
+
+def _run(urls, cache):
+    object_storage._read_url_cache = cache
+    started = time.perf_counter()
+    for url in urls:
+        object_storage.read_url(url)
+    return time.perf_counter() - started
+
+
+def main():
+    p = argparse.ArgumentParser(description='Benchmark the presigned read-URL cache')
+    p.add_argument('--objects', type=int, default=20000, help='distinct stories with media')
+    p.add_argument('--lookups', type=int, default=100000, help='read_url calls to replay')
+    p.add_argument('--skew', type=float, default=1.1, help='Zipf exponent (higher = more skewed)')
+    p.add_argument('--cache-size', type=int, default=10000)
+    p.add_argument('--seed', type=int, default=7)
+    args = p.parse_args()
+
+    _configure()
+    urls = _zipf_urls(args.objects, args.lookups, args.skew, args.seed)
+    object_storage.read_url(urls[0])        # build the boto3 client outside the timing
+    margin = config.MEDIA_READ_URL_REUSE_MARGIN_MINUTES * 60
+
+    print(f"=== {args.lookups} lookups over {args.objects} objects, Zipf skew {args.skew} ===")
+    uncached = _run(urls, object_storage.PresignedUrlCache(0, margin))
+    print(f"uncached  {uncached:7.2f} s  {uncached / args.lookups * 1e6:8.1f} us/lookup")
+    cache = object_storage.PresignedUrlCache(args.cache_size, margin)
+    cached = _run(urls, cache)
+    stats = cache.stats()
+    print(f"cached    {cached:7.2f} s  {cached / args.lookups * 1e6:8.1f} us/lookup  "
+          f"hit rate {stats['hit_rate']:.1%}  evictions {stats['evictions']}")
+    print(f"=== speed-up x{uncached / cached:.1f} ===")
+
+
+if __name__ == '__main__':
+    main()
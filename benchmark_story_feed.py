@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Story feed latency benchmark.
+
+Times `list_stories(limit=20)` (the /api/stories first page) against a
+file-backed SQLite database holding N VERIFIED uploads, for each N. With the
+feed filtered, ordered and paged in SQL over ix_file_uploads_feed, the
+per-request cost should stay flat as N grows -- only the page is read and
+serialized. The severity column is the exception by design: its rank is a
+CASE expression with no index behind it, so the database does a top-N sort
+over the filtered rows (still serializing only the page).
+
+    python benchmark_story_feed.py                       # 1k, 10k, 100k, 1M
+    python benchmark_story_feed.py --sizes 1000,100000 --repeat 50
+
+Rows are bulk-inserted through SQLAlchemy Core so seeding 1M rows takes
+seconds, not the minutes the ORM would need.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask  # noqa: E402
+
+from app.models import db, FileUpload, FileType  # noqa: E402
+from app.story.service import list_stories  # noqa: E402
+
+_SEVERITIES = ('LOW', 'MEDIUM', 'HIGH')
+_PATHS = ('https://cdn.example/a.mp4', 'https://cdn.example/b.jpg', 'ingest:no-media')
+
+
+def _seed(n, batch=20000):
+    ft = FileType(type_name='Other', allowed_extensions='*')
+    db.session.add(ft)
+    db.session.commit()
+    rnd = random.Random(n)
+    start = datetime(2026, 1, 1)
+    table = FileUpload.__table__
+    for lo in range(0, n, batch):
+        rows = [{
+            'filename': f'r{i}',
+            'file_path': rnd.choice(_PATHS),
+            'title': f'report {i}',
+            'upload_date': start + timedelta(seconds=rnd.randrange(90 * 86400)),
+            'severity': rnd.choice(_SEVERITIES),
+            'confidence_score': rnd.random(),
+            'verification_status': 'VERIFIED' if rnd.random() < 0.9 else 'PENDING',
+            'file_type_id': ft.filetypeid,
+        } for i in range(lo, min(lo + batch, n))]
+        db.session.execute(table.insert(), rows)
+    db.session.commit()
+
+
+def _time(repeat, **kwargs):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        list_stories(limit=20, **kwargs)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def run(size, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            t0 = time.perf_counter()
+            _seed(size)
+            seed_s = time.perf_counter() - t0
+            cases = {
+                'newest': _time(repeat),
+                'page 50': _time(repeat, offset=1000),
+                'severity': _time(repeat, sort='severity'),
+                'has_media': _time(repeat, has_media=True),
+            }
+            db.session.remove()
+            db.engine.dispose()
+    return seed_s, cases
+
+
+def main():
+    p = argparse.ArgumentParser(description='list_stories latency vs table size')
+    p.add_argument('--sizes', default='1000,10000,100000,1000000',
+                   help='comma-separated row counts')
+    p.add_argument('--repeat', type=int, default=20, help='timed calls per case')
+    args = p.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    print(f"{'rows':>9}  {'seed s':>7}  " + '  '.join(
+        f'{c:>10}' for c in ('newest', 'page 50', 'severity', 'has_media')) + '   (median ms)')
+    for n in sizes:
+        seed_s, cases = run(n, args.repeat)
+        print(f'{n:>9}  {seed_s:>7.1f}  ' + '  '.join(f'{v:>10.2f}' for v in cases.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import os
 import logging
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -97,6 +98,15 @@ AZURE_CONTAINER_NAME = os.getenv("AZURE_BLOB_CONTAINER", "uploads")
 DOWNLOADS_FOLDER = os.getenv("DOWNLOAD_FOLDER", "./downloads")
 os.makedirs(DOWNLOADS_FOLDER, exist_ok=True)
 
+# Blob client tuning (app/utils/azure_blob.py; one pooled client per process).
+# Sockets kept open to the storage account.
+AZURE_CONNECTION_POOL_SIZE = int(os.getenv('AZURE_CONNECTION_POOL_SIZE', '16'))
+# Files up to this size go up in one request; larger ones in blocks.
+AZURE_SINGLE_PUT_MB = float(os.getenv('AZURE_SINGLE_PUT_MB', '16'))
+AZURE_UPLOAD_BLOCK_MB = float(os.getenv('AZURE_UPLOAD_BLOCK_MB', '8'))
+# Blocks of one file uploaded in parallel.
+AZURE_UPLOAD_MAX_CONCURRENCY = int(os.getenv('AZURE_UPLOAD_MAX_CONCURRENCY', '4'))
+
 # ── S3-compatible object storage (Hetzner Object Storage / MinIO, ADR-0017) ──
 # Endpoint e.g. https://fsn1.your-objectstorage.com (Hetzner) or your MinIO URL.
 S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
@@ -112,6 +122,12 @@ S3_ADDRESSING_STYLE = os.getenv("S3_ADDRESSING_STYLE", "virtual").lower()
 # TTL (minutes) for the short-lived presigned GET URLs handed to readers so a
 # private bucket's media can still be displayed (ADR-0017).
 MEDIA_READ_URL_TTL_MINUTES = int(os.getenv("MEDIA_READ_URL_TTL_MINUTES", "60"))
+# Each process reuses a signed read URL until this long before it expires, so
+# a reader always gets at least this much of its life. Must be below the TTL.
+MEDIA_READ_URL_REUSE_MARGIN_MINUTES = float(os.getenv("MEDIA_READ_URL_REUSE_MARGIN_MINUTES", "15"))
+# Signed read URLs kept per process (least recently used dropped first);
+# 0 turns the cache off.
+MEDIA_READ_URL_CACHE_SIZE = int(os.getenv("MEDIA_READ_URL_CACHE_SIZE", "10000"))
 
 # ── Azure AI Services ──────────────────────────────────────────────
 AZURE_VISION_ENDPOINT = os.getenv("AZURE_VISION_ENDPOINT")
@@ -128,11 +144,93 @@ AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o")
 # corroboration density during the pilot. Semantic clustering is deferred.
 EVENT_CLUSTER_RADIUS_KM = float(os.getenv('EVENT_CLUSTER_RADIUS_KM', '1.0'))
 EVENT_CLUSTER_WINDOW_HOURS = float(os.getenv('EVENT_CLUSTER_WINDOW_HOURS', '24'))
+# Serve clustering candidate lookups from an in-process grid of open Events
+# (app/events/grid.py) instead of a bounding-box query per ingest. Off by
+# default; every worker must share the setting, since writers only bump the
+# cross-worker invalidation counter while it is on.
+EVENT_GRID_INDEX = os.getenv('EVENT_GRID_INDEX', 'false').lower() in ('1', 'true', 'yes')
 # Distinct non-anonymous identities among VERIFIED members required before an
 # Event can reach CORROBORATED. Still gated: auto-promotion also needs a
 # rung-2+ member present, so a flood of fresh rung-1 keys cannot self-promote.
 EVENT_CORROBORATION_THRESHOLD = int(os.getenv('EVENT_CORROBORATION_THRESHOLD', '2'))
 
+# ── Corroboration-graph snapshots (ADR-0025) ──────────────────────────
+# Archival transitions capture the graph's inputs in-transaction and a
+# background thread per worker builds, hashes and stores the snapshot. Set
+# false to store snapshots synchronously inside the transition instead.
+SNAPSHOT_WRITER_ASYNC = os.getenv('SNAPSHOT_WRITER_ASYNC', 'true').lower() in ('1', 'true', 'yes')
+# Idle poll, so a worker also picks up captures committed by other workers.
+SNAPSHOT_WRITER_POLL_SECONDS = float(os.getenv('SNAPSHOT_WRITER_POLL_SECONDS', '30'))
+# Compression for new snapshot chunks (ADR-0026): zlib, or zstd when the
+# optional zstandard package is installed. Existing chunks keep their codec.
+SNAPSHOT_CHUNK_CODEC = os.getenv('SNAPSHOT_CHUNK_CODEC', 'zlib').lower()
+
+# ── Cross-event campaign detection (app/events/campaigns.py) ──────────
+# Moderation queue items carry an advisory flag when recent reports anywhere
+# share at least this much of their wording (exact Jaccard over 3-word
+# shingles). The index's banding is tuned for thresholds of about 0.8 and up.
+CAMPAIGN_DUP_JACCARD = float(os.getenv('CAMPAIGN_DUP_JACCARD', '0.85'))
+# How far back "recent" reaches; older index rows are pruned.
+CAMPAIGN_WINDOW_HOURS = float(os.getenv('CAMPAIGN_WINDOW_HOURS', '168'))
+# Candidates verified per queue item; a flag past this reports "at least N".
+CAMPAIGN_VERIFY_LIMIT = int(os.getenv('CAMPAIGN_VERIFY_LIMIT', '200'))
+# Each process prunes expired index rows at most this often (and at startup).
+CAMPAIGN_PRUNE_INTERVAL_SECONDS = float(os.getenv('CAMPAIGN_PRUNE_INTERVAL_SECONDS', '3600'))
+
+# ── Media analysis queue (app/file_upload/analysis_queue.py) ──────────
+# Uploads enqueue an analysis job; `python scripts/analysis_worker.py` runs
+# them. Set ANALYSIS_WORKER_IN_PROCESS=true to also run a pool inside the API
+# process (single-box dev setups without a separate worker).
+ANALYSIS_WORKER_IN_PROCESS = os.getenv('ANALYSIS_WORKER_IN_PROCESS', 'false').lower() in ('1', 'true', 'yes')
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', '2'))
+# Concurrent jobs per media kind within one worker process. Transcription and
+# video work are the heavy ones.
+ANALYSIS_MAX_VIDEO_JOBS = int(os.getenv('ANALYSIS_MAX_VIDEO_JOBS', '1'))
+ANALYSIS_MAX_AUDIO_JOBS = int(os.getenv('ANALYSIS_MAX_AUDIO_JOBS', '1'))
+ANALYSIS_MAX_IMAGE_JOBS = int(os.getenv('ANALYSIS_MAX_IMAGE_JOBS', '2'))
+ANALYSIS_MAX_OTHER_JOBS = int(os.getenv('ANALYSIS_MAX_OTHER_JOBS', '1'))
+# Retries: attempt n waits BACKOFF * 2**(n-1) seconds before the next.
+ANALYSIS_JOB_MAX_ATTEMPTS = int(os.getenv('ANALYSIS_JOB_MAX_ATTEMPTS', '3'))
+ANALYSIS_JOB_BACKOFF_SECONDS = float(os.getenv('ANALYSIS_JOB_BACKOFF_SECONDS', '30'))
+# A running job's worker refreshes its lock this often; a RUNNING job
+# untouched for the timeout belongs to a dead worker and is reclaimed. Keep
+# the timeout several heartbeats long.
+ANALYSIS_JOB_HEARTBEAT_SECONDS = float(os.getenv('ANALYSIS_JOB_HEARTBEAT_SECONDS', '60'))
+ANALYSIS_JOB_TIMEOUT_SECONDS = float(os.getenv('ANALYSIS_JOB_TIMEOUT_SECONDS', '3600'))
+ANALYSIS_POLL_SECONDS = float(os.getenv('ANALYSIS_POLL_SECONDS', '5'))
+
+# ── Chunked uploads (app/file_upload/upload_sessions.py) ──────────────
+# Where chunk files wait for assembly. Every API worker (and container) must
+# see the same directory; keep it out of the publicly served UPLOAD_FOLDER.
+CHUNK_UPLOAD_DIR = os.getenv('CHUNK_UPLOAD_DIR', os.path.join(tempfile.gettempdir(), 'melo_chunks'))
+# A session with no chunk for this long is abandoned; the janitor deletes it
+# and its files.
+CHUNK_SESSION_TTL_HOURS = float(os.getenv('CHUNK_SESSION_TTL_HOURS', '24'))
+# How often each API process runs that janitor (on the next session opened).
+CHUNK_JANITOR_INTERVAL_SECONDS = float(os.getenv('CHUNK_JANITOR_INTERVAL_SECONDS', '900'))
+
+# ── Direct web uploads to object storage (app/file_upload/direct_upload.py) ──
+# Part size for browser multipart uploads; raised automatically so no file
+# needs more than S3's 10,000 parts (and never below S3's 5 MiB minimum).
+DIRECT_UPLOAD_PART_MB = int(os.getenv('DIRECT_UPLOAD_PART_MB', '16'))
+# Largest file a direct upload may declare.
+DIRECT_UPLOAD_MAX_MB = int(os.getenv('DIRECT_UPLOAD_MAX_MB', '4096'))
+# Lifetime of each presigned part URL; a client asks again for late parts.
+DIRECT_UPLOAD_URL_TTL_MINUTES = int(os.getenv('DIRECT_UPLOAD_URL_TTL_MINUTES', '60'))
+# A direct upload not completed this long after it started is aborted by the
+# upload janitor.
+DIRECT_UPLOAD_TTL_HOURS = float(os.getenv('DIRECT_UPLOAD_TTL_HOURS', '24'))
+
+# ── Media compute pool (app/utils/media_pool.py) ──────────────────────
+# Processes per API/worker process for CPU-bound media stages (image
+# sanitizing, EXIF, keyframes). 0 runs them inline on the calling thread.
+MEDIA_POOL_WORKERS = int(os.getenv('MEDIA_POOL_WORKERS', '2'))
+# Stages allowed to wait for a free worker before callers block.
+MEDIA_POOL_MAX_QUEUE = int(os.getenv('MEDIA_POOL_MAX_QUEUE', '16'))
+# A stage still running after this is killed (with the pool) and fails; the
+# analysis queue retries it with backoff.
+MEDIA_POOL_TIMEOUT_SECONDS = float(os.getenv('MEDIA_POOL_TIMEOUT_SECONDS', '300'))
+
 # ── Startup log ───────────────────────────────────────────────────────
 logger.info(f"Environment: {ENVIRONMENT}")
 logger.info(f"Log level: {LOG_LEVEL}")
@@ -1,51 +1,48 @@
 import os
 import json
+import base64
 import logging
 import uuid as _uuid_mod
 from datetime import datetime, timedelta, timezone
 from azure.storage.blob import (
-    BlobServiceClient,
+    BlobBlock,
     BlobSasPermissions,
+    ContentSettings,
     CorsRule,
     generate_blob_sas,
 )
-from azure.core.exceptions import ResourceExistsError
-from urllib.parse import unquote
+from urllib.parse import quote, unquote
 from config import AZURE_CONNECTION_STRING, AZURE_CONTAINER_NAME, DOWNLOADS_FOLDER
 
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
-# Lazy client — avoids network calls (and timeouts) at import time
+# Clients come from the process-wide pool in app/utils/azure_blob, shared with
+# the web upload lane: one HTTP connection pool per process, built lazily (no
+# network at import time), and the container created once.
 # ---------------------------------------------------------------------------
-_blob_service_client = None
-_container_client = None
-
 
 def _get_clients():
-    """Return (blob_service_client, container_client), creating them once."""
-    global _blob_service_client, _container_client
-    if _blob_service_client is None:
-        if not AZURE_CONNECTION_STRING:
-            raise RuntimeError(
-                "Azure Storage is not configured (AZURE_STORAGE_CONNECTION_STRING missing)"
-            )
-        _blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
-        _container_client = _blob_service_client.get_container_client(AZURE_CONTAINER_NAME)
-        try:
-            _container_client.create_container()
-        except ResourceExistsError:
-            pass
-    return _blob_service_client, _container_client
+    """Return (blob_service_client, container_client) on the shared pool."""
+    if not AZURE_CONNECTION_STRING:
+        raise RuntimeError(
+            "Azure Storage is not configured (AZURE_STORAGE_CONNECTION_STRING missing)"
+        )
+    from app.utils.azure_blob import get_blob_service_client, get_container_client
+    return (get_blob_service_client(AZURE_CONNECTION_STRING),
+            get_container_client(AZURE_CONTAINER_NAME, AZURE_CONNECTION_STRING))
 
 def upload_file_to_blob(local_file_path):
     """Uploads a local file to Azure Blob Storage and returns its URL."""
+    from app.utils.azure_blob import upload_concurrency
+
     blob_service_client, container_client = _get_clients()
     filename = unquote(os.path.basename(local_file_path))
     blob_client = container_client.get_blob_client(filename)
     try:
         with open(local_file_path, "rb") as data:
-            blob_client.upload_blob(data, overwrite=True)
+            blob_client.upload_blob(data, overwrite=True, length=os.fstat(data.fileno()).st_size,
+                                    max_concurrency=upload_concurrency())
         blob_url = f"https://{blob_service_client.account_name}.blob.core.windows.net/{AZURE_CONTAINER_NAME}/{filename}"
         logger.info("Azure upload success: %s", blob_url)
         return blob_url
@@ -119,6 +116,68 @@ def generate_sas_upload_url(blob_name: str, expiry_minutes: int = 15) -> dict:
     }
 
 
+# ---------------------------------------------------------------------------
+# Block-blob staging — the Azure side of direct multipart web uploads
+# (ADR-0030). The browser PUTs each part as an uncommitted block with a SAS
+# URL; the server commits the block list. Uncommitted blocks are discarded by
+# the service after 7 days, so an abandoned upload needs no cleanup call.
+# ---------------------------------------------------------------------------
+
+def block_id(part_number: int) -> str:
+    """Base64 block id for a 1-based part number. Every id in a blob must have
+    the same length, hence the fixed width."""
+    return base64.b64encode(f"part-{part_number:06d}".encode()).decode()
+
+
+def begin_block_upload(blob_name: str) -> None:
+    """Nothing to initiate on Azure; checks the backend is configured.
+    Raises RuntimeError otherwise."""
+    account_name, account_key = _parse_connection_string(AZURE_CONNECTION_STRING)
+    if not account_name or not account_key:
+        raise RuntimeError("Azure Storage is not configured (AZURE_STORAGE_CONNECTION_STRING missing)")
+
+
+def generate_sas_block_urls(blob_name: str, part_numbers, expiry_minutes: int = 60) -> dict:
+    """{part_number: SAS URL} — HTTP PUT a part's bytes to its URL to stage it
+    as a block (Put Block)."""
+    upload_url = generate_sas_upload_url(blob_name, expiry_minutes=expiry_minutes)['upload_url']
+    return {
+        n: f"{upload_url}&comp=block&blockid={quote(block_id(n), safe='')}"
+        for n in part_numbers
+    }
+
+
+def commit_blocks(blob_name: str, part_numbers, content_type: str | None = None) -> str:
+    """Commit the staged blocks in part order and return the blob URL. Raises
+    ValueError if a block was never staged."""
+    blob_service_client, container_client = _get_clients()
+    blob_client = container_client.get_blob_client(blob_name)
+    wanted = [block_id(n) for n in part_numbers]
+    _, uncommitted = blob_client.get_block_list('uncommitted')
+    staged = {block.id for block in uncommitted}
+    missing = [n for n, bid in zip(part_numbers, wanted) if bid not in staged]
+    if missing:
+        raise ValueError(f"parts not uploaded: {missing}")
+    blob_client.commit_block_list(
+        [BlobBlock(block_id=bid) for bid in wanted],
+        content_settings=ContentSettings(content_type=content_type) if content_type else None,
+    )
+    logger.info("Azure block list committed for '%s' (%d blocks)", blob_name, len(wanted))
+    return f"https://{blob_service_client.account_name}.blob.core.windows.net/{AZURE_CONTAINER_NAME}/{blob_name}"
+
+
+def download_blob_to_file(blob_name: str, local_path: str) -> None:
+    """Stream a blob to a local file."""
+    _, container_client = _get_clients()
+    with open(local_path, "wb") as out:
+        container_client.get_blob_client(blob_name).download_blob(max_concurrency=4).readinto(out)
+
+
+def delete_blob(blob_name: str) -> None:
+    _, container_client = _get_clients()
+    container_client.delete_blob(blob_name)
+
+
 def setup_cors():
     """Configure CORS rules for Azure Blob Storage"""
     try:
@@ -14,13 +14,92 @@ The concrete backend functions are imported INSIDE each call so that:
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
 
 import config
 
 logger = logging.getLogger(__name__)
 
-# Stored file_path values that mean "no media" — never presign these.
-_NO_MEDIA = {"", "ingest:no-media", "anonymous:no-media"}
+# file_path of a report whose media is still in the incoming area of the
+# bucket, waiting for the background sanitize-and-publish step (ADR-0030).
+PENDING_MEDIA = "direct:pending"
+
+# Stored file_path values with nothing to show (no media, or not published
+# yet) — never presign these.
+_NO_MEDIA = {"", "ingest:no-media", "anonymous:no-media", PENDING_MEDIA}
+
+
+class PresignedUrlCache:
+    """Bounded LRU of presigned GET URLs, keyed by (object key, TTL minutes).
+
+    A URL is handed out again until `margin_seconds` before it expires, so a
+    reader always gets at least that much of its life. Signing happens outside
+    the lock; two threads missing on one key at once both sign, and the later
+    URL wins. Thread-safe; one per process.
+    """
+
+    def __init__(self, max_entries, margin_seconds, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.margin_seconds = margin_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()       # (key, ttl) -> (url, reuse until)
+        self.hits = self.misses = self.evictions = 0
+
+    def get_or_sign(self, object_key, ttl_minutes, sign):
+        """The cached URL for the object, else `sign(object_key, ttl_minutes)`."""
+        cache_key = (object_key, ttl_minutes)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and now < entry[1]:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        url = sign(object_key, ttl_minutes)
+        # Timed from before signing, so the URL lives at least this long.
+        reuse_until = now + ttl_minutes * 60 - self.margin_seconds
+        if self.max_entries > 0 and reuse_until > now:
+            with self._lock:
+                self._entries[cache_key] = (url, reuse_until)
+                self._entries.move_to_end(cache_key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return url
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+# Every serialized story asks for its media URL, and reader traffic is heavily
+# skewed to recent stories, so most lookups reuse a URL signed moments ago.
+_read_url_cache = PresignedUrlCache(
+    getattr(config, "MEDIA_READ_URL_CACHE_SIZE", 10000),
+    getattr(config, "MEDIA_READ_URL_REUSE_MARGIN_MINUTES", 15) * 60,
+)
+
+
+def read_url_cache_stats():
+    """Hit/miss/eviction counters of the presigned-GET cache (this process)."""
+    return _read_url_cache.stats()
 
 
 def read_url(stored_url, expiry_minutes=None):
@@ -28,9 +107,10 @@ def read_url(stored_url, expiry_minutes=None):
 
     For an object in our private S3 bucket, returns a short-lived **presigned
     GET** URL (ADR-0017) so the bucket stays private but media still displays /
-    can be re-hashed for reader-side verification. No-media sentinels return
-    None; anything else (local `/api/uploads/...`, Azure, external http) is
-    returned unchanged.
+    can be re-hashed for reader-side verification. The URL comes from
+    _read_url_cache while it has more than MEDIA_READ_URL_REUSE_MARGIN_MINUTES
+    left. No-media sentinels return None; anything else (local
+    `/api/uploads/...`, Azure, external http) is returned unchanged.
     """
     if not stored_url or stored_url in _NO_MEDIA:
         return None
@@ -39,7 +119,8 @@ def read_url(stored_url, expiry_minutes=None):
         if s3_handler.is_our_object_url(stored_url):
             ttl = expiry_minutes or getattr(config, "MEDIA_READ_URL_TTL_MINUTES", 60)
             try:
-                return s3_handler.presigned_get_for_object_url(stored_url, ttl)
+                return _read_url_cache.get_or_sign(s3_handler._object_key_from_url(stored_url),
+                                                   ttl, s3_handler.presigned_get_url)
             except Exception as exc:  # noqa: BLE001 — degrade to the stored URL
                 logger.warning("presigned GET failed for %s: %s", stored_url, exc)
                 return stored_url
@@ -64,3 +145,61 @@ def upload_local_file(local_file_path: str):
         return upload_file_to_bucket(local_file_path)
     from modules.azure_handler import upload_file_to_blob
     return upload_file_to_blob(local_file_path)
+
+
+# ── Multipart direct uploads (web lane, ADR-0030) ─────────────────────────
+# S3 multipart upload or Azure block staging behind one interface. Parts are
+# numbered from 1.
+
+def start_multipart(object_name: str, content_type: str | None = None):
+    """Open a multipart upload; returns the backend's upload id (None on Azure,
+    where blocks are staged against the blob name). Raises RuntimeError if the
+    backend is not configured."""
+    if config.STORAGE_BACKEND == "s3":
+        from modules.s3_handler import create_multipart_upload
+        return create_multipart_upload(object_name, content_type)
+    from modules.azure_handler import begin_block_upload
+    return begin_block_upload(object_name)
+
+
+def part_upload_urls(object_name: str, upload_id, part_numbers, expiry_minutes: int = 60) -> dict:
+    """{part_number: URL} — the client PUTs each part's bytes to its URL."""
+    if config.STORAGE_BACKEND == "s3":
+        from modules.s3_handler import presigned_part_urls
+        return presigned_part_urls(object_name, upload_id, part_numbers, expiry_minutes)
+    from modules.azure_handler import generate_sas_block_urls
+    return generate_sas_block_urls(object_name, part_numbers, expiry_minutes)
+
+
+def complete_multipart(object_name: str, upload_id, parts, content_type: str | None = None) -> str:
+    """Join the uploaded parts, [(part_number, etag or None)] in order, into
+    the object and return its URL. Raises ValueError if a part is missing."""
+    if config.STORAGE_BACKEND == "s3":
+        from modules.s3_handler import complete_multipart_upload
+        return complete_multipart_upload(object_name, upload_id, parts)
+    from modules.azure_handler import commit_blocks
+    return commit_blocks(object_name, [n for n, _ in parts], content_type)
+
+
+def abort_multipart(object_name: str, upload_id) -> None:
+    """Drop an unfinished multipart upload and the parts stored so far."""
+    if config.STORAGE_BACKEND == "s3":
+        from modules.s3_handler import abort_multipart_upload
+        abort_multipart_upload(object_name, upload_id)
+    # Azure discards uncommitted blocks on its own.
+
+
+def download_object(object_name: str, local_path: str) -> None:
+    if config.STORAGE_BACKEND == "s3":
+        from modules.s3_handler import download_object as download
+        return download(object_name, local_path)
+    from modules.azure_handler import download_blob_to_file
+    return download_blob_to_file(object_name, local_path)
+
+
+def delete_object(object_name: str) -> None:
+    if config.STORAGE_BACKEND == "s3":
+        from modules.s3_handler import delete_object as delete
+        return delete(object_name)
+    from modules.azure_handler import delete_blob
+    return delete_blob(object_name)
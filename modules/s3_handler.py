@@ -11,6 +11,10 @@ URL that the phone uploads to directly — the API server never sees the bytes
 
 The presigned URL is signed WITHOUT a fixed Content-Type, so the client does a
 plain PUT of the bytes (no Azure-specific headers).
+
+Large web uploads use S3 multipart upload the same way (ADR-0030): the server
+initiates it, signs one PUT URL per part, and completes or aborts it; the
+browser PUTs the parts straight to the bucket.
 """
 
 import logging
@@ -24,6 +28,10 @@ logger = logging.getLogger(__name__)
 # Lazy client — avoid constructing boto3/botocore at import time.
 _client = None
 
+# S3 multipart limits: at most 10,000 parts, each at least 5 MiB but the last.
+MAX_PARTS = 10_000
+MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 def _require(*names):
     missing = [n for n in names if not getattr(config, n, None)]
@@ -125,6 +133,13 @@ def presigned_get_for_object_url(object_url: str, expiry_minutes: int = 60) -> s
     return presigned_get_url(_object_key_from_url(object_url), expiry_minutes)
 
 
+def _stored_url(key: str) -> str:
+    """Permanent URL recorded for an object the server wrote itself."""
+    base = getattr(config, "S3_PUBLIC_BASE_URL", None)
+    return (f"{base.rstrip('/')}/{key}" if base
+            else f"{config.S3_ENDPOINT_URL.rstrip('/')}/{config.S3_BUCKET}/{key}")
+
+
 def upload_file_to_bucket(local_file_path: str) -> str | None:
     """Server-side upload of a local file (web/anonymous lane). Returns the
     object URL, or None on failure."""
@@ -132,11 +147,89 @@ def upload_file_to_bucket(local_file_path: str) -> str | None:
         client = _get_client()
         key = os.path.basename(local_file_path)
         client.upload_file(local_file_path, config.S3_BUCKET, key)
-        base = getattr(config, "S3_PUBLIC_BASE_URL", None)
-        url = (f"{base.rstrip('/')}/{key}" if base
-               else f"{config.S3_ENDPOINT_URL.rstrip('/')}/{config.S3_BUCKET}/{key}")
+        url = _stored_url(key)
         logger.info("S3 upload success: %s", url)
         return url
     except Exception as exc:  # noqa: BLE001 — log and degrade
         logger.error("S3 upload failed for %s: %s", local_file_path, exc)
         return None
+
+
+def create_multipart_upload(object_name: str, content_type: str | None = None) -> str:
+    """Initiate a multipart upload and return its UploadId.
+    Raises RuntimeError if S3 is not configured."""
+    client = _get_client()
+    params = {"Bucket": config.S3_BUCKET, "Key": object_name}
+    if content_type:
+        params["ContentType"] = content_type
+    upload_id = client.create_multipart_upload(**params)["UploadId"]
+    logger.info("S3 multipart upload started for '%s'", object_name)
+    return upload_id
+
+
+def presigned_part_urls(object_name: str, upload_id: str, part_numbers,
+                        expiry_minutes: int = 60) -> dict:
+    """{part_number: presigned PUT URL} for parts of a multipart upload. The
+    client PUTs each part's bytes and keeps the ETag response header."""
+    client = _get_client()
+    return {
+        n: client.generate_presigned_url(
+            "upload_part",
+            Params={"Bucket": config.S3_BUCKET, "Key": object_name,
+                    "UploadId": upload_id, "PartNumber": n},
+            ExpiresIn=expiry_minutes * 60,
+        )
+        for n in part_numbers
+    }
+
+
+def _uploaded_parts(client, object_name, upload_id) -> dict:
+    """{part_number: ETag} for every part S3 holds for the upload."""
+    parts, marker = {}, 0
+    while True:
+        page = client.list_parts(Bucket=config.S3_BUCKET, Key=object_name,
+                                 UploadId=upload_id, PartNumberMarker=marker)
+        for part in page.get("Parts", []):
+            parts[part["PartNumber"]] = part["ETag"]
+        if not page.get("IsTruncated"):
+            return parts
+        marker = page["NextPartNumberMarker"]
+
+
+def complete_multipart_upload(object_name: str, upload_id: str, parts) -> str:
+    """Join the parts into the object and return its stored URL.
+
+    `parts` is [(part_number, etag or None)] covering every part in order. When
+    an ETag is missing (a browser that cannot read the header) the parts are
+    listed from S3 instead. Raises ValueError if a part was never uploaded --
+    S3 would otherwise silently complete a shorter object.
+    """
+    client = _get_client()
+    parts = list(parts)
+    if any(etag is None for _, etag in parts):
+        held = _uploaded_parts(client, object_name, upload_id)
+        missing = [n for n, _ in parts if n not in held]
+        if missing:
+            raise ValueError(f"parts not uploaded: {missing}")
+        parts = [(n, etag or held[n]) for n, etag in parts]
+    client.complete_multipart_upload(
+        Bucket=config.S3_BUCKET, Key=object_name, UploadId=upload_id,
+        MultipartUpload={"Parts": [{"PartNumber": n, "ETag": etag} for n, etag in parts]},
+    )
+    logger.info("S3 multipart upload completed for '%s' (%d parts)", object_name, len(parts))
+    return _stored_url(object_name)
+
+
+def abort_multipart_upload(object_name: str, upload_id: str) -> None:
+    """Abort a multipart upload; S3 frees the parts already stored."""
+    _get_client().abort_multipart_upload(Bucket=config.S3_BUCKET, Key=object_name,
+                                         UploadId=upload_id)
+
+
+def download_object(object_key: str, local_path: str) -> None:
+    """Stream an object to a local file (boto3 fetches ranges in parallel)."""
+    _get_client().download_file(config.S3_BUCKET, object_key, local_path)
+
+
+def delete_object(object_key: str) -> None:
+    _get_client().delete_object(Bucket=config.S3_BUCKET, Key=object_key)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Run the media-analysis job queue (app/file_upload/analysis_queue.py).
+
+The API only enqueues analysis jobs; this process claims and runs them with a
+fixed pool of ANALYSIS_WORKERS threads and the per-media-kind limits from
+config. Run as many of these as the box can take -- jobs are claimed
+atomically, so they never double up. The worker must see the same uploads
+directory as the API, where the raw analysis copies are staged.
+
+``--once`` runs every job due now in the foreground and exits (cron, tests,
+draining a backlog by hand).
+
+Run inside the API image, e.g.:
+
+    docker compose -f docker-compose.prod.yml up -d melo-analysis-worker
+
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/analysis_worker.py --once
+"""
+
+import argparse
+import os
+import signal
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Run the media-analysis job queue')
+    p.add_argument('--workers', type=int, default=None,
+                   help='pool size (default ANALYSIS_WORKERS)')
+    p.add_argument('--once', action='store_true',
+                   help='run every due job in the foreground, then exit')
+    args = p.parse_args()
+
+    from app import create_app
+    from app.file_upload.analysis_queue import AnalysisWorkerPool, reclaim_stuck_jobs, run_pending
+
+    app = create_app()
+    if args.once:
+        with app.app_context():
+            reclaimed, orphaned = reclaim_stuck_jobs()
+            n = run_pending()
+        print(f"=== {n} job(s) run, {reclaimed} reclaimed, {orphaned} orphaned report(s) failed ===")
+        return
+
+    pool = AnalysisWorkerPool(app, size=args.workers)
+    signal.signal(signal.SIGTERM, lambda *_: pool.stop())
+    signal.signal(signal.SIGINT, lambda *_: pool.stop())
+    print(f"=== analysis worker {pool.worker_id}: {pool.size} thread(s) ===")
+    pool.start()
+    pool.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+"""
+Stamp the stored text MinHash on reports that predate it.
+
+``FileUpload.text_minhash`` is written at ingest and on every text edit; rows
+from before the column stay NULL, and near-duplicate detection hashes their
+text on every graph build instead. This signs each of them with the SAME
+``member_signature`` ingest uses. Safe to re-run: signed rows are skipped.
+
+``--check`` writes nothing; it counts reports with text but no signature and
+exits 1 if there are any.
+
+Run inside the API container, e.g.:
+
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/backfill_text_signatures.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Backfill stored report text signatures')
+    p.add_argument('--check', action='store_true',
+                   help='only count unsigned reports; exit 1 if any')
+    p.add_argument('--batch', type=int, default=500, help='rows per commit')
+    args = p.parse_args()
+
+    from sqlalchemy import or_
+
+    from app import create_app
+    from app.models import FileUpload
+    from app.events.service import backfill_text_signatures
+
+    app = create_app()
+    with app.app_context():
+        if args.check:
+            n = FileUpload.query.filter(
+                FileUpload.text_minhash.is_(None),
+                or_(FileUpload.witness_statement.isnot(None), FileUpload.title.isnot(None)),
+            ).count()
+            print(f"=== {n} report(s) with text but no signature ===")
+            sys.exit(1 if n else 0)
+
+        n = backfill_text_signatures(batch=args.batch)
+        print(f"=== {n} report(s) signed ===")
+
+
+if __name__ == '__main__':
+    main()
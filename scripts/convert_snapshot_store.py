@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Move corroboration-graph snapshots into the chunk store (ADR-0026).
+
+Snapshots written before the chunk store hold their full graph as verbatim
+``graph_json``. This chunks each one with the SAME ``convert_legacy_snapshots``
+the migrating startup runs, checking byte-identical reassembly before the text
+is dropped. Safe to re-run: converted rows are skipped.
+
+``--verify`` converts nothing; it reassembles every snapshot and checks its
+``graph_sha256`` against the bytes, exiting 1 on any mismatch.
+
+Run inside the API container, e.g.:
+
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/convert_snapshot_store.py
+
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/convert_snapshot_store.py --verify
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Convert graph snapshots to the chunk store')
+    p.add_argument('--verify', action='store_true',
+                   help='only check every snapshot reassembles to its graph_sha256')
+    p.add_argument('--batch', type=int, default=200, help='rows per commit')
+    args = p.parse_args()
+
+    from app import create_app
+    from app.models import EventGraphSnapshot
+    from app.events.archive import graph_content_hash
+    from app.events.snapshot_store import convert_legacy_snapshots, load_graph_json
+
+    app = create_app()
+    with app.app_context():
+        if not args.verify:
+            n = convert_legacy_snapshots(batch=args.batch)
+            print(f"=== {n} snapshot(s) converted ===")
+            return
+
+        bad = 0
+        for snap in EventGraphSnapshot.query.order_by(EventGraphSnapshot.id).yield_per(args.batch):
+            if graph_content_hash(json.loads(load_graph_json(snap))) != snap.graph_sha256:
+                bad += 1
+                print(f"  snapshot #{snap.id} (event {snap.event_id}) does not match its hash")
+        print(f"=== {bad} snapshot(s) failed verification ===")
+        sys.exit(1 if bad else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Expire abandoned chunked-upload sessions (ADR-0029) and direct uploads
+(ADR-0030).
+
+Each API process already runs this janitor every
+``CHUNK_JANITOR_INTERVAL_SECONDS`` when a session is opened. Use this script
+to run it on demand, e.g. from cron on a quiet instance or after lowering
+``CHUNK_SESSION_TTL_HOURS``. It deletes sessions idle longer than the TTL,
+with their chunk files, and removes chunk directories that no session owns,
+including legacy ``melo_chunk_*`` temp dirs from the in-memory registry. It
+then aborts direct-to-storage uploads started more than
+``DIRECT_UPLOAD_TTL_HOURS`` ago.
+
+``--list`` prints the open sessions and direct uploads and deletes nothing.
+
+Run inside the API container, e.g.:
+
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/expire_upload_sessions.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Expire abandoned chunked-upload sessions and direct uploads')
+    p.add_argument('--list', action='store_true', help='list open sessions, delete nothing')
+    args = p.parse_args()
+
+    from app import create_app
+    from app.models import DirectUpload, UploadSession
+    from app.file_upload.direct_upload import expire_stale_uploads
+    from app.file_upload.upload_sessions import describe, expire_stale_sessions
+
+    app = create_app()
+    with app.app_context():
+        if args.list:
+            sessions = UploadSession.query.order_by(UploadSession.updated_at).all()
+            for s in sessions:
+                view = describe(s)
+                print(f"{s.id}  {s.status:<10}  {len(view['received'])}/{s.total_chunks} chunk(s)  "
+                      f"expires {view['expires_at']}  {s.filename}")
+            print(f"=== {len(sessions)} session(s) ===")
+            uploads = DirectUpload.query.order_by(DirectUpload.created_at).all()
+            for u in uploads:
+                print(f"{u.id}  {u.status:<10}  {u.backend:<5}  {u.part_count} part(s)  "
+                      f"started {u.created_at.isoformat()}  {u.filename}")
+            print(f"=== {len(uploads)} direct upload(s) ===")
+            return
+
+        sessions, dirs = expire_stale_sessions()
+        print(f"=== {sessions} session(s) expired, {dirs} orphan chunk dir(s) removed ===")
+        aborted = expire_stale_uploads()
+        print(f"=== {aborted} direct upload(s) aborted ===")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Rebuild or prune the cross-event campaign index (ADR-0027).
+
+``text_lsh_buckets`` is kept current by the FileUpload mapper hooks, and
+startup rebuilds it only when it is empty. This re-derives it from the reports
+inside ``CAMPAIGN_WINDOW_HOURS`` with the SAME ``rebuild_campaign_index``, e.g.
+after rows were written with bulk SQL or the banding changed.
+
+``--prune-only`` just drops index rows older than the window.
+
+Run inside the API container, e.g.:
+
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/rebuild_campaign_index.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Rebuild the cross-event campaign index')
+    p.add_argument('--prune-only', action='store_true',
+                   help='only drop index rows older than the window')
+    p.add_argument('--batch', type=int, default=1000, help='reports per commit')
+    args = p.parse_args()
+
+    from app import create_app
+    from app.models import db
+    from app.events.campaigns import prune_campaign_index, rebuild_campaign_index
+
+    app = create_app()
+    with app.app_context():
+        if args.prune_only:
+            n = prune_campaign_index()
+            db.session.commit()
+            print(f"=== {n} expired index row(s) pruned ===")
+            return
+
+        n = rebuild_campaign_index(batch=args.batch)
+        print(f"=== {n} recent report(s) indexed ===")
+
+
+if __name__ == '__main__':
+    main()
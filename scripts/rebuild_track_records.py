@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Reconcile the stored reporter track records from scratch (ADR-0024).
+
+``User.reports_count`` / ``User.corroborated_count`` are maintained on every
+write path that can move them, but they are a cache of the ADR-0012
+computed-on-read aggregate, not a source of truth. This re-derives every user
+from current rows with the SAME ``rebuild_track_records`` the startup backfill
+uses, and prints each row it had to correct. No output besides the summary
+means the cache had not drifted.
+
+Run inside the API container, e.g.:
+
+    # report drift without writing (exit status 1 if any)
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/rebuild_track_records.py --check
+
+    # fix it
+    docker compose -f docker-compose.prod.yml exec -T melo-api \\
+        python scripts/rebuild_track_records.py
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main():
+    p = argparse.ArgumentParser(description='Rebuild stored reporter track records')
+    p.add_argument('--check', action='store_true',
+                   help='report drift only; roll back and exit 1 if any')
+    args = p.parse_args()
+
+    from app import create_app
+    from app.models import db
+    from app.story.track_record import rebuild_track_records
+
+    app = create_app()
+    with app.app_context():
+        drift = rebuild_track_records()
+        for user_id, (reports, corr), (new_reports, new_corr) in drift:
+            print(f"  #{user_id:<5} reports {reports} -> {new_reports}  "
+                  f"corroborated {corr} -> {new_corr}")
+
+        if args.check:
+            db.session.rollback()
+            print(f"=== {len(drift)} user(s) drifted (not written) ===")
+            sys.exit(1 if drift else 0)
+
+        db.session.commit()
+        print(f"=== {len(drift)} user(s) corrected ===")
+
+
+if __name__ == '__main__':
+    main()